@@ -11,8 +11,15 @@ Detects:
 - Unused subnets (no resources, no default route)
 - Orphaned AMIs (not used by launch templates or autoscaling groups)
 
+Every check reads from one inventory snapshot (see
+`ol_infrastructure.lib.aws.inventory`), which paginates every describe call and
+covers every enabled region unless `--region` narrows it. Save the snapshot with
+`--save-snapshot` and re-run the report offline with `--snapshot`.
+
 Usage:
-    python find_orphaned_aws_resources.py --region us-east-1 --days 30
+    python find_orphaned_aws_resources.py --days 30
+    python find_orphaned_aws_resources.py --region us-east-1 --save-snapshot inv.json.gz
+    python find_orphaned_aws_resources.py --snapshot inv.json.gz
 
 Output:
     orphaned_resources_YYYY-MM-DD.csv
@@ -20,380 +27,280 @@ Output:
 
 import csv
 import itertools
+import sys
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-import boto3
 import cyclopts
 
-
-def find_orphaned_ebs_volumes(ec2: Any) -> list[dict[str, Any]]:
-    """Find unattached EBS volumes older than 30 days."""
-    orphaned = []
-    response = ec2.describe_volumes()
-
-    for volume in response.get("Volumes", []):
-        # Check if unattached
-        if not volume["Attachments"]:
-            # Check age (created_time is in UTC)
-            created = volume["CreateTime"].replace(tzinfo=UTC)
-            age_days = (datetime.now(UTC) - created).days
-
-            orphaned.append(
-                {
-                    "Resource Type": "EBS Volume",
-                    "Resource ID": volume["VolumeId"],
-                    "Region": volume["AvailabilityZone"],
-                    "Status": volume["State"],
-                    "Size (GB)": volume["Size"],
-                    "Created": volume["CreateTime"].isoformat(),
-                    "Age (days)": age_days,
-                    "Tags": ", ".join(
-                        [
-                            f"{tag['Key']}={tag['Value']}"
-                            for tag in volume.get("Tags", [])
-                        ]
-                    ),
-                }
-            )
-
-    return orphaned
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ol_infrastructure.lib.aws.inventory import (
+    Snapshot,
+    collect,
+    parse_timestamp,
+    tags_string,
+)
+from ol_infrastructure.lib.aws.security_group_index import (
+    REFERENCE_COLLECTIONS,
+    SecurityGroupIndex,
+)
+
+#: What each check reads. A check whose inputs errored in any region is skipped with a
+#: warning: reporting on a partial inventory would list live resources as orphaned.
+CHECK_INPUTS: dict[str, tuple[str, ...]] = {
+    "EBS volumes": ("volumes",),
+    "Elastic IPs": ("addresses",),
+    "network interfaces": ("network_interfaces",),
+    "security groups": REFERENCE_COLLECTIONS,
+    "RDS snapshots": ("db_snapshots",),
+    "subnets": ("subnets", "instances", "route_tables"),
+    "AMIs": (
+        "images",
+        "launch_template_versions",
+        "auto_scaling_groups",
+        "launch_configurations",
+    ),
+}
+
+
+def _age_days(timestamp: str) -> int:
+    return (datetime.now(UTC) - parse_timestamp(timestamp)).days
+
+
+def find_orphaned_ebs_volumes(snapshot: Snapshot) -> list[dict[str, Any]]:
+    """Find unattached EBS volumes."""
+    return [
+        {
+            "Resource Type": "EBS Volume",
+            "Resource ID": volume["VolumeId"],
+            "Region": volume["AvailabilityZone"],
+            "Status": volume["State"],
+            "Size (GB)": volume["Size"],
+            "Created": volume["CreateTime"],
+            "Age (days)": _age_days(volume["CreateTime"]),
+            "Tags": tags_string(volume),
+        }
+        for volume in snapshot.items("volumes")
+        if not volume["Attachments"]
+    ]
 
 
-def find_orphaned_elastic_ips(ec2: Any) -> list[dict[str, Any]]:
+def find_orphaned_elastic_ips(snapshot: Snapshot) -> list[dict[str, Any]]:
     """Find Elastic IPs not associated with instances."""
-    response = ec2.describe_addresses()
-
     return [
         {
             "Resource Type": "Elastic IP",
             "Resource ID": address["PublicIp"],
+            "Region": address["_region"],
             "Allocation ID": address.get("AllocationId", "N/A"),
             "Associated Instance": address.get("InstanceId", "None"),
             "Domain": address.get("Domain", "N/A"),
         }
-        for address in response.get("Addresses", [])
+        for address in snapshot.items("addresses")
         if "InstanceId" not in address or not address["InstanceId"]
     ]
 
 
-def find_orphaned_network_interfaces(ec2: Any) -> list[dict[str, Any]]:
+def find_orphaned_network_interfaces(snapshot: Snapshot) -> list[dict[str, Any]]:
     """Find network interfaces not attached to instances."""
-    response = ec2.describe_network_interfaces()
-
     return [
         {
             "Resource Type": "Network Interface",
             "Resource ID": eni["NetworkInterfaceId"],
+            "Region": eni["_region"],
             "Status": eni["Status"],
             "Subnet": eni["SubnetId"],
             "VPC": eni["VpcId"],
-            "Tags": ", ".join(
-                [f"{tag['Key']}={tag['Value']}" for tag in eni.get("Tags", [])]
-            ),
+            "Tags": tags_string(eni),
         }
-        for eni in response.get("NetworkInterfaces", [])
+        for eni in snapshot.items("network_interfaces")
         if eni["Status"] == "available" and not eni.get("Attachment")
     ]
 
 
-def find_orphaned_security_groups(ec2: Any) -> list[dict[str, Any]]:
-    """Find security groups not in use by any resources."""
-    orphaned = []
-
-    # Get all security groups
-    all_groups_response = ec2.describe_security_groups()
-    all_groups = {
-        (sg["GroupId"], sg["GroupName"], sg.get("VpcId")): sg
-        for sg in all_groups_response["SecurityGroups"]
-    }
-
-    # Collect active security groups from various resources
-    active_groups = set()
-
-    # From EC2 instances
-    instances_response = ec2.describe_instances()
-    for reservation in instances_response.get("Reservations", []):
-        for instance in reservation["Instances"]:
-            for sg in instance.get("SecurityGroups", []):
-                if "GroupId" in sg:
-                    active_groups.add(sg["GroupId"])
-
-    # From RDS instances
-    try:
-        rds = boto3.client("rds")
-        db_response = rds.describe_db_instances()
-        for db in db_response.get("DBInstances", []):
-            for sg in db.get("VpcSecurityGroups", []):
-                if "VpcSecurityGroupId" in sg:
-                    active_groups.add(sg["VpcSecurityGroupId"])
-    except Exception:  # noqa: S110
-        # Silently skip RDS if inaccessible
-        pass
-
-    # From ElastiCache clusters
-    try:
-        cache = boto3.client("elasticache")
-        cache_response = cache.describe_cache_clusters()
-        for cluster in cache_response.get("CacheClusters", []):
-            for sg in cluster.get("SecurityGroups", []):
-                if "SecurityGroupId" in sg:
-                    active_groups.add(sg["SecurityGroupId"])
-    except Exception:  # noqa: S110
-        # Silently skip ElastiCache if inaccessible
-        pass
-
-    # From Network Interfaces
-    eni_response = ec2.describe_network_interfaces()
-    for eni in eni_response.get("NetworkInterfaces", []):
-        for sg in eni.get("Groups", []):
-            active_groups.add(sg["GroupId"])
-
-    # Find stale groups (excluding default)
-    for (group_id, group_name, vpc_id), sg_data in all_groups.items():
-        if group_id not in active_groups and group_name != "default":
-            orphaned.append(
-                {
-                    "Resource Type": "Security Group",
-                    "Resource ID": group_id,
-                    "Group Name": group_name,
-                    "VPC": vpc_id or "EC2-Classic",
-                    "Ingress Rules": len(sg_data.get("IpPermissions", [])),
-                    "Egress Rules": len(sg_data.get("IpPermissionsEgress", [])),
-                }
-            )
+def find_orphaned_security_groups(snapshot: Snapshot) -> list[dict[str, Any]]:
+    """Find security groups not in use by any resources.
 
-    return orphaned
-
-
-def find_orphaned_rds_snapshots(rds: Any, days_old: int = 90) -> list[dict[str, Any]]:
-    """Find RDS snapshots older than retention period not associated with DB."""
-    response = rds.describe_db_snapshots()
+    "In use" comes from the reverse-reference index, so a group held only by a load
+    balancer, launch template, EKS cluster, Lambda, VPC endpoint or another in-use
+    group's rules is no longer reported as orphaned.
+    """
+    index = SecurityGroupIndex.from_snapshot(snapshot)
     orphaned = []
-
-    for snapshot in response.get("DBSnapshots", []):
-        # Check if snapshot is manual (not automated)
-        if snapshot["SnapshotType"] == "manual":
-            created = snapshot["SnapshotCreateTime"].replace(tzinfo=UTC)
-            age_days = (datetime.now(UTC) - created).days
-
-            if age_days > days_old:
-                orphaned.append(
-                    {
-                        "Resource Type": "RDS Snapshot (Manual)",
-                        "Resource ID": snapshot["DBSnapshotIdentifier"],
-                        "DB Instance": snapshot.get("DBInstanceIdentifier", "Deleted"),
-                        "Created": snapshot["SnapshotCreateTime"].isoformat(),
-                        "Age (days)": age_days,
-                        "Size (GB)": snapshot["AllocatedStorage"],
-                        "Status": snapshot["Status"],
-                    }
-                )
-
+    for group_id in sorted(index.unused()):
+        sg = index.groups[group_id]
+        rule_references = sorted(
+            reference.resource_id for reference in index.references(group_id)
+        )
+        orphaned.append(
+            {
+                "Resource Type": "Security Group",
+                "Resource ID": group_id,
+                "Region": sg["_region"],
+                "Group Name": sg["GroupName"],
+                "VPC": sg.get("VpcId") or "EC2-Classic",
+                "Ingress Rules": len(sg.get("IpPermissions", [])),
+                "Egress Rules": len(sg.get("IpPermissionsEgress", [])),
+                # Only other unused groups can reference an unused one; they have
+                # to go first (or together) for the delete to succeed.
+                "Referenced By Unused Groups": ", ".join(rule_references),
+            }
+        )
     return orphaned
 
 
-def find_orphaned_subnets(ec2: Any) -> list[dict[str, Any]]:
-    """Find subnets with no running resources and no explicit route tables."""
-    orphaned = []
-    subnets_response = ec2.describe_subnets()
-
-    for subnet in subnets_response.get("Subnets", []):
-        subnet_id = subnet["SubnetId"]
-
-        # Check for running instances in this subnet
-        instances_response = ec2.describe_instances(
-            Filters=[
-                {"Name": "subnet-id", "Values": [subnet_id]},
-                {"Name": "instance-state-name", "Values": ["running"]},
-            ]
-        )
+def find_orphaned_rds_snapshots(
+    snapshot: Snapshot, days_old: int = 90
+) -> list[dict[str, Any]]:
+    """Find manual RDS snapshots older than the retention period."""
+    return [
+        {
+            "Resource Type": "RDS Snapshot (Manual)",
+            "Resource ID": db_snapshot["DBSnapshotIdentifier"],
+            "Region": db_snapshot["_region"],
+            "DB Instance": db_snapshot.get("DBInstanceIdentifier", "Deleted"),
+            "Created": db_snapshot["SnapshotCreateTime"],
+            "Age (days)": _age_days(db_snapshot["SnapshotCreateTime"]),
+            "Size (GB)": db_snapshot["AllocatedStorage"],
+            "Status": db_snapshot["Status"],
+        }
+        for db_snapshot in snapshot.items("db_snapshots")
+        if db_snapshot["SnapshotType"] == "manual"
+        and _age_days(db_snapshot["SnapshotCreateTime"]) > days_old
+    ]
 
-        has_instances = False
-        for reservation in instances_response.get("Reservations", []):
-            if reservation["Instances"]:
-                has_instances = True
-                break
-
-        if not has_instances:
-            # Check if subnet has explicit route table association
-            route_tables_response = ec2.describe_route_tables(
-                Filters=[{"Name": "association.subnet-id", "Values": [subnet_id]}]
-            )
-
-            explicit_rt = len(route_tables_response.get("RouteTables", [])) > 0
-
-            if not explicit_rt:
-                orphaned.append(
-                    {
-                        "Resource Type": "Subnet",
-                        "Resource ID": subnet_id,
-                        "VPC": subnet["VpcId"],
-                        "CIDR": subnet["CidrBlock"],
-                        "Availability Zone": subnet["AvailabilityZone"],
-                        "Available IPs": subnet["AvailableIpAddressCount"],
-                    }
-                )
 
-    return orphaned
+def find_orphaned_subnets(snapshot: Snapshot) -> list[dict[str, Any]]:
+    """Find subnets with no running resources and no explicit route tables."""
+    subnets_with_instances = {
+        instance["SubnetId"]
+        for instance in snapshot.items("instances")
+        if instance.get("SubnetId")
+        and instance.get("State", {}).get("Name") == "running"
+    }
+    subnets_with_route_tables = {
+        association["SubnetId"]
+        for route_table in snapshot.items("route_tables")
+        for association in route_table.get("Associations", [])
+        if association.get("SubnetId")
+    }
+    return [
+        {
+            "Resource Type": "Subnet",
+            "Resource ID": subnet["SubnetId"],
+            "Region": subnet["_region"],
+            "VPC": subnet["VpcId"],
+            "CIDR": subnet["CidrBlock"],
+            "Availability Zone": subnet["AvailabilityZone"],
+            "Available IPs": subnet["AvailableIpAddressCount"],
+        }
+        for subnet in snapshot.items("subnets")
+        if subnet["SubnetId"] not in subnets_with_instances
+        and subnet["SubnetId"] not in subnets_with_route_tables
+    ]
 
 
-def find_orphaned_amis(ec2: Any) -> list[dict[str, Any]]:
+def find_orphaned_amis(snapshot: Snapshot) -> list[dict[str, Any]]:
     """Find AMIs not used by launch templates or autoscaling groups."""
-    orphaned = []
-
-    # Get all owned AMIs (exclude public/community images)
-    amis_response = ec2.describe_images(Owners=["self"])
-    all_amis = {ami["ImageId"]: ami for ami in amis_response.get("Images", [])}
-
-    # Collect active AMI IDs from launch template versions
-    active_amis = set()
-
-    # From launch templates
-    try:
-        lt_response = ec2.describe_launch_templates()
-        for lt in lt_response.get("LaunchTemplates", []):
-            lt_id = lt["LaunchTemplateId"]
-            # Get all versions of this launch template
-            try:
-                versions_response = ec2.describe_launch_template_versions(
-                    LaunchTemplateId=lt_id
-                )
-                for version in versions_response.get("LaunchTemplateVersions", []):
-                    ami_id = version.get("LaunchTemplateData", {}).get("ImageId")
-                    if ami_id:
-                        active_amis.add(ami_id)
-            except Exception:  # noqa: S110
-                # Skip if template version list inaccessible
-                pass
-    except Exception:  # noqa: S110
-        # Skip if launch templates inaccessible
-        pass
-
-    # From autoscaling groups
-    try:
-        asg = boto3.client("autoscaling", region_name=ec2.meta.region_name)
-        asgs_response = asg.describe_auto_scaling_groups()
-        for group in asgs_response.get("AutoScalingGroups", []):
-            # Check launch template
-            lt_spec = group.get("LaunchTemplate")
-            if lt_spec:
-                lt_id = lt_spec.get("LaunchTemplateId")
-                if lt_id:
-                    try:
-                        versions_response = ec2.describe_launch_template_versions(
-                            LaunchTemplateId=lt_id
-                        )
-                        for version in versions_response.get(
-                            "LaunchTemplateVersions", []
-                        ):
-                            ami_id = version.get("LaunchTemplateData", {}).get(
-                                "ImageId"
-                            )
-                            if ami_id:
-                                active_amis.add(ami_id)
-                    except Exception:  # noqa: S110
-                        # Skip if template inaccessible
-                        pass
-
-            # Check launch configuration (legacy)
-            lc_name = group.get("LaunchConfigurationName")
-            if lc_name:
-                try:
-                    lcs_response = asg.describe_launch_configurations(
-                        LaunchConfigurationNames=[lc_name]
-                    )
-                    for lc in lcs_response.get("LaunchConfigurations", []):
-                        ami_id = lc.get("ImageId")
-                        if ami_id:
-                            active_amis.add(ami_id)
-                except Exception:  # noqa: S110
-                    # Skip if configuration inaccessible
-                    pass
-    except Exception:  # noqa: S110
-        # Silently skip autoscaling if inaccessible
-        pass
-
-    # Find orphaned AMIs
-    for ami_id, ami_data in all_amis.items():
-        if ami_id not in active_amis:
-            created = ami_data["CreationDate"]
-            # Parse ISO format datetime string
-            if isinstance(created, str):
-                created_dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-            else:
-                created_dt = created.replace(tzinfo=UTC)
-
-            age_days = (datetime.now(UTC) - created_dt).days
-
-            orphaned.append(
-                {
-                    "Resource Type": "AMI",
-                    "Resource ID": ami_id,
-                    "Name": ami_data.get("Name", "N/A"),
-                    "Created": ami_data["CreationDate"],
-                    "Age (days)": age_days,
-                    "State": ami_data.get("State", "unknown"),
-                    "Root Device": ami_data.get("RootDeviceName", "N/A"),
-                    "Size (GB)": sum(
-                        bdm.get("Ebs", {}).get("VolumeSize", 0)
-                        for bdm in ami_data.get("BlockDeviceMappings", [])
-                    ),
-                    "Tags": ", ".join(
-                        [
-                            f"{tag['Key']}={tag['Value']}"
-                            for tag in ami_data.get("Tags", [])
-                        ]
-                    ),
-                }
-            )
+    # Every version of every launch template, which covers the templates ASGs use.
+    active_amis = {
+        version["LaunchTemplateData"]["ImageId"]
+        for version in snapshot.items("launch_template_versions")
+        if version.get("LaunchTemplateData", {}).get("ImageId")
+    }
+    # Launch configurations (legacy) referenced by an autoscaling group
+    in_use_configurations = {
+        (group["_region"], group["LaunchConfigurationName"])
+        for group in snapshot.items("auto_scaling_groups")
+        if group.get("LaunchConfigurationName")
+    }
+    active_amis.update(
+        configuration["ImageId"]
+        for configuration in snapshot.items("launch_configurations")
+        if (configuration["_region"], configuration["LaunchConfigurationName"])
+        in in_use_configurations
+        and configuration.get("ImageId")
+    )
 
-    return orphaned
+    return [
+        {
+            "Resource Type": "AMI",
+            "Resource ID": ami["ImageId"],
+            "Region": ami["_region"],
+            "Name": ami.get("Name", "N/A"),
+            "Created": ami["CreationDate"],
+            "Age (days)": _age_days(ami["CreationDate"]),
+            "State": ami.get("State", "unknown"),
+            "Root Device": ami.get("RootDeviceName", "N/A"),
+            "Size (GB)": sum(
+                bdm.get("Ebs", {}).get("VolumeSize", 0)
+                for bdm in ami.get("BlockDeviceMappings", [])
+            ),
+            "Tags": tags_string(ami),
+        }
+        for ami in snapshot.items("images")
+        if ami["ImageId"] not in active_amis
+    ]
 
 
 def main(
-    region: str = "us-east-1",
+    region: list[str] | None = None,
     days: int = 90,
     output: str | None = None,
+    snapshot: Path | None = None,
+    save_snapshot: Path | None = None,
 ) -> None:
     """
     Find orphaned AWS resources candidates for deletion.
 
     Args:
-        region: AWS region to scan (default: us-east-1)
+        region: AWS region(s) to scan (default: every enabled region)
         days: Age threshold in days for RDS snapshots (default: 90)
         output: Output file path (default: orphaned_resources_YYYY-MM-DD.csv)
+        snapshot: Read this inventory snapshot instead of calling AWS
+        save_snapshot: Write the collected inventory here (.json or .json.gz)
     """
-    # Initialize AWS clients
-    ec2 = boto3.client("ec2", region_name=region)
-    rds = boto3.client("rds", region_name=region)
+    if snapshot:
+        print(f"Reading inventory snapshot {snapshot}...")
+        inventory = Snapshot.load(snapshot)
+    else:
+        collections = set(itertools.chain.from_iterable(CHECK_INPUTS.values()))
+        print(f"Collecting inventory from {', '.join(region or ['all regions'])}...")
+        inventory = collect(region, collections)
+        if save_snapshot:
+            inventory.save(save_snapshot)
+            print(f"Inventory snapshot written to: {save_snapshot.absolute()}")
+
+    print(
+        f"Scanning {len(inventory.regions)} region(s) from the inventory taken "
+        f"{inventory.taken_at} for orphaned resources..."
+    )
+    for error in inventory.errors:
+        print(
+            f"  ! {error['region']} {error['collection']}: {error['error']}",
+            file=sys.stderr,
+        )
 
-    print(f"Scanning {region} for orphaned resources...")
+    checks = {
+        "EBS volumes": find_orphaned_ebs_volumes,
+        "Elastic IPs": find_orphaned_elastic_ips,
+        "network interfaces": find_orphaned_network_interfaces,
+        "security groups": find_orphaned_security_groups,
+        "RDS snapshots": lambda inv: find_orphaned_rds_snapshots(inv, days),
+        "subnets": find_orphaned_subnets,
+        "AMIs": find_orphaned_amis,
+    }
 
     # Collect all orphaned resources
     all_orphaned: list[dict[str, Any]] = []
-
-    print("  - Checking EBS volumes...")
-    all_orphaned.extend(find_orphaned_ebs_volumes(ec2))
-
-    print("  - Checking Elastic IPs...")
-    all_orphaned.extend(find_orphaned_elastic_ips(ec2))
-
-    print("  - Checking network interfaces...")
-    all_orphaned.extend(find_orphaned_network_interfaces(ec2))
-
-    print("  - Checking security groups...")
-    all_orphaned.extend(find_orphaned_security_groups(ec2))
-
-    print("  - Checking RDS snapshots...")
-    all_orphaned.extend(find_orphaned_rds_snapshots(rds, days))
-
-    print("  - Checking subnets...")
-    all_orphaned.extend(find_orphaned_subnets(ec2))
-
-    print("  - Checking AMIs...")
-    all_orphaned.extend(find_orphaned_amis(ec2))
+    for label, check in checks.items():
+        if not inventory.is_complete(*CHECK_INPUTS[label]):
+            print(f"  - Skipping {label}: inventory is incomplete (see errors above)")
+            continue
+        print(f"  - Checking {label}...")
+        all_orphaned.extend(check(inventory))
 
     # Generate output filename
     if output:
@@ -1,41 +1,253 @@
 #!/usr/bin/env python3
-"""Deep diff two JSON files and report differences."""
+"""Deep diff two JSON files and report differences.
 
+Built for multi-megabyte inputs -- `dump_settings.py` output and Pulumi stack state
+exports -- so it never materialises a flattened copy of either document:
+
+- Every subtree gets a content digest in one bottom-up pass, and the diff descends
+  only where the digests differ. Identical subtrees cost one comparison, not a walk.
+- Lists of objects are aligned by an identity key (`urn`, `id`, `name`, ... or any
+  `--list-key`) rather than by index, so one inserted resource does not report every
+  later one as changed. Other lists are aligned by content, which has the same effect
+  for insertions and deletions.
+- Paths are produced by generators over an explicit stack, so depth is not bounded
+  by the recursion limit and nothing is built per level.
+
+Values compare as `==` does, like the flattening diff this replaced: `1`, `1.0`
+and `True` are the same leaf. Empty objects and lists have no leaves, so they never
+show up in the report on their own.
+
+Parsing uses the stdlib C decoder. A streaming parser was considered and dropped:
+the structural diff needs both trees, and a pure-Python event parser is several
+times slower than `json.load` for the same memory.
+
+Usage: json_deep_diff.py [--list-key KEY ...] <file1.json> <file2.json>
+"""
+
+import argparse
+import hashlib
 import json
 import sys
+from collections.abc import Iterator
+from difflib import SequenceMatcher
+from pathlib import Path
 from typing import Any
 
+#: Tried in order to align lists of objects; the first key present and unique in
+#: every element of both lists wins. `urn` matches Pulumi state exports.
+DEFAULT_LIST_KEYS = ("urn", "id", "name", "key", "slug")
+
+Digests = dict[int, bytes]
+
+
+class _Missing:
+    """Marks the absent side of an unpaired list element."""
+
+
+_MISSING: Any = _Missing()
+
+
+def iter_paths(obj: Any, prefix: str = "") -> Iterator[tuple[str, Any]]:
+    """Yield (dotted path, leaf value) for every leaf of a nested structure.
+
+    Empty containers have no leaves and yield nothing.
+    """
+    stack = [(prefix, obj)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, dict) and node:
+            stack.extend(
+                (f"{path}.{key}" if path else str(key), value)
+                for key, value in reversed(node.items())
+            )
+        elif isinstance(node, list) and node:
+            stack.extend(
+                (f"{path}[{idx}]", item)
+                for idx, item in reversed(list(enumerate(node)))
+            )
+        elif not isinstance(node, (dict, list)):
+            yield path, node
+
 
 def get_all_paths(obj: Any, prefix: str = "") -> dict[str, Any]:
-    """Recursively get all paths and their values from a nested structure."""
-    paths = {}
-
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            if isinstance(value, (dict, list)):
-                paths.update(get_all_paths(value, current_path))
-            else:
-                paths[current_path] = value
-    elif isinstance(obj, list):
-        for idx, item in enumerate(obj):
-            current_path = f"{prefix}[{idx}]"
-            if isinstance(item, (dict, list)):
-                paths.update(get_all_paths(item, current_path))
-            else:
-                paths[current_path] = item
-
-    return paths
-
-
-def deep_diff(file1_path: str, file2_path: str) -> None:
+    """Get all paths and their values from a nested structure."""
+    return dict(iter_paths(obj, prefix))
+
+
+def subtree_digests(root: Any) -> Digests:
+    """Return a content digest for every container in `root`, keyed by `id()`.
+
+    Computed iteratively in post-order, so each node is hashed exactly once and a
+    parent's digest is derived from its children's rather than re-serialising them.
+    Dict digests are key-order independent, matching `==` on dicts.
+    """
+    digests: Digests = {}
+    stack: list[tuple[Any, bool]] = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not isinstance(node, (dict, list)) or id(node) in digests:
+            continue
+        children = node.values() if isinstance(node, dict) else node
+        if not children_done:
+            stack.append((node, True))
+            stack.extend(
+                (child, False) for child in children if isinstance(child, (dict, list))
+            )
+            continue
+        hasher = hashlib.blake2b(digest_size=16)
+        if isinstance(node, dict):
+            hasher.update(b"{")
+            for key in sorted(node, key=str):
+                hasher.update(repr(key).encode())
+                hasher.update(_digest(node[key], digests))
+        else:
+            hasher.update(b"[")
+            for item in node:
+                hasher.update(_digest(item, digests))
+        digests[id(node)] = hasher.digest()
+    return digests
+
+
+def _digest(node: Any, digests: Digests) -> bytes:
+    """Return a container's digest, or a leaf's type-tagged repr.
+
+    Leaves are not hashed on their own: their tagged repr is already a unique,
+    comparable encoding, and hashing each one separately doubled the diff's cost on
+    a state export. Numbers are normalised first so that digests agree with `==`:
+    `1`, `1.0` and `True` share one encoding, while `"1"` keeps its own.
+    """
+    if isinstance(node, (dict, list)):
+        return digests[id(node)]
+    if isinstance(node, (bool, int, float)):
+        if isinstance(node, bool) or (isinstance(node, float) and node.is_integer()):
+            node = int(node)
+        return f"number:{node!r}\0".encode()
+    return f"{type(node).__name__}:{node!r}\0".encode()
+
+
+def _alignment_key(
+    left: list[Any], right: list[Any], keys: tuple[str, ...]
+) -> str | None:
+    """Return the first of `keys` that identifies every element of both lists."""
+    if not left or not right:
+        return None
+    if not all(isinstance(item, dict) for item in (*left, *right)):
+        return None
+    for key in keys:
+        for items in (left, right):
+            values = [item.get(key) for item in items]
+            if None in values or len(set(map(str, values))) != len(values):
+                break
+        else:
+            return key
+    return None
+
+
+def structural_diff(
+    left: Any,
+    right: Any,
+    list_keys: tuple[str, ...] = DEFAULT_LIST_KEYS,
+) -> Iterator[tuple[str, str, Any, Any]]:
+    """Yield (kind, path, left_value, right_value) for every difference.
+
+    `kind` is "removed" (only in left), "added" (only in right) or "changed". Removed
+    and added entries are whole subtrees; callers flatten them with `iter_paths`.
+    """
+    left_digests = subtree_digests(left)
+    right_digests = subtree_digests(right)
+    stack: list[tuple[str, Any, Any]] = [("", left, right)]
+    while stack:
+        path, a, b = stack.pop()
+        if a is _MISSING:
+            yield "added", path, None, b
+            continue
+        if b is _MISSING:
+            yield "removed", path, a, None
+            continue
+        if _digest(a, left_digests) == _digest(b, right_digests):
+            continue
+        if isinstance(a, dict) and isinstance(b, dict):
+            pending = []
+            for key in a.keys() | b.keys():
+                child = f"{path}.{key}" if path else str(key)
+                if key not in b:
+                    yield "removed", child, a[key], None
+                elif key not in a:
+                    yield "added", child, None, b[key]
+                else:
+                    pending.append((child, a[key], b[key]))
+            stack.extend(sorted(pending, key=lambda entry: entry[0], reverse=True))
+        elif isinstance(a, list) and isinstance(b, list):
+            stack.extend(
+                reversed(
+                    list(
+                        _diff_lists(path, a, b, left_digests, right_digests, list_keys)
+                    )
+                )
+            )
+        else:
+            yield "changed", path, a, b
+
+
+def _diff_lists(
+    path: str,
+    a: list[Any],
+    b: list[Any],
+    left_digests: Digests,
+    right_digests: Digests,
+    list_keys: tuple[str, ...],
+) -> Iterator[Any]:
+    """Pair up list elements, yielding (path, a, b) with `_MISSING` for an absent side.
+
+    The pairs go back on `structural_diff`'s stack rather than being reported here,
+    so additions and removals come out in path order with everything else.
+    """
+    key = _alignment_key(a, b, list_keys)
+    if key:
+        right_by_key = {str(item[key]): item for item in b}
+        left_keys = {str(item[key]) for item in a}
+        for item in a:
+            identity = str(item[key])
+            child = f"{path}[{key}={identity}]"
+            yield child, item, right_by_key.get(identity, _MISSING)
+        for item in b:
+            identity = str(item[key])
+            if identity not in left_keys:
+                yield f"{path}[{key}={identity}]", _MISSING, item
+        return
+
+    matcher = SequenceMatcher(
+        None,
+        [_digest(item, left_digests) for item in a],
+        [_digest(item, right_digests) for item in b],
+        autojunk=False,
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for offset in range(paired):
+            yield f"{path}[{i1 + offset}]", a[i1 + offset], b[j1 + offset]
+        for idx in range(i1 + paired, i2):
+            yield f"{path}[{idx}]", a[idx], _MISSING
+        for idx in range(j1 + paired, j2):
+            yield f"{path}[{idx}]", _MISSING, b[idx]
+
+
+def load_json(file_path: str) -> Any:
+    """Parse a JSON file with the stdlib C decoder."""
+    with Path(file_path).open("rb") as f:
+        return json.load(f)
+
+
+def deep_diff(
+    file1_path: str, file2_path: str, list_keys: tuple[str, ...] = DEFAULT_LIST_KEYS
+) -> None:
     """Compare two JSON files and report differences."""
     # Load JSON files
     try:
-        with open(file1_path) as f:
-            data1 = json.load(f)
-        with open(file2_path) as f:
-            data2 = json.load(f)
+        data1 = load_json(file1_path)
+        data2 = load_json(file2_path)
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -43,31 +255,31 @@ def deep_diff(file1_path: str, file2_path: str) -> None:
         print(f"Error parsing JSON: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Get all paths from both files
-    paths1 = get_all_paths(data1)
-    paths2 = get_all_paths(data2)
-
-    keys1 = set(paths1.keys())
-    keys2 = set(paths2.keys())
+    only_in_file1: list[tuple[str, Any]] = []
+    only_in_file2: list[tuple[str, Any]] = []
+    different_values: list[tuple[str, Any, Any]] = []
+    for kind, path, val1, val2 in structural_diff(data1, data2, list_keys):
+        if kind == "removed":
+            only_in_file1.extend(iter_paths(val1, path))
+        elif kind == "added":
+            only_in_file2.extend(iter_paths(val2, path))
+        elif isinstance(val1, (dict, list)) or isinstance(val2, (dict, list)):
+            # A type change (object vs scalar, say): both sides' leaves differ.
+            only_in_file1.extend(iter_paths(val1, path))
+            only_in_file2.extend(iter_paths(val2, path))
+        else:
+            different_values.append((path, val1, val2))
 
-    # Find keys only in file1
-    only_in_file1 = sorted(keys1 - keys2)
-
-    # Find keys only in file2
-    only_in_file2 = sorted(keys2 - keys1)
-
-    # Find keys with different values
-    different_values = []
-    for key in sorted(keys1 & keys2):
-        if paths1[key] != paths2[key]:
-            different_values.append((key, paths1[key], paths2[key]))
+    only_in_file1.sort(key=lambda entry: entry[0])
+    only_in_file2.sort(key=lambda entry: entry[0])
+    different_values.sort(key=lambda entry: entry[0])
 
     # Print results
     print("Keys in File1 not found in File2")
     print("=" * 80)
     if only_in_file1:
-        for key in only_in_file1:
-            print(f"  {key}: {paths1[key]}")
+        for key, value in only_in_file1:
+            print(f"  {key}: {value}")
     else:
         print("  (none)")
     print()
@@ -75,8 +287,8 @@ def deep_diff(file1_path: str, file2_path: str) -> None:
     print("Keys in File2 not found in File1")
     print("=" * 80)
     if only_in_file2:
-        for key in only_in_file2:
-            print(f"  {key}: {paths2[key]}")
+        for key, value in only_in_file2:
+            print(f"  {key}: {value}")
     else:
         print("  (none)")
     print()
@@ -94,14 +306,21 @@ def deep_diff(file1_path: str, file2_path: str) -> None:
 
 def main() -> None:
     """Entry point for the script."""
-    if len(sys.argv) != 3:
-        print("Usage: json_deep_diff.py <file1.json> <file2.json>", file=sys.stderr)
-        sys.exit(1)
-
-    file1 = sys.argv[1]
-    file2 = sys.argv[2]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file1")
+    parser.add_argument("file2")
+    parser.add_argument(
+        "--list-key",
+        action="append",
+        default=[],
+        help=(
+            "Align lists of objects on this key (repeatable; tried before the "
+            f"defaults {', '.join(DEFAULT_LIST_KEYS)})."
+        ),
+    )
+    args = parser.parse_args()
 
-    deep_diff(file1, file2)
+    deep_diff(args.file1, args.file2, (*args.list_key, *DEFAULT_LIST_KEYS))
 
 
 if __name__ == "__main__":
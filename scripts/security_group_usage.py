@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Answer "who uses this security group?" from an AWS inventory snapshot.
+
+Every reference is listed: instances, ENIs, RDS, ElastiCache, launch templates and
+configurations, load balancers, EKS, Lambda, VPC endpoints, and other groups' rules.
+Select groups by id, VPC or tag; with no selector, every group is listed.
+
+Usage:
+    python security_group_usage.py --snapshot inv.json.gz --group sg-0123
+    python security_group_usage.py --snapshot inv.json.gz --vpc vpc-0abc
+    python security_group_usage.py --region us-east-1 --tag Name=edxapp-web
+"""
+
+import sys
+from pathlib import Path
+
+import cyclopts
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ol_infrastructure.lib.aws.inventory import Snapshot, collect
+from ol_infrastructure.lib.aws.security_group_index import (
+    REFERENCE_COLLECTIONS,
+    SecurityGroupIndex,
+)
+
+
+def main(
+    group: list[str] | None = None,
+    vpc: str | None = None,
+    tag: str | None = None,
+    snapshot: Path | None = None,
+    region: list[str] | None = None,
+) -> None:
+    """
+    List the references to each selected security group.
+
+    Args:
+        group: Security group id(s) to look up
+        vpc: Select every group in this VPC
+        tag: Select groups by tag, as KEY or KEY=VALUE
+        snapshot: Read this inventory snapshot instead of calling AWS
+        region: AWS region(s) to collect when no snapshot is given (default: all)
+    """
+    inventory = (
+        Snapshot.load(snapshot)
+        if snapshot
+        else collect(region, collections=REFERENCE_COLLECTIONS)
+    )
+    index = SecurityGroupIndex.from_snapshot(inventory)
+
+    selected = set(group or [])
+    if vpc:
+        selected |= index.groups_in_vpc(vpc)
+    if tag:
+        key, _, value = tag.partition("=")
+        selected |= index.groups_with_tag(key, value or None)
+    if not (group or vpc or tag):
+        selected = set(index.groups)
+
+    unused = index.unused()
+    for group_id in sorted(selected):
+        sg = index.groups.get(group_id)
+        name = sg["GroupName"] if sg else "(not in snapshot)"
+        state = " [unused]" if group_id in unused else ""
+        print(f"{group_id}  {name}{state}")
+        for reference in sorted(
+            index.references(group_id),
+            key=lambda ref: (ref.kind, ref.resource_id, ref.detail),
+        ):
+            detail = f" ({reference.detail})" if reference.detail else ""
+            print(
+                f"    {reference.kind:<22} {reference.resource_id}"
+                f"  {reference.region}{detail}"
+            )
+
+
+if __name__ == "__main__":
+    app = cyclopts.App(default_command=main)
+    app()
@@ -5,6 +5,7 @@ from typing import Any
 from pydantic_settings import SettingsConfigDict
 
 from bilder.lib.model_helpers import OLBaseSettings
+from bridge.lib.vector import VectorBuffer, VectorPipeline
 
 
 class VectorInstallMethod(StrEnum):
@@ -19,10 +20,21 @@ class VectorConfig(OLBaseSettings):
         Path(__file__).resolve().parent.joinpath("templates", "vector.toml"): {},
         Path(__file__).resolve().parent.joinpath("templates", "host_metrics.yaml"): {},
     }
+    # Typed configurations, rendered and written under configuration_directory by
+    # file name alongside the templates.
+    configurations: dict[str, VectorPipeline] = {}  # noqa: RUF012
     configuration_directory: Path = Path("/etc/vector/")
     data_directory: Path = Path("/var/lib/vector")
     is_proxy: bool = False
     is_docker: bool = False
     use_global_log_sink: bool = False
     use_global_metric_sink: bool = False
+    # None keeps Vector's default: 500 events in memory, blocking when full. The
+    # file, journald and docker sources wait for a blocked sink without losing
+    # anything, so an image whose logs must also survive a restart during a
+    # Grafana Cloud outage can opt into a disk buffer, e.g.
+    # VectorBuffer.disk(512 * MIB). That reserves up to 512 MiB of the root
+    # volume under data_directory, so it is not the default for every host.
+    global_log_sink_buffer: VectorBuffer | None = None
+    global_metric_sink_buffer: VectorBuffer = VectorBuffer.memory(10_000)
     tls_config_directory: Path = Path("/etc/vector/ssl/")
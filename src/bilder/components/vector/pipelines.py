@@ -0,0 +1,76 @@
+"""Vector pipelines shared by every image, built with bridge.lib.vector.
+
+Each image's own templates end their log pipelines in a transform named
+`enrich_logs_global_funnel` and their metric pipelines in
+`noop_metric_global_funnel`; these sinks read from those.
+"""
+
+from bridge.lib.vector import (
+    RemapTransform,
+    VectorBatch,
+    VectorBuffer,
+    VectorComponent,
+    VectorPipeline,
+    VectorRequest,
+    grafana_cloud_loki_sink,
+    grafana_cloud_metrics_sink,
+)
+
+LOG_FUNNEL = "enrich_logs_global_funnel"
+METRIC_FUNNEL = "noop_metric_global_funnel"
+
+
+def global_log_sink(buffer: VectorBuffer | None = None) -> VectorPipeline:
+    """Ship every host log pipeline to Grafana Cloud Loki."""
+    return VectorPipeline(
+        sinks={
+            "global_ship_logs_to_grafana_cloud": grafana_cloud_loki_sink(
+                [LOG_FUNNEL],
+                labels={
+                    "environment": "${ENVIRONMENT}",
+                    "application": "{{ .application }}",
+                    "service": "{{ .service }}",
+                },
+                buffer=buffer,
+                # Hosts log little each; a longer linger means fewer, larger
+                # pushes from the fleet as a whole.
+                batch=VectorBatch(timeout_secs=5),
+                request=VectorRequest(concurrency="adaptive"),
+            )
+        }
+    )
+
+
+def global_metric_sink(buffer: VectorBuffer) -> VectorPipeline:
+    """Ship every host metric pipeline to Grafana Cloud Prometheus."""
+    return VectorPipeline(
+        sinks={
+            "ship_host_metrics_to_grafana_cloud": grafana_cloud_metrics_sink(
+                [METRIC_FUNNEL],
+                buffer=buffer,
+                request=VectorRequest(concurrency="adaptive"),
+            )
+        }
+    )
+
+
+def stand_in_funnels() -> VectorPipeline:
+    """Feed the global sinks from stand-in sources, for `vector validate`.
+
+    Each image supplies the real funnel transforms; a configuration holding only
+    the sinks fails validation on their missing inputs.
+    """
+    return VectorPipeline(
+        sources={
+            "stand_in_logs": VectorComponent.model_validate(
+                {"type": "demo_logs", "format": "json"}
+            ),
+            "stand_in_metrics": VectorComponent(type="internal_metrics"),
+        },
+        transforms={
+            LOG_FUNNEL: RemapTransform(
+                inputs=["stand_in_logs"], source='.service = "x"'
+            ),
+            METRIC_FUNNEL: RemapTransform(inputs=["stand_in_metrics"], source="."),
+        },
+    )
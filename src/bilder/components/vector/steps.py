@@ -1,3 +1,4 @@
+from io import StringIO
 from pathlib import Path
 
 from pyinfra import host
@@ -6,7 +7,9 @@ from pyinfra.facts.files import File
 from pyinfra.operations import files, server, systemd
 
 from bilder.components.vector.models import VectorConfig
+from bilder.components.vector.pipelines import global_log_sink, global_metric_sink
 from bilder.facts.has_systemd import HasSystemd
+from bridge.lib.vector import VALIDATION_ENVIRONMENT
 
 
 def _debian_pkg_repo():
@@ -100,17 +103,13 @@ def install_vector(vector_config: VectorConfig):
 
     # Config flags to enable global sink configurations
     if vector_config.use_global_log_sink:
-        vector_config.configuration_templates[
-            Path(__file__)
-            .resolve()
-            .parent.joinpath("templates", "global_log_sink.yaml")
-        ] = {}
+        vector_config.configurations["global_log_sink.yaml"] = global_log_sink(
+            vector_config.global_log_sink_buffer
+        )
     if vector_config.use_global_metric_sink:
-        vector_config.configuration_templates[
-            Path(__file__)
-            .resolve()
-            .parent.joinpath("templates", "global_metric_sink.yaml")
-        ] = {}
+        vector_config.configurations["global_metric_sink.yaml"] = global_metric_sink(
+            vector_config.global_metric_sink_buffer
+        )
 
 
 @deploy("Configure Vector: create configuration files")
@@ -127,6 +126,13 @@ def configure_vector(vector_config: VectorConfig):
             user=vector_config.user,
             context=context,
         )
+    for fname, pipeline in vector_config.configurations.items():
+        files.put(
+            name=f"Write Vector configuration file {fname}",
+            src=StringIO(pipeline.render()),
+            dest=str(vector_config.configuration_directory.joinpath(fname)),
+            user=vector_config.user,
+        )
 
     # Validate the vector configuration files that were laid down
     # and confirm that vector starts without issue.
@@ -137,21 +143,7 @@ def configure_vector(vector_config: VectorConfig):
     server.shell(
         name="Run vector validate",
         commands=["/usr/bin/vector validate --no-environment"],
-        _env={
-            "VECTOR_CONFIG_DIR": "/etc/vector",
-            "AWS_REGION": "us-east-1",
-            "ENVIRONMENT": "placeholder",
-            "APPLICATION": "placeholder",
-            "SERVICE": "placeholder",
-            "FASTLY_PROXY_PASSWORD": "placeholder",  # pragma: allowlist secret
-            "FASTLY_PROXY_USERNAME": "placeholder",
-            "GRAFANA_CLOUD_API_KEY": "placeholder",  # pragma: allowlist secret
-            "HOSTNAME": "placeholder",
-            "HEROKU_PROXY_PASSWORD": "placeholder",  # pragma: allowlist secret
-            "HEROKU_PROXY_USERNAME": "placeholder",
-            "VECTOR_STRICT_ENV_VARS": "false",
-            "VECTOR_DANGEROUSLY_ALLOW_ENV_VAR_INTERPOLATION": "true",
-        },
+        _env={"VECTOR_CONFIG_DIR": "/etc/vector", **VALIDATION_ENVIRONMENT},
     )
 
 
@@ -0,0 +1,442 @@
+"""Typed Vector configuration, shared by bilder images and Kubernetes deployments.
+
+Vector's defaults suit a laptop, not a log shipper whose downstream is a SaaS
+endpoint that slows down: a 500-event in-memory buffer per sink that blocks when
+full. When Grafana Cloud stalls, that backpressure reaches whatever is upstream --
+for the log proxy, Fastly's and Heroku's log drains. Sinks built here state their
+buffer, batch, compression and request concurrency instead of inheriting them.
+
+    pipeline = VectorPipeline(
+        sources={
+            "drain": VectorComponent.model_validate(
+                {"type": "heroku_logs", "address": "0.0.0.0:9000"}
+            )
+        },
+        sinks={
+            "loki": grafana_cloud_loki_sink(
+                ["drain"],
+                labels={"service": "heroku"},
+                buffer=VectorBuffer.disk(1024 * MIB, when_full=WhenFull.drop_newest),
+            )
+        },
+    )
+    pipeline.render()  # YAML, for a ConfigMap or a file on a host
+    check_vector_config({"vector.yaml": pipeline})  # `vector validate` on it
+
+Sinks are typed because that is where the tuning lives, and so are the
+transforms built in Python (`RemapTransform`, `SampleTransform` ...). Any other
+component is a `VectorComponent`, which keeps whatever options it is validated
+from: `VectorComponent.model_validate({"type": ..., ...})`.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from collections.abc import Mapping, Sequence
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Literal, Self
+
+import yaml
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PositiveInt,
+    SerializeAsAny,
+    model_validator,
+)
+
+MIB = 1024 * 1024
+#: Vector refuses a disk buffer smaller than this (one data file plus its ledger).
+DISK_BUFFER_MIN_BYTES = 268435488
+#: Vector's own default data_dir, and where disk buffers live under it.
+DEFAULT_DATA_DIR = "/var/lib/vector"
+
+GRAFANA_CLOUD_LOKI_ENDPOINT = "https://logs-prod-us-central1.grafana.net"
+GRAFANA_CLOUD_PROMETHEUS_ENDPOINT = (
+    "https://prometheus-prod-10-prod-us-central-0.grafana.net/api/prom/push"
+)
+
+#: Placeholders for the environment variables our configs interpolate, so that
+#: `vector validate --no-environment` can parse them anywhere.
+VALIDATION_ENVIRONMENT = {
+    "AWS_REGION": "us-east-1",
+    "ENVIRONMENT": "placeholder",
+    "APPLICATION": "placeholder",
+    "SERVICE": "placeholder",
+    "FASTLY_PROXY_PASSWORD": "placeholder",  # pragma: allowlist secret
+    "FASTLY_PROXY_USERNAME": "placeholder",
+    "GRAFANA_CLOUD_API_KEY": "placeholder",  # pragma: allowlist secret
+    "HOSTNAME": "placeholder",
+    "HEROKU_PROXY_PASSWORD": "placeholder",  # pragma: allowlist secret
+    "HEROKU_PROXY_USERNAME": "placeholder",
+    "VECTOR_STRICT_ENV_VARS": "false",
+    "VECTOR_DANGEROUSLY_ALLOW_ENV_VAR_INTERPOLATION": "true",
+}
+
+
+class WhenFull(StrEnum):
+    # Backpressure: upstream sources slow down. Lossless for sources that can
+    # wait (files, journald); for push sources it moves the queue to the sender.
+    block = "block"
+    # Shed new events once full, so senders never see the downstream stall.
+    drop_newest = "drop_newest"
+
+
+class Compression(StrEnum):
+    none = "none"
+    gzip = "gzip"
+    snappy = "snappy"
+    zstd = "zstd"
+
+
+class VectorBuffer(BaseModel):
+    """A sink's buffer: events held while the sink cannot send them."""
+
+    type: Literal["memory", "disk"] = "memory"
+    max_events: int | None = None
+    max_size: int | None = None
+    when_full: WhenFull = WhenFull.block
+
+    @model_validator(mode="after")
+    def check_size(self) -> Self:
+        if self.type == "disk":
+            if self.max_size is None or self.max_size < DISK_BUFFER_MIN_BYTES:
+                msg = f"a disk buffer needs max_size >= {DISK_BUFFER_MIN_BYTES} bytes"
+                raise ValueError(msg)
+            if self.max_events is not None:
+                msg = "a disk buffer is sized by max_size, not max_events"
+                raise ValueError(msg)
+        elif self.max_size is not None:
+            msg = "a memory buffer is sized by max_events, not max_size"
+            raise ValueError(msg)
+        return self
+
+    @classmethod
+    def memory(
+        cls, max_events: int = 500, *, when_full: WhenFull = WhenFull.block
+    ) -> Self:
+        return cls(type="memory", max_events=max_events, when_full=when_full)
+
+    @classmethod
+    def disk(cls, max_size: int, *, when_full: WhenFull = WhenFull.block) -> Self:
+        """Buffer on disk under `data_dir`, kept across restarts; size in bytes."""
+        return cls(type="disk", max_size=max_size, when_full=when_full)
+
+
+class VectorBatch(BaseModel):
+    """How much a sink accumulates before sending; whichever limit is hit first."""
+
+    max_bytes: int | None = None
+    max_events: int | None = None
+    timeout_secs: float | None = None
+
+
+class VectorRequest(BaseModel):
+    """In-flight request limits and retries for an HTTP-based sink."""
+
+    # "adaptive" lets Vector's adaptive request concurrency back off on rising
+    # latency; an int is a fixed ceiling.
+    concurrency: Literal["adaptive", "none"] | int | None = None
+    rate_limit_num: int | None = None
+    rate_limit_duration_secs: int | None = None
+    retry_attempts: int | None = None
+    retry_max_duration_secs: int | None = None
+    timeout_secs: int | None = None
+
+
+class VectorComponent(BaseModel):
+    """A source, transform, or sink; options other than the typed ones pass through."""
+
+    model_config = ConfigDict(extra="allow")
+
+    type: str
+    inputs: list[str] | None = None
+
+
+class RemapTransform(VectorComponent):
+    type: Literal["remap"] = "remap"
+    inputs: list[str]
+    source: str
+
+
+class SampleTransform(VectorComponent):
+    type: Literal["sample"] = "sample"
+    inputs: list[str]
+    rate: int
+    #: VRL condition; matching events bypass sampling.
+    exclude: str | None = None
+
+
+class DedupeTransform(VectorComponent):
+    type: Literal["dedupe"] = "dedupe"
+    inputs: list[str]
+    fields: dict[Literal["match", "ignore"], list[str]]
+    cache: dict[Literal["num_events"], int] | None = None
+
+
+class LogToMetricTransform(VectorComponent):
+    type: Literal["log_to_metric"] = "log_to_metric"
+    inputs: list[str]
+    metrics: list[dict[str, Any]]
+
+
+class AggregateTransform(VectorComponent):
+    type: Literal["aggregate"] = "aggregate"
+    inputs: list[str]
+    interval_ms: int | None = None
+
+
+class VectorSink(VectorComponent):
+    inputs: list[str]
+    buffer: VectorBuffer | None = None
+    batch: VectorBatch | None = None
+    request: VectorRequest | None = None
+    compression: Compression | None = None
+
+
+class LokiSink(VectorSink):
+    type: Literal["loki"] = "loki"
+    endpoint: str
+    labels: dict[str, str]
+    auth: dict[str, str] | None = None
+    encoding: dict[str, Any] = Field(default_factory=lambda: {"codec": "json"})
+    out_of_order_action: Literal["accept", "drop", "rewrite_timestamp"] | None = None
+
+
+class PrometheusRemoteWriteSink(VectorSink):
+    type: Literal["prometheus_remote_write"] = "prometheus_remote_write"
+    endpoint: str
+    auth: dict[str, str] | None = None
+    healthcheck: bool | None = None
+    # Upper bounds for histograms converted from distributions (log_to_metric).
+    buckets: list[float] | None = None
+
+
+_FIELD_PATH = re.compile(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$")
+_DEDUPE_WINDOW_FIELD = "._dedupe_window"
+
+
+class LogReduction(BaseModel):
+    """Stages that cut a log stream's volume before it ships; each is off by default.
+
+    Applied in order: drop fields, sample, dedupe. Anything that must see every
+    event -- request counts, latency -- has to be derived upstream of these.
+
+    Vector's dedupe transform remembers the last ``dedupe_cache_events`` events
+    and has no notion of time, so on a quiet stream a line could be suppressed
+    for hours. ``dedupe_window_seconds`` bounds that: the current window number
+    joins the match fields (and is removed again after the dedupe), so a
+    repeated line ships at most once per window, and again in the next one.
+    """
+
+    #: Dotted paths removed from every event.
+    drop_fields: list[str] = Field(default_factory=list)
+    #: Dotted path to the event's HTTP status; events without one are kept.
+    status_field: str | None = None
+    #: Keep 1 in ``sample_rate`` events whose status is below ``keep_status_from``.
+    sample_rate: int | None = None
+    keep_status_from: int = 400
+    #: Drop an event identical on these fields to one among the last
+    #: ``dedupe_cache_events`` seen.
+    dedupe_fields: list[str] = Field(default_factory=list)
+    dedupe_cache_events: int = 5000
+    #: Let a duplicate through again once per this many seconds, by arrival time.
+    dedupe_window_seconds: PositiveInt | None = None
+
+    @model_validator(mode="after")
+    def check_stages(self) -> Self:
+        for path in (*self.drop_fields, *self.dedupe_fields, self.status_field or "_"):
+            if not _FIELD_PATH.match(path):
+                msg = f"{path!r} is not a dotted field path"
+                raise ValueError(msg)
+        if self.sample_rate is not None:
+            if self.sample_rate < 2:  # noqa: PLR2004
+                msg = "sample_rate keeps 1 in N events; N must be at least 2"
+                raise ValueError(msg)
+            if self.status_field is None:
+                msg = "sampling keeps every error by status, so it needs status_field"
+                raise ValueError(msg)
+        if self.dedupe_window_seconds is not None and not self.dedupe_fields:
+            msg = "dedupe_window_seconds only applies with dedupe_fields"
+            raise ValueError(msg)
+        return self
+
+    def transforms(
+        self, name: str, upstream: str
+    ) -> tuple[dict[str, VectorComponent], str]:
+        """Return the stages as transforms named after ``name``, and the last one.
+
+        The last is ``upstream`` itself when every stage is off.
+        """
+        transforms: dict[str, VectorComponent] = {}
+        if self.drop_fields:
+            transforms[f"{name}_drop_fields"] = RemapTransform(
+                inputs=[upstream],
+                source="".join(f"del(.{path})\n" for path in self.drop_fields),
+            )
+            upstream = f"{name}_drop_fields"
+        if self.sample_rate:
+            transforms[f"{name}_sample"] = SampleTransform(
+                inputs=[upstream],
+                rate=self.sample_rate,
+                exclude=(
+                    f"status = to_int(.{self.status_field}) ?? 0\n"
+                    f"status == 0 || status >= {self.keep_status_from}\n"
+                ),
+            )
+            upstream = f"{name}_sample"
+        if self.dedupe_fields:
+            match = list(self.dedupe_fields)
+            if self.dedupe_window_seconds:
+                transforms[f"{name}_dedupe_window"] = RemapTransform(
+                    inputs=[upstream],
+                    source=(
+                        f"{_DEDUPE_WINDOW_FIELD} = to_int(floor("
+                        f"to_unix_timestamp(now()) / {self.dedupe_window_seconds}))\n"
+                    ),
+                )
+                upstream = f"{name}_dedupe_window"
+                match.append(_DEDUPE_WINDOW_FIELD.removeprefix("."))
+            transforms[f"{name}_dedupe"] = DedupeTransform(
+                inputs=[upstream],
+                fields={"match": match},
+                cache={"num_events": self.dedupe_cache_events},
+            )
+            upstream = f"{name}_dedupe"
+            if self.dedupe_window_seconds:
+                transforms[f"{name}_dedupe_window_drop"] = RemapTransform(
+                    inputs=[upstream], source=f"del({_DEDUPE_WINDOW_FIELD})\n"
+                )
+                upstream = f"{name}_dedupe_window_drop"
+        return transforms, upstream
+
+
+class VectorPipeline(BaseModel):
+    """One Vector config file. Several can make up one running configuration."""
+
+    data_dir: str | None = None
+    api: dict[str, Any] | None = None
+    log_schema: dict[str, str] | None = None
+    sources: dict[str, SerializeAsAny[VectorComponent]] = Field(default_factory=dict)
+    transforms: dict[str, SerializeAsAny[VectorComponent]] = Field(default_factory=dict)
+    sinks: dict[str, SerializeAsAny[VectorSink]] = Field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        config = self.model_dump(mode="json", exclude_none=True)
+        return {key: value for key, value in config.items() if value != {}}
+
+    def render(self) -> str:
+        return yaml.dump(
+            self.as_dict(), Dumper=_VectorDumper, sort_keys=False, width=1000
+        )
+
+
+class _VectorDumper(yaml.SafeDumper):
+    """Write multi-line strings (VRL programs) as block literals."""
+
+
+def _represent_str(dumper: yaml.SafeDumper, value: str) -> yaml.ScalarNode:
+    style = "|" if "\n" in value else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", value, style=style)
+
+
+_VectorDumper.add_representer(str, _represent_str)
+
+
+def grafana_cloud_loki_sink(  # noqa: PLR0913
+    inputs: Sequence[str],
+    labels: Mapping[str, str],
+    *,
+    buffer: VectorBuffer | None = None,
+    batch: VectorBatch | None = None,
+    request: VectorRequest | None = None,
+    compression: Compression = Compression.snappy,
+) -> LokiSink:
+    """Build a Loki sink for our Grafana Cloud stack, authenticated by env vars.
+
+    Expects ``GRAFANA_CLOUD_API_KEY`` (and optionally
+    ``GRAFANA_CLOUD_LOKI_API_USER``) in Vector's environment.
+    """
+    return LokiSink(
+        inputs=list(inputs),
+        endpoint=GRAFANA_CLOUD_LOKI_ENDPOINT,
+        auth={
+            "strategy": "basic",
+            "user": "${GRAFANA_CLOUD_LOKI_API_USER-loki}",
+            "password": "${GRAFANA_CLOUD_API_KEY}",
+        },
+        labels=dict(labels),
+        out_of_order_action="rewrite_timestamp",
+        buffer=buffer,
+        batch=batch,
+        request=request,
+        compression=compression,
+    )
+
+
+def grafana_cloud_metrics_sink(
+    inputs: Sequence[str],
+    *,
+    buffer: VectorBuffer | None = None,
+    batch: VectorBatch | None = None,
+    request: VectorRequest | None = None,
+    buckets: Sequence[float] | None = None,
+) -> PrometheusRemoteWriteSink:
+    """Build a remote-write sink for our Grafana Cloud Prometheus (Mimir) endpoint."""
+    return PrometheusRemoteWriteSink(
+        inputs=list(inputs),
+        endpoint=GRAFANA_CLOUD_PROMETHEUS_ENDPOINT,
+        healthcheck=False,
+        auth={
+            "strategy": "basic",
+            "user": "${GRAFANA_CLOUD_PROMETHEUS_API_USER-prometheus}",
+            "password": "${GRAFANA_CLOUD_API_KEY}",
+        },
+        buffer=buffer,
+        batch=batch,
+        request=request,
+        buckets=list(buckets) if buckets is not None else None,
+        # The remote-write protocol requires snappy.
+        compression=Compression.snappy,
+    )
+
+
+def check_vector_config(
+    files: Mapping[str, VectorPipeline | str],
+    *,
+    docker_image: str | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Run `vector validate --no-environment` over ``files`` as one configuration.
+
+    ``files`` maps file names to pipelines (or already-rendered YAML), written to a
+    temporary directory first. Uses the ``vector`` on PATH, or ``docker_image``
+    (e.g. ``f"timberio/vector:{VECTOR_VERSION}-alpine"``) when given.
+    """
+    with tempfile.TemporaryDirectory(prefix="vector-config-") as config_dir:
+        for name, pipeline in files.items():
+            Path(config_dir, name).write_text(
+                pipeline.render() if isinstance(pipeline, VectorPipeline) else pipeline
+            )
+        if docker_image:
+            command = ["docker", "run", "--rm", "-v", f"{config_dir}:/config:ro"]
+            for name in VALIDATION_ENVIRONMENT:
+                command.extend(["-e", name])
+            command.extend(["-w", "/config", docker_image])
+        else:
+            vector = shutil.which("vector")
+            if vector is None:
+                msg = "no `vector` binary on PATH"
+                raise FileNotFoundError(msg)
+            command = [vector]
+        return subprocess.run(  # noqa: S603
+            [*command, "validate", "--no-environment", *files],
+            cwd=config_dir,
+            env={**os.environ, **VALIDATION_ENVIRONMENT},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
@@ -3,7 +3,11 @@
 Each target diffs one Concourse worker role's real AWS API usage (IAM Access
 Analyzer: CloudTrail-derived policy generation merged with the unused-access
 finding history) against the union of the ``iam_policies`` modules attached to
-that role, then opens or updates a pull request proposing the difference.
+that role, then opens or updates a pull request proposing the difference. The
+observations for every target are collected first, in one concurrent batch
+whose results persist in a task cache between builds, and published to S3.
+Each target then has its own propose job that reads them, so one target's
+failure neither blocks nor hides another's.
 
 The point is that the least-privilege policies added in #4873 don't silently
 fall out of sync with what the Pulumi stacks actually need -- the failure mode
@@ -28,17 +32,20 @@ from dataclasses import dataclass, field
 from ol_concourse.lib.constants import REGISTRY_IMAGE
 from ol_concourse.lib.models.pipeline import (
     AnonymousResource,
+    Cache,
     Command,
     GetStep,
     Identifier,
     Input,
     Job,
+    Output,
     Pipeline,
     Platform,
+    PutStep,
     TaskConfig,
     TaskStep,
 )
-from ol_concourse.lib.resources import git_repo, schedule
+from ol_concourse.lib.resources import git_repo, s3_object, schedule
 
 from ol_concourse.pipelines.constants import ECR_REGION, dockerhub_ecr_image_uri
 
@@ -119,69 +126,197 @@ ol_infrastructure_image = AnonymousResource(
 )
 
 
-def drift_job(target: DriftTarget) -> Job:
-    """Build the analyze-then-propose job for a single drift target."""
+# Access Analyzer observations, per role and CloudTrail window (see
+# `bin/analyze-pulumi-iam-usage prefetch`). Kept in a task cache so that a re-run
+# the same day -- e.g. after a failed PR push -- reuses the policy-generation jobs
+# that already finished instead of scanning CloudTrail again.
+OBSERVATIONS_CACHE = "iam-usage-cache"
+OBSERVATIONS_ARCHIVE = "iam-usage-observations"
+PREFETCH_REPORT = Identifier("prefetch-report")
+
+# Task caches and outputs don't cross job boundaries, so the prefetched cache
+# reaches the per-target jobs as a tarball in ol-eng-artifacts, which the infra
+# pool's `operations` policy can already read and write.
+observations = s3_object(
+    name=Identifier("iam-usage-observations"),
+    bucket="ol-eng-artifacts",
+    object_regex=r"iam-drift/iam-usage-observations-(\d+)\.tar\.gz",
+)
+
+
+def _task_params() -> dict[str, str]:
+    return {
+        # The checkout, not the image's installed copy: the policy module the
+        # check reads has to be the same one it edits and pushes.
+        "PYTHONPATH": f"{ol_infrastructure.name}/src",
+        "AWS_DEFAULT_REGION": AWS_REGION,
+    }
+
+
+def prefetch_step(targets: list[DriftTarget]) -> TaskStep:
+    """Collect every target role's observations in one batch.
+
+    The policy-generation jobs for all roles run concurrently, so the batch
+    costs about as long as the slowest role rather than the sum of them. Roles
+    that finished are cached even when another fails, and the cache persists
+    between builds. A failed role doesn't fail this step: the cache is archived
+    either way, and the failure is left in the report for `report_step`.
+    """
+    role_prefixes = " ".join(target.role_name_prefix for target in targets)
+    return TaskStep(
+        task=Identifier("prefetch-iam-usage"),
+        config=TaskConfig(
+            platform=Platform.linux,
+            image_resource=ol_infrastructure_image,
+            inputs=[Input(name=ol_infrastructure.name)],
+            outputs=[
+                Output(name=Identifier(OBSERVATIONS_ARCHIVE)),
+                Output(name=PREFETCH_REPORT),
+            ],
+            caches=[Cache(path=OBSERVATIONS_CACHE)],
+            params=_task_params(),
+            run=Command(
+                user="root",
+                path="sh",
+                args=[
+                    "-exc",
+                    (
+                        f"{{ python {ol_infrastructure.name}/bin/"
+                        f"analyze-pulumi-iam-usage prefetch {role_prefixes}"
+                        f" --cache-dir {OBSERVATIONS_CACHE} 2>&1"
+                        f" || echo $? > {PREFETCH_REPORT}/exit-status; }}"
+                        f" | tee {PREFETCH_REPORT}/prefetch.log"
+                        "\n"
+                        f"tar -czf {OBSERVATIONS_ARCHIVE}/"
+                        f"{OBSERVATIONS_ARCHIVE}-$(date +%s).tar.gz"
+                        f" -C {OBSERVATIONS_CACHE} ."
+                    ),
+                ],
+            ),
+        ),
+    )
+
+
+def report_step() -> TaskStep:
+    """Fail the prefetch build if any role's observations could not be collected.
+
+    Runs after the archive is published, so the roles that did finish still
+    reach the propose jobs; each of those re-fetches a role missing from it.
+    """
+    return TaskStep(
+        task=Identifier("report-prefetch-failures"),
+        config=TaskConfig(
+            platform=Platform.linux,
+            image_resource=ol_infrastructure_image,
+            inputs=[Input(name=PREFETCH_REPORT)],
+            run=Command(
+                path="sh",
+                args=[
+                    "-ec",
+                    (
+                        f"if [ -f {PREFETCH_REPORT}/exit-status ]; then"
+                        f" tail -n 20 {PREFETCH_REPORT}/prefetch.log;"
+                        " echo 'prefetch exited with status'"
+                        f" $(cat {PREFETCH_REPORT}/exit-status); exit 1; fi"
+                    ),
+                ],
+            ),
+        ),
+    )
+
+
+def propose_step(target: DriftTarget) -> TaskStep:
+    """Propose and open the pull request for one target from the prefetched cache."""
     policy_module_args = " ".join(
         f"--policy-module {module}" for module in target.policy_modules
     )
+    return TaskStep(
+        task=Identifier(f"propose-{target.name}-iam-policy"),
+        config=TaskConfig(
+            platform=Platform.linux,
+            image_resource=ol_infrastructure_image,
+            inputs=[Input(name=ol_infrastructure.name), Input(name=observations.name)],
+            params={
+                **_task_params(),
+                "GITHUB_APP_ID": GITHUB_APP_ID_VAULT_PATH,
+                "GITHUB_APP_INSTALLATION_ID": GITHUB_APP_INSTALLATION_ID_VAULT_PATH,
+                "GITHUB_APP_PRIVATE_KEY": GITHUB_APP_PRIVATE_KEY_VAULT_PATH,
+            },
+            run=Command(
+                user="root",
+                path="sh",
+                args=[
+                    "-exc",
+                    (
+                        f"mkdir -p {OBSERVATIONS_CACHE}"
+                        f" && tar -xzf {observations.name}/*.tar.gz"
+                        f" -C {OBSERVATIONS_CACHE}"
+                        "\n"
+                        f"python {ol_infrastructure.name}/bin/"
+                        "analyze-pulumi-iam-usage propose"
+                        f" {target.role_name_prefix}"
+                        f" {policy_module_args}"
+                        f" --target-module {target.target_module}"
+                        f" --repo-root {ol_infrastructure.name}"
+                        f" --cache-dir {OBSERVATIONS_CACHE}"
+                        " --pr-body-file pr_body.md"
+                        "\n"
+                        f"python {ol_infrastructure.name}/bin/open-drift-pr"
+                        f" --repo-dir {ol_infrastructure.name}"
+                        f" --repo {GITHUB_REPOSITORY}"
+                        f" --branch iam-drift/{target.name}"
+                        " --title 'chore(concourse): sync"
+                        f" {target.target_module.rsplit('.', 1)[-1]} IAM"
+                        " policy with observed usage'"
+                        " --body-file pr_body.md"
+                    ),
+                ],
+            ),
+        ),
+    )
+
+
+PREFETCH_JOB = Identifier("prefetch-iam-usage")
+
+
+def prefetch_job(targets: list[DriftTarget]) -> Job:
+    """Build the job that collects every target's observations and publishes them."""
     return Job(
-        name=Identifier(f"check-{target.name}-iam-drift"),
+        name=PREFETCH_JOB,
         plan=[
             GetStep(get=drift_schedule.name, trigger=True),
             GetStep(get=ol_infrastructure.name, trigger=False),
-            TaskStep(
-                task=Identifier(f"propose-{target.name}-iam-policy"),
-                config=TaskConfig(
-                    platform=Platform.linux,
-                    image_resource=ol_infrastructure_image,
-                    inputs=[Input(name=ol_infrastructure.name)],
-                    params={
-                        # The checkout, not the image's installed copy: the
-                        # policy module the check reads has to be the same one
-                        # it edits and pushes.
-                        "PYTHONPATH": f"{ol_infrastructure.name}/src",
-                        "AWS_DEFAULT_REGION": AWS_REGION,
-                        "GITHUB_APP_ID": GITHUB_APP_ID_VAULT_PATH,
-                        "GITHUB_APP_INSTALLATION_ID": (
-                            GITHUB_APP_INSTALLATION_ID_VAULT_PATH
-                        ),
-                        "GITHUB_APP_PRIVATE_KEY": GITHUB_APP_PRIVATE_KEY_VAULT_PATH,
-                    },
-                    run=Command(
-                        user="root",
-                        path="sh",
-                        args=[
-                            "-exc",
-                            (
-                                f"python {ol_infrastructure.name}/bin/"
-                                "analyze-pulumi-iam-usage propose"
-                                f" {target.role_name_prefix}"
-                                f" {policy_module_args}"
-                                f" --target-module {target.target_module}"
-                                f" --repo-root {ol_infrastructure.name}"
-                                " --pr-body-file pr_body.md"
-                                "\n"
-                                f"python {ol_infrastructure.name}/bin/open-drift-pr"
-                                f" --repo-dir {ol_infrastructure.name}"
-                                f" --repo {GITHUB_REPOSITORY}"
-                                f" --branch iam-drift/{target.name}"
-                                " --title 'chore(concourse): sync"
-                                f" {target.target_module.rsplit('.', 1)[-1]} IAM"
-                                " policy with observed usage'"
-                                " --body-file pr_body.md"
-                            ),
-                        ],
-                    ),
-                ),
+            prefetch_step(targets),
+            PutStep(
+                put=observations.name,
+                params={
+                    "file": f"{OBSERVATIONS_ARCHIVE}/{OBSERVATIONS_ARCHIVE}-*.tar.gz"
+                },
             ),
+            report_step(),
+        ],
+    )
+
+
+def drift_job(target: DriftTarget) -> Job:
+    """Build the propose job for a single drift target from published observations."""
+    return Job(
+        name=Identifier(f"check-{target.name}-iam-drift"),
+        plan=[
+            GetStep(get=observations.name, trigger=True, passed=[PREFETCH_JOB]),
+            GetStep(get=ol_infrastructure.name, trigger=False),
+            propose_step(target),
         ],
     )
 
 
 def iam_drift_pipeline() -> Pipeline:
     return Pipeline(
-        resources=[drift_schedule, ol_infrastructure],
-        jobs=[drift_job(target) for target in DRIFT_TARGETS],
+        resources=[drift_schedule, ol_infrastructure, observations],
+        jobs=[
+            prefetch_job(DRIFT_TARGETS),
+            *(drift_job(target) for target in DRIFT_TARGETS),
+        ],
     )
 
 
@@ -52,11 +52,17 @@ PROJECT_VERSIONS: dict[str, list[str]] = {
     ],
     "applications/digital_credentials/": [],
     "applications/ecs_test/": [],
-    "applications/edx_notes/": ["NGINX_VERSION"],
+    "applications/edx_notes/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
     "applications/edxapp/": [
         "MEILISEARCH_CHART_VERSION",
         "MEILISEARCH_VERSION",
         "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
         "TYPESENSE_VERSION",
     ],
     "applications/fastly_redirector/": [],
@@ -70,17 +76,45 @@ PROJECT_VERSIONS: dict[str, list[str]] = {
     "applications/keycloak/": ["KEYCLOAK_OPERATOR_CRD_VERSION"],
     "applications/kubewatch/": ["KUBEWATCH_CHART_VERSION"],
     "applications/kubewatch_webhook_handler/": [],
-    "applications/learn_ai/": ["NGINX_VERSION"],
+    "applications/learn_ai/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
     "applications/mailgun/": [],
     "applications/marimo_data/": [],
-    "applications/micromasters/": ["NGINX_VERSION"],
-    "applications/mit_learn/": ["NGINX_VERSION"],
+    "applications/micromasters/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
+    "applications/mit_learn/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
     "applications/mit_learn_nextjs/": [],
-    "applications/mitxonline/": ["NGINX_VERSION"],
+    "applications/mitxonline/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
     "applications/ocw_site/": [],
-    "applications/ocw_studio/": ["NGINX_VERSION"],
-    "applications/odl_video_service/": ["NGINX_VERSION"],
-    "applications/ol_analytics_api/": ["NGINX_VERSION"],
+    "applications/ocw_studio/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
+    "applications/odl_video_service/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
+    "applications/ol_analytics_api/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
     "applications/omnigraph/": [],
     "applications/open_discussions/": [],
     "applications/open_metadata/": ["OPEN_METADATA_VERSION"],
@@ -106,8 +140,16 @@ PROJECT_VERSIONS: dict[str, list[str]] = {
         "MCP_SENTRY_VERSION",
     ],
     "applications/witan/": [],
-    "applications/xpro/": ["NGINX_VERSION"],
-    "applications/xqueue/": ["NGINX_VERSION"],
+    "applications/xpro/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
+    "applications/xqueue/": [
+        "NGINX_VERSION",
+        "PGBOUNCER_EXPORTER_VERSION",
+        "PGBOUNCER_VERSION",
+    ],
     "applications/xqwatcher/": [],
     # ---- infrastructure/ ----------------------------------------------------
     "infrastructure/aws/data_warehouse/": [],
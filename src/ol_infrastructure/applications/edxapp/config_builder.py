@@ -703,6 +703,13 @@ def build_general_config(
     return config
 
 
+class _NoAliasSafeDumper(yaml.SafeDumper):
+    """SafeDumper that never emits anchors/aliases, preventing duplicate anchor errors."""
+
+    def ignore_aliases(self, data: Any) -> bool:  # noqa: ARG002
+        return True
+
+
 def render_yaml(config: ConfigDict) -> str:
     """Render configuration dictionary to YAML string.
 
@@ -712,18 +719,10 @@ def render_yaml(config: ConfigDict) -> str:
     Returns:
         YAML string representation
     """
-
-    # Create custom SafeDumper that ignores aliases to prevent duplicate anchor errors
-    class NoAliasSafeDumper(yaml.SafeDumper):
-        pass
-
-    # Override ignore_aliases to disable YAML anchors/aliases
-    NoAliasSafeDumper.ignore_aliases = lambda self, data: True  # type: ignore[method-assign]  # noqa: ARG005
-
     # Use safe_dump with custom dumper and explicit settings for consistent formatting
     return yaml.dump(
         config,
-        Dumper=NoAliasSafeDumper,
+        Dumper=_NoAliasSafeDumper,
         default_flow_style=False,
         sort_keys=False,
         allow_unicode=True,
@@ -6,9 +6,11 @@ maintainable dictionary-based configuration system that supports per-deployment
 customization while reducing duplication across the 4 EDX deployments.
 """
 
+import hashlib
+import json
 import textwrap
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Literal
 
 import pulumi_kubernetes as kubernetes
 import yaml
@@ -424,12 +426,52 @@ def _build_interpolated_config_dict(
     return config
 
 
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+class _ConfigMapRenderer:
+    """Create edxapp's ConfigMaps and record a content hash for each.
+
+    Every document is rendered exactly once, straight into the ConfigMap's
+    ``data``; the hash is taken from that same rendered text, so it changes
+    only when the document a pod reads changes.
+    """
+
+    def __init__(
+        self, stack_info: StackInfo, namespace: str, k8s_labels: dict[str, str]
+    ):
+        self.stack_info = stack_info
+        self.namespace = namespace
+        self.k8s_labels = k8s_labels
+        self.content_hashes: dict[str, str | Output[str]] = {}
+
+    def create(
+        self,
+        resource_slug: str,
+        config_name: str,
+        data: dict[str, str] | Output[dict[str, str]],
+        opts: ResourceOptions | None = None,
+    ) -> kubernetes.core.v1.ConfigMap:
+        self.content_hashes[config_name] = Output.from_input(data).apply(_digest)
+        return kubernetes.core.v1.ConfigMap(
+            f"ol-{self.stack_info.env_prefix}-edxapp-{resource_slug}-{self.stack_info.env_suffix}",
+            metadata={
+                "name": config_name,
+                "namespace": self.namespace,
+                "labels": self.k8s_labels,
+            },
+            data=data,
+            opts=opts,
+        )
+
+
 @dataclass
 class EdxappConfigMaps:
     """Container for all EDXApp configuration maps."""
 
     general: kubernetes.core.v1.ConfigMap
-    interpolated: Output
+    interpolated: kubernetes.core.v1.ConfigMap
     cms_general: kubernetes.core.v1.ConfigMap
     cms_interpolated: kubernetes.core.v1.ConfigMap
     lms_general: kubernetes.core.v1.ConfigMap
@@ -448,6 +490,31 @@ class EdxappConfigMaps:
     ssh_known_hosts_config_name: str
     settings_override_config_name: str
 
+    #: ConfigMap name -> sha256 of its rendered data.
+    content_hashes: dict[str, str | Output[str]] = field(default_factory=dict)
+
+    def service_content_hashes(
+        self, service: Literal["lms", "cms"]
+    ) -> dict[str, str | Output[str]]:
+        """Return the content hashes of the ConfigMaps ``service`` pods read.
+
+        Both services read the shared general and interpolated documents and
+        mount the waffle flags, known hosts and settings override; each reads
+        only its own service-specific documents.
+        """
+        names = [
+            self.general_config_name,
+            self.interpolated_config_name,
+            self.waffle_flags_yaml_config_name,
+            self.ssh_known_hosts_config_name,
+            self.settings_override_config_name,
+        ]
+        if service == "lms":
+            names += [self.lms_general_config_name, self.lms_interpolated_config_name]
+        else:
+            names += [self.cms_general_config_name, self.cms_interpolated_config_name]
+        return {name: self.content_hashes[name] for name in names}
+
 
 def create_k8s_configmaps(  # noqa: PLR0915
     stack_info: StackInfo,
@@ -472,6 +539,9 @@ def create_k8s_configmaps(  # noqa: PLR0915
     Returns:
         EdxappConfigMaps dataclass containing all ConfigMap resources
     """
+    renderer = _ConfigMapRenderer(stack_info, namespace, k8s_global_labels)
+    domains = edxapp_config.require_object("domains")
+
     general_config_name = "50-general-config-yaml"
 
     # Build general config from dictionary (replaces YAML file)
@@ -480,18 +550,10 @@ def create_k8s_configmaps(  # noqa: PLR0915
         enable_courseware_index=edxapp_config.get_bool("enable_courseware_index")
         or False,
     )
-    general_config_yaml = render_yaml(general_config_dict)
-
-    general_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-general-config-{stack_info.env_suffix}",
-        metadata={
-            "name": general_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={
-            "50-general-config.yaml": general_config_yaml,
-        },
+    general_config_map = renderer.create(
+        "general-config",
+        general_config_name,
+        {"50-general-config.yaml": render_yaml(general_config_dict)},
     )
 
     # Misc values needed for the next step
@@ -504,21 +566,19 @@ def create_k8s_configmaps(  # noqa: PLR0915
     # Extract base features early for use in both CMS and LMS configs
     base_features: dict[str, Any] = general_config_dict["FEATURES"]
 
-    # Load interpolated configuration from dictionary
+    # Load interpolated configuration from dictionary. The runtime inputs are
+    # resolved once and only the rendered document waits on them; the ConfigMap
+    # itself is registered up front so previews diff it like any other.
     interpolated_config_name = "60-interpolated-config-yaml"
-    interpolated_config_map = Output.all(
-        redis_hostname=edxapp_cache.address,
-        opensearch_hostname=opensearch_hostname,
-        notes_domain=notes_stack.require_output("notes_domain"),
-    ).apply(
-        lambda runtime_config: kubernetes.core.v1.ConfigMap(
-            f"ol-{stack_info.env_prefix}-edxapp-interpolated-config-{stack_info.env_suffix}",
-            metadata={
-                "name": interpolated_config_name,
-                "namespace": namespace,
-                "labels": k8s_global_labels,
-            },
-            data={
+    interpolated_config_map = renderer.create(
+        "interpolated-config",
+        interpolated_config_name,
+        Output.all(
+            redis_hostname=edxapp_cache.address,
+            opensearch_hostname=opensearch_hostname,
+            notes_domain=notes_stack.require_output("notes_domain"),
+        ).apply(
+            lambda runtime_config: {
                 "60-interpolated-config.yaml": render_yaml(
                     _build_interpolated_config_dict(
                         stack_info=stack_info,
@@ -531,9 +591,9 @@ def create_k8s_configmaps(  # noqa: PLR0915
                         env_name=env_name,
                     )
                 ),
-            },
-            opts=ResourceOptions(delete_before_replace=True),
-        )
+            }
+        ),
+        opts=ResourceOptions(delete_before_replace=True),
     )
 
     # CMS general configuration
@@ -573,24 +633,18 @@ def create_k8s_configmaps(  # noqa: PLR0915
 
     cms_general_config_content["FEATURES"] = cms_features
 
-    cms_general_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-cms-general-config-{stack_info.env_suffix}",
-        metadata={
-            "name": cms_general_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={
-            "71-cms-general-config.yaml": render_yaml(cms_general_config_content),
-        },
+    cms_general_config_map = renderer.create(
+        "cms-general-config",
+        cms_general_config_name,
+        {"71-cms-general-config.yaml": render_yaml(cms_general_config_content)},
     )
 
     # CMS interpolated configuration
     cms_interpolated_config_name = "72-cms-interpolated-config-yaml"
     cms_interpolated_config = {
-        "SITE_NAME": edxapp_config.require_object("domains")["studio"],
-        "SOCIAL_AUTH_EDX_OAUTH2_URL_ROOT": f"https://{edxapp_config.require_object('domains')['lms']}",
-        "SOCIAL_AUTH_EDX_OAUTH2_PUBLIC_URL_ROOT": f"https://{edxapp_config.require_object('domains')['lms']}",
+        "SITE_NAME": domains["studio"],
+        "SOCIAL_AUTH_EDX_OAUTH2_URL_ROOT": f"https://{domains['lms']}",
+        "SOCIAL_AUTH_EDX_OAUTH2_PUBLIC_URL_ROOT": f"https://{domains['lms']}",
         "SESSION_COOKIE_NAME": f"{env_name}-edx-studio-sessionid",
     }
 
@@ -607,14 +661,10 @@ def create_k8s_configmaps(  # noqa: PLR0915
             f"https://{meilisearch_config.require('domain')}"
         )
 
-    cms_interpolated_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-cms-interpolated-config-{stack_info.env_suffix}",
-        metadata={
-            "name": cms_interpolated_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={"72-cms-interpolated-config.yaml": render_yaml(cms_interpolated_config)},
+    cms_interpolated_config_map = renderer.create(
+        "cms-interpolated-config",
+        cms_interpolated_config_name,
+        {"72-cms-interpolated-config.yaml": render_yaml(cms_interpolated_config)},
         opts=ResourceOptions(delete_before_replace=True),
     )
 
@@ -634,7 +684,7 @@ def create_k8s_configmaps(  # noqa: PLR0915
         "AUDIT_CERT_CUTOFF_DATE": None,
         "AUTH_DOCUMENTATION_URL": "http://course-catalog-api-guide.readthedocs.io/en/latest/authentication/index.html",
         "BULK_EMAIL_ROUTING_KEY_SMALL_JOBS": "edx.lms.core.default",
-        "COMMUNICATIONS_MICROFRONTEND_URL": f"https://{edxapp_config.require_object('domains')['lms']}/communications",
+        "COMMUNICATIONS_MICROFRONTEND_URL": f"https://{domains['lms']}/communications",
         "CONTACT_MAILING_ADDRESS": "SET-ME-PLEASE",
         "CREDIT_HELP_LINK_URL": "",
         "DCS_SESSION_COOKIE_SAMESITE": "None",
@@ -769,66 +819,42 @@ def create_k8s_configmaps(  # noqa: PLR0915
     # Assign the deployment-specific FEATURES (already enriched with base config)
     lms_general_config_content["FEATURES"] = deployment_features
 
-    lms_general_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-lms-general-config-{stack_info.env_suffix}",
-        metadata={
-            "name": lms_general_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={
-            "81-lms-general-config.yaml": render_yaml(lms_general_config_content),
-        },
+    lms_general_config_map = renderer.create(
+        "lms-general-config",
+        lms_general_config_name,
+        {"81-lms-general-config.yaml": render_yaml(lms_general_config_content)},
     )
 
     # LMS interpolated configuration
     lms_interpolated_config_name = "82-lms-interpolated-config-yaml"
     lms_interpolated_config = {
         "APPZI_URL": edxapp_config.get("appzi_url", ""),
-        "SITE_NAME": edxapp_config.require_object("domains")["lms"],
+        "SITE_NAME": domains["lms"],
         "SESSION_COOKIE_NAME": f"{env_name}-edx-lms-sessionid",
         "MIT_LEARN_SUPPORT_SITE_LINK": "https://support.learn.mit.edu/",
     }
 
-    lms_interpolated_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-lms-interpolated-config-{stack_info.env_suffix}",
-        metadata={
-            "name": lms_interpolated_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={
-            "82-lms-interpolated-config.yaml": render_yaml(lms_interpolated_config),
-        },
+    lms_interpolated_config_map = renderer.create(
+        "lms-interpolated-config",
+        lms_interpolated_config_name,
+        {"82-lms-interpolated-config.yaml": render_yaml(lms_interpolated_config)},
         opts=ResourceOptions(delete_before_replace=True),
     )
 
     # Waffle flags configuration (unchanged, built from config)
     waffle_flags_yaml_config_name = "waffle-flags-yaml"
     waffle_list = edxapp_config.get_object("waffle_flags", default=[])
-    waffle_flags_yaml_content = yaml.safe_dump({"waffles": waffle_list})
-
-    waffle_flags_yaml_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-waffle-flags-{stack_info.env_suffix}",
-        metadata={
-            "name": waffle_flags_yaml_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={
-            "waffle-flags.yaml": waffle_flags_yaml_content,
-        },
+    waffle_flags_yaml_config_map = renderer.create(
+        "waffle-flags",
+        waffle_flags_yaml_config_name,
+        {"waffle-flags.yaml": yaml.safe_dump({"waffles": waffle_list})},
     )
 
     ssh_known_hosts_config_name = "ssh-known-hosts"
-    ssh_known_hosts_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-ssh-known-hosts-{stack_info.env_suffix}",
-        metadata={
-            "name": ssh_known_hosts_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={
+    ssh_known_hosts_config_map = renderer.create(
+        "ssh-known-hosts",
+        ssh_known_hosts_config_name,
+        {
             "known_hosts": (
                 "github.com ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIOMqqnkVzrm0SdG6UOoqKLsabgH5C9okWi0dh2l9GKJl\n"
                 "github.com ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAABgQCj7ndNxQowgcQnjshcLrqPEiiphnt+VTTvDP6mHBL9j1aNUkY4Ue1gvwnGLVlOhGeYrnZaMgRK6+PKCUXaDbC7qtbW8gIkhL7aGCsOr/C56SJMy/BCZfxd1nWzAOxSDPgVsmerOBYfNqltV9/hWCqBywINIR+5dIg6JTJ72pcEpEjcYgXkE2YEFXV1JHnsKgbLWNlhScqb2UmyRkQyytRLtL+38TGxkxCflmO+5Z8CSSNY7GidjMIZ7Q4zMjA2n1nGrlTDkzwDCsw+wqFPGQA179cnfGWOWRVruj16z6XyvxvjJwbz0wQZ75XK5tKSb7FNyeIEs4TT4jk+S4dhPeAUC5y+bDYirYgM4GC7uEnztnZyaVWQ7B381AK4Qdrwt51ZqExKbQpTUNn+EjqoTwvqNj4kqx5QUCI0ThS/YkOxJCXmPUWZbhjpCg56i+2aB6CmK2JGhn57K5mj0MNdBXA4/WnwH6XoPWJzK5Nyu2zB3nAZp+S5hpQs+p1vN1/wsjk=\n"
@@ -886,14 +912,10 @@ def create_k8s_configmaps(  # noqa: PLR0915
             SEARCH_ENGINE = "search.typesense.TypesenseEngine"
             """
         )
-    settings_override_config_map = kubernetes.core.v1.ConfigMap(
-        f"ol-{stack_info.env_prefix}-edxapp-settings-override-{stack_info.env_suffix}",
-        metadata={
-            "name": settings_override_config_name,
-            "namespace": namespace,
-            "labels": k8s_global_labels,
-        },
-        data={"production.py": settings_override_module},
+    settings_override_config_map = renderer.create(
+        "settings-override",
+        settings_override_config_name,
+        {"production.py": settings_override_module},
     )
 
     return EdxappConfigMaps(
@@ -915,4 +937,5 @@ def create_k8s_configmaps(  # noqa: PLR0915
         waffle_flags_yaml_config_name=waffle_flags_yaml_config_name,
         ssh_known_hosts_config_name=ssh_known_hosts_config_name,
         settings_override_config_name=settings_override_config_name,
+        content_hashes=renderer.content_hashes,
     )
@@ -20,13 +20,14 @@ from ol_infrastructure.applications.edxapp.k8s_autoscaling import (
     create_celery_autoscaling_resources,
     create_webapp_trigger_auth,
 )
-from ol_infrastructure.applications.edxapp.k8s_configmaps import (
-    create_k8s_configmaps,
-)
+from ol_infrastructure.applications.edxapp.k8s_configmaps import create_k8s_configmaps
 from ol_infrastructure.applications.edxapp.k8s_secrets import create_k8s_secrets
 from ol_infrastructure.applications.edxapp.meilisearch import (
     create_meilisearch_resources,
 )
+from ol_infrastructure.applications.edxapp.resource_groups import (
+    EDXAPP_RESOURCE_GROUPS,
+)
 from ol_infrastructure.applications.edxapp.typesense import create_typesense_resources
 from ol_infrastructure.components.aws.cache import OLAmazonCache
 from ol_infrastructure.components.aws.database import OLAmazonDB
@@ -51,6 +52,8 @@ from ol_infrastructure.components.services.k8s import (
     OLApplicationK8s,
     OLApplicationK8sConfig,
     OLApplicationK8sScheduledJobConfig,
+    config_hash_annotations,
+    webapp_deployment_name,
 )
 from ol_infrastructure.components.services.vault import (
     OLVaultK8SResources,
@@ -73,6 +76,7 @@ from ol_infrastructure.lib.ol_types import (
     Services,
 )
 from ol_infrastructure.lib.pulumi_helper import (
+    ResourceGroups,
     StackInfo,
     make_stack_reference,
 )
@@ -131,6 +135,7 @@ def create_k8s_resources(  # noqa: C901
     vault_policy: vault.Policy,
 ) -> dict[str, Any]:
     """Create all Kubernetes resources for the edxapp LMS and CMS deployments."""
+    resource_groups = ResourceGroups("edxapp", EDXAPP_RESOURCE_GROUPS)
     env_name = f"{stack_info.env_prefix}-{stack_info.env_suffix}"
     lms_webapp_deployment_name = f"{env_name}-edxapp-lms-webapp"
     cms_webapp_deployment_name = f"{env_name}-edxapp-cms-webapp"
@@ -140,11 +145,13 @@ def create_k8s_resources(  # noqa: C901
     cms_celery_deployment_name = f"{env_name}-edxapp-cms-celery"
     lms_beat_deployment_name = f"{env_name}-edxapp-lms-beat"
 
-    # All deployments that consume MariaDB credentials and need to restart on rotation.
-    # Includes both OLApplicationK8s-managed webapps and hand-rolled celery/batch deployments.
+    # All deployments that consume MariaDB credentials and need to restart on
+    # rotation: the OLApplicationK8s-managed LMS and CMS webapps, the only pods of
+    # those components that mount the credential secret volumes (they run no
+    # celery or PgBouncer of their own), then the hand-rolled celery/batch ones.
     edxapp_db_restart_deployment_names = [
-        "lms-edxapp-app",  # LMS webapp (OLApplicationK8s application_name="lms-edxapp")
-        "cms-edxapp-app",  # CMS webapp (OLApplicationK8s application_name="cms-edxapp")
+        webapp_deployment_name("lms-edxapp"),
+        webapp_deployment_name("cms-edxapp"),
         lms_celery_deployment_name,
         lms_high_mem_celery_deployment_name,
         cms_celery_deployment_name,
@@ -340,26 +347,152 @@ def create_k8s_resources(  # noqa: C901
     )
 
     # Call out to other modules to create the k8s secrets and configmaps
-    secrets = create_k8s_secrets(
-        edxapp_cache=edxapp_cache,
-        edxapp_config=edxapp_config,
-        edxapp_db=edxapp_db,
-        k8s_global_labels=k8s_global_labels,
-        mongodb_atlas_stack=mongodb_atlas_stack,
-        namespace=namespace,
-        stack_info=stack_info,
-        vault_k8s_resources=vault_k8s_resources,
-        restart_deployment_names=edxapp_db_restart_deployment_names,
-    )
-    configmaps = create_k8s_configmaps(
-        stack_info=stack_info,
-        namespace=namespace,
-        k8s_global_labels=k8s_global_labels,
-        edxapp_config=edxapp_config,
-        edxapp_cache=edxapp_cache,
-        notes_stack=notes_stack,
-        opensearch_hostname=opensearch_hostname,
-    )
+    if resource_groups.selected("secrets"):
+        secrets = create_k8s_secrets(
+            edxapp_cache=edxapp_cache,
+            edxapp_config=edxapp_config,
+            edxapp_db=edxapp_db,
+            k8s_global_labels=k8s_global_labels,
+            mongodb_atlas_stack=mongodb_atlas_stack,
+            namespace=namespace,
+            stack_info=stack_info,
+            vault_k8s_resources=vault_k8s_resources,
+            restart_deployment_names=edxapp_db_restart_deployment_names,
+        )
+    if resource_groups.selected("configmaps"):
+        configmaps = create_k8s_configmaps(
+            stack_info=stack_info,
+            namespace=namespace,
+            k8s_global_labels=k8s_global_labels,
+            edxapp_config=edxapp_config,
+            edxapp_cache=edxapp_cache,
+            notes_stack=notes_stack,
+            opensearch_hostname=opensearch_hostname,
+        )
+
+    if resource_groups.selected("search"):
+        # Meilisearch
+        _meilisearch_helm_release = create_meilisearch_resources(
+            stack_info=stack_info,
+            namespace=namespace,
+            k8s_global_labels=k8s_global_labels,
+        )
+
+        # Typesense
+        _typesense_cluster_crd = create_typesense_resources(
+            stack_info=stack_info,
+            namespace=namespace,
+            k8s_global_labels=k8s_global_labels,
+        )
+
+    if resource_groups.selected("ingress"):
+        # APISIX ingress configuration and setup
+        apisix_ingress_class = edxapp_config.get("apisix_ingress_class") or "apisix"
+        tls_secret_name = "shared-backend-tls-pair"  # pragma: allowlist secret  # noqa: S105
+        cert_manager_certificate = OLCertManagerCert(
+            f"ol-{stack_info.env_prefix}-edxapp-tls-cert-{stack_info.env_suffix}",
+            cert_config=OLCertManagerCertConfig(
+                application_name="edxapp",
+                k8s_namespace=namespace,
+                k8s_labels=k8s_global_labels,
+                create_apisixtls_resource=True,
+                dest_secret_name=tls_secret_name,
+                dns_names=[
+                    edxapp_config.require("backend_lms_domain"),
+                    edxapp_config.require("backend_studio_domain"),
+                    edxapp_config.require("backend_preview_domain"),
+                ],
+            ),
+        )
+
+        edxapp_shared_plugins = OLApisixSharedPlugins(
+            f"ol-{stack_info.env_prefix}-edxapp-shared-plugins-{stack_info.env_suffix}",
+            plugin_config=OLApisixSharedPluginsConfig(
+                application_name="edxapp",
+                resource_suffix="ol-shared-plugins",
+                k8s_namespace=namespace,
+                k8s_labels=k8s_global_labels,
+                enable_defaults=True,
+            ),
+        )
+
+        lms_apisixroute = OLApisixRoute(
+            name=f"ol-{stack_info.env_prefix}-edxapp-lms-apisix-route-{stack_info.env_suffix}",
+            k8s_namespace=namespace,
+            k8s_labels=k8s_global_labels,
+            route_configs=[
+                OLApisixRouteConfig(
+                    route_name="lms-default",
+                    priority=0,
+                    plugins=[],
+                    shared_plugin_config_name=edxapp_shared_plugins.resource_name,
+                    hosts=[
+                        edxapp_config.require("backend_lms_domain"),
+                        edxapp_config.require_object("domains")["lms"],
+                    ],
+                    paths=["/*"],
+                    timeout_connect="600s",
+                    timeout_read="600s",
+                    timeout_send="600s",
+                    backend_service_name=lms_webapp_deployment_name,
+                    backend_service_port="http",
+                ),
+            ],
+        )
+
+        cms_apisixroute = OLApisixRoute(
+            name=f"ol-{stack_info.env_prefix}-edxapp-cms-apisix-route-{stack_info.env_suffix}",
+            k8s_namespace=namespace,
+            k8s_labels=k8s_global_labels,
+            route_configs=[
+                OLApisixRouteConfig(
+                    route_name="cms-default",
+                    priority=0,
+                    plugins=[],
+                    shared_plugin_config_name=edxapp_shared_plugins.resource_name,
+                    hosts=[
+                        edxapp_config.require("backend_studio_domain"),
+                        edxapp_config.require_object("domains")["studio"],
+                    ],
+                    paths=["/*"],
+                    backend_service_name=cms_webapp_deployment_name,
+                    backend_service_port="http",
+                    # "endpoint" makes APISIX load-balance across cms-edxapp-app
+                    # pod IPs directly (paired with the chash ApisixUpstream
+                    # below), instead of the default "service" granularity which
+                    # would hand load-balancing off to a single ClusterIP node
+                    # and make per-client hashing impossible.
+                    backend_resolve_granularity="endpoint",
+                ),
+            ],
+        )
+
+        # Studio's chunked course-import upload endpoint tracks each chunk's
+        # progress via the on-disk file size at a path keyed by course id, which
+        # isn't safe to read/write from multiple pods concurrently. Consistent-
+        # hash on the (APISIX-resolved, real) client IP so every chunk of one
+        # upload lands on the same cms-edxapp-app pod, regardless of which of
+        # the 3-5 APISIX gateway replicas or which CMS pod a given HTTP request
+        # would otherwise round-robin to.
+        cms_apisix_upstream = OLApisixUpstream(
+            name=f"ol-{stack_info.env_prefix}-edxapp-cms-apisix-upstream-{stack_info.env_suffix}",
+            upstream_config=OLApisixUpstreamConfig(
+                service_name=cms_webapp_deployment_name,
+                k8s_namespace=namespace,
+                k8s_labels=k8s_global_labels,
+                loadbalancer_type="chash",
+                hash_on="vars",
+                hash_key="remote_addr",
+            ),
+        )
+
+    outputs = {
+        "edxapp_k8s_app_security_group_id": edxapp_k8s_app_security_group.id,
+    }
+    # Everything below runs the application and needs both the secrets and the
+    # configmaps; see EDXAPP_RESOURCE_GROUPS.
+    if not resource_groups.selected("workloads"):
+        return outputs
 
     openedx_data_pvc = kubernetes.core.v1.PersistentVolumeClaim(
         f"ol-{stack_info.env_prefix}-openedx-data-pvc-{stack_info.env_suffix}",
@@ -632,6 +765,13 @@ def create_k8s_resources(  # noqa: C901
             )
         )
 
+    # Stamped on each pod template so that pods roll when a ConfigMap they read
+    # changes, and only then: a CMS-only settings change leaves LMS pods alone.
+    lms_config_hashes = configmaps.service_content_hashes("lms")
+    cms_config_hashes = configmaps.service_content_hashes("cms")
+    lms_config_hash_annotations = config_hash_annotations(lms_config_hashes)
+    cms_config_hash_annotations = config_hash_annotations(cms_config_hashes)
+
     ############################################
     # lms deployment resources
     ############################################
@@ -802,6 +942,7 @@ def create_k8s_resources(  # noqa: C901
             vault_k8s_resource_auth_name=vault_k8s_resources.auth_name,
             k8s_global_labels=k8s_global_labels,
             env_from_secret_names=[],
+            config_hash_inputs=lms_config_hashes,
             project_root=Path(__file__).parent,
             import_nginx_config=False,
             import_uwsgi_config=False,
@@ -1134,6 +1275,7 @@ def create_k8s_resources(  # noqa: C901
             vault_k8s_resource_auth_name=vault_k8s_resources.auth_name,
             k8s_global_labels=k8s_global_labels,
             env_from_secret_names=[],
+            config_hash_inputs=cms_config_hashes,
             project_root=Path(__file__).parent,
             import_nginx_config=False,
             import_uwsgi_config=False,
@@ -1305,7 +1447,10 @@ def create_k8s_resources(  # noqa: C901
                 match_labels=lms_celery_selector_labels
             ),
             template=kubernetes.core.v1.PodTemplateSpecArgs(
-                metadata=kubernetes.meta.v1.ObjectMetaArgs(labels=lms_celery_labels),
+                metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                    labels=lms_celery_labels,
+                    annotations=lms_config_hash_annotations,
+                ),
                 spec=kubernetes.core.v1.PodSpecArgs(
                     termination_grace_period_seconds=DEFAULT_CELERY_TERMINATION_GRACE_PERIOD_SECONDS,
                     affinity=kubernetes.core.v1.AffinityArgs(
@@ -1487,6 +1632,7 @@ def create_k8s_resources(  # noqa: C901
                 metadata=kubernetes.meta.v1.ObjectMetaArgs(
                     labels=lms_high_mem_celery_labels,
                     annotations={
+                        **lms_config_hash_annotations,
                         # Keep Karpenter and the cluster autoscaler from reclaiming the
                         # node underneath a running report.
                         "karpenter.sh/do-not-disrupt": "true",
@@ -1654,7 +1800,10 @@ def create_k8s_resources(  # noqa: C901
                 match_labels=lms_beat_selector_labels
             ),
             template=kubernetes.core.v1.PodTemplateSpecArgs(
-                metadata=kubernetes.meta.v1.ObjectMetaArgs(labels=lms_beat_labels),
+                metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                    labels=lms_beat_labels,
+                    annotations=lms_config_hash_annotations,
+                ),
                 spec=kubernetes.core.v1.PodSpecArgs(
                     service_account_name=vault_k8s_resources.service_account_name,
                     security_context=pod_security_context,
@@ -1761,7 +1910,8 @@ def create_k8s_resources(  # noqa: C901
             ),
             template=kubernetes.core.v1.PodTemplateSpecArgs(
                 metadata=kubernetes.meta.v1.ObjectMetaArgs(
-                    labels=lms_process_scheduled_emails_labels
+                    labels=lms_process_scheduled_emails_labels,
+                    annotations=lms_config_hash_annotations,
                 ),
                 spec=kubernetes.core.v1.PodSpecArgs(
                     affinity=kubernetes.core.v1.AffinityArgs(
@@ -1872,7 +2022,10 @@ def create_k8s_resources(  # noqa: C901
                 match_labels=cms_celery_selector_labels
             ),
             template=kubernetes.core.v1.PodTemplateSpecArgs(
-                metadata=kubernetes.meta.v1.ObjectMetaArgs(labels=cms_celery_labels),
+                metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                    labels=cms_celery_labels,
+                    annotations=cms_config_hash_annotations,
+                ),
                 spec=kubernetes.core.v1.PodSpecArgs(
                     termination_grace_period_seconds=DEFAULT_CELERY_TERMINATION_GRACE_PERIOD_SECONDS,
                     affinity=kubernetes.core.v1.AffinityArgs(
@@ -2007,122 +2160,6 @@ def create_k8s_resources(  # noqa: C901
         cms_celery_deployment=cms_celery_deployment,
     )
 
-    # Meilisearch
-    _meilisearch_helm_release = create_meilisearch_resources(
-        stack_info=stack_info,
-        namespace=namespace,
-        k8s_global_labels=k8s_global_labels,
-    )
-
-    # Typesense
-    _typesense_cluster_crd = create_typesense_resources(
-        stack_info=stack_info,
-        namespace=namespace,
-        k8s_global_labels=k8s_global_labels,
-    )
-
-    # APISIX ingress configuration and setup
-    apisix_ingress_class = edxapp_config.get("apisix_ingress_class") or "apisix"
-    tls_secret_name = (
-        "shared-backend-tls-pair"  # pragma: allowlist secret  # noqa: S105
-    )
-    cert_manager_certificate = OLCertManagerCert(
-        f"ol-{stack_info.env_prefix}-edxapp-tls-cert-{stack_info.env_suffix}",
-        cert_config=OLCertManagerCertConfig(
-            application_name="edxapp",
-            k8s_namespace=namespace,
-            k8s_labels=k8s_global_labels,
-            create_apisixtls_resource=True,
-            dest_secret_name=tls_secret_name,
-            dns_names=[
-                edxapp_config.require("backend_lms_domain"),
-                edxapp_config.require("backend_studio_domain"),
-                edxapp_config.require("backend_preview_domain"),
-            ],
-        ),
-    )
-
-    edxapp_shared_plugins = OLApisixSharedPlugins(
-        f"ol-{stack_info.env_prefix}-edxapp-shared-plugins-{stack_info.env_suffix}",
-        plugin_config=OLApisixSharedPluginsConfig(
-            application_name="edxapp",
-            resource_suffix="ol-shared-plugins",
-            k8s_namespace=namespace,
-            k8s_labels=k8s_global_labels,
-            enable_defaults=True,
-        ),
-    )
-
-    lms_apisixroute = OLApisixRoute(
-        name=f"ol-{stack_info.env_prefix}-edxapp-lms-apisix-route-{stack_info.env_suffix}",
-        k8s_namespace=namespace,
-        k8s_labels=k8s_global_labels,
-        route_configs=[
-            OLApisixRouteConfig(
-                route_name="lms-default",
-                priority=0,
-                plugins=[],
-                shared_plugin_config_name=edxapp_shared_plugins.resource_name,
-                hosts=[
-                    edxapp_config.require("backend_lms_domain"),
-                    edxapp_config.require_object("domains")["lms"],
-                ],
-                paths=["/*"],
-                timeout_connect="600s",
-                timeout_read="600s",
-                timeout_send="600s",
-                backend_service_name=lms_webapp_deployment_name,
-                backend_service_port="http",
-            ),
-        ],
-    )
-
-    cms_apisixroute = OLApisixRoute(
-        name=f"ol-{stack_info.env_prefix}-edxapp-cms-apisix-route-{stack_info.env_suffix}",
-        k8s_namespace=namespace,
-        k8s_labels=k8s_global_labels,
-        route_configs=[
-            OLApisixRouteConfig(
-                route_name="cms-default",
-                priority=0,
-                plugins=[],
-                shared_plugin_config_name=edxapp_shared_plugins.resource_name,
-                hosts=[
-                    edxapp_config.require("backend_studio_domain"),
-                    edxapp_config.require_object("domains")["studio"],
-                ],
-                paths=["/*"],
-                backend_service_name=cms_webapp_deployment_name,
-                backend_service_port="http",
-                # "endpoint" makes APISIX load-balance across cms-edxapp-app
-                # pod IPs directly (paired with the chash ApisixUpstream
-                # below), instead of the default "service" granularity which
-                # would hand load-balancing off to a single ClusterIP node
-                # and make per-client hashing impossible.
-                backend_resolve_granularity="endpoint",
-            ),
-        ],
-    )
-
-    # Studio's chunked course-import upload endpoint tracks each chunk's
-    # progress via the on-disk file size at a path keyed by course id, which
-    # isn't safe to read/write from multiple pods concurrently. Consistent-
-    # hash on the (APISIX-resolved, real) client IP so every chunk of one
-    # upload lands on the same cms-edxapp-app pod, regardless of which of
-    # the 3-5 APISIX gateway replicas or which CMS pod a given HTTP request
-    # would otherwise round-robin to.
-    cms_apisix_upstream = OLApisixUpstream(
-        name=f"ol-{stack_info.env_prefix}-edxapp-cms-apisix-upstream-{stack_info.env_suffix}",
-        upstream_config=OLApisixUpstreamConfig(
-            service_name=cms_webapp_deployment_name,
-            k8s_namespace=namespace,
-            k8s_labels=k8s_global_labels,
-            loadbalancer_type="chash",
-            hash_on="vars",
-            hash_key="remote_addr",
-        ),
-    )
-
     # VPA objects.
     # The LMS and CMS webapp memory VPAs are created by OLApplicationK8s
     # (manage_webapp_memory_vpa) rather than declared here. Declaring them here as
@@ -2189,6 +2226,4 @@ def create_k8s_resources(  # noqa: C901
     #      loop in instructor_task needs. Static sizing is the right call for a
     #      bursty workload whose whole purpose is finishing one long job promptly.
 
-    return {
-        "edxapp_k8s_app_security_group_id": edxapp_k8s_app_security_group.id,
-    }
+    return outputs
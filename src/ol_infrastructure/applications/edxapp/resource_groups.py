@@ -0,0 +1,67 @@
+"""What `edxapp:resource_groups` can restrict a preview to.
+
+See ol_infrastructure.lib.pulumi_helper.ResourceGroups. The trust role, vault auth
+and security groups at the top of create_k8s_resources are always built. The groups
+share resource types (the webapp's Prometheus credentials are a Vault secret built
+with the workloads, search has a cert and routes like ingress), so most targets
+name the resources rather than their types.
+"""
+
+from ol_infrastructure.lib.pulumi_helper import ResourceGroup
+
+EDXAPP_RESOURCE_GROUPS = [
+    ResourceGroup(
+        "secrets",
+        targets=(
+            "**ol:services:Vault:K8S:Vault*Secret::ol-*-edxapp-*-secret-*",
+            "**ol:services:Vault:K8S:VaultStaticSecret::ol-*-edxapp-git-export-ssh-key-*",
+            "**ol:services:Vault:K8S:Vault*Secret$**::OLVaultK8SSecret-*-yaml",
+            "**ol:services:Vault:K8S:VaultStaticSecret$**::OLVaultK8SSecret-*-git-export-ssh-key",
+        ),
+    ),
+    ResourceGroup(
+        "configmaps", targets=("**kubernetes:core/v1:ConfigMap::ol-*-edxapp-*",)
+    ),
+    ResourceGroup(
+        "search",
+        targets=(
+            "**::ol-*-edxapp-meilisearch-cert-*",
+            "**::ol-cert-manager-*-meilisearch-cert",
+            "**::ol-*-edxapp-meilisearch-shared-plugins-*",
+            "**::OLApisixSharedPlugin*-meilisearch-ol-shared-plugins",
+            "**::ol-*-edxapp-meilisearch-httproute-*",
+            "**::OLApisixHTTPRoute-ol-*-edxapp-meilisearch-httproute-*",
+            "**::ol-*-edxapp-meilisearch-helm-release-*",
+            "**::ol-*-edxapp-typesense-bootstrap-key-*",
+            "**::ol-*-edxapp-typesense-crd-*",
+        ),
+    ),
+    ResourceGroup(
+        "ingress",
+        targets=(
+            "**::ol-*-edxapp-tls-cert-*",
+            "**::ol-cert-manager-*-edxapp-cert",
+            "**::ol-*-edxapp-shared-plugins-*",
+            "**::OLApisixSharedPlugin*-edxapp-ol-shared-plugins",
+            "**::ol-*-edxapp-*-apisix-*",
+            "**::OLApisix*-ol-*-edxapp-*-apisix-*",
+        ),
+    ),
+    # The webapps, celery workers and everything that scales or monitors them.
+    ResourceGroup(
+        "workloads",
+        requires=("secrets", "configmaps"),
+        targets=(
+            "**ol:infrastructure:components:services:OLApplicationK8s**",
+            "**kubernetes:apps/v1:Deployment::*",
+            "**kubernetes:core/v1:PersistentVolumeClaim::*",
+            "**kubernetes:autoscaling.k8s.io/v1:VerticalPodAutoscaler::*",
+            "**kubernetes:keda.sh/v1alpha1:ScaledObject::*",
+            "**kubernetes:keda.sh/v1alpha1:TriggerAuthentication::*",
+            "**kubernetes:monitoring.coreos.com/v1:PodMonitor::*",
+            "**kubernetes:vpcresources.k8s.aws/v1beta1:SecurityGroupPolicy::*",
+            "**ol:services:Vault:K8S:VaultStaticSecret::ol-*-edxapp-webapp-prometheus-auth-*",
+            "**ol:services:Vault:K8S:VaultStaticSecret$**::OLVaultK8SSecret-*-edxapp-webapp-prometheus-auth",
+        ),
+    ),
+]
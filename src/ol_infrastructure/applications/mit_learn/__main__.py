@@ -41,6 +41,9 @@ from ol_infrastructure.applications.mit_learn.k8s_autoscaling import (
 from ol_infrastructure.applications.mit_learn.k8s_secrets import (
     create_mitlearn_k8s_secrets,
 )
+from ol_infrastructure.applications.mit_learn.resource_groups import (
+    MIT_LEARN_RESOURCE_GROUPS,
+)
 from ol_infrastructure.components.aws.cache import (
     OLAmazonCache,
     OLAmazonRedisConfig,
@@ -96,6 +99,7 @@ from ol_infrastructure.lib.ol_types import (
     Services,
 )
 from ol_infrastructure.lib.pulumi_helper import (
+    ResourceGroups,
     docker_image_config_kwargs,
     make_stack_reference,
     merge_otel_resource_attributes,
@@ -113,6 +117,8 @@ vault_config = Config("vault")
 
 stack_info = parse_stack()
 
+resource_groups = ResourceGroups("mitlearn", MIT_LEARN_RESOURCE_GROUPS)
+
 cluster_stack = make_stack_reference(projects.EKS, f"applications.{stack_info.name}")
 cluster_substructure_stack = make_stack_reference(
     projects.EKS_SUB, f"applications.{stack_info.name}"
@@ -775,355 +781,361 @@ mitlearn_vault_backend_config = OLVaultPostgresDatabaseConfig(
 mitlearn_vault_backend = OLVaultDatabaseBackend(mitlearn_vault_backend_config)
 
 
-vector_log_proxy_secrets = read_yaml_secrets(
-    Path(f"vector/vector_log_proxy.{stack_info.env_suffix}.yaml")
-)
-fastly_proxy_credentials = vector_log_proxy_secrets["fastly"]
-encoded_fastly_proxy_credentials = base64.b64encode(
-    f"{fastly_proxy_credentials['username']}:{fastly_proxy_credentials['password']}".encode()
-).decode("utf8")
-vector_log_proxy_domain = vector_log_proxy_stack.require_output(
-    "vector_log_proxy_domain"
-)
-
-fastly_access_logging_bucket = monitoring_stack.require_output(
-    "fastly_access_logging_bucket"
-)
-fastly_access_logging_iam_role = monitoring_stack.require_output(
-    "fastly_access_logging_iam_role"
-)
-gzip_settings: dict[str, set[str]] = {"extensions": set(), "content_types": set()}
-for k, v in mimetypes.types_map.items():
-    if k in (
-        ".json",
-        ".pdf",
-        ".jpeg",
-        ".jpg",
-        ".html",
-        ".css",
-        ".js",
-        ".svg",
-        ".png",
-        ".gif",
-        ".xml",
-        ".vtt",
-        ".srt",
-    ):
-        gzip_settings["extensions"].add(k.strip("."))
-        gzip_settings["content_types"].add(v)
-fastly_shielding_enabled = mitlearn_config.get_bool("enable_fastly_shielding") or False
-bucket_backend_name = "MIT Learn S3 Media Storage"
-ocw_courses_bucket_backend_name = "OCW S3 Courses"
-ocw_courses_bucket_fqdn = ocw_site_buckets["buckets"]["live"].apply(
-    lambda name: f"{name}.s3.us-east-1.amazonaws.com"
-)
-mitlearn_fastly_service = fastly.ServiceVcl(
-    f"fastly-mit_learn-{stack_info.env_suffix}",
-    name=f"MIT Learn {stack_info.env_suffix}",
-    comment="Managed by Pulumi",
-    backends=[
-        fastly.ServiceVclBackendArgs(
-            address=nextjs_heroku_domain,
-            name="NextJS_Frontend",
-            first_byte_timeout=30000,
-            override_host=nextjs_heroku_domain,
-            port=DEFAULT_HTTPS_PORT,
-            shield="iad-va-us" if fastly_shielding_enabled else None,
-            ssl_cert_hostname=nextjs_heroku_domain,
-            ssl_sni_hostname=nextjs_heroku_domain,
-            use_ssl=True,
-        ),
-        fastly.ServiceVclBackendArgs(
-            address=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
-            name=bucket_backend_name,
-            first_byte_timeout=30000,
-            override_host=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
-            port=443,
-            request_condition="Media asset requests",
-            shield="iad-va-us" if fastly_shielding_enabled else None,
-            ssl_cert_hostname=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
-            ssl_sni_hostname=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
-            use_ssl=True,
-        ),
-        fastly.ServiceVclBackendArgs(
-            address=ocw_courses_bucket_fqdn,
-            name=ocw_courses_bucket_backend_name,
-            first_byte_timeout=30000,
-            override_host=ocw_courses_bucket_fqdn,
-            port=443,
-            request_condition="OCW course requests",
-            shield="iad-va-us" if fastly_shielding_enabled else None,
-            ssl_cert_hostname=ocw_courses_bucket_fqdn,
-            ssl_sni_hostname=ocw_courses_bucket_fqdn,
-            use_ssl=True,
-        ),
-    ],
-    gzips=[
-        fastly.ServiceVclGzipArgs(
-            name="enable-gzip-compression",
-            extensions=list(gzip_settings["extensions"]),
-            content_types=list(gzip_settings["content_types"]),
-        )
-    ],
-    product_enablement=fastly.ServiceVclProductEnablementArgs(
-        brotli_compression=True,
-    ),
-    cache_settings=[],
-    conditions=[
-        fastly.ServiceVclConditionArgs(
-            name="Media asset requests",
-            statement="var.is_media_request",
-            type="REQUEST",
-        ),
-        fastly.ServiceVclConditionArgs(
-            name="OCW course requests",
-            statement="var.is_ocw_request",
-            type="REQUEST",
-        ),
-    ],
-    dictionaries=[
-        fastly.ServiceVclDictionaryArgs(name="path_redirects"),  # exact path redirects
-        fastly.ServiceVclDictionaryArgs(
-            name="prefix_redirects"
-        ),  # first-segment prefix redirects
-    ],
-    domains=[
-        fastly.ServiceVclDomainArgs(
-            comment=f"mit_learn {stack_info.env_suffix} Application",
-            name=learn_frontend_domain,
-        ),
-        fastly.ServiceVclDomainArgs(
-            comment=f"mit_learn {stack_info.env_suffix} Application - Legacy",
-            name=legacy_learn_frontend_domain,
-        ),
-    ],
-    headers=[
-        fastly.ServiceVclHeaderArgs(
-            action="set",
-            destination="http.Strict-Transport-Security",
-            name="Generated by force TLS and enable HSTS",
-            source='"max-age=31536000"',
-            type="response",
-        ),
-    ],
-    request_settings=[
-        fastly.ServiceVclRequestSettingArgs(
-            force_ssl=True,
-            name="Generated by force TLS and enable HSTS, change hash keys for prerender.io",
-            hash_keys="req.url, req.http.host",
-            xff="leave",
-        ),
-    ],
-    snippets=[
-        fastly.ServiceVclSnippetArgs(
-            name="handle domain redirect",
-            content=textwrap.dedent(
-                rf"""
-                set req.http.orig-req-url = req.url;
-                unset req.http.Cookie;
-
-                # If the request is for the old DNS name, redirect
-                if (req.http.host == "{mitlearn_config.require("legacy_frontend_domain")}") {{
-                  error 618 "redirect-host";
-                }}
-                """
+if resource_groups.selected("cdn"):
+    vector_log_proxy_secrets = read_yaml_secrets(
+        Path(f"vector/vector_log_proxy.{stack_info.env_suffix}.yaml")
+    )
+    fastly_proxy_credentials = vector_log_proxy_secrets["fastly"]
+    encoded_fastly_proxy_credentials = base64.b64encode(
+        f"{fastly_proxy_credentials['username']}:{fastly_proxy_credentials['password']}".encode()
+    ).decode("utf8")
+    vector_log_proxy_domain = vector_log_proxy_stack.require_output(
+        "vector_log_proxy_domain"
+    )
+
+    fastly_access_logging_bucket = monitoring_stack.require_output(
+        "fastly_access_logging_bucket"
+    )
+    fastly_access_logging_iam_role = monitoring_stack.require_output(
+        "fastly_access_logging_iam_role"
+    )
+    gzip_settings: dict[str, set[str]] = {"extensions": set(), "content_types": set()}
+    for k, v in mimetypes.types_map.items():
+        if k in (
+            ".json",
+            ".pdf",
+            ".jpeg",
+            ".jpg",
+            ".html",
+            ".css",
+            ".js",
+            ".svg",
+            ".png",
+            ".gif",
+            ".xml",
+            ".vtt",
+            ".srt",
+        ):
+            gzip_settings["extensions"].add(k.strip("."))
+            gzip_settings["content_types"].add(v)
+    fastly_shielding_enabled = (
+        mitlearn_config.get_bool("enable_fastly_shielding") or False
+    )
+    bucket_backend_name = "MIT Learn S3 Media Storage"
+    ocw_courses_bucket_backend_name = "OCW S3 Courses"
+    ocw_courses_bucket_fqdn = ocw_site_buckets["buckets"]["live"].apply(
+        lambda name: f"{name}.s3.us-east-1.amazonaws.com"
+    )
+    mitlearn_fastly_service = fastly.ServiceVcl(
+        f"fastly-mit_learn-{stack_info.env_suffix}",
+        name=f"MIT Learn {stack_info.env_suffix}",
+        comment="Managed by Pulumi",
+        backends=[
+            fastly.ServiceVclBackendArgs(
+                address=nextjs_heroku_domain,
+                name="NextJS_Frontend",
+                first_byte_timeout=30000,
+                override_host=nextjs_heroku_domain,
+                port=DEFAULT_HTTPS_PORT,
+                shield="iad-va-us" if fastly_shielding_enabled else None,
+                ssl_cert_hostname=nextjs_heroku_domain,
+                ssl_sni_hostname=nextjs_heroku_domain,
+                use_ssl=True,
             ),
-            type="recv",
-            priority=10,
-        ),
-        fastly.ServiceVclSnippetArgs(
-            content=textwrap.dedent(
-                r"""
-            declare local var.is_media_request BOOL;
-            set var.is_media_request = false;
-            if( req.url ~ "^/media" ) {
-              set var.is_media_request = true;
-              unset req.http.Cookie;
-            }"""
+            fastly.ServiceVclBackendArgs(
+                address=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
+                name=bucket_backend_name,
+                first_byte_timeout=30000,
+                override_host=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
+                port=443,
+                request_condition="Media asset requests",
+                shield="iad-va-us" if fastly_shielding_enabled else None,
+                ssl_cert_hostname=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
+                ssl_sni_hostname=f"{mitlearn_app_storage_bucket_name}.s3.us-east-1.amazonaws.com",
+                use_ssl=True,
             ),
-            name="Route media requests to S3",
-            priority=200,
-            type="recv",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            content=textwrap.dedent(
-                r"""
-            declare local var.is_ocw_request BOOL;
-            set var.is_ocw_request = false;
-            if (req.url.path ~ "^/courses/o/") {
-              set req.url = regsub(
-                req.url, "^/courses/o/", "/ocw-course-v3/courses/"
-              );
-            }
-            if (req.url.path ~ "^/static_shared/") {
-              set var.is_ocw_request = true;
-            }
-            if (req.url.path ~ "^/ocw-course-v3/") {
-              set var.is_ocw_request = true;
-              set req.url = querystring.remove(req.url);
-              if (req.url !~ "\.[^/]+$") {
-                set req.url = regsub(req.url, "/?$", "/index.html");
-              }
-              unset req.http.Cookie;
-            }"""
+            fastly.ServiceVclBackendArgs(
+                address=ocw_courses_bucket_fqdn,
+                name=ocw_courses_bucket_backend_name,
+                first_byte_timeout=30000,
+                override_host=ocw_courses_bucket_fqdn,
+                port=443,
+                request_condition="OCW course requests",
+                shield="iad-va-us" if fastly_shielding_enabled else None,
+                ssl_cert_hostname=ocw_courses_bucket_fqdn,
+                ssl_sni_hostname=ocw_courses_bucket_fqdn,
+                use_ssl=True,
             ),
-            name="Route OCW courses to S3",
-            priority=200,
-            type="recv",
+        ],
+        gzips=[
+            fastly.ServiceVclGzipArgs(
+                name="enable-gzip-compression",
+                extensions=list(gzip_settings["extensions"]),
+                content_types=list(gzip_settings["content_types"]),
+            )
+        ],
+        product_enablement=fastly.ServiceVclProductEnablementArgs(
+            brotli_compression=True,
         ),
-        fastly.ServiceVclSnippetArgs(
-            content=textwrap.dedent(
-                f"""\
-            if (req.backend == F_{bucket_backend_name.replace(" ", "_")}) {{
-              unset bereq.http.Authorization;
-            }}"""
+        cache_settings=[],
+        conditions=[
+            fastly.ServiceVclConditionArgs(
+                name="Media asset requests",
+                statement="var.is_media_request",
+                type="REQUEST",
             ),
-            name="Strip auth headers in S3 miss requests",
-            type="miss",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            content=textwrap.dedent(
-                f"""\
-            if (req.backend == F_{ocw_courses_bucket_backend_name.replace(" ", "_")}) {{
-              unset bereq.http.Authorization;
-            }}"""
+            fastly.ServiceVclConditionArgs(
+                name="OCW course requests",
+                statement="var.is_ocw_request",
+                type="REQUEST",
             ),
-            name="Strip auth headers for OCW S3 miss requests",
-            type="miss",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            content=textwrap.dedent(
-                f"""\
-            if (req.backend == F_{bucket_backend_name.replace(" ", "_")}) {{
-              unset bereq.http.Authorization;
-            }}"""
+        ],
+        dictionaries=[
+            # exact path redirects
+            fastly.ServiceVclDictionaryArgs(name="path_redirects"),
+            fastly.ServiceVclDictionaryArgs(
+                name="prefix_redirects"
+            ),  # first-segment prefix redirects
+        ],
+        domains=[
+            fastly.ServiceVclDomainArgs(
+                comment=f"mit_learn {stack_info.env_suffix} Application",
+                name=learn_frontend_domain,
             ),
-            name="Strip auth headers in S3 pass requests",
-            type="pass",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            content=textwrap.dedent(
-                f"""\
-            if (req.backend == F_{ocw_courses_bucket_backend_name.replace(" ", "_")}) {{
-              unset bereq.http.Authorization;
-            }}"""
+            fastly.ServiceVclDomainArgs(
+                comment=f"mit_learn {stack_info.env_suffix} Application - Legacy",
+                name=legacy_learn_frontend_domain,
             ),
-            name="Strip auth headers for OCW S3 pass requests",
-            type="pass",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            name="Redirect for to correct domain",
-            content=textwrap.dedent(
-                rf"""
-                # redirect to the correct host/domain
-                if (obj.status == 618 && obj.response == "redirect-host") {{
-                  set obj.status = 302;
-                  set obj.http.Location = "https://" + "{mitlearn_config.require("frontend_domain")}" + req.url.path + if (std.strlen(req.url.qs) > 0, "?" req.url.qs, "");
-                  return (deliver);
-                }}
-                """
+        ],
+        headers=[
+            fastly.ServiceVclHeaderArgs(
+                action="set",
+                destination="http.Strict-Transport-Security",
+                name="Generated by force TLS and enable HSTS",
+                source='"max-age=31536000"',
+                type="response",
             ),
-            type="error",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            name="handle route dictionary redirect",
-            content=Path(__file__)
-            .parent.joinpath("snippets/redirect_recv.vcl")
-            .read_text(),
-            type="recv",
-            priority=10,
-        ),
-        fastly.ServiceVclSnippetArgs(
-            name="Disable stale-while-revalidate when acting as a shield",
-            content=Path(__file__)
-            .parent.joinpath("snippets/shield_stale_while_revalidate_guard.vcl")
-            .read_text(),
-            type="recv",
-            # After the priority-10 redirect snippets, which exit via `error` and so
-            # never reach a cache lookup, and before the priority-200 S3 routing,
-            # which this is independent of. 100 is Fastly's default, so this only
-            # makes the existing order explicit.
-            priority=100,
-        ),
-        fastly.ServiceVclSnippetArgs(
-            name="deliver route dictionary redirect",
-            content=Path(__file__)
-            .parent.joinpath("snippets/redirect_deliver.vcl")
-            .read_text(),
-            type="error",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            name="Set proper Content-Type for media files",
-            content=Path(__file__)
-            .parent.joinpath("snippets/set_media_content_type.vcl")
-            .read_text(),
-            type="fetch",
-        ),
-        fastly.ServiceVclSnippetArgs(
-            name="Strip noindex header from NextJS backend",
-            content="unset resp.http.X-Robots-Tag;",
-            type="deliver",
-        ),
-    ],
-    logging_https=[
-        fastly.ServiceVclLoggingHttpArgs(
-            url=Output.all(domain=vector_log_proxy_domain).apply(
-                lambda kwargs: f"https://{kwargs['domain']}/fastly"
+        ],
+        request_settings=[
+            fastly.ServiceVclRequestSettingArgs(
+                force_ssl=True,
+                name="Generated by force TLS and enable HSTS, change hash keys for prerender.io",
+                hash_keys="req.url, req.http.host",
+                xff="leave",
+            ),
+        ],
+        snippets=[
+            fastly.ServiceVclSnippetArgs(
+                name="handle domain redirect",
+                content=textwrap.dedent(
+                    rf"""
+                    set req.http.orig-req-url = req.url;
+                    unset req.http.Cookie;
+
+                    # If the request is for the old DNS name, redirect
+                    if (req.http.host == "{mitlearn_config.require("legacy_frontend_domain")}") {{
+                      error 618 "redirect-host";
+                    }}
+                    """
+                ),
+                type="recv",
+                priority=10,
+            ),
+            fastly.ServiceVclSnippetArgs(
+                content=textwrap.dedent(
+                    r"""
+                declare local var.is_media_request BOOL;
+                set var.is_media_request = false;
+                if( req.url ~ "^/media" ) {
+                  set var.is_media_request = true;
+                  unset req.http.Cookie;
+                }"""
+                ),
+                name="Route media requests to S3",
+                priority=200,
+                type="recv",
             ),
-            name=f"fastly-mit_learn-{stack_info.env_suffix}-https-logging-args",
-            content_type="application/json",
-            format=build_fastly_log_format_string(
-                additional_static_fields={
-                    "application": Application.mit_learn,
-                    "environment": stack_info.env_suffix,
+            fastly.ServiceVclSnippetArgs(
+                content=textwrap.dedent(
+                    r"""
+                declare local var.is_ocw_request BOOL;
+                set var.is_ocw_request = false;
+                if (req.url.path ~ "^/courses/o/") {
+                  set req.url = regsub(
+                    req.url, "^/courses/o/", "/ocw-course-v3/courses/"
+                  );
                 }
+                if (req.url.path ~ "^/static_shared/") {
+                  set var.is_ocw_request = true;
+                }
+                if (req.url.path ~ "^/ocw-course-v3/") {
+                  set var.is_ocw_request = true;
+                  set req.url = querystring.remove(req.url);
+                  if (req.url !~ "\.[^/]+$") {
+                    set req.url = regsub(req.url, "/?$", "/index.html");
+                  }
+                  unset req.http.Cookie;
+                }"""
+                ),
+                name="Route OCW courses to S3",
+                priority=200,
+                type="recv",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                content=textwrap.dedent(
+                    f"""\
+                if (req.backend == F_{bucket_backend_name.replace(" ", "_")}) {{
+                  unset bereq.http.Authorization;
+                }}"""
+                ),
+                name="Strip auth headers in S3 miss requests",
+                type="miss",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                content=textwrap.dedent(
+                    f"""\
+                if (req.backend == F_{ocw_courses_bucket_backend_name.replace(" ", "_")}) {{
+                  unset bereq.http.Authorization;
+                }}"""
+                ),
+                name="Strip auth headers for OCW S3 miss requests",
+                type="miss",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                content=textwrap.dedent(
+                    f"""\
+                if (req.backend == F_{bucket_backend_name.replace(" ", "_")}) {{
+                  unset bereq.http.Authorization;
+                }}"""
+                ),
+                name="Strip auth headers in S3 pass requests",
+                type="pass",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                content=textwrap.dedent(
+                    f"""\
+                if (req.backend == F_{ocw_courses_bucket_backend_name.replace(" ", "_")}) {{
+                  unset bereq.http.Authorization;
+                }}"""
+                ),
+                name="Strip auth headers for OCW S3 pass requests",
+                type="pass",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                name="Redirect for to correct domain",
+                content=textwrap.dedent(
+                    rf"""
+                    # redirect to the correct host/domain
+                    if (obj.status == 618 && obj.response == "redirect-host") {{
+                      set obj.status = 302;
+                      set obj.http.Location = "https://" + "{mitlearn_config.require("frontend_domain")}" + req.url.path + if (std.strlen(req.url.qs) > 0, "?" req.url.qs, "");
+                      return (deliver);
+                    }}
+                    """
+                ),
+                type="error",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                name="handle route dictionary redirect",
+                content=Path(__file__)
+                .parent.joinpath("snippets/redirect_recv.vcl")
+                .read_text(),
+                type="recv",
+                priority=10,
+            ),
+            fastly.ServiceVclSnippetArgs(
+                name="Disable stale-while-revalidate when acting as a shield",
+                content=Path(__file__)
+                .parent.joinpath("snippets/shield_stale_while_revalidate_guard.vcl")
+                .read_text(),
+                type="recv",
+                # After the priority-10 redirect snippets, which exit via `error` and so
+                # never reach a cache lookup, and before the priority-200 S3 routing,
+                # which this is independent of. 100 is Fastly's default, so this only
+                # makes the existing order explicit.
+                priority=100,
+            ),
+            fastly.ServiceVclSnippetArgs(
+                name="deliver route dictionary redirect",
+                content=Path(__file__)
+                .parent.joinpath("snippets/redirect_deliver.vcl")
+                .read_text(),
+                type="error",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                name="Set proper Content-Type for media files",
+                content=Path(__file__)
+                .parent.joinpath("snippets/set_media_content_type.vcl")
+                .read_text(),
+                type="fetch",
+            ),
+            fastly.ServiceVclSnippetArgs(
+                name="Strip noindex header from NextJS backend",
+                content="unset resp.http.X-Robots-Tag;",
+                type="deliver",
+            ),
+        ],
+        logging_https=[
+            fastly.ServiceVclLoggingHttpArgs(
+                url=Output.all(domain=vector_log_proxy_domain).apply(
+                    lambda kwargs: f"https://{kwargs['domain']}/fastly"
+                ),
+                name=f"fastly-mit_learn-{stack_info.env_suffix}-https-logging-args",
+                content_type="application/json",
+                format=build_fastly_log_format_string(
+                    additional_static_fields={
+                        "application": Application.mit_learn,
+                        "environment": stack_info.env_suffix,
+                    }
+                ),
+                format_version=2,
+                header_name="Authorization",
+                header_value=f"Basic {encoded_fastly_proxy_credentials}",
+                json_format="0",
+                method="POST",
+                request_max_bytes=ONE_MEGABYTE_BYTE,
+            )
+        ],
+        opts=ResourceOptions.merge(
+            fastly_provider,
+            ResourceOptions(
+                aliases=[
+                    Alias(name=f"fastly-mitopen-{stack_info.env_suffix}"),
+                    Alias(name=f"fastly-mitlearn-{stack_info.env_suffix}"),
+                ],
             ),
-            format_version=2,
-            header_name="Authorization",
-            header_value=f"Basic {encoded_fastly_proxy_credentials}",
-            json_format="0",
-            method="POST",
-            request_max_bytes=ONE_MEGABYTE_BYTE,
-        )
-    ],
-    opts=ResourceOptions.merge(
-        fastly_provider,
-        ResourceOptions(
-            aliases=[
-                Alias(name=f"fastly-mitopen-{stack_info.env_suffix}"),
-                Alias(name=f"fastly-mitlearn-{stack_info.env_suffix}"),
-            ],
         ),
-    ),
-)
+    )
 
-path_redirects_dict_id = mitlearn_fastly_service.dictionaries.apply(
-    lambda dicts: str(
-        next(d.dictionary_id for d in (dicts or []) if d.name == "path_redirects")
+    path_redirects_dict_id = mitlearn_fastly_service.dictionaries.apply(
+        lambda dicts: str(
+            next(d.dictionary_id for d in (dicts or []) if d.name == "path_redirects")
+        )
+    )
+    mitlearn_redirects_dictionary = fastly.ServiceDictionaryItems(
+        "mitlearn-redirects-dictionary",
+        dictionary_id=path_redirects_dict_id,
+        items={
+            "/dashboard/organization/mit": "/dashboard/organization/mit-universal-ai"
+        },
+        service_id=mitlearn_fastly_service.id,
+        manage_items=True,
+        opts=fastly_provider,
     )
-)
-mitlearn_redirects_dictionary = fastly.ServiceDictionaryItems(
-    "mitlearn-redirects-dictionary",
-    dictionary_id=path_redirects_dict_id,
-    items={"/dashboard/organization/mit": "/dashboard/organization/mit-universal-ai"},
-    service_id=mitlearn_fastly_service.id,
-    manage_items=True,
-    opts=fastly_provider,
-)
 
-prefix_redirects_dict_id = mitlearn_fastly_service.dictionaries.apply(
-    lambda dicts: str(
-        next(d.dictionary_id for d in (dicts or []) if d.name == "prefix_redirects")
+    prefix_redirects_dict_id = mitlearn_fastly_service.dictionaries.apply(
+        lambda dicts: str(
+            next(d.dictionary_id for d in (dicts or []) if d.name == "prefix_redirects")
+        )
+    )
+    mitlearn_prefix_redirects_dictionary = fastly.ServiceDictionaryItems(
+        "mitlearn-prefix-redirects-dictionary",
+        dictionary_id=prefix_redirects_dict_id,
+        items={},
+        service_id=mitlearn_fastly_service.id,
+        manage_items=True,
+        opts=fastly_provider,
     )
-)
-mitlearn_prefix_redirects_dictionary = fastly.ServiceDictionaryItems(
-    "mitlearn-prefix-redirects-dictionary",
-    dictionary_id=prefix_redirects_dict_id,
-    items={},
-    service_id=mitlearn_fastly_service.id,
-    manage_items=True,
-    opts=fastly_provider,
-)
 
 
 five_minutes = 60 * 5
@@ -1428,32 +1440,33 @@ redis_cache = OLAmazonCache(
     ),
 )
 
-# Create all Kubernetes secrets needed by the application
-secret_names, secret_resources = create_mitlearn_k8s_secrets(
-    stack_info=stack_info,
-    mitlearn_namespace=learn_namespace,
-    k8s_global_labels=k8s_app_labels,
-    vault_k8s_resources=vault_k8s_resources,
-    mitlearn_vault_mount=mitlearn_vault_mount,
-    db_config=mitlearn_vault_backend,  # Use the original DB config object
-    redis_password=redis_config.require("password"),
-    redis_cache=redis_cache,
-)
+if resource_groups.selected("workloads"):
+    # Create all Kubernetes secrets needed by the application
+    secret_names, secret_resources = create_mitlearn_k8s_secrets(
+        stack_info=stack_info,
+        mitlearn_namespace=learn_namespace,
+        k8s_global_labels=k8s_app_labels,
+        vault_k8s_resources=vault_k8s_resources,
+        mitlearn_vault_mount=mitlearn_vault_mount,
+        db_config=mitlearn_vault_backend,  # Use the original DB config object
+        redis_password=redis_config.require("password"),
+        redis_cache=redis_cache,
+    )
 
-# KEDA webapp autoscaling: scale on APISIX request-rate + p95 latency
-# (CPU backstop) instead of CPU/memory alone, since search blocks on I/O.
-webapp_trigger_auth, webapp_trigger_auth_name = create_webapp_trigger_auth(
-    env_name=stack_info.env_suffix,
-    namespace=learn_namespace,
-    k8s_global_labels=k8s_app_labels,
-    stack_info=stack_info,
-    vault_k8s_resources=vault_k8s_resources,
-)
-webapp_keda_config = build_webapp_keda_config(
-    trigger_auth_name=webapp_trigger_auth_name,
-    stack_info=stack_info,
-    mitlearn_config=mitlearn_config,
-)
+    # KEDA webapp autoscaling: scale on APISIX request-rate + p95 latency
+    # (CPU backstop) instead of CPU/memory alone, since search blocks on I/O.
+    webapp_trigger_auth, webapp_trigger_auth_name = create_webapp_trigger_auth(
+        env_name=stack_info.env_suffix,
+        namespace=learn_namespace,
+        k8s_global_labels=k8s_app_labels,
+        stack_info=stack_info,
+        vault_k8s_resources=vault_k8s_resources,
+    )
+    webapp_keda_config = build_webapp_keda_config(
+        trigger_auth_name=webapp_trigger_auth_name,
+        stack_info=stack_info,
+        mitlearn_config=mitlearn_config,
+    )
 
 
 # Resource requests/limits, configurable per-stack via Pulumi config, falling back
@@ -1524,425 +1537,429 @@ celery_beat_resource_limits = _resource_config(
     "celery_beat_resource_limits", {"memory": "1536Mi"}
 )
 
-# Configure and deploy the mitlearn application using OLApplicationK8s
-mitlearn_k8s_app = OLApplicationK8s(
-    ol_app_k8s_config=OLApplicationK8sConfig(
-        project_root=Path(__file__).parent,
-        application_config=env_vars,
-        application_name="mitlearn",
-        application_namespace=learn_namespace,
-        application_lb_service_name="mitlearn-webapp",
-        application_lb_service_port_name="http",
-        k8s_global_labels=k8s_app_labels,
-        # Reference all Kubernetes secrets containing environment variables
-        env_from_secret_names=secret_names,
-        application_min_replicas=mitlearn_config.get_int("min_replicas") or 2,
-        application_max_replicas=mitlearn_config.get_int("max_replicas") or 10,
-        application_security_group_id=mitlearn_app_security_group.id,
-        application_security_group_name=mitlearn_app_security_group.name,
-        application_image_repository="mitodl/mit-learn-app",
-        **docker_image_config_kwargs("MIT_LEARN"),
-        application_cmd_array=["uwsgi"],
-        application_arg_array=["/tmp/uwsgi.ini"],  # noqa: S108
-        granian_config=GranianConfig(
-            workers=2,
-            # Sized against the VPA *floor* (3.5Gi in production), not the declared
-            # 3200Mi limit, because the floor is the smallest limit a pod can be
-            # running under and therefore the one the cap has to beat. The component's
-            # own floor(limit/workers*0.9) would give 1440, leaving the worker pair at
-            # 2880Mi with almost nothing left for the master under the floor.
-            #
-            # Raised again 2026-08-07, 1350 -> 1500. The previous 1350 (pair 2700Mi,
-            # ~370Mi margin under a 3Gi floor) was sized against a 2774Mi peak that
-            # was itself measured while the fleet was over-scaled (the two inert Prometheus
-            # triggers left the undersized-request CPU trigger pegging the HPA near
-            # max_replicas and spreading traffic thin). PR #5303 raised the CPU request, so
-            # the HPA settled into a much smaller replica range,
-            # container RSS to 3045-3069Mi within a day -- eating the margin and
-            # reviving the OOMKills. 2*1500 = 3000Mi leaves ~580Mi under the new 3.5Gi
-            # floor for the master and transient overshoot, sized with more headroom
-            # than before since this margin has now been eaten twice. See
-            # les-root-cause-found-mit-learn-s-aug-6-cpu-request-b-cfebf0 (witan) for
-            # the full investigation.
-            #
-            # Coupled to `workers` and to the VPA floor: both must be revisited
-            # together. Dropping to workers=1 without resizing this would cap the sole
-            # worker at 1500Mi of a 3.5Gi pod. See the stage 4 task in
-            # docs/plans/granian-configuration-overhaul.md.
-            #
-            # This is one value across all stacks, while the VPA floor it is sized
-            # against is production-only (CI/QA keep the 256Mi default). That is not
-            # the protection gap it looks like: a cap only guards anything when
-            # 2*cap + master fits under the running limit, and no cap derived from
-            # the 3200Mi declared limit fits under a VPA floor of 256Mi. Below a
-            # ~2300Mi limit the cap is inert at 1080, 1350 and 1500 alike, so CI/QA
-            # are no worse off than before. Making it genuinely track the limit the
-            # kernel enforces needs a runtime cgroup read, not a synth-time constant
-            # -- tracked as tk-evaluate-runtime-cgroup-derived-workers-max-rss.
-            workers_max_rss=1500,
-            enable_metrics=True,
-            interface="asginl",
-            backlog=None,
-            log_level=mitlearn_config.get("granian_log_level") or "info",
-            application_module="main.asgi:application",
-            runtime_mode=None,
-            # Holding pin: the component default dropped to 1. asginl forces
-            # blocking_threads=1 regardless, so this is the only axis on which the
-            # overhaul touches mit_learn until its review task.
-            # See docs/plans/granian-configuration-overhaul.md
-            runtime_threads=2,
-            # Serve /static/* from Granian's Rust layer instead of the sidecar
-            # (docs/plans/remove-nginx-sidecar.md, stage 5). No /media mount:
-            # the sidecar's /media/ location pointed at /src/django_media, a
-            # directory that does not exist in the image (MEDIA_ROOT is
-            # /var/media/ and uploads actually live in S3 under
-            # AWS_STORAGE_BUCKET_NAME), so nginx's try_files just 404'd there.
-            # Granian instead validates every mount at startup and refuses to
-            # boot on a missing one, so carrying the dead route over
-            # crashlooped the container. The sidecar's other tier ($uri against
-            # root /src, before /staticfiles) can't be reproduced either --
-            # Granian has no cross-mount fallthrough on a miss, see
-            # static_path_routes's docstring -- but it never mattered here:
-            # init_collectstatic=True always populates /src/staticfiles before
-            # the app container starts.
-            static_path_mounts=["/src/staticfiles"],
-            static_path_expires=STATIC_ASSET_MAX_AGE_SECONDS,
-        )
-        if mitlearn_config.get_bool("use_granian")
-        else None,
-        vault_k8s_resource_auth_name=vault_k8s_resources.auth_name,
-        # The sidecar is only redundant once Granian is actually serving the
-        # app (static_path_mounts above); the use_granian=False branch still
-        # runs bare uwsgi with no static handling of its own, so it keeps the
-        # sidecar. See docs/plans/remove-nginx-sidecar.md.
-        import_nginx_config=not mitlearn_config.get_bool("use_granian"),
-        import_nginx_config_path="files/web.conf_uwsgi",
-        import_uwsgi_config=True,
-        init_migrations=False,
-        init_collectstatic=True,  # Assuming Django app needs collectstatic
-        pre_deploy_commands=[("migrate", ["scripts/heroku-release-phase.sh"])],
-        celery_worker_configs=[
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="default",
-                max_replicas=20,
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests=celery_default_resource_requests,
-                resource_limits=celery_default_resource_limits,
-            ),
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="edx_content",
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests=celery_edx_content_resource_requests,
-                resource_limits=celery_edx_content_resource_limits,
-            ),
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="embeddings",
-                max_replicas=30,
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests=celery_embeddings_resource_requests,
-                resource_limits=celery_embeddings_resource_limits,
-            ),
-        ],
-        celery_beat_config=OLApplicationK8sCeleryBeatConfig(
-            resource_requests=celery_beat_resource_requests,
-            resource_limits=celery_beat_resource_limits,
-        ),
-        resource_requests=webapp_resource_requests,
-        resource_limits=webapp_resource_limits,
-        # The component would default this floor to resource_requests["memory"],
-        # which here is the same 3200Mi as the limit. Setting it lower lets the VPA
-        # size these pods back down as well as up. It must still clear measured peak
-        # RSS: a floor below real demand lets the VPA shrink the limit under the
-        # working set and the kernel OOM-kills the container. See
-        # Pulumi.Production.yaml for the production floor.
-        webapp_vpa_min_allowed_memory=webapp_vpa_min_allowed_memory,
-        webapp_vpa_max_allowed_memory=webapp_vpa_max_allowed_memory,
-        webapp_keda_config=webapp_keda_config,
-    ),
-    opts=ResourceOptions(
-        depends_on=[
-            mitlearn_app_security_group,
-            webapp_trigger_auth,
-            *secret_resources,
-        ]
-    ),
-)
-
-mitlearn_k8s_app_oidc_resources_no_prefix = OLApisixOIDCResources(
-    f"ol-mitlearn-k8s-olapisixoidcresources-no-prefix-{stack_info.env_suffix}",
-    oidc_config=OLApisixOIDCConfig(
-        application_name="mitlearn-k8s-no-prefix",
-        k8s_labels=application_labels,
-        k8s_namespace=learn_namespace,
-        oidc_logout_path="/logout/oidc",
-        oidc_post_logout_redirect_uri=f"https://{mitlearn_config.get('api_domain')}/logout/",
-        oidc_session_absolute_timeout=60 * 20160,
-        # Disable APISIX's own idling/rolling checks (which otherwise default
-        # to 15min/60min) so the session envelope lasts the full 14-day
-        # absolute_timeout above, matching the Keycloak SSO session and
-        # browser cookie lifetime instead of expiring early (hq#8416).
-        oidc_session_idling_timeout=0,
-        oidc_session_rolling_timeout=0,
-        # Broadened from the default host-only scope so a logged-in session
-        # cookie is also sent to ol-analytics-api's Learn-scoped host
-        # (analytics.learn.mit.edu et al.), letting its "pass" route recognize
-        # the same session instead of requiring a second login -- see
-        # ol_analytics_api/__main__.py's Learn-scoped OIDC resource, which
-        # shares this same "sso/mitlearn" Vault path/client and mirrors this
-        # cookie domain.
-        oidc_session_cookie_domain=mitlearn_api_domain.removeprefix("api"),
-        # Environment-scoped name instead of lua-resty-session's default
-        # "session". Required because of the broadened cookie domain above:
-        # a *.learn.mit.edu cookie is also sent to the RC and CI hosts, where
-        # a same-named cookie from another environment cannot be decrypted.
-        # Shared with learn-ai and ol-analytics-api -- see the helper's
-        # docstring.
-        oidc_session_cookie_name=mit_learn_session_cookie_name(
-            stack_info.env_suffix,
-        ),
-        oidc_use_session_secret=True,
-        vault_mount="secret-operations",
-        vault_mount_type="kv-v1",
-        vault_path="sso/mitlearn",
-        vaultauth=vault_k8s_resources.auth_name,
-    ),
-)
-mitlearn_k8s_app_oidc_resources = OLApisixOIDCResources(
-    f"ol-mitlearn-k8s-olapisixoidcresources-{stack_info.env_suffix}",
-    oidc_config=OLApisixOIDCConfig(
-        application_name="mitlearn-k8s",
-        k8s_labels=application_labels,
-        k8s_namespace=learn_namespace,
-        oidc_logout_path="/learn/logout/oidc",
-        oidc_post_logout_redirect_uri=f"https://{mitlearn_config.get('api_domain')}/learn/logout/",
-        oidc_session_absolute_timeout=60 * 20160,
-        # See the mitlearn-k8s-no-prefix resources above for why these are 0,
-        # and for the cookie domain and name below.
-        oidc_session_idling_timeout=0,
-        oidc_session_rolling_timeout=0,
-        oidc_session_cookie_domain=mitlearn_api_domain.removeprefix("api"),
-        oidc_session_cookie_name=mit_learn_session_cookie_name(
-            stack_info.env_suffix,
-        ),
-        oidc_use_session_secret=True,
-        vault_mount="secret-operations",
-        vault_mount_type="kv-v1",
-        vault_path="sso/mitlearn",
-        vaultauth=vault_k8s_resources.auth_name,
-    ),
-)
-
-proxy_rewrite_plugin_config = OLApisixPluginConfig(
-    name="proxy-rewrite",
-    config={
-        "regex_uri": [
-            "/learn/(.*)",
-            "/$1",
-        ],
-    },
-)
-
-learn_external_service_apisix_route_no_prefix = OLApisixRoute(
-    name=f"ol-mitlearn-k8s-apisix-route-no-prefix-{stack_info.env_suffix}",
-    k8s_namespace=learn_namespace,
-    k8s_labels=application_labels,
-    route_configs=[
-        OLApisixRouteConfig(
-            route_name="passauth",
-            priority=0,
-            shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
-            plugins=[
-                proxy_rewrite_plugin_config,
-                mitlearn_k8s_app_oidc_resources_no_prefix.get_full_oidc_plugin_config(
-                    unauth_action="pass"
+if resource_groups.selected("workloads"):
+    # Configure and deploy the mitlearn application using OLApplicationK8s
+    mitlearn_k8s_app = OLApplicationK8s(
+        ol_app_k8s_config=OLApplicationK8sConfig(
+            project_root=Path(__file__).parent,
+            application_config=env_vars,
+            application_name="mitlearn",
+            application_namespace=learn_namespace,
+            application_lb_service_name="mitlearn-webapp",
+            application_lb_service_port_name="http",
+            k8s_global_labels=k8s_app_labels,
+            # Reference all Kubernetes secrets containing environment variables
+            env_from_secret_names=secret_names,
+            application_min_replicas=mitlearn_config.get_int("min_replicas") or 2,
+            application_max_replicas=mitlearn_config.get_int("max_replicas") or 10,
+            application_security_group_id=mitlearn_app_security_group.id,
+            application_security_group_name=mitlearn_app_security_group.name,
+            application_image_repository="mitodl/mit-learn-app",
+            **docker_image_config_kwargs("MIT_LEARN"),
+            application_cmd_array=["uwsgi"],
+            application_arg_array=["/tmp/uwsgi.ini"],  # noqa: S108
+            granian_config=GranianConfig(
+                workers=2,
+                # Sized against the VPA *floor* (3.5Gi in production), not the declared
+                # 3200Mi limit, because the floor is the smallest limit a pod can be
+                # running under and therefore the one the cap has to beat. The component's
+                # own floor(limit/workers*0.9) would give 1440, leaving the worker pair at
+                # 2880Mi with almost nothing left for the master under the floor.
+                #
+                # Raised again 2026-08-07, 1350 -> 1500. The previous 1350 (pair 2700Mi,
+                # ~370Mi margin under a 3Gi floor) was sized against a 2774Mi peak that
+                # was itself measured while the fleet was over-scaled (the two inert Prometheus
+                # triggers left the undersized-request CPU trigger pegging the HPA near
+                # max_replicas and spreading traffic thin). PR #5303 raised the CPU request, so
+                # the HPA settled into a much smaller replica range,
+                # container RSS to 3045-3069Mi within a day -- eating the margin and
+                # reviving the OOMKills. 2*1500 = 3000Mi leaves ~580Mi under the new 3.5Gi
+                # floor for the master and transient overshoot, sized with more headroom
+                # than before since this margin has now been eaten twice. See
+                # les-root-cause-found-mit-learn-s-aug-6-cpu-request-b-cfebf0 (witan) for
+                # the full investigation.
+                #
+                # Coupled to `workers` and to the VPA floor: both must be revisited
+                # together. Dropping to workers=1 without resizing this would cap the sole
+                # worker at 1500Mi of a 3.5Gi pod. See the stage 4 task in
+                # docs/plans/granian-configuration-overhaul.md.
+                #
+                # This is one value across all stacks, while the VPA floor it is sized
+                # against is production-only (CI/QA keep the 256Mi default). That is not
+                # the protection gap it looks like: a cap only guards anything when
+                # 2*cap + master fits under the running limit, and no cap derived from
+                # the 3200Mi declared limit fits under a VPA floor of 256Mi. Below a
+                # ~2300Mi limit the cap is inert at 1080, 1350 and 1500 alike, so CI/QA
+                # are no worse off than before. Making it genuinely track the limit the
+                # kernel enforces needs a runtime cgroup read, not a synth-time constant
+                # -- tracked as tk-evaluate-runtime-cgroup-derived-workers-max-rss.
+                workers_max_rss=1500,
+                enable_metrics=True,
+                interface="asginl",
+                backlog=None,
+                log_level=mitlearn_config.get("granian_log_level") or "info",
+                application_module="main.asgi:application",
+                runtime_mode=None,
+                # Holding pin: the component default dropped to 1. asginl forces
+                # blocking_threads=1 regardless, so this is the only axis on which the
+                # overhaul touches mit_learn until its review task.
+                # See docs/plans/granian-configuration-overhaul.md
+                runtime_threads=2,
+                # Serve /static/* from Granian's Rust layer instead of the sidecar
+                # (docs/plans/remove-nginx-sidecar.md, stage 5). No /media mount:
+                # the sidecar's /media/ location pointed at /src/django_media, a
+                # directory that does not exist in the image (MEDIA_ROOT is
+                # /var/media/ and uploads actually live in S3 under
+                # AWS_STORAGE_BUCKET_NAME), so nginx's try_files just 404'd there.
+                # Granian instead validates every mount at startup and refuses to
+                # boot on a missing one, so carrying the dead route over
+                # crashlooped the container. The sidecar's other tier ($uri against
+                # root /src, before /staticfiles) can't be reproduced either --
+                # Granian has no cross-mount fallthrough on a miss, see
+                # static_path_routes's docstring -- but it never mattered here:
+                # init_collectstatic=True always populates /src/staticfiles before
+                # the app container starts.
+                static_path_mounts=["/src/staticfiles"],
+                static_path_expires=STATIC_ASSET_MAX_AGE_SECONDS,
+            )
+            if mitlearn_config.get_bool("use_granian")
+            else None,
+            vault_k8s_resource_auth_name=vault_k8s_resources.auth_name,
+            # The sidecar is only redundant once Granian is actually serving the
+            # app (static_path_mounts above); the use_granian=False branch still
+            # runs bare uwsgi with no static handling of its own, so it keeps the
+            # sidecar. See docs/plans/remove-nginx-sidecar.md.
+            import_nginx_config=not mitlearn_config.get_bool("use_granian"),
+            import_nginx_config_path="files/web.conf_uwsgi",
+            import_uwsgi_config=True,
+            init_migrations=False,
+            init_collectstatic=True,  # Assuming Django app needs collectstatic
+            pre_deploy_commands=[("migrate", ["scripts/heroku-release-phase.sh"])],
+            celery_worker_configs=[
+                OLApplicationK8sCeleryWorkerConfig(
+                    queue_name="default",
+                    max_replicas=20,
+                    redis_host=redis_cache.address,
+                    redis_password=redis_config.require("password"),
+                    resource_requests=celery_default_resource_requests,
+                    resource_limits=celery_default_resource_limits,
                 ),
-            ],
-            hosts=[mitlearn_api_domain],
-            paths=["/*"],
-            backend_service_name=mitlearn_k8s_app.application_lb_service_name,
-            backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
-        ),
-        OLApisixRouteConfig(
-            route_name="logout-redirect",
-            priority=10,
-            shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
-            plugins=[
-                OLApisixPluginConfig(name="redirect", config={"uri": "/logout/oidc"}),
-            ],
-            hosts=[mitlearn_api_domain],
-            paths=["/logout/oidc/*"],
-            backend_service_name=mitlearn_k8s_app.application_lb_service_name,
-            backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
-        ),
-        OLApisixRouteConfig(
-            route_name="reqauth",
-            priority=10,
-            shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
-            plugins=[
-                proxy_rewrite_plugin_config,
-                mitlearn_k8s_app_oidc_resources_no_prefix.get_full_oidc_plugin_config(
-                    unauth_action="auth"
+                OLApplicationK8sCeleryWorkerConfig(
+                    queue_name="edx_content",
+                    redis_host=redis_cache.address,
+                    redis_password=redis_config.require("password"),
+                    resource_requests=celery_edx_content_resource_requests,
+                    resource_limits=celery_edx_content_resource_limits,
                 ),
-            ],
-            hosts=[mitlearn_api_domain],
-            paths=[
-                "/admin/login/*",
-                "/login",
-                "/login/*",
-            ],
-            backend_service_name=mitlearn_k8s_app.application_lb_service_name,
-            backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
-        ),
-        # The sidecar answered this with a 204 (EFF Do Not Track convention
-        # for "no policy published"). "passauth" above would otherwise proxy
-        # it through to Django, which has no view for it -- kept as a mock so
-        # a crawled path doesn't burn a Granian blocking thread on a 404. Only
-        # needed here, not on the /learn/* prefixed resource below: that one
-        # requires the /learn/ prefix on every path, so this URL never reached
-        # the backend through it even with the sidecar. See
-        # docs/plans/remove-nginx-sidecar.md.
-        OLApisixRouteConfig(
-            route_name="dnt-policy",
-            priority=10,
-            hosts=[mitlearn_api_domain],
-            paths=["/.well-known/dnt-policy.txt"],
-            backend_service_name=mitlearn_k8s_app.application_lb_service_name,
-            backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
-            plugins=[
-                OLApisixPluginConfig(
-                    name="mocking",
-                    secretRef=None,
-                    config={
-                        "response_status": 204,
-                        "response_example": "",
-                        "content_type": "text/plain",
-                        "with_mock_header": False,
-                    },
+                OLApplicationK8sCeleryWorkerConfig(
+                    queue_name="embeddings",
+                    max_replicas=30,
+                    redis_host=redis_cache.address,
+                    redis_password=redis_config.require("password"),
+                    resource_requests=celery_embeddings_resource_requests,
+                    resource_limits=celery_embeddings_resource_limits,
                 ),
             ],
+            celery_beat_config=OLApplicationK8sCeleryBeatConfig(
+                resource_requests=celery_beat_resource_requests,
+                resource_limits=celery_beat_resource_limits,
+            ),
+            resource_requests=webapp_resource_requests,
+            resource_limits=webapp_resource_limits,
+            # The component would default this floor to resource_requests["memory"],
+            # which here is the same 3200Mi as the limit. Setting it lower lets the VPA
+            # size these pods back down as well as up. It must still clear measured peak
+            # RSS: a floor below real demand lets the VPA shrink the limit under the
+            # working set and the kernel OOM-kills the container. See
+            # Pulumi.Production.yaml for the production floor.
+            webapp_vpa_min_allowed_memory=webapp_vpa_min_allowed_memory,
+            webapp_vpa_max_allowed_memory=webapp_vpa_max_allowed_memory,
+            webapp_keda_config=webapp_keda_config,
         ),
-    ],
-    opts=ResourceOptions(
-        delete_before_replace=True,
-    ),
-)
-
-learn_external_service_apisix_route = OLApisixRoute(
-    name=f"ol-mitlearn-k8s-apisix-route-{stack_info.env_suffix}",
-    k8s_namespace=learn_namespace,
-    k8s_labels=application_labels,
-    route_configs=[
-        OLApisixRouteConfig(
-            route_name="passauth",
-            priority=0,
-            shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
-            plugins=[
-                proxy_rewrite_plugin_config,
-                mitlearn_k8s_app_oidc_resources.get_full_oidc_plugin_config(
-                    unauth_action="pass"
-                ),
-            ],
-            hosts=[mitlearn_api_domain],
-            paths=["/learn/*"],
-            backend_service_name=mitlearn_k8s_app.application_lb_service_name,
-            backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+        opts=ResourceOptions(
+            depends_on=[
+                mitlearn_app_security_group,
+                webapp_trigger_auth,
+                *secret_resources,
+            ]
         ),
-        OLApisixRouteConfig(
-            route_name="logout-redirect",
-            priority=10,
-            shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
-            plugins=[
-                OLApisixPluginConfig(name="redirect", config={"uri": "/logout/oidc"}),
-            ],
-            hosts=[mitlearn_api_domain],
-            paths=["/learn/logout/oidc/*"],
-            backend_service_name=mitlearn_k8s_app.application_lb_service_name,
-            backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+    )
+
+    mitlearn_k8s_app_oidc_resources_no_prefix = OLApisixOIDCResources(
+        f"ol-mitlearn-k8s-olapisixoidcresources-no-prefix-{stack_info.env_suffix}",
+        oidc_config=OLApisixOIDCConfig(
+            application_name="mitlearn-k8s-no-prefix",
+            k8s_labels=application_labels,
+            k8s_namespace=learn_namespace,
+            oidc_logout_path="/logout/oidc",
+            oidc_post_logout_redirect_uri=f"https://{mitlearn_config.get('api_domain')}/logout/",
+            oidc_session_absolute_timeout=60 * 20160,
+            # Disable APISIX's own idling/rolling checks (which otherwise default
+            # to 15min/60min) so the session envelope lasts the full 14-day
+            # absolute_timeout above, matching the Keycloak SSO session and
+            # browser cookie lifetime instead of expiring early (hq#8416).
+            oidc_session_idling_timeout=0,
+            oidc_session_rolling_timeout=0,
+            # Broadened from the default host-only scope so a logged-in session
+            # cookie is also sent to ol-analytics-api's Learn-scoped host
+            # (analytics.learn.mit.edu et al.), letting its "pass" route recognize
+            # the same session instead of requiring a second login -- see
+            # ol_analytics_api/__main__.py's Learn-scoped OIDC resource, which
+            # shares this same "sso/mitlearn" Vault path/client and mirrors this
+            # cookie domain.
+            oidc_session_cookie_domain=mitlearn_api_domain.removeprefix("api"),
+            # Environment-scoped name instead of lua-resty-session's default
+            # "session". Required because of the broadened cookie domain above:
+            # a *.learn.mit.edu cookie is also sent to the RC and CI hosts, where
+            # a same-named cookie from another environment cannot be decrypted.
+            # Shared with learn-ai and ol-analytics-api -- see the helper's
+            # docstring.
+            oidc_session_cookie_name=mit_learn_session_cookie_name(
+                stack_info.env_suffix,
+            ),
+            oidc_use_session_secret=True,
+            vault_mount="secret-operations",
+            vault_mount_type="kv-v1",
+            vault_path="sso/mitlearn",
+            vaultauth=vault_k8s_resources.auth_name,
         ),
-        OLApisixRouteConfig(
-            route_name="reqauth",
-            priority=10,
-            shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
-            plugins=[
-                proxy_rewrite_plugin_config,
-                mitlearn_k8s_app_oidc_resources.get_full_oidc_plugin_config(
-                    unauth_action="auth"
-                ),
-            ],
-            hosts=[mitlearn_api_domain],
-            paths=[
-                "/learn/admin/login/*",
-                "/learn/login",
-                "/learn/login/*",
-            ],
-            backend_service_name=mitlearn_k8s_app.application_lb_service_name,
-            backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+    )
+    mitlearn_k8s_app_oidc_resources = OLApisixOIDCResources(
+        f"ol-mitlearn-k8s-olapisixoidcresources-{stack_info.env_suffix}",
+        oidc_config=OLApisixOIDCConfig(
+            application_name="mitlearn-k8s",
+            k8s_labels=application_labels,
+            k8s_namespace=learn_namespace,
+            oidc_logout_path="/learn/logout/oidc",
+            oidc_post_logout_redirect_uri=f"https://{mitlearn_config.get('api_domain')}/learn/logout/",
+            oidc_session_absolute_timeout=60 * 20160,
+            # See the mitlearn-k8s-no-prefix resources above for why these are 0,
+            # and for the cookie domain and name below.
+            oidc_session_idling_timeout=0,
+            oidc_session_rolling_timeout=0,
+            oidc_session_cookie_domain=mitlearn_api_domain.removeprefix("api"),
+            oidc_session_cookie_name=mit_learn_session_cookie_name(
+                stack_info.env_suffix,
+            ),
+            oidc_use_session_secret=True,
+            vault_mount="secret-operations",
+            vault_mount_type="kv-v1",
+            vault_path="sso/mitlearn",
+            vaultauth=vault_k8s_resources.auth_name,
         ),
-    ],
-    opts=ResourceOptions(
-        delete_before_replace=True,
-    ),
-)
-
+    )
 
-# VPA objects for mit-learn workloads.
-# The webapp's memory VPA is created by OLApplicationK8s (manage_webapp_memory_vpa)
-# rather than declared here, so every app gets the same split: the horizontal scaler
-# (a KEDA cpu trigger, in mit-learn's case) owns CPU and the VPA owns memory. Bounds
-# come from webapp_vpa_min/max_allowed_memory on the OLApplicationK8sConfig above.
-# Celery workers and beat are scaled via KEDA (Redis queue depth), so CPU+memory VPA is safe.
-# The 128Mi memory floor was too low to be safe. make_vpa() scales the limit
-# proportionally to the declared request:limit ratio, so the floor sets the limit
-# floor too -- at 128Mi the VPA was free to shrink the default worker's request to
-# ~662Mi, which dragged its limit down to 1324Mi. Steady-state use fits there, but
-# bursts hit 1307Mi and OOMKilled just under the cap, which is exactly the failure
-# the 2:1 ratio above was introduced to prevent: the ratio only helps if the request
-# it multiplies cannot collapse. A 1Gi floor keeps the effective limit at or above
-# 2Gi while still leaving the VPA room to trim over-provisioned workers.
-_worker_vpa_bounds = {
-    "min_allowed": {"cpu": "25m", "memory": "1Gi"},
-    "max_allowed": {"cpu": "1000m", "memory": "3Gi"},
-}
-# The embeddings worker runs ML inference (embedding generation), which is
-# more CPU-intensive than the other celery queues' typically I/O-bound tasks.
-# Its uncapped VPA CPU target (1311m, observed on applications-production
-# 2026-07-28) already exceeds the shared 1000m ceiling above, so it gets its
-# own bounds instead of sharing _worker_vpa_bounds with the lighter queues.
-_embeddings_worker_vpa_bounds = {
-    "min_allowed": {"cpu": "25m", "memory": "1Gi"},
-    "max_allowed": {"cpu": "2000m", "memory": "3Gi"},
-}
-for _celery_name in mitlearn_k8s_app.celery_deployment_names:
-    _vpa_bounds = (
-        _embeddings_worker_vpa_bounds
-        if _celery_name.endswith("-embeddings-celery-worker")
-        else _worker_vpa_bounds
+    proxy_rewrite_plugin_config = OLApisixPluginConfig(
+        name="proxy-rewrite",
+        config={
+            "regex_uri": [
+                "/learn/(.*)",
+                "/$1",
+            ],
+        },
     )
-    make_vpa(
-        name=f"{_celery_name}-vpa",
-        namespace=learn_namespace,
-        target_kind="Deployment",
-        target_name=_celery_name,
-        controlled_resources=["cpu", "memory"],
-        container_name="celery-worker",
-        **_vpa_bounds,
-        opts=ResourceOptions(depends_on=[mitlearn_k8s_app]),
+
+    learn_external_service_apisix_route_no_prefix = OLApisixRoute(
+        name=f"ol-mitlearn-k8s-apisix-route-no-prefix-{stack_info.env_suffix}",
+        k8s_namespace=learn_namespace,
+        k8s_labels=application_labels,
+        route_configs=[
+            OLApisixRouteConfig(
+                route_name="passauth",
+                priority=0,
+                shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
+                plugins=[
+                    proxy_rewrite_plugin_config,
+                    mitlearn_k8s_app_oidc_resources_no_prefix.get_full_oidc_plugin_config(
+                        unauth_action="pass"
+                    ),
+                ],
+                hosts=[mitlearn_api_domain],
+                paths=["/*"],
+                backend_service_name=mitlearn_k8s_app.application_lb_service_name,
+                backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+            ),
+            OLApisixRouteConfig(
+                route_name="logout-redirect",
+                priority=10,
+                shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
+                plugins=[
+                    OLApisixPluginConfig(
+                        name="redirect", config={"uri": "/logout/oidc"}
+                    ),
+                ],
+                hosts=[mitlearn_api_domain],
+                paths=["/logout/oidc/*"],
+                backend_service_name=mitlearn_k8s_app.application_lb_service_name,
+                backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+            ),
+            OLApisixRouteConfig(
+                route_name="reqauth",
+                priority=10,
+                shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
+                plugins=[
+                    proxy_rewrite_plugin_config,
+                    mitlearn_k8s_app_oidc_resources_no_prefix.get_full_oidc_plugin_config(
+                        unauth_action="auth"
+                    ),
+                ],
+                hosts=[mitlearn_api_domain],
+                paths=[
+                    "/admin/login/*",
+                    "/login",
+                    "/login/*",
+                ],
+                backend_service_name=mitlearn_k8s_app.application_lb_service_name,
+                backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+            ),
+            # The sidecar answered this with a 204 (EFF Do Not Track convention
+            # for "no policy published"). "passauth" above would otherwise proxy
+            # it through to Django, which has no view for it -- kept as a mock so
+            # a crawled path doesn't burn a Granian blocking thread on a 404. Only
+            # needed here, not on the /learn/* prefixed resource below: that one
+            # requires the /learn/ prefix on every path, so this URL never reached
+            # the backend through it even with the sidecar. See
+            # docs/plans/remove-nginx-sidecar.md.
+            OLApisixRouteConfig(
+                route_name="dnt-policy",
+                priority=10,
+                hosts=[mitlearn_api_domain],
+                paths=["/.well-known/dnt-policy.txt"],
+                backend_service_name=mitlearn_k8s_app.application_lb_service_name,
+                backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+                plugins=[
+                    OLApisixPluginConfig(
+                        name="mocking",
+                        secretRef=None,
+                        config={
+                            "response_status": 204,
+                            "response_example": "",
+                            "content_type": "text/plain",
+                            "with_mock_header": False,
+                        },
+                    ),
+                ],
+            ),
+        ],
+        opts=ResourceOptions(
+            delete_before_replace=True,
+        ),
     )
-if mitlearn_k8s_app.beat_deployment_name:
-    make_vpa(
-        name=f"{mitlearn_k8s_app.beat_deployment_name}-vpa",
-        namespace=learn_namespace,
-        target_kind="Deployment",
-        target_name=mitlearn_k8s_app.beat_deployment_name,
-        controlled_resources=["cpu", "memory"],
-        container_name="celery-beat",
-        **_worker_vpa_bounds,
-        opts=ResourceOptions(depends_on=[mitlearn_k8s_app]),
+
+    learn_external_service_apisix_route = OLApisixRoute(
+        name=f"ol-mitlearn-k8s-apisix-route-{stack_info.env_suffix}",
+        k8s_namespace=learn_namespace,
+        k8s_labels=application_labels,
+        route_configs=[
+            OLApisixRouteConfig(
+                route_name="passauth",
+                priority=0,
+                shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
+                plugins=[
+                    proxy_rewrite_plugin_config,
+                    mitlearn_k8s_app_oidc_resources.get_full_oidc_plugin_config(
+                        unauth_action="pass"
+                    ),
+                ],
+                hosts=[mitlearn_api_domain],
+                paths=["/learn/*"],
+                backend_service_name=mitlearn_k8s_app.application_lb_service_name,
+                backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+            ),
+            OLApisixRouteConfig(
+                route_name="logout-redirect",
+                priority=10,
+                shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
+                plugins=[
+                    OLApisixPluginConfig(
+                        name="redirect", config={"uri": "/logout/oidc"}
+                    ),
+                ],
+                hosts=[mitlearn_api_domain],
+                paths=["/learn/logout/oidc/*"],
+                backend_service_name=mitlearn_k8s_app.application_lb_service_name,
+                backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+            ),
+            OLApisixRouteConfig(
+                route_name="reqauth",
+                priority=10,
+                shared_plugin_config_name=learn_external_service_shared_plugins.resource_name,
+                plugins=[
+                    proxy_rewrite_plugin_config,
+                    mitlearn_k8s_app_oidc_resources.get_full_oidc_plugin_config(
+                        unauth_action="auth"
+                    ),
+                ],
+                hosts=[mitlearn_api_domain],
+                paths=[
+                    "/learn/admin/login/*",
+                    "/learn/login",
+                    "/learn/login/*",
+                ],
+                backend_service_name=mitlearn_k8s_app.application_lb_service_name,
+                backend_service_port=mitlearn_k8s_app.application_lb_service_port_name,
+            ),
+        ],
+        opts=ResourceOptions(
+            delete_before_replace=True,
+        ),
     )
 
+    # VPA objects for mit-learn workloads.
+    # The webapp's memory VPA is created by OLApplicationK8s (manage_webapp_memory_vpa)
+    # rather than declared here, so every app gets the same split: the horizontal scaler
+    # (a KEDA cpu trigger, in mit-learn's case) owns CPU and the VPA owns memory. Bounds
+    # come from webapp_vpa_min/max_allowed_memory on the OLApplicationK8sConfig above.
+    # Celery workers and beat are scaled via KEDA (Redis queue depth), so CPU+memory VPA is safe.
+    # The 128Mi memory floor was too low to be safe. make_vpa() scales the limit
+    # proportionally to the declared request:limit ratio, so the floor sets the limit
+    # floor too -- at 128Mi the VPA was free to shrink the default worker's request to
+    # ~662Mi, which dragged its limit down to 1324Mi. Steady-state use fits there, but
+    # bursts hit 1307Mi and OOMKilled just under the cap, which is exactly the failure
+    # the 2:1 ratio above was introduced to prevent: the ratio only helps if the request
+    # it multiplies cannot collapse. A 1Gi floor keeps the effective limit at or above
+    # 2Gi while still leaving the VPA room to trim over-provisioned workers.
+    _worker_vpa_bounds = {
+        "min_allowed": {"cpu": "25m", "memory": "1Gi"},
+        "max_allowed": {"cpu": "1000m", "memory": "3Gi"},
+    }
+    # The embeddings worker runs ML inference (embedding generation), which is
+    # more CPU-intensive than the other celery queues' typically I/O-bound tasks.
+    # Its uncapped VPA CPU target (1311m, observed on applications-production
+    # 2026-07-28) already exceeds the shared 1000m ceiling above, so it gets its
+    # own bounds instead of sharing _worker_vpa_bounds with the lighter queues.
+    _embeddings_worker_vpa_bounds = {
+        "min_allowed": {"cpu": "25m", "memory": "1Gi"},
+        "max_allowed": {"cpu": "2000m", "memory": "3Gi"},
+    }
+    for _celery_name in mitlearn_k8s_app.celery_deployment_names:
+        _vpa_bounds = (
+            _embeddings_worker_vpa_bounds
+            if _celery_name.endswith("-embeddings-celery-worker")
+            else _worker_vpa_bounds
+        )
+        make_vpa(
+            name=f"{_celery_name}-vpa",
+            namespace=learn_namespace,
+            target_kind="Deployment",
+            target_name=_celery_name,
+            controlled_resources=["cpu", "memory"],
+            container_name="celery-worker",
+            **_vpa_bounds,
+            opts=ResourceOptions(depends_on=[mitlearn_k8s_app]),
+        )
+    if mitlearn_k8s_app.beat_deployment_name:
+        make_vpa(
+            name=f"{mitlearn_k8s_app.beat_deployment_name}-vpa",
+            namespace=learn_namespace,
+            target_kind="Deployment",
+            target_name=mitlearn_k8s_app.beat_deployment_name,
+            controlled_resources=["cpu", "memory"],
+            container_name="celery-beat",
+            **_worker_vpa_bounds,
+            opts=ResourceOptions(depends_on=[mitlearn_k8s_app]),
+        )
+
 export(
     "mit_learn",
     {
@@ -0,0 +1,32 @@
+"""What `mitlearn:resource_groups` can restrict a preview to.
+
+See ol_infrastructure.lib.pulumi_helper.ResourceGroups. The buckets, database,
+cache, vault backends and DNS records are always built.
+"""
+
+from ol_infrastructure.lib.pulumi_helper import ResourceGroup
+
+MIT_LEARN_RESOURCE_GROUPS = [
+    ResourceGroup(
+        "cdn",
+        targets=(
+            "**fastly:index/serviceVcl:ServiceVcl::*",
+            "**fastly:index/serviceDictionaryItems:ServiceDictionaryItems::*",
+        ),
+    ),
+    # The application, its celery workers, their secrets, routes and scaling.
+    ResourceGroup(
+        "workloads",
+        targets=(
+            "**ol:infrastructure:components:services:OLApplicationK8s**",
+            "**ol:infrastructure:services:k8s:OLApisixRoute**",
+            "**ol:infrastructure:services:k8s:OLApisixOIDCResources**",
+            "**ol:services:Vault:K8S:VaultStaticSecret**",
+            "**ol:services:Vault:K8S:VaultDynamicSecret**",
+            "**kubernetes:core/v1:Secret::*-redis-creds",
+            "**kubernetes:autoscaling.k8s.io/v1:VerticalPodAutoscaler::*",
+            "**kubernetes:keda.sh/v1alpha1:TriggerAuthentication::*",
+            "**kubernetes:vpcresources.k8s.aws/v1beta1:SecurityGroupPolicy::*",
+        ),
+    ),
+]
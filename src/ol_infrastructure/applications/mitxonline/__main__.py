@@ -35,6 +35,8 @@ from bridge.lib.magic_numbers import (
 )
 from bridge.secrets.sops import read_yaml_secrets
 from ol_infrastructure.applications.mitxonline.k8s_secrets import (
+    REDIS_CREDS_SECRET_NAME,
+    REDIS_PASSWORD_KEY,
     create_mitxonline_k8s_secrets,
 )
 from ol_infrastructure.components.aws.cache import (
@@ -83,8 +85,13 @@ from ol_infrastructure.lib.aws.route53_helper import (
     fastly_certificate_validation_records,
     lookup_zone_id_from_domain,
 )
+from ol_infrastructure.lib.connection_budget import (
+    DatabaseBudget,
+    consumers_from_application,
+)
 from ol_infrastructure.lib.fastly import get_fastly_provider
 from ol_infrastructure.lib.k8s_keda import (
+    build_celery_queue_scaling,
     build_webapp_keda_config,
     create_webapp_prometheus_trigger_auth,
 )
@@ -614,95 +621,113 @@ mitxonline_webapp_keda_config = build_webapp_keda_config(
     cpu_threshold=mitxonline_config.get("autoscaling_cpu_threshold") or "60",
 )
 
-mitxonline_k8s_app = OLApplicationK8s(
-    ol_app_k8s_config=OLApplicationK8sConfig(
-        project_root=Path(__file__).parent,
-        application_config=env_vars,
-        application_name=Services.mitxonline,
-        application_namespace=mitxonline_namespace,
-        application_lb_service_name="mitxonline-webapp",
-        application_lb_service_port_name="http",
-        application_min_replicas=mitxonline_config.get_int("min_replicas") or 2,
-        k8s_global_labels=k8s_app_labels,
-        # Use the secret names returned by create_mitxonline_k8s_secrets
-        env_from_secret_names=secret_names,
-        application_security_group_id=mitxonline_app_security_group.id,
-        application_security_group_name=mitxonline_app_security_group.name,
-        application_image_repository="mitodl/mitxonline-app",
-        **docker_image_config_kwargs("MITXONLINE"),
-        application_cmd_array=["uwsgi"],
-        application_arg_array=["/tmp/uwsgi.ini"],  # noqa: S108
-        granian_config=GranianConfig(
-            # Holding pins: preserve the pre-overhaul effective concurrency until
-            # this app's stage of the rollout. Granian derived backpressure=64
-            # (backlog=128 // workers=2) and blocking_threads=64 // 2 = 32.
-            # Delete all four (and revert workers to the default) to adopt the
-            # component defaults (1 worker, 8 blocking threads, 16 backpressure).
-            # See docs/plans/granian-configuration-overhaul.md
-            workers=MITXONLINE_GRANIAN_WORKERS,
-            runtime_mode="mt",
-            runtime_threads=2,
-            blocking_threads=32,
-            backpressure=64,
-            blocking_threads_idle_timeout=120,
-            enable_metrics=True,
-            # Pinned to the VPA ceiling rather than the component's default
-            # limit-derived calculation. See the note above.
-            workers_max_rss=mitxonline_granian_workers_max_rss,
-            # Serve /static/* from Granian's Rust layer instead of the sidecar
-            # (docs/plans/remove-nginx-sidecar.md, stage 5), same shape as
-            # ocw_studio/xpro. STATIC_ROOT is /src/staticfiles, the same
-            # emptyDir the collectstatic init container populates, and
-            # STATIC_URL is Granian's default /static route.
-            static_path_mounts=["/src/staticfiles"],
-            static_path_expires=STATIC_ASSET_MAX_AGE_SECONDS,
-        )
-        if mitxonline_config.get_bool("use_granian")
-        else None,
-        slack_channel=slack_channel,
-        vault_k8s_resource_auth_name=vault_k8s_resources.auth_name,
-        # The sidecar is only redundant once Granian is actually serving the
-        # app (static_path_mounts above); the use_granian=False branch still
-        # runs true uwsgi with no static handling of its own, so it keeps the
-        # sidecar. See docs/plans/remove-nginx-sidecar.md.
-        import_nginx_config=not mitxonline_config.get_bool("use_granian"),
-        import_nginx_config_path="files/web.conf_uwsgi",
-        import_uwsgi_config=True,
-        init_migrations=False,
-        init_collectstatic=True,
-        pre_deploy_commands=[
-            ("migrate", ["python", "manage.py", "migrate", "--noinput"])
-        ],
-        celery_worker_configs=[
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="celery",
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests={"cpu": "100m", "memory": "2Gi"},
-                resource_limits={"memory": "2Gi"},
+mitxonline_k8s_config = OLApplicationK8sConfig(
+    project_root=Path(__file__).parent,
+    application_config=env_vars,
+    application_name=Services.mitxonline,
+    application_namespace=mitxonline_namespace,
+    application_lb_service_name="mitxonline-webapp",
+    application_lb_service_port_name="http",
+    application_min_replicas=mitxonline_config.get_int("min_replicas") or 2,
+    k8s_global_labels=k8s_app_labels,
+    # Use the secret names returned by create_mitxonline_k8s_secrets
+    env_from_secret_names=secret_names,
+    application_security_group_id=mitxonline_app_security_group.id,
+    application_security_group_name=mitxonline_app_security_group.name,
+    application_image_repository="mitodl/mitxonline-app",
+    **docker_image_config_kwargs("MITXONLINE"),
+    application_cmd_array=["uwsgi"],
+    application_arg_array=["/tmp/uwsgi.ini"],  # noqa: S108
+    granian_config=GranianConfig(
+        # Holding pins: preserve the pre-overhaul effective concurrency until
+        # this app's stage of the rollout. Granian derived backpressure=64
+        # (backlog=128 // workers=2) and blocking_threads=64 // 2 = 32.
+        # Delete all four (and revert workers to the default) to adopt the
+        # component defaults (1 worker, 8 blocking threads, 16 backpressure).
+        # See docs/plans/granian-configuration-overhaul.md
+        workers=MITXONLINE_GRANIAN_WORKERS,
+        runtime_mode="mt",
+        runtime_threads=2,
+        blocking_threads=32,
+        backpressure=64,
+        blocking_threads_idle_timeout=120,
+        enable_metrics=True,
+        # Pinned to the VPA ceiling rather than the component's default
+        # limit-derived calculation. See the note above.
+        workers_max_rss=mitxonline_granian_workers_max_rss,
+        # Serve /static/* from Granian's Rust layer instead of the sidecar
+        # (docs/plans/remove-nginx-sidecar.md, stage 5), same shape as
+        # ocw_studio/xpro. STATIC_ROOT is /src/staticfiles, the same
+        # emptyDir the collectstatic init container populates, and
+        # STATIC_URL is Granian's default /static route.
+        static_path_mounts=["/src/staticfiles"],
+        static_path_expires=STATIC_ASSET_MAX_AGE_SECONDS,
+    )
+    if mitxonline_config.get_bool("use_granian")
+    else None,
+    slack_channel=slack_channel,
+    vault_k8s_resource_auth_name=vault_k8s_resources.auth_name,
+    # The sidecar is only redundant once Granian is actually serving the
+    # app (static_path_mounts above); the use_granian=False branch still
+    # runs true uwsgi with no static handling of its own, so it keeps the
+    # sidecar. See docs/plans/remove-nginx-sidecar.md.
+    import_nginx_config=not mitxonline_config.get_bool("use_granian"),
+    import_nginx_config_path="files/web.conf_uwsgi",
+    import_uwsgi_config=True,
+    init_migrations=False,
+    init_collectstatic=True,
+    pre_deploy_commands=[("migrate", ["python", "manage.py", "migrate", "--noinput"])],
+    celery_worker_configs=[
+        OLApplicationK8sCeleryWorkerConfig(
+            queue_name="celery",
+            redis_host=redis_cache.address,
+            queue_scaling=build_celery_queue_scaling(
+                redis_password_secret_name=REDIS_CREDS_SECRET_NAME,
+                redis_password_secret_key=REDIS_PASSWORD_KEY,
             ),
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="hubspot_sync",
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests={"cpu": "100m", "memory": "1Gi"},
-                resource_limits={"memory": "1Gi"},
+            resource_requests={"cpu": "100m", "memory": "2Gi"},
+            resource_limits={"memory": "2Gi"},
+        ),
+        OLApplicationK8sCeleryWorkerConfig(
+            queue_name="hubspot_sync",
+            redis_host=redis_cache.address,
+            # Bursty and latency-tolerant: idles at zero overnight and wakes on the
+            # first queued sync.
+            queue_scaling=build_celery_queue_scaling(
+                scale_to_zero=True,
+                redis_password_secret_name=REDIS_CREDS_SECRET_NAME,
+                redis_password_secret_key=REDIS_PASSWORD_KEY,
             ),
-        ],
-        celery_beat_config=OLApplicationK8sCeleryBeatConfig(
-            resource_requests={"cpu": "10m", "memory": "384Mi"},
-            resource_limits={"memory": "384Mi"},
+            resource_requests={"cpu": "100m", "memory": "1Gi"},
+            resource_limits={"memory": "1Gi"},
         ),
-        resource_requests={"cpu": "250m", "memory": mitxonline_web_memory_limit},
-        resource_limits={"memory": mitxonline_web_memory_limit},
-        # Memory is managed vertically by the component's webapp VPA; the ceiling
-        # below is what `mitxonline_granian_workers_max_rss` is derived from, so keep
-        # the two in sync if either changes. Horizontal scaling is KEDA-driven (see
-        # above), so hpa_scaling_metrics is unused -- the component builds a
-        # ScaledObject instead of a native HPA when webapp_keda_config is set.
-        webapp_vpa_max_allowed_memory=mitxonline_web_memory_ceiling,
-        webapp_keda_config=mitxonline_webapp_keda_config,
+    ],
+    celery_beat_config=OLApplicationK8sCeleryBeatConfig(
+        resource_requests={"cpu": "10m", "memory": "384Mi"},
+        resource_limits={"memory": "384Mi"},
     ),
+    resource_requests={"cpu": "250m", "memory": mitxonline_web_memory_limit},
+    resource_limits={"memory": mitxonline_web_memory_limit},
+    # Memory is managed vertically by the component's webapp VPA; the ceiling
+    # below is what `mitxonline_granian_workers_max_rss` is derived from, so keep
+    # the two in sync if either changes. Horizontal scaling is KEDA-driven (see
+    # above), so hpa_scaling_metrics is unused -- the component builds a
+    # ScaledObject instead of a native HPA when webapp_keda_config is set.
+    webapp_vpa_max_allowed_memory=mitxonline_web_memory_ceiling,
+    webapp_keda_config=mitxonline_webapp_keda_config,
+)
+
+# Fails the preview if the webapp, workers and beat can together open more
+# connections at max replicas than the instance accepts. The budget is also exported
+# for bin/plan-db-connections.
+DatabaseBudget(
+    database=db_instance_name,
+    instance_class=db_defaults["instance_size"],
+    consumers=consumers_from_application(mitxonline_k8s_config),
+).check()
+
+mitxonline_k8s_app = OLApplicationK8s(
+    ol_app_k8s_config=mitxonline_k8s_config,
     opts=ResourceOptions(
         # Ensure secrets and the KEDA trigger authentication are created before the
         # application deployment; the ScaledObject references the auth by name.
@@ -22,6 +22,10 @@ from ol_infrastructure.components.services.vault import (
 )
 from ol_infrastructure.lib.pulumi_helper import StackInfo
 
+REDIS_CREDS_SECRET_NAME = "redis-creds"  # noqa: S105  # pragma: allowlist secret
+#: Key in REDIS_CREDS_SECRET_NAME holding the bare broker password, for KEDA.
+REDIS_PASSWORD_KEY = "REDIS_PASSWORD"  # noqa: S105  # pragma: allowlist secret
+
 
 def _create_static_secret(
     stack_info: StackInfo,
@@ -195,11 +199,10 @@ def create_mitxonline_k8s_secrets(
     secret_resources.append(db_secret)
 
     # 2.5 A regular k8s secret for redis credentials
-    redis_creds_secret_name = "redis-creds"  # noqa: S105  # pragma: allowlist secret
     redis_creds = kubernetes.core.v1.Secret(
         f"learn-ai-{stack_info.env_suffix}-redis-creds",
         metadata=kubernetes.meta.v1.ObjectMetaArgs(
-            name=redis_creds_secret_name,
+            name=REDIS_CREDS_SECRET_NAME,
             namespace=mitxonline_namespace,
             labels=k8s_global_labels,
         ),
@@ -208,6 +211,7 @@ def create_mitxonline_k8s_secrets(
                 "REDIS_URL": f"rediss://default:{redis_password}@{address}:{DEFAULT_REDIS_PORT}",  # Value in heroku omits db
                 "CELERY_BROKER_URL": f"rediss://default:{redis_password}@{address}:{DEFAULT_REDIS_PORT}/1?ssl_cert_reqs=required",
                 "CELERY_RESULT_BACKEND": f"rediss://default:{redis_password}@{address}:{DEFAULT_REDIS_PORT}/1?ssl_cert_reqs=required",
+                REDIS_PASSWORD_KEY: redis_password,
             }
         ),
         opts=ResourceOptions(
@@ -215,7 +219,7 @@ def create_mitxonline_k8s_secrets(
             delete_before_replace=True,
         ),
     )
-    secret_names.append(redis_creds_secret_name)
+    secret_names.append(REDIS_CREDS_SECRET_NAME)
     secret_resources.append(
         redis_creds
     )  # This is different from everything else in the list but allowed per the type hints above
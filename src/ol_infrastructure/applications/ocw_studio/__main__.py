@@ -52,6 +52,7 @@ from ol_infrastructure.components.services.k8s import (
     OLApplicationK8sCeleryBeatConfig,
     OLApplicationK8sCeleryWorkerConfig,
     OLApplicationK8sConfig,
+    deployments_reading_secret,
 )
 from ol_infrastructure.components.services.vault import (
     OLVaultDatabaseBackend,
@@ -567,16 +568,41 @@ vault_k8s_resources = OLVaultK8SResources(
 db_instance_name = f"ocw-studio-db-applications-{stack_info.env_suffix}"
 rds_endpoint = f"{db_instance_name}.cbnm7ajau6mi.us-east-1.rds.amazonaws.com:{DEFAULT_POSTGRES_PORT}"
 
-# All deployments that consume the secret-ocw-studio application secrets and
-# need a rolling restart when those secrets change. Names must match the
-# deterministic naming in OLApplicationK8s (application_name="ocw-studio").
-ocw_studio_restart_deployment_names = [
-    "ocw-studio-app",  # webapp
-    "ocw-studio-default-celery-worker",
-    "ocw-studio-publish-celery-worker",
-    "ocw-studio-batch-celery-worker",
-    "ocw-studio-celery-beat",
+# Worker memory limits are 2x the request rather than matching it. With
+# request == limit == 768Mi the default queue rode at ~694Mi and OOMKilled
+# on publish/batch bursts, taking the deployment unavailable; the request
+# still reflects steady-state use, the limit now absorbs the spike.
+ocw_studio_celery_worker_configs = [
+    OLApplicationK8sCeleryWorkerConfig(
+        queue_name=queue_name,
+        redis_host=redis_cache.address,
+        redis_password=redis_config.require("password"),
+        resource_requests={"cpu": "50m", "memory": "768Mi"},
+        resource_limits={"memory": "1536Mi"},
+    )
+    for queue_name in ("default", "publish", "batch")
 ]
+ocw_studio_celery_beat_config = OLApplicationK8sCeleryBeatConfig(
+    scheduler="celery.beat.PersistentScheduler",
+    resource_requests={"cpu": "10m", "memory": "384Mi"},
+    resource_limits={"memory": "384Mi"},
+)
+
+
+def ocw_studio_restart_deployment_names(secret_name: str) -> list[str]:
+    """Deployments to rolling-restart when a secret-ocw-studio secret changes.
+
+    Every secret the factory returns is passed as env_from_secret_names below, so
+    it reaches the webapp, the celery workers and beat.
+    """
+    return deployments_reading_secret(
+        application_name=Services.ocw_studio,
+        celery_worker_configs=ocw_studio_celery_worker_configs,
+        celery_beat_config=ocw_studio_celery_beat_config,
+        secret_name=secret_name,
+        env_from_secret_names=[secret_name],
+    )
+
 
 # Create Kubernetes secrets
 secret_names, secret_resources = create_ocw_studio_k8s_secrets(
@@ -649,38 +675,8 @@ ocw_studio_k8s_app = OLApplicationK8s(
         pre_deploy_commands=[
             ("migrate", ["python", "manage.py", "migrate", "--noinput"])
         ],
-        # Worker memory limits are 2x the request rather than matching it. With
-        # request == limit == 768Mi the default queue rode at ~694Mi and OOMKilled
-        # on publish/batch bursts, taking the deployment unavailable; the request
-        # still reflects steady-state use, the limit now absorbs the spike.
-        celery_worker_configs=[
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="default",
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests={"cpu": "50m", "memory": "768Mi"},
-                resource_limits={"memory": "1536Mi"},
-            ),
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="publish",
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests={"cpu": "50m", "memory": "768Mi"},
-                resource_limits={"memory": "1536Mi"},
-            ),
-            OLApplicationK8sCeleryWorkerConfig(
-                queue_name="batch",
-                redis_host=redis_cache.address,
-                redis_password=redis_config.require("password"),
-                resource_requests={"cpu": "50m", "memory": "768Mi"},
-                resource_limits={"memory": "1536Mi"},
-            ),
-        ],
-        celery_beat_config=OLApplicationK8sCeleryBeatConfig(
-            scheduler="celery.beat.PersistentScheduler",
-            resource_requests={"cpu": "10m", "memory": "384Mi"},
-            resource_limits={"memory": "384Mi"},
-        ),
+        celery_worker_configs=ocw_studio_celery_worker_configs,
+        celery_beat_config=ocw_studio_celery_beat_config,
         resource_requests={"cpu": "100m", "memory": "1Gi"},
         resource_limits={"memory": "3Gi"},
     ),
@@ -6,6 +6,7 @@ This module defines functions to create Kubernetes secrets required by the OCW S
 application by fetching data from various Vault secret backends (static KV and dynamic).
 """
 
+from collections.abc import Callable
 from typing import Any
 
 import pulumi_kubernetes as kubernetes
@@ -34,7 +35,7 @@ def _create_static_secret(
     templates: dict[str, str],
     vaultauth: str,
     mount_type: str = "kv-v1",
-    restart_targets: list[OLVaultRestartTarget] | None = None,
+    restart_targets: Callable[[str], list[OLVaultRestartTarget]] | None = None,
     opts: ResourceOptions | None = None,
 ) -> tuple[str, OLVaultK8SSecret]:
     """
@@ -50,7 +51,8 @@ def _create_static_secret(
         templates: Dictionary defining how Vault data maps to Kubernetes secret keys.
         vaultauth: Name of the Vault Kubernetes auth backend role.
         mount_type: Type of the Vault mount (e.g., "kv-v1", "kv-v2"). Defaults to "kv-v1".
-        restart_targets: Deployments to rolling-restart when the secret data changes.
+        restart_targets: Called with the secret's name; returns the Deployments to
+            rolling-restart when the secret data changes.
         opts: Optional Pulumi resource options.
 
     Returns:
@@ -72,7 +74,7 @@ def _create_static_secret(
             exclude_raw=True,
             templates=templates,
             vaultauth=vaultauth,
-            restart_targets=restart_targets,
+            restart_targets=restart_targets(secret_name) if restart_targets else None,
         ),
         opts=opts,
     )
@@ -137,7 +139,7 @@ def create_ocw_studio_k8s_secrets(
     rds_endpoint: str,
     redis_password: str,
     redis_cache: OLAmazonCache,
-    restart_deployment_names: list[str] | None = None,
+    restart_deployment_names: Callable[[str], list[str]] | None = None,
 ) -> tuple[list[str], list[OLVaultK8SSecret | kubernetes.core.v1.Secret]]:
     """
     Create all Kubernetes secrets required by the OCW Studio application.
@@ -154,8 +156,10 @@ def create_ocw_studio_k8s_secrets(
         rds_endpoint: The endpoint address of the RDS instance.
         redis_password: The password for the Redis cluster.
         redis_cache: The Redis cache resource for connection details.
-        restart_deployment_names: Deployment names to rolling-restart when the
-            application secrets in the secret-ocw-studio mount change.
+        restart_deployment_names: Called with the name of each secret rendered
+            from the secret-ocw-studio mount; returns the Deployment names to
+            rolling-restart when it changes. Build with
+            ``deployments_reading_secret()``.
 
     Returns:
         A tuple containing a list of the names of the created Kubernetes secrets
@@ -167,10 +171,12 @@ def create_ocw_studio_k8s_secrets(
     vaultauth = vault_k8s_resources.auth_name
 
     app_restart_targets = (
-        [
-            OLVaultRestartTarget(kind="Deployment", name=name)
-            for name in restart_deployment_names
-        ]
+        (
+            lambda secret_name: [
+                OLVaultRestartTarget(kind="Deployment", name=name)
+                for name in restart_deployment_names(secret_name)
+            ]
+        )
         if restart_deployment_names
         else None
     )
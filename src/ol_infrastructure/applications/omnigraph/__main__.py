@@ -69,6 +69,8 @@ from ol_infrastructure.applications.omnigraph.maintenance import (
     DEFAULT_CLEANUP_OLDER_THAN,
     DEFAULT_CLEANUP_SCHEDULE,
     DEFAULT_OPTIMIZE_SCHEDULE,
+    DEFAULT_PARALLELISM,
+    DEFAULT_SHARDS,
 )
 from ol_infrastructure.applications.omnigraph.storage import (
     validate_migration_target_prefix,
@@ -213,6 +215,20 @@ CLEANUP_SCHEDULE = omnigraph_config.get("cleanup_schedule") or DEFAULT_CLEANUP_S
 CLEANUP_OLDER_THAN = (
     omnigraph_config.get("cleanup_older_than") or DEFAULT_CLEANUP_OLDER_THAN
 )
+# How wide each sweep runs: graphs at once per pod, and pods per run. Sized from
+# the omnigraph_maintenance_graph_duration_seconds gauges rather than guessed;
+# create_maintenance refuses anything below one. `is None`, not `or`, so an
+# explicit 0 reaches that check instead of becoming the default.
+_maintenance_parallelism = omnigraph_config.get_int("maintenance_parallelism")
+MAINTENANCE_PARALLELISM = (
+    DEFAULT_PARALLELISM
+    if _maintenance_parallelism is None
+    else _maintenance_parallelism
+)
+_maintenance_shards = omnigraph_config.get_int("maintenance_shards")
+MAINTENANCE_SHARDS = (
+    DEFAULT_SHARDS if _maintenance_shards is None else _maintenance_shards
+)
 
 # Per-actor admission caps (data_tier.py). Overridable per environment for the
 # same reason the schedules above are, and a sharper one: the count's default is
@@ -796,6 +812,8 @@ data_tier = create_data_tier(
     # the same config that creates the Job so the two cannot drift: clearing
     # `migrate_from_image` resumes them in the same `pulumi up`.
     suspend_maintenance=bool(MIGRATE_FROM_IMAGE),
+    maintenance_parallelism=MAINTENANCE_PARALLELISM,
+    maintenance_shards=MAINTENANCE_SHARDS,
 )
 
 #########################################
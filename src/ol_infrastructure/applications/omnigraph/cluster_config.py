@@ -40,7 +40,7 @@ BRIDGE_SCHEMA_FILE = "bridge-schema.pg"
 # Cedar bundle filenames, baked into the image next to the schemas by the same
 # build and for the same reason. Their committed `groups:` are fixtures — the
 # image entrypoint rewrites membership from the mounted actor-token map before
-# `cluster apply`, because `witan-users` has to track the hourly token-sync
+# `cluster apply`, because `witan-users` has to track the scheduled token-sync
 # job's output and this program cannot see it. See agent-kit
 # mcp/servers/witan/policy/README.md § "Group membership is rendered at boot".
 MEMORY_POLICY_FILE = "memory.policy.yaml"
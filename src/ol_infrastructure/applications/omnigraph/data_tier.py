@@ -56,6 +56,8 @@ from ol_infrastructure.applications.omnigraph.cluster_config import (
     build_cluster_policies,
 )
 from ol_infrastructure.applications.omnigraph.maintenance import (
+    DEFAULT_PARALLELISM,
+    DEFAULT_SHARDS,
     OmnigraphMaintenance,
     create_maintenance,
 )
@@ -260,6 +262,8 @@ def create_data_tier(  # noqa: PLR0913
     per_actor_bytes_max: int = DEFAULT_PER_ACTOR_BYTES_MAX,
     *,
     suspend_maintenance: bool = False,
+    maintenance_parallelism: int = DEFAULT_PARALLELISM,
+    maintenance_shards: int = DEFAULT_SHARDS,
 ) -> OmnigraphDataTier:
     """Provision the S3 bucket, IRSA policy, ECR repo, ConfigMap, and Deployment.
 
@@ -840,6 +844,8 @@ def create_data_tier(  # noqa: PLR0913
         cleanup_older_than=cleanup_older_than,
         depends_on=[cluster_apply_job, *auth_binding.irsa_service_accounts],
         suspend=suspend_maintenance,
+        parallelism=maintenance_parallelism,
+        shards=maintenance_shards,
     )
 
     return OmnigraphDataTier(
@@ -48,6 +48,26 @@ failure is one non-zero exit among many. The loop records the failure, keeps
 going, and exits non-zero at the end, so a bad graph costs that graph's
 maintenance and nothing else while still failing the Job loudly.
 
+WHY GRAPHS RUN IN PARALLEL, AND HOW FAR
+
+A serial loop makes a sweep's duration the sum of every graph's, so each new
+managed repo eats into the gap between the two schedules. Locks are per graph,
+so different graphs do not contend: each pod runs up to ``parallelism`` graphs
+at once, and ``shards`` > 1 turns the Job into an Indexed Job whose completion
+``i`` sweeps every ``shards``-th graph starting at ``i``. Each shard is its own
+pod with its own memory, which is the lever once one pod's parallelism is
+limited by memory rather than by S3. ``backoffLimitPerIndex: 0`` lets one
+shard fail without killing the others; the Job still fails at the end.
+
+Every graph's run logs one line,
+
+    omnigraph_maintenance command=optimize graph=council succeeded=1
+    duration_seconds=41 finished=1760000000   (one line in the log)
+
+which Alloy turns into the ``omnigraph_maintenance_graph_*`` gauges (see
+``substructure/aws/eks/grafana.py``). The CLI does not report bytes compacted
+in a form worth parsing, so the per-graph cost is measured in time.
+
 ``omnigraph repair`` is deliberately NOT scheduled here. It reconciles
 manifest/head drift and its ``--force`` mode publishes drift a human has not
 verified; it is a reactive, operator-driven command. See the runbook.
@@ -101,6 +121,23 @@ DEFAULT_CLEANUP_OLDER_THAN = "30d"
 # cleanup starts.
 ACTIVE_DEADLINE_SECONDS = 2700
 
+# Graphs swept at once in each pod, and Indexed-Job completions the graph list
+# is split across. Four concurrent graphs keep the sweep well inside the
+# schedule gap at today's graph count, and four small graphs' compactions fit
+# the pod's memory limit below; shards stay at one until they no longer do.
+DEFAULT_PARALLELISM = 4
+DEFAULT_SHARDS = 1
+
+# A pod's memory request grows with the graphs it has in flight, since
+# compaction rewrites fragments through memory; its limit does not. The limit
+# is kept below the server's own (SERVER_MEMORY_LIMIT in data_tier, 2Gi): it is
+# the same node pool, and maintenance losing an eviction race to the serving pod
+# is the correct outcome. More concurrency than the limit holds is what shards
+# are for -- each shard is another pod under the same cap.
+_MEMORY_REQUEST_MIB_PER_GRAPH = 256
+_MEMORY_LIMIT_MIB = 1024
+MAX_PARALLELISM = _MEMORY_LIMIT_MIB // _MEMORY_REQUEST_MIB_PER_GRAPH
+
 # No retry. Both commands are idempotent, so a retry would be safe, but neither
 # is urgent: the next scheduled run is the retry, and an immediate re-attempt
 # of a run that just failed on a held lock or an unopenable graph fails the
@@ -108,7 +145,14 @@ ACTIVE_DEADLINE_SECONDS = 2700
 BACKOFF_LIMIT = 0
 
 
-def _sweep_script(command: str, extra_args: list[str], graph_ids: list[str]) -> str:
+def _sweep_script(
+    command: str,
+    extra_args: list[str],
+    graph_ids: list[str],
+    *,
+    parallelism: int = 1,
+    shards: int = 1,
+) -> str:
     """Render the per-graph sweep both CronJobs run.
 
     ``graph_ids`` is interpolated as a literal shell word list rather than
@@ -146,27 +190,77 @@ def _sweep_script(command: str, extra_args: list[str], graph_ids: list[str]) ->
     unchanged. Verified against both binaries before removing it: 0.9.0 without
     ``--as`` compacts, and 0.8.1 without ``--as`` also compacts, so the sweeps
     work on either side of the upgrade.
+
+    Each graph runs in the background and is reaped oldest-first once
+    ``parallelism`` are in flight; ``wait <pid>`` returns that graph's exit
+    status, which is how a failure is recorded without a status file. With
+    ``shards`` > 1 the sweep only takes the graphs whose position matches
+    ``JOB_COMPLETION_INDEX``. The pod's shell is dash, so all of it is POSIX.
     """
     graph_list = " ".join(shlex.quote(graph) for graph in graph_ids)
     args = " ".join(shlex.quote(arg) for arg in extra_args)
+    shard_note = f" (shard ${{shard}} of {shards})" if shards > 1 else ""
     return f"""set -u
 failed=""
-for graph in {graph_list}; do
-    echo "=== omnigraph {command} ${{graph}}"
+pids=""
+pid_graphs=""
+running=0
+index=0
+shard="${{JOB_COMPLETION_INDEX:-0}}"
+
+sweep() {{
+    started=$(date +%s)
+    echo "=== omnigraph {command} ${{1}}"
     if omnigraph {command} \\
         --cluster "${{OMNIGRAPH_STORAGE_ROOT}}" \\
-        --graph "${{graph}}" {args}; then
-        :
+        --graph "${{1}}" {args}; then
+        succeeded=1
     else
-        echo "!!! omnigraph {command} failed for ${{graph}}" >&2
-        failed="${{failed}} ${{graph}}"
+        succeeded=0
+        echo "!!! omnigraph {command} failed for ${{1}}" >&2
+    fi
+    finished=$(date +%s)
+    echo "omnigraph_maintenance command={command} graph=${{1}}" \\
+        "succeeded=${{succeeded}} duration_seconds=$((finished - started))" \\
+        "finished=${{finished}}"
+    [ "${{succeeded}}" -eq 1 ]
+}}
+
+reap() {{
+    set -- ${{pids}}
+    pid="${{1}}"
+    shift
+    pids="$*"
+    set -- ${{pid_graphs}}
+    reaped="${{1}}"
+    shift
+    pid_graphs="$*"
+    running=$((running - 1))
+    if ! wait "${{pid}}"; then
+        failed="${{failed}} ${{reaped}}"
+    fi
+}}
+
+for graph in {graph_list}; do
+    if [ $((index % {shards})) -eq "${{shard}}" ]; then
+        sweep "${{graph}}" &
+        pids="${{pids}} $!"
+        pid_graphs="${{pid_graphs}} ${{graph}}"
+        running=$((running + 1))
+        if [ "${{running}}" -ge {parallelism} ]; then
+            reap
+        fi
     fi
+    index=$((index + 1))
+done
+while [ "${{running}}" -gt 0 ]; do
+    reap
 done
 if [ -n "${{failed}}" ]; then
     echo "!!! omnigraph {command} failed for:${{failed}}" >&2
     exit 1
 fi
-echo "omnigraph {command}: all graphs completed"
+echo "omnigraph {command}: all graphs completed{shard_note}"
 """
 
 
@@ -184,8 +278,18 @@ def _cron_job(  # noqa: PLR0913
     depends_on: list[Resource],
     *,
     suspend: bool = False,
+    parallelism: int = 1,
+    shards: int = 1,
 ) -> kubernetes.batch.v1.CronJob:
-    """Build one maintenance CronJob around ``script``."""
+    """Build one maintenance CronJob around ``script``.
+
+    ``parallelism`` sizes each pod for that many graphs in flight; ``shards`` > 1
+    makes the Job Indexed, one completion (and pod) per shard, all at once.
+    """
+    # One shard's failure must not terminate the others mid-compaction, so a
+    # sharded Job limits retries per index; it still fails once they all finish.
+    indexed = shards > 1
+    memory_request = f"{_MEMORY_REQUEST_MIB_PER_GRAPH * parallelism}Mi"
     return kubernetes.batch.v1.CronJob(
         f"omnigraph-{name}-{stack_info.env_suffix}",
         metadata=kubernetes.meta.v1.ObjectMetaArgs(
@@ -222,7 +326,11 @@ def _cron_job(  # noqa: PLR0913
             job_template=kubernetes.batch.v1.JobTemplateSpecArgs(
                 metadata=kubernetes.meta.v1.ObjectMetaArgs(labels=k8s_global_labels),
                 spec=kubernetes.batch.v1.JobSpecArgs(
-                    backoff_limit=BACKOFF_LIMIT,
+                    completion_mode="Indexed" if indexed else None,
+                    completions=shards if indexed else None,
+                    parallelism=shards if indexed else None,
+                    backoff_limit=None if indexed else BACKOFF_LIMIT,
+                    backoff_limit_per_index=BACKOFF_LIMIT if indexed else None,
                     active_deadline_seconds=ACTIVE_DEADLINE_SECONDS,
                     template=kubernetes.core.v1.PodTemplateSpecArgs(
                         metadata=kubernetes.meta.v1.ObjectMetaArgs(
@@ -263,13 +371,20 @@ def _cron_job(  # noqa: PLR0913
                                     ],
                                     # Compaction rewrites fragments through
                                     # memory, so this is the one job here with a
-                                    # real memory floor. Kept below the server's
-                                    # own limit: it is the same node pool, and
-                                    # maintenance losing an eviction race to the
-                                    # serving pod is the correct outcome.
+                                    # real memory floor, per graph in flight.
+                                    # Kept below the server's own limit: it is
+                                    # the same node pool, and maintenance losing
+                                    # an eviction race to the serving pod is the
+                                    # correct outcome.
                                     resources=kubernetes.core.v1.ResourceRequirementsArgs(
-                                        requests={"cpu": "100m", "memory": "256Mi"},
-                                        limits={"cpu": "1", "memory": "1Gi"},
+                                        requests={
+                                            "cpu": "100m",
+                                            "memory": memory_request,
+                                        },
+                                        limits={
+                                            "cpu": "1",
+                                            "memory": f"{_MEMORY_LIMIT_MIB}Mi",
+                                        },
                                     ),
                                 )
                             ],
@@ -304,6 +419,8 @@ def create_maintenance(  # noqa: PLR0913
     depends_on: list[Resource],
     *,
     suspend: bool = False,
+    parallelism: int = DEFAULT_PARALLELISM,
+    shards: int = DEFAULT_SHARDS,
 ) -> OmnigraphMaintenance:
     """Provision the scheduled optimize and cleanup sweeps.
 
@@ -315,7 +432,22 @@ def create_maintenance(  # noqa: PLR0913
     migration. Set together, never individually: they run an hour apart
     precisely so they cannot overlap each other, and suspending one alone would
     leave the other writing to a root the migration needs frozen.
+
+    ``parallelism`` (graphs at once per pod) and ``shards`` (pods per run) apply
+    to both sweeps; see the module docstring.
     """
+    for name, value in (("parallelism", parallelism), ("shards", shards)):
+        if value < 1:
+            msg = f"omnigraph maintenance {name} must be at least 1, got {value}"
+            raise ValueError(msg)
+    if parallelism > MAX_PARALLELISM:
+        msg = (
+            f"omnigraph maintenance parallelism {parallelism} does not fit one "
+            f"pod's {_MEMORY_LIMIT_MIB}Mi limit (at most {MAX_PARALLELISM}); "
+            "raise shards instead"
+        )
+        raise ValueError(msg)
+    concurrency = {"parallelism": parallelism, "shards": shards}
     optimize_cron_job = _cron_job(
         name="optimize",
         stack_info=stack_info,
@@ -327,9 +459,10 @@ def create_maintenance(  # noqa: PLR0913
         storage_uri=storage_uri,
         schedule=optimize_schedule,
         # Non-destructive, so no --confirm and no confirmation prompt to skip.
-        script=_sweep_script("optimize", [], graph_ids),
+        script=_sweep_script("optimize", [], graph_ids, **concurrency),
         depends_on=depends_on,
         suspend=suspend,
+        **concurrency,
     )
 
     # `--confirm` arms the destructive run; `--yes` is separately required
@@ -351,9 +484,11 @@ def create_maintenance(  # noqa: PLR0913
             "cleanup",
             ["--older-than", cleanup_older_than, "--confirm", "--yes"],
             graph_ids,
+            **concurrency,
         ),
         depends_on=depends_on,
         suspend=suspend,
+        **concurrency,
     )
 
     return OmnigraphMaintenance(
@@ -43,26 +43,42 @@ authenticates to the witan tier with an OIDC JWT; witan maps their ``sub`` to
 omnigraph-server on their behalf. The token is an internal capability, so it is
 opaque random bytes with no format requirements and nothing to distribute.
 
+Because a steady-state run writes nothing, it is cheap to run often: every
+request in a run reuses one keep-alive connection per host (see
+:class:`_ConnectionPool`), so a no-op pass is a Vault login, two Vault reads and
+a few Keycloak pages over two TLS handshakes.
+
+WHY THE WRITE RE-READS FIRST
+
+``secret-operations`` is a kv-v1 mount, and kv-v1 has no check-and-set. Two
+overlapping runs — the deploy-time bootstrap Job and a scheduled tick, which
+``concurrencyPolicy: Forbid`` does not serialise against each other — would each
+read the same map, mint different tokens for a new user, and the second write
+would silently replace the first run's tokens. :func:`write_token_map` therefore
+re-reads the path immediately before writing and aborts if it no longer matches
+the map this run reconciled against; the next run reconciles against the new
+one. That narrows the race to the gap between two requests rather than closing
+it, which is what is available without moving the path to a kv-v2 mount.
+
 DELIBERATELY STDLIB-ONLY
 
 Both the Keycloak Admin API and the Vault HTTP API are plain JSON over HTTPS,
 so this needs no third-party client and therefore no image to build, publish,
 or keep patched — it runs on a stock ``python:3.12-slim``. Keep it that way;
 an ``import`` of anything outside the standard library turns a ConfigMap into a
-release pipeline.
+release pipeline. That includes the connection pooling, which is ``http.client``.
 """
 
 from __future__ import annotations
 
+import http.client
 import json
 import logging
 import os
 import re
 import secrets
 import sys
-import urllib.error
 import urllib.parse
-import urllib.request
 from typing import Any
 
 LOG = logging.getLogger("sync-actor-tokens")
@@ -104,6 +120,70 @@ class SyncError(Exception):
     """A condition that must stop the run before anything is written."""
 
 
+class _ConnectionPool:
+    """One keep-alive connection per origin, shared by every request in a run.
+
+    ``urllib.request`` opens and tears down a connection (and a TLS handshake)
+    per call; a run makes several calls to each of two hosts.
+    """
+
+    def __init__(self) -> None:
+        self._connections: dict[tuple[str, str], http.client.HTTPConnection] = {}
+
+    def request(
+        self, method: str, url: str, headers: dict[str, str], data: bytes | None
+    ) -> tuple[int, bytes]:
+        """Send one request, returning its status and body."""
+        parts = urllib.parse.urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        target = f"{parts.path or '/'}{'?' + parts.query if parts.query else ''}"
+        pooled = self._connections.pop(origin, None)
+        if pooled is not None:
+            try:
+                return self._send(origin, pooled, method, target, headers, data)
+            except (http.client.RemoteDisconnected, ConnectionResetError):
+                # The server closed a connection that sat idle in the pool
+                # before the request reached it; retry once on a fresh one.
+                pass
+        connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        connection = connection_class(parts.netloc, timeout=HTTP_TIMEOUT_SECONDS)
+        return self._send(origin, connection, method, target, headers, data)
+
+    def _send(  # noqa: PLR0913
+        self,
+        origin: tuple[str, str],
+        connection: http.client.HTTPConnection,
+        method: str,
+        target: str,
+        headers: dict[str, str],
+        data: bytes | None,
+    ) -> tuple[int, bytes]:
+        try:
+            connection.request(method, target, body=data, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        if response.will_close:
+            connection.close()
+        else:
+            self._connections[origin] = connection
+        return response.status, body
+
+    def close(self) -> None:
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+
+_POOL = _ConnectionPool()
+
+
 def derive_actor_id(sub: str) -> str:
     """Map a Keycloak ``sub`` (== the user's uuid) to an omnigraph actor id."""
     slug = _SANITIZE_RE.sub("-", sub.strip().lower()).strip("-")
@@ -127,23 +207,19 @@ def _request(
     the one expected not-found is the actor-tokens path on a brand-new
     environment, where this job's first run is what creates it.
     """
-    request = urllib.request.Request(  # noqa: S310 - https URLs from config
-        url, method=method, data=data, headers=headers or {}
-    )
     try:
-        with urllib.request.urlopen(  # noqa: S310 - https URLs from config
-            request, timeout=HTTP_TIMEOUT_SECONDS
-        ) as response:
-            body = response.read()
-    except urllib.error.HTTPError as exc:
-        if exc.code == 404 and allow_404:  # noqa: PLR2004
-            return None
-        detail = exc.read().decode("utf-8", "replace")[:500]
-        msg = f"{method} {url} failed: HTTP {exc.code} {detail}"
-        raise SyncError(msg) from exc
-    except urllib.error.URLError as exc:
-        msg = f"{method} {url} failed: {exc.reason}"
+        status, body = _POOL.request(method, url, headers or {}, data)
+    except (OSError, http.client.HTTPException) as exc:
+        msg = f"{method} {url} failed: {exc}"
         raise SyncError(msg) from exc
+    if status == 404 and allow_404:  # noqa: PLR2004
+        return None
+    # Anything outside 2xx, redirects included: neither API redirects a
+    # correctly addressed request, so a 3xx is a misconfigured URL.
+    if not 200 <= status < 300:  # noqa: PLR2004
+        detail = body.decode("utf-8", "replace")[:500]
+        msg = f"{method} {url} failed: HTTP {status} {detail}"
+        raise SyncError(msg)
     if not body:
         return None
     try:
@@ -226,14 +302,29 @@ def read_token_map(vault_addr: str, vault_token: str, path: str) -> dict[str, st
 
 
 def write_token_map(
-    vault_addr: str, vault_token: str, path: str, tokens: dict[str, str]
+    vault_addr: str,
+    vault_token: str,
+    path: str,
+    tokens: dict[str, str],
+    *,
+    expected: dict[str, str],
 ) -> None:
-    """Replace the kv-v1 secret at ``path`` with ``tokens``.
+    """Replace the kv-v1 secret at ``path`` with ``tokens``, if it holds ``expected``.
 
     kv-v1 writes replace the whole secret rather than patching it, which is
     exactly the semantics wanted here: the map is a computed artifact, so the
-    write is a declaration of the complete desired state.
+    write is a declaration of the complete desired state. ``expected`` is the
+    map ``tokens`` was reconciled from; kv-v1 has no check-and-set, so the
+    comparison is a re-read immediately before the write (see the module
+    docstring).
     """
+    if read_token_map(vault_addr, vault_token, path) != expected:
+        msg = (
+            f"Vault path {path} changed while this run was reconciling — another "
+            "run wrote it. Not overwriting its tokens; the next run will "
+            "reconcile against the new map."
+        )
+        raise SyncError(msg)
     _request(
         f"{vault_addr}/v1/{path}",
         method="POST",
@@ -503,7 +594,9 @@ def main() -> int:
         LOG.info("dry run: not writing %s", actor_tokens_path)
         return 0
 
-    write_token_map(vault_addr, vault_token, actor_tokens_path, desired)
+    write_token_map(
+        vault_addr, vault_token, actor_tokens_path, desired, expected=current
+    )
     # Worth saying explicitly: this write is what triggers the VSO
     # rolloutRestartTarget on the actor-tokens secret, and therefore a brief
     # omnigraph-server outage. If this line appears every run, something is
@@ -523,3 +616,5 @@ if __name__ == "__main__":
     except SyncError as error:
         LOG.error("%s", error)  # noqa: TRY400 - the traceback adds nothing here
         sys.exit(1)
+    finally:
+        _POOL.close()
@@ -91,14 +91,15 @@ SERVICE_TOKENS_VAULT_PATH = (  # pragma: allowlist secret
 KEYCLOAK_CREDENTIALS_VAULT_PATH = "witan/token-sync-oidc"
 KEYCLOAK_CREDENTIALS_SECRET_NAME = "witan-token-sync-oidc"  # noqa: S105  # pragma: allowlist secret
 
-# Hourly. The floor on this is not Keycloak's cost — the job makes two API
-# calls — but the fact that a membership change writes Vault and therefore
-# bounces omnigraph-server (replicas=1/Recreate, a hard ~10-30s graph outage
-# absorbed by client-side connect retry). Hourly makes onboarding latency an
-# hour in the worst case while keeping any conceivable churn well clear of
-# overlapping restarts. Steady state is free: an unchanged membership writes
-# nothing at all, so the restart cost is paid only on real change.
-DEFAULT_SYNC_SCHEDULE = "17 * * * *"
+# Every 15 minutes. The floor on this is not Keycloak's cost — a no-op run is a
+# handful of requests over two pooled connections — but the fact that a
+# membership change writes Vault and therefore bounces omnigraph-server
+# (replicas=1/Recreate, a hard ~10-30s graph outage absorbed by client-side
+# connect retry). Fifteen minutes bounds onboarding latency while keeping any
+# conceivable churn well clear of overlapping restarts. Steady state is free: an
+# unchanged membership writes nothing at all, so the restart cost is paid only
+# on real change, however often the job runs.
+DEFAULT_SYNC_SCHEDULE = "2-59/15 * * * *"
 
 # Two HTTPS calls and a Vault write. A run that has not finished in five
 # minutes is wedged on a hung connection, not slow.
@@ -401,7 +402,7 @@ def create_token_sync(  # noqa: PLR0913
     # tick, and the VSO sync that renders it — and the Deployment that mounts
     # the result — would come up against nothing. Pulumi waits for a Job to
     # succeed, so this also makes a broken Keycloak credential fail the deploy
-    # loudly instead of producing a CronJob that silently errors every hour.
+    # loudly instead of producing a CronJob that silently errors every interval.
     bootstrap_hash = hashlib.sha256(
         f"{script_body}\n{keycloak_url}\n{keycloak_realm}".encode()
     ).hexdigest()
@@ -443,9 +444,10 @@ def create_token_sync(  # noqa: PLR0913
             schedule=schedule,
             # Two concurrent runs would read the same actor-tokens map and
             # write back divergent merges, and the loser's freshly minted
-            # tokens would be silently dropped. The reconciliation is a
-            # read-modify-write with no compare-and-swap behind it, so
-            # serialising the runs is what stands in for one.
+            # tokens would be silently dropped. kv-v1 has no check-and-set, so
+            # serialising the runs is the main guard; the script's re-read
+            # before writing covers the bootstrap Job, which this policy does
+            # not serialise against.
             concurrency_policy="Forbid",
             starting_deadline_seconds=600,
             successful_jobs_history_limit=1,
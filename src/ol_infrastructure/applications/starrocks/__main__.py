@@ -503,11 +503,12 @@ starrocks_values: dict[str, Any] = {
 # that annotation only affects Karpenter-owned nodes, and FE no longer runs on
 # any.
 
-# Placeholder ConfigMap for the file-based group provider managed by the substructure
-# stack (substructure/starrocks keycloak_group_sync.py).  Created here so the FE pods
-# have the volume available at startup; the substructure stack populates groups.txt
-# via kubectl apply after each pulumi up.  ignore_changes=["data"] prevents this stack
-# from overwriting the substructure-managed content on subsequent runs.
+# Placeholder ConfigMap for the file-based group provider managed by the
+# substructure stack (substructure/starrocks keycloak_group_sync.py). Created
+# here so the FE pods have the volume available at startup; the substructure
+# stack patches groups.txt whenever the Keycloak role memberships change.
+# ignore_changes=["data"] prevents this stack from overwriting the
+# substructure-managed content on subsequent runs.
 if starrocks_config.get_bool("oidc_enabled"):
     _oidc_group_cm_name = f"{stack_info.env_prefix}-starrocks-oidc-groups"
     kubernetes.core.v1.ConfigMap(
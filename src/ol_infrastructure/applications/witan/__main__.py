@@ -107,6 +107,7 @@ from ol_infrastructure.applications.witan.break_glass import (
 )
 from ol_infrastructure.applications.witan.ci_indexer import (
     DEFAULT_INDEX_SCHEDULE,
+    DEFAULT_POLL_SCHEDULE,
     create_ci_indexer,
 )
 from ol_infrastructure.applications.witan.deployment import (
@@ -270,12 +271,17 @@ KEYCLOAK_ISSUER = f"https://{KEYCLOAK_DOMAIN}/realms/ol-platform-engineering"
 # value; defaults to a plain "witan" audience.
 WITAN_OIDC_AUDIENCE = witan_config.get("oidc_audience") or "witan"
 
-# How often the CI indexer sweeps every managed repo's default branch onto its
-# shared code graph. Per-stack so a lower environment can be turned down (or
-# up, to shake the job out) without touching the default — see ci_indexer.py
-# for why the interval is what bounds staleness of the shared view.
-WITAN_CI_INDEX_SCHEDULE = (
-    witan_config.get("ci_index_schedule") or DEFAULT_INDEX_SCHEDULE
+# How often the CI indexer checks every managed repo's default branch and
+# indexes the ones that moved onto their shared code graphs. Per-stack so a
+# lower environment can be turned down (or up, to shake the job out) without
+# touching the default — see ci_indexer.py for why the interval is what bounds
+# staleness of the shared view. `ci_index_change_driven: false` goes back to
+# re-indexing every repo every run, on the slower full-sweep default.
+WITAN_CI_INDEX_CHANGE_DRIVEN = witan_config.get_bool("ci_index_change_driven")
+if WITAN_CI_INDEX_CHANGE_DRIVEN is None:
+    WITAN_CI_INDEX_CHANGE_DRIVEN = True
+WITAN_CI_INDEX_SCHEDULE = witan_config.get("ci_index_schedule") or (
+    DEFAULT_POLL_SCHEDULE if WITAN_CI_INDEX_CHANGE_DRIVEN else DEFAULT_INDEX_SCHEDULE
 )
 
 # Client-side write admission, applied inside the MCP tier before a write is
@@ -1008,6 +1014,7 @@ witan_ci_indexer = create_ci_indexer(
     ),
     github_app_secret_name=GITHUB_APP_SECRET_NAME if github_app_secret else None,
     github_app_secret=github_app_secret,
+    change_driven=WITAN_CI_INDEX_CHANGE_DRIVEN,
 )
 
 export("namespace", NAMESPACE)
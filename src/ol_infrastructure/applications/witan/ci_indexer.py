@@ -33,6 +33,31 @@ against the *graph* — file content hashes live in the graph, not in the
 working tree, so a fresh clone every run still skips every unchanged file and
 only the first run for a repo pays full parse cost.
 
+WHY IT ONLY INDEXES REPOS WHOSE HEAD MOVED
+
+Skipping unchanged files still left every run paying a full clone and a hash
+pass per repo, for repos that mostly had not changed since the last one. So
+the job polls instead: ``git ls-remote`` fetches each default branch's head
+SHA (a ref advertisement, no objects), and a repo whose head matches the SHA
+recorded after its last successful index is skipped outright. Only repos that
+moved are handed to the entrypoint, one at a time, and each one's SHA is
+recorded only if its index succeeded, so a failure is retried next tick.
+Because a quiet tick costs one round trip per repo, the schedule is every 15
+minutes rather than every four hours.
+
+The recorded SHAs live on a small PVC, keyed by repo AND image, so a new witan
+release re-indexes every repo once under its own parser. Each record also
+expires after ``FULL_REINDEX_AFTER_SECONDS``: a graph rebuilt underneath the
+indexer (a storage-format migration, a restore) is back in sync within a day
+without anyone remembering to clear the state. When ``ls-remote`` cannot read
+a head (a private repo reached only through the GitHub App, a GitHub blip),
+the repo is indexed as if it had moved; an unknown head is never "unchanged".
+
+Working out which files changed from the diff belongs to the entrypoint
+(agent-kit ``witan-ci-index``), which owns the clone; this job decides which
+repos are worth cloning at all. ``witan:ci_index_change_driven: false`` goes
+back to sweeping every repo every run.
+
 The image is the ``witan`` MCP-tier image, whose ``witan-ci-index`` entrypoint
 does the actual sweep (agent-kit ``docker/witan-ci-index.sh``). Same build as
 the tier serving these graphs, so the writer and the readers can never be a
@@ -66,16 +91,24 @@ SCRATCH_WORKDIR = f"{SCRATCH_MOUNT_PATH}/witan-ci-index"
 # cloning the next), so this bounds the largest single repo, not their sum.
 SCRATCH_SIZE_LIMIT = "8Gi"
 
-# Default cadence. Four hours is a compromise between how stale a shared view
-# may get and the fact that every run re-clones every repo — the clone, not the
-# parse, is the recurring cost, since parsing is skipped for unchanged files.
-# Overridable per environment via `witan:ci_index_schedule`.
+# Default cadences, overridable per environment via `witan:ci_index_schedule`.
+# Change-driven, a tick where nothing moved is one `ls-remote` per repo, so it
+# can run often. A full sweep re-clones every repo every run, and four hours is
+# the compromise between staleness and that cost.
+DEFAULT_POLL_SCHEDULE = "*/15 * * * *"
 DEFAULT_INDEX_SCHEDULE = "0 */4 * * *"
 
-# The first run for a repo parses it from scratch, and this sweeps the whole
-# fleet serially, so the ceiling has to clear a cold start on every repo at
-# once. Three hours keeps it comfortably under the four-hour cadence, so a
-# wedged run is reaped before the next one is due rather than suppressing it.
+# Recorded head SHAs expire after a day; see the module docstring.
+FULL_REINDEX_AFTER_SECONDS = 24 * 60 * 60
+
+STATE_MOUNT_PATH = "/var/lib/witan-ci-index"
+# One line per (repo, image); a few KiB in practice.
+STATE_VOLUME_SIZE = "1Gi"
+
+# The first run for a repo parses it from scratch, and a new image re-indexes
+# the whole fleet serially, so the ceiling has to clear a cold start on every
+# repo at once. Ticks that fall inside a long run are skipped (Forbid), not
+# queued, so a short poll interval does not stack runs behind a cold one.
 INDEX_ACTIVE_DEADLINE_SECONDS = 3 * 60 * 60
 
 # Not the usual "retry a few times": a failed sweep costs a full re-clone of
@@ -86,6 +119,44 @@ INDEX_ACTIVE_DEADLINE_SECONDS = 3 * 60 * 60
 INDEX_BACKOFF_LIMIT = 1
 
 
+# Runs each moved repo through the entrypoint on its own, so one repo's failure
+# neither skips the rest nor stops the others' heads from being recorded. POSIX
+# sh: the entrypoint's own shell is what the image guarantees.
+CHANGE_DRIVEN_SCRIPT = """set -u
+state_dir="${WITAN_CODE_CI_STATE_DIR}"
+mkdir -p "${state_dir}"
+now=$(date +%s)
+failed=""
+for repo in ${WITAN_CODE_CI_REPOS}; do
+    key=$(printf '%s %s' "${repo}" "${WITAN_CODE_CI_IMAGE}" | cksum | cut -d ' ' -f 1)
+    head=$(GIT_TERMINAL_PROMPT=0 git ls-remote "${repo}" HEAD 2>/dev/null | cut -f 1)
+    recorded_head=""
+    recorded_at=0
+    if [ -f "${state_dir}/${key}" ]; then
+        read -r recorded_head recorded_at < "${state_dir}/${key}"
+    fi
+    if [ -n "${head}" ] && [ "${head}" = "${recorded_head}" ] \\
+        && [ $((now - recorded_at)) -lt "${WITAN_CODE_CI_MAX_AGE_SECONDS}" ]; then
+        echo "witan_ci_index repo=${repo} outcome=unchanged head=${head}"
+        continue
+    fi
+    if WITAN_CODE_CI_REPOS="${repo}" witan-ci-index; then
+        echo "witan_ci_index repo=${repo} outcome=indexed head=${head:-unknown}"
+        if [ -n "${head}" ]; then
+            printf '%s %s\\n' "${head}" "$(date +%s)" > "${state_dir}/${key}"
+        fi
+    else
+        echo "witan_ci_index repo=${repo} outcome=failed" >&2
+        failed="${failed} ${repo}"
+    fi
+done
+if [ -n "${failed}" ]; then
+    echo "witan_ci_index failed for:${failed}" >&2
+    exit 1
+fi
+"""
+
+
 def create_ci_indexer(  # noqa: PLR0913
     stack_info: StackInfo,
     namespace: str,
@@ -102,6 +173,8 @@ def create_ci_indexer(  # noqa: PLR0913
     github_app_installation_id: str | None = None,
     github_app_secret_name: str | None = None,
     github_app_secret: Resource | None = None,
+    *,
+    change_driven: bool = True,
 ) -> kubernetes.batch.v1.CronJob | None:
     """Provision the CronJob that indexes each repo's default branch.
 
@@ -115,6 +188,9 @@ def create_ci_indexer(  # noqa: PLR0913
     repos; without them it clones anonymously, which is correct while every
     managed repo is public. See ``witan_code/github_app.py`` for why an App
     rather than a deploy key or a PAT.
+
+    ``change_driven`` (the default) indexes only repos whose head moved since
+    their last successful index; ``False`` sweeps every repo every run.
     """
     if not managed_repos:
         return None
@@ -220,6 +296,19 @@ def create_ci_indexer(  # noqa: PLR0913
         ).items()
     ]
     indexer_env += downward_api_env_args()
+    if change_driven:
+        indexer_env += [
+            kubernetes.core.v1.EnvVarArgs(
+                name="WITAN_CODE_CI_STATE_DIR", value=STATE_MOUNT_PATH
+            ),
+            kubernetes.core.v1.EnvVarArgs(
+                name="WITAN_CODE_CI_IMAGE", value=witan_image
+            ),
+            kubernetes.core.v1.EnvVarArgs(
+                name="WITAN_CODE_CI_MAX_AGE_SECONDS",
+                value=str(FULL_REINDEX_AFTER_SECONDS),
+            ),
+        ]
 
     volume_mounts = [
         kubernetes.core.v1.VolumeMountArgs(
@@ -237,6 +326,39 @@ def create_ci_indexer(  # noqa: PLR0913
     ]
     depends_on: list[Resource] = [witan_ci_token_secret]
 
+    if change_driven:
+        # Outlives the pods, which is the point; RWO is enough because Forbid
+        # means one pod at a time.
+        state_claim = kubernetes.core.v1.PersistentVolumeClaim(
+            f"witan-ci-indexer-state-{stack_info.env_suffix}",
+            metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                name="witan-ci-indexer-state",
+                namespace=namespace,
+                labels=k8s_global_labels,
+            ),
+            spec=kubernetes.core.v1.PersistentVolumeClaimSpecArgs(
+                access_modes=["ReadWriteOnce"],
+                resources=kubernetes.core.v1.VolumeResourceRequirementsArgs(
+                    requests={"storage": STATE_VOLUME_SIZE},
+                ),
+            ),
+        )
+        volume_mounts.append(
+            kubernetes.core.v1.VolumeMountArgs(
+                name="state",
+                mount_path=STATE_MOUNT_PATH,
+            )
+        )
+        volumes.append(
+            kubernetes.core.v1.VolumeArgs(
+                name="state",
+                persistent_volume_claim=kubernetes.core.v1.PersistentVolumeClaimVolumeSourceArgs(
+                    claim_name="witan-ci-indexer-state",
+                ),
+            )
+        )
+        depends_on.append(state_claim)
+
     # Narrowed on the Resource itself rather than on `use_github_app`: the
     # all-or-none check above already makes the two equivalent, and this is the
     # form that tells the type checker so.
@@ -320,9 +442,13 @@ def create_ci_indexer(  # noqa: PLR0913
                                     name="witan-ci-index",
                                     image=witan_image,
                                     # Overrides the image's `witan` ENTRYPOINT:
-                                    # this is the sweep script, not a witan
-                                    # subcommand.
-                                    command=["witan-ci-index"],
+                                    # this is the sweep script (behind the
+                                    # change check), not a witan subcommand.
+                                    command=(
+                                        ["/bin/sh", "-c", CHANGE_DRIVEN_SCRIPT]
+                                        if change_driven
+                                        else ["witan-ci-index"]
+                                    ),
                                     env=indexer_env,
                                     volume_mounts=volume_mounts,
                                     # Tree-sitter parsing is single-process and
@@ -49,7 +49,7 @@ from ol_infrastructure.components.services.k8s import (
     OLApplicationK8sCeleryBeatConfig,
     OLApplicationK8sCeleryWorkerConfig,
     OLApplicationK8sConfig,
-    application_deployment_names,
+    deployments_reading_secret,
 )
 from ol_infrastructure.components.services.vault import (
     OLVaultDatabaseBackend,
@@ -538,14 +538,19 @@ if k8s_deploy:
     # without these restart targets a credential change lands in the Secret and
     # the pods keep serving the old value until something unrelated rolls them.
     # That is exactly how the 2026-07-28 xPro Sheets outage went unnoticed.
-    xpro_secret_restart_targets = [
-        OLVaultRestartTarget(kind="Deployment", name=deployment_name)
-        for deployment_name in application_deployment_names(
-            application_name=Services.xpro,
-            celery_worker_configs=xpro_celery_worker_configs,
-            celery_beat_config=xpro_celery_beat_config,
-        )
-    ]
+    def xpro_secret_restart_targets(secret_name: str) -> list[OLVaultRestartTarget]:
+        # Every secret the factory returns is passed as env_from_secret_names
+        # below, so it reaches the webapp, the celery workers and beat.
+        return [
+            OLVaultRestartTarget(kind="Deployment", name=deployment_name)
+            for deployment_name in deployments_reading_secret(
+                application_name=Services.xpro,
+                celery_worker_configs=xpro_celery_worker_configs,
+                celery_beat_config=xpro_celery_beat_config,
+                secret_name=secret_name,
+                env_from_secret_names=[secret_name],
+            )
+        ]
 
     # Create Kubernetes secrets
     secret_names, secret_resources = create_xpro_k8s_secrets(
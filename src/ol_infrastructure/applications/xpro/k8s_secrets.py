@@ -6,6 +6,7 @@ This module defines functions to create Kubernetes secrets required by the xPro
 application by fetching data from various Vault secret backends (static KV and dynamic).
 """
 
+from collections.abc import Callable
 from typing import Any
 
 import pulumi_kubernetes as kubernetes
@@ -34,7 +35,7 @@ def _create_static_secret(
     templates: dict[str, str],
     vaultauth: str,
     mount_type: str = "kv-v1",
-    restart_targets: list[OLVaultRestartTarget] | None = None,
+    restart_targets: Callable[[str], list[OLVaultRestartTarget]] | None = None,
     opts: ResourceOptions | None = None,
 ) -> tuple[str, OLVaultK8SSecret]:
     """
@@ -50,10 +51,11 @@ def _create_static_secret(
         templates: Dictionary defining how Vault data maps to Kubernetes secret keys.
         vaultauth: Name of the Vault Kubernetes auth backend role.
         mount_type: Type of the Vault mount (e.g., "kv-v1", "kv-v2"). Defaults to "kv-v1".
-        restart_targets: Deployments to rolling-restart when this secret's contents
-            change. Required for anything consumed via ``env_from_secret_names``:
-            those values become pod environment variables fixed at pod start, so
-            re-rendering the Kubernetes Secret leaves running pods on the old value.
+        restart_targets: Called with the secret's name; returns the Deployments to
+            rolling-restart when its contents change. Required for anything
+            consumed via ``env_from_secret_names``: those values become pod
+            environment variables fixed at pod start, so re-rendering the
+            Kubernetes Secret leaves running pods on the old value.
         opts: Optional Pulumi resource options.
 
     Returns:
@@ -75,7 +77,7 @@ def _create_static_secret(
             exclude_raw=True,
             templates=templates,
             vaultauth=vaultauth,
-            restart_targets=restart_targets,
+            restart_targets=restart_targets(secret_name) if restart_targets else None,
         ),
         opts=opts,
     )
@@ -140,7 +142,7 @@ def create_xpro_k8s_secrets(
     rds_endpoint: str,
     redis_password: str,
     redis_cache: OLAmazonCache,
-    restart_targets: list[OLVaultRestartTarget] | None = None,
+    restart_targets: Callable[[str], list[OLVaultRestartTarget]] | None = None,
 ) -> tuple[list[str], list[OLVaultK8SSecret | kubernetes.core.v1.Secret]]:
     """
     Create all Kubernetes secrets required by the xPro application.
@@ -157,12 +159,12 @@ def create_xpro_k8s_secrets(
         rds_endpoint: The endpoint address of the RDS instance.
         redis_password: The password for the Redis cluster.
         redis_cache: The Redis cache resource for connection details.
-        restart_targets: Deployments to rolling-restart when a static secret's
-            contents change. These secrets are consumed via
-            ``env_from_secret_names``, so their values become pod environment
-            variables fixed at pod start; without this, a credential change
-            lands in the Kubernetes Secret and running pods keep the old value.
-            Build with ``application_deployment_names()``.
+        restart_targets: Called with each static secret's name; returns the
+            Deployments to rolling-restart when that secret's contents change.
+            These secrets are consumed via ``env_from_secret_names``, so their
+            values become pod environment variables fixed at pod start; without
+            this, a credential change lands in the Kubernetes Secret and running
+            pods keep the old value. Build with ``deployments_reading_secret()``.
 
     Returns:
         A tuple containing a list of the names of the created Kubernetes secrets
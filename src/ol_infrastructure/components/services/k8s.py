@@ -3,19 +3,30 @@
 
 import hashlib
 import json
+from collections.abc import Mapping, Sequence
 from datetime import UTC, datetime, timedelta
+from functools import partial
 from pathlib import Path
 from typing import Annotated, Any, Literal
 
 import pulumi_kubernetes as kubernetes
 import pulumiverse_time as pulumi_time
 from kubernetes.utils.quantity import parse_quantity
-from pulumi import Alias, ComponentResource, CustomTimeouts, Output, ResourceOptions
+from pulumi import (
+    Alias,
+    ComponentResource,
+    CustomTimeouts,
+    Output,
+    Resource,
+    ResourceOptions,
+    log,
+)
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
     NonNegativeInt,
+    PositiveFloat,
     PositiveInt,
     field_validator,
     model_validator,
@@ -30,7 +41,17 @@ from bridge.lib.magic_numbers import (
     MAXIMUM_K8S_NAME_LENGTH,
 )
 from bridge.lib.versions import NGINX_VERSION
+from ol_infrastructure.components.services.pgbouncer import (
+    OLPgBouncer,
+    OLPgBouncerConfig,
+    pgbouncer_deployment_name,
+)
 from ol_infrastructure.lib.aws.eks_helper import cached_image_uri, ecr_image_uri
+from ol_infrastructure.lib.granian_tuning import (
+    GranianRequestProfile,
+    GranianTuning,
+    tune_granian,
+)
 from ol_infrastructure.lib.k8s_vpa import make_vpa
 from ol_infrastructure.lib.ol_types import Component, KubernetesServiceAppProtocol
 from ol_infrastructure.lib.pulumi_helper import parse_stack
@@ -66,6 +87,8 @@ def application_deployment_names(
     application_name: str,
     celery_worker_configs: "list[OLApplicationK8sCeleryWorkerConfig] | None" = None,
     celery_beat_config: "OLApplicationK8sCeleryBeatConfig | None" = None,
+    *,
+    with_pgbouncer: bool = False,
 ) -> list[str]:
     """Deployment names OLApplicationK8s will create, without constructing it.
 
@@ -93,9 +116,13 @@ def application_deployment_names(
             env_from_secret_names=secret_names, ...
         ))
 
+    For a secret's restart targets, prefer ``deployments_reading_secret``, which
+    narrows this list to the Deployments that actually mount the secret.
+
     Deliberately does NOT take the full ``OLApplicationK8sConfig``: that config
     needs ``env_from_secret_names``, which is what the caller is still trying to
-    build. Pass only the three fields the names actually derive from.
+    build. Pass only the fields the names actually derive from; ``with_pgbouncer``
+    is whether ``pgbouncer_config`` is set.
     """
     names = [webapp_deployment_name(application_name)]
     for worker_config in celery_worker_configs or []:
@@ -106,9 +133,97 @@ def application_deployment_names(
         )
     if celery_beat_config is not None:
         names.append(celery_beat_deployment_name(application_name))
+    if with_pgbouncer:
+        names.append(pgbouncer_deployment_name(application_name))
+    return names
+
+
+def deployments_reading_secret(  # noqa: PLR0913
+    application_name: str,
+    celery_worker_configs: "list[OLApplicationK8sCeleryWorkerConfig] | None" = None,
+    celery_beat_config: "OLApplicationK8sCeleryBeatConfig | None" = None,
+    *,
+    secret_name: str | Output[str],
+    env_from_secret_names: Sequence[str] = (),
+    extra_volumes: Sequence[kubernetes.core.v1.VolumeArgs] = (),
+    deployment_env_from_secret_names: Mapping[str, Sequence[str]] | None = None,
+    pgbouncer_config: OLPgBouncerConfig | None = None,
+) -> list[str]:
+    """Deployments whose pods read ``secret_name``, to restart when it changes.
+
+    Use this rather than ``application_deployment_names`` for a secret's
+    ``restart_targets``: it is computable before the component for the same
+    ordering reason, and takes the mount fields of ``OLApplicationK8sConfig``
+    so that only the Deployments actually mounting the secret are restarted.
+
+    ``env_from_secret_names`` and the secret volumes in ``extra_volumes`` are
+    mounted on the webapp, every celery worker and beat alike, so a secret named
+    there restarts all of them. A secret in ``deployment_env_from_secret_names``
+    restarts only the Deployments it is listed under. PgBouncer reads only its
+    ``credentials_secret_name``, and restarting it drops every pooled
+    connection, so it is included only for that secret. A name that is still an
+    ``Output`` cannot be compared here, so every Deployment is returned for it:
+    an extra restart is cheaper than a pod left holding rotated-out credentials.
+
+    Raises ``ValueError`` when no Deployment reads the secret, since an empty
+    target list would silently stop the rotation from reaching any pod.
+    """
+    app_deployment_names = application_deployment_names(
+        application_name, celery_worker_configs, celery_beat_config
+    )
+    pgbouncer_deployment_names = (
+        [pgbouncer_deployment_name(application_name)] if pgbouncer_config else []
+    )
+    if isinstance(secret_name, Output):
+        return [*app_deployment_names, *pgbouncer_deployment_names]
+
+    shared_secret_names = {
+        *env_from_secret_names,
+        *(
+            volume.secret.secret_name
+            for volume in extra_volumes
+            if isinstance(volume.secret, kubernetes.core.v1.SecretVolumeSourceArgs)
+        ),
+    }
+    per_deployment = deployment_env_from_secret_names or {}
+    names = [
+        deployment_name
+        for deployment_name in app_deployment_names
+        if secret_name in shared_secret_names
+        or secret_name in per_deployment.get(deployment_name, ())
+    ]
+    if pgbouncer_config and secret_name == pgbouncer_config.credentials_secret_name:
+        names.extend(pgbouncer_deployment_names)
+    if not names:
+        msg = (
+            f"No {application_name} Deployment reads secret {secret_name!r}; "
+            "pass the env_from_secret_names, extra_volumes or "
+            "deployment_env_from_secret_names that mount it."
+        )
+        raise ValueError(msg)
     return names
 
 
+def config_hash_annotations(
+    sources: dict[str, str | Output[str]],
+) -> dict[str, Output[str]]:
+    """Return the ``ol.mit.edu/config-hash`` pod annotation for ``sources``.
+
+    ``sources`` names the config a pod reads; the annotation is a sha256 over all
+    of it, so changing any one value rolls the pods that carry it. Empty when
+    there is nothing to hash, so callers can spread it unconditionally.
+    """
+    if not sources:
+        return {}
+    return {
+        "ol.mit.edu/config-hash": Output.all(**sources).apply(
+            lambda values: hashlib.sha256(
+                json.dumps(values, sort_keys=True).encode()
+            ).hexdigest()
+        )
+    }
+
+
 def default_probe_configs(port: int) -> dict[str, kubernetes.core.v1.ProbeArgs]:
     """Probes against the django-health-check endpoints on ``port``.
 
@@ -167,6 +282,155 @@ def default_probe_configs(port: int) -> dict[str, kubernetes.core.v1.ProbeArgs]:
     }
 
 
+class OLApplicationK8sCeleryQueueScalingConfig(BaseModel):
+    """Scale a celery worker on its broker backlog, and optionally on task age.
+
+    The default worker ScaledObject watches one Redis list at a fixed length, never
+    goes below ``min_replicas``, and embeds the broker password in its spec. This
+    replaces it with one ``redis`` trigger per queue the worker consumes, each
+    asking for a replica per ``backlog_per_replica`` queued tasks, authenticated
+    through a ``TriggerAuthentication``. With ``scale_to_zero`` the worker idles at
+    no replicas until a queue has work. Queue length alone misses a slow trickle
+    of long tasks, so a Prometheus task-age trigger can be added alongside.
+    ``lib.k8s_keda.build_celery_queue_scaling`` fills in the Prometheus wiring.
+    """
+
+    queues: list[str] | None = Field(
+        default=None,
+        description=(
+            "Redis lists to scale on. Defaults to the worker's -Q queues, or to "
+            "worker_name when it consumes every queue."
+        ),
+    )
+    backlog_per_replica: PositiveInt = Field(
+        default=10, description="Queued tasks per queue that warrant one replica."
+    )
+    activation_backlog: NonNegativeInt = Field(
+        default=0,
+        description="Queued tasks above which a worker scaled to zero is woken.",
+    )
+    scale_to_zero: bool = Field(
+        default=False,
+        description=(
+            "Let KEDA remove every replica while all queues are idle, instead of "
+            "holding min_replicas. Only for queues that can absorb a cold start."
+        ),
+    )
+    idle_cooldown_seconds: PositiveInt = Field(
+        default=300,
+        description="Seconds every queue must be idle before scaling to zero.",
+    )
+    polling_interval: PositiveInt = Field(
+        default=15, description="Seconds between trigger evaluations."
+    )
+    scale_down_stabilization_seconds: NonNegativeInt = Field(
+        default=300,
+        description=(
+            "How long the backlog must stay low before replicas are shed. Scale-up "
+            "is immediate: a backlog is the one signal here that is never early."
+        ),
+    )
+    redis_password_secret_name: str | None = Field(
+        default=None,
+        description=(
+            "Existing Secret (e.g. one synced from Vault) holding the broker "
+            "password. When unset the component stores redis_password in a Secret "
+            "of its own for the TriggerAuthentication to read."
+        ),
+    )
+    redis_password_secret_key: str = "password"  # noqa: S105  # pragma: allowlist secret
+    task_age_query: str | None = Field(
+        default=None,
+        description=(
+            "PromQL for the age in seconds of the oldest task waiting on a queue. "
+            "Every literal ``{queue}`` is replaced with the queue name by plain "
+            "substitution, not str.format, so label matchers keep single braces: "
+            '``max(age_seconds{queue="{queue}"})``. Celery\'s Redis transport '
+            "keeps no enqueue time, so this needs an exporter that does; confirm "
+            "the series exists before adopting, as a KEDA trigger against a "
+            "missing metric errors rather than scaling."
+        ),
+    )
+    max_task_age_seconds: PositiveInt | None = Field(
+        default=None,
+        description="Oldest-task age above which the worker scales out.",
+    )
+    prometheus_server_address: str | None = None
+    prometheus_trigger_authentication_name: str | None = None
+
+    @model_validator(mode="after")
+    def validate_task_age(self) -> "OLApplicationK8sCeleryQueueScalingConfig":
+        age_fields = {
+            "task_age_query": self.task_age_query,
+            "max_task_age_seconds": self.max_task_age_seconds,
+            "prometheus_server_address": self.prometheus_server_address,
+            "prometheus_trigger_authentication_name": (
+                self.prometheus_trigger_authentication_name
+            ),
+        }
+        missing = [name for name, value in age_fields.items() if value is None]
+        if self.task_age_query and "{queue}" not in self.task_age_query:
+            msg = "queue_scaling.task_age_query must contain a {queue} placeholder"
+            raise ValueError(msg)
+        if missing and len(missing) < len(age_fields):
+            msg = (
+                "queue_scaling task-age scaling needs all of "
+                f"{', '.join(age_fields)}; missing {', '.join(missing)}"
+            )
+            raise ValueError(msg)
+        return self
+
+    def build_triggers(
+        self,
+        queues: list[str],
+        *,
+        redis_address: str,
+        redis_database_index: str,
+        redis_trigger_authentication_name: str,
+    ) -> list[dict[str, Any]]:
+        """Return the KEDA triggers for ``queues``, one or two per queue."""
+        triggers: list[dict[str, Any]] = []
+        for queue in queues:
+            triggers.append(
+                {
+                    "type": "redis",
+                    # AverageValue: desired = ceil(length / listLength), so the
+                    # threshold is the backlog each replica is expected to drain.
+                    "metricType": "AverageValue",
+                    "metadata": {
+                        "address": redis_address,
+                        "username": "default",
+                        "databaseIndex": redis_database_index,
+                        "listName": queue,
+                        "listLength": str(self.backlog_per_replica),
+                        "activationListLength": str(self.activation_backlog),
+                        "enableTLS": "true",
+                    },
+                    "authenticationRef": {"name": redis_trigger_authentication_name},
+                }
+            )
+            if self.task_age_query is not None:
+                triggers.append(
+                    {
+                        "type": "prometheus",
+                        # Value, as for latency: age does not fall as replicas are
+                        # added to a queue that is not draining, so it must not be
+                        # divided by the replica count.
+                        "metricType": "Value",
+                        "metadata": {
+                            "serverAddress": self.prometheus_server_address,
+                            "query": self.task_age_query.replace("{queue}", queue),
+                            "threshold": str(self.max_task_age_seconds),
+                            "authModes": "basic",
+                        },
+                        "authenticationRef": {
+                            "name": self.prometheus_trigger_authentication_name
+                        },
+                    }
+                )
+        return triggers
+
+
 class OLApplicationK8sCeleryWorkerConfig(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     application_name: str = "main.celery:app"
@@ -185,11 +449,26 @@ class OLApplicationK8sCeleryWorkerConfig(BaseModel):
     autoscale_queue_depth: NonNegativeInt = 10
     redis_database_index: str = "1"
     redis_host: Output[str]
-    redis_password: str
+    redis_password: str | None = Field(
+        default=None,
+        description=(
+            "Broker password. Only optional when queue_scaling reads it from "
+            "redis_password_secret_name."
+        ),
+    )
     redis_port: int = DEFAULT_REDIS_PORT
     run_beat: bool = (
         False  # Deprecated: use celery_beat_config on OLApplicationK8sConfig instead
     )
+    queue_scaling: OLApplicationK8sCeleryQueueScalingConfig | None = Field(
+        default=None,
+        description=(
+            "Scale on per-queue backlog (and optionally task age) through a "
+            "TriggerAuthentication, with optional scale-to-zero. When unset the "
+            "worker keeps the single-list ScaledObject driven by "
+            "autoscale_queue_depth."
+        ),
+    )
 
     @field_validator("queue_name", "worker_name")
     @classmethod
@@ -215,6 +494,29 @@ class OLApplicationK8sCeleryWorkerConfig(BaseModel):
             self.worker_name = self.queue_name
         return self
 
+    @model_validator(mode="after")
+    def validate_redis_password(self) -> "OLApplicationK8sCeleryWorkerConfig":
+        """Require a password unless queue scaling reads it from a Secret."""
+        from_secret = (
+            self.queue_scaling is not None
+            and self.queue_scaling.redis_password_secret_name is not None
+        )
+        if self.redis_password is None and not from_secret:
+            msg = (
+                "redis_password is required unless "
+                "queue_scaling.redis_password_secret_name is set"
+            )
+            raise ValueError(msg)
+        return self
+
+    def scaling_queues(self) -> list[str]:
+        """Return the Redis lists whose backlog this worker scales on."""
+        if self.queue_scaling is not None and self.queue_scaling.queues:
+            return self.queue_scaling.queues
+        if self.queue_name:
+            return [queue.strip() for queue in self.queue_name.split(",")]
+        return [self.worker_name or ""]
+
 
 class OLApplicationK8sCeleryBeatConfig(BaseModel):
     """Configuration for a standalone celery beat scheduler deployment.
@@ -402,6 +704,24 @@ class GranianConfig(BaseModel):
         ),
     )
 
+    request_profile: GranianRequestProfile | None = Field(
+        default=None,
+        description=(
+            "Measured request profile to tune workers, blocking_threads and "
+            "backpressure from, against the webapp's CPU request and memory limit "
+            "(see ol_infrastructure.lib.granian_tuning). Any of the three set "
+            "explicitly is kept as a pin. The derivation is logged at preview."
+        ),
+    )
+    max_queue_wait_seconds: PositiveFloat | None = Field(
+        default=None,
+        description=(
+            "With request_profile, how long a request may wait inside a worker for a "
+            "thread before backpressure leaves it in the listen backlog. Defaults to "
+            "the profile's mean service time."
+        ),
+    )
+
     @field_validator("nginx_config_filename")
     @classmethod
     def validate_nginx_config_filename(cls, v: str) -> str:
@@ -453,7 +773,10 @@ class GranianConfig(BaseModel):
         value there would be silently ignored. A config that reads as tuned but isn't is
         worse than a synth-time failure, hence the ValueError.
         """
-        if self.interface == "wsgi":
+        if self.interface == "wsgi" and self.request_profile is not None:
+            # Left unset for tuned() to derive once the pod's resources are known.
+            pass
+        elif self.interface == "wsgi":
             if self.blocking_threads is None:
                 self.blocking_threads = DEFAULT_WSGI_BLOCKING_THREADS
             if self.backpressure is None:
@@ -470,6 +793,38 @@ class GranianConfig(BaseModel):
             raise ValueError(msg)
         return self
 
+    def tuned(
+        self, resource_requests: dict[str, str], resource_limits: dict[str, str]
+    ) -> tuple["GranianConfig", GranianTuning | None]:
+        """Apply ``request_profile`` against the webapp container's resources.
+
+        Returns the config unchanged, and no tuning, when there is no profile.
+        """
+        if self.request_profile is None:
+            return self, None
+        memory_limit = resource_limits.get("memory")
+        cpu_limit = resource_limits.get("cpu")
+        tuning = tune_granian(
+            self.request_profile,
+            interface=self.interface,
+            cpu_request_cores=float(parse_quantity(resource_requests.get("cpu", "0"))),
+            cpu_limit_cores=float(parse_quantity(cpu_limit)) if cpu_limit else None,
+            memory_limit_bytes=int(parse_quantity(memory_limit))
+            if memory_limit
+            else None,
+            max_queue_wait_seconds=self.max_queue_wait_seconds,
+            workers=self.workers if "workers" in self.model_fields_set else None,
+            blocking_threads=self.blocking_threads,
+            backpressure=self.backpressure,
+        )
+        update: dict[str, Any] = {
+            "workers": tuning.workers,
+            "backpressure": tuning.backpressure,
+        }
+        if self.interface == "wsgi":
+            update["blocking_threads"] = tuning.blocking_threads
+        return self.model_copy(update=update), tuning
+
     def build_args(self) -> list[str]:
         """Build the granian CLI argument list from this configuration."""
         args = [
@@ -583,6 +938,53 @@ class OLApplicationK8sKedaWebappScalingConfig(BaseModel):
     )
 
 
+# Prefork processes per celery worker pod. Deliberately not all the node's cores;
+# scale with worker replicas instead. Each process holds its own database
+# connection, so lib/connection_budget.py reads this too.
+CELERY_WORKER_CONCURRENCY = 2
+
+
+def celery_queue_scaled_object_spec(
+    worker_config: "OLApplicationK8sCeleryWorkerConfig",
+    redis_host: str,
+    *,
+    deployment_name: str,
+    redis_trigger_authentication_name: str,
+) -> dict[str, Any]:
+    """Build the ScaledObject spec for a worker with ``queue_scaling`` set."""
+    scaling = worker_config.queue_scaling
+    if scaling is None:
+        msg = f"celery worker {worker_config.worker_name} has no queue_scaling"
+        raise ValueError(msg)
+    return {
+        "scaleTargetRef": {"kind": "Deployment", "name": deployment_name},
+        "pollingInterval": scaling.polling_interval,
+        # Only governs the final step to zero; the HPA behavior below handles
+        # everything above one replica.
+        "cooldownPeriod": scaling.idle_cooldown_seconds,
+        "minReplicaCount": 0 if scaling.scale_to_zero else worker_config.min_replicas,
+        "maxReplicaCount": worker_config.max_replicas,
+        "advanced": {
+            "horizontalPodAutoscalerConfig": {
+                "behavior": {
+                    "scaleUp": {"stabilizationWindowSeconds": 0},
+                    "scaleDown": {
+                        "stabilizationWindowSeconds": (
+                            scaling.scale_down_stabilization_seconds
+                        )
+                    },
+                }
+            }
+        },
+        "triggers": scaling.build_triggers(
+            worker_config.scaling_queues(),
+            redis_address=f"{redis_host}:{worker_config.redis_port}",
+            redis_database_index=worker_config.redis_database_index,
+            redis_trigger_authentication_name=redis_trigger_authentication_name,
+        ),
+    }
+
+
 # Pod identity from the downward API. These are the names
 # mitol-django-observability already reads in _get_resource() to set the
 # k8s.pod.name / k8s.namespace.name / k8s.node.name resource attributes, and the
@@ -927,7 +1329,43 @@ class OLApplicationK8sConfig(BaseModel):
             "change out-of-band. Pass a value here (e.g. a Secret's resourceVersion, "
             "or a hash of externally-managed config) for anything whose changes "
             "should trigger a rolling restart. The content of the nginx/uwsgi "
-            "ConfigMaps this component manages is folded in automatically."
+            "ConfigMaps this component manages is folded into the webapp's hash "
+            "only, since only the webapp pod mounts them."
+        ),
+    )
+    deployment_config_hash_inputs: dict[str, dict[str, str | Output[str]]] = Field(
+        default_factory=dict,
+        description=(
+            "Like config_hash_inputs, but keyed by Deployment name (see "
+            "application_deployment_names) and folded only into that Deployment's "
+            "config-hash annotation. Use it for config a single process reads, e.g. "
+            "a ConfigMap only the beat scheduler mounts, so that a change to it "
+            "restarts that Deployment and leaves the webapp and other workers alone."
+        ),
+    )
+    deployment_env_from_secret_names: dict[str, list[str]] = Field(
+        default_factory=dict,
+        description=(
+            "Like env_from_secret_names, but keyed by Deployment name (see "
+            "application_deployment_names) and mounted via envFrom only on that "
+            "Deployment's containers. Use it for a secret a single process reads, "
+            "e.g. a credential only one celery worker needs, so that "
+            "deployments_reading_secret restarts just that Deployment when the "
+            "secret rotates."
+        ),
+    )
+    pgbouncer_config: OLPgBouncerConfig | None = Field(
+        default=None,
+        description=(
+            "When set, the component provisions a transaction-mode PgBouncer tier "
+            "(Deployment, Service, exporter sidecar and PodMonitor) sized from the "
+            "RDS instance class, and points the webapp, celery worker and beat "
+            "containers' database URL at it. Migrations, pre/post-deploy commands "
+            "and scheduled jobs keep the direct connection. PgBouncer does not "
+            "terminate TLS from clients, so the application must not require SSL "
+            "on its database connection, and it must not rely on session state "
+            "(server-side cursors, SET, advisory locks) outside a transaction -- "
+            "for Django, DISABLE_SERVER_SIDE_CURSORS."
         ),
     )
     webapp_deployment_aliases: list[Any] = Field(
@@ -1053,6 +1491,29 @@ class OLApplicationK8sConfig(BaseModel):
                 raise ValueError(msg)
         return self
 
+    @model_validator(mode="after")
+    def validate_per_deployment_keys(self) -> "OLApplicationK8sConfig":
+        """Reject per-Deployment settings for a Deployment this component doesn't
+        create.
+
+        A misspelled or stale key would otherwise be dropped silently, and the
+        config or secret it names would stop reaching the pods it was added for.
+        """
+        known = application_deployment_names(
+            self.application_name, self.celery_worker_configs, self.celery_beat_config
+        )
+        for field_name in (
+            "deployment_config_hash_inputs",
+            "deployment_env_from_secret_names",
+        ):
+            if unknown := sorted(set(getattr(self, field_name)) - set(known)):
+                msg = (
+                    f"{field_name} names unknown Deployment(s) {unknown}. "
+                    f"Expected one of {known}."
+                )
+                raise ValueError(msg)
+        return self
+
     @model_validator(mode="after")
     def validate_no_duplicate_metrics_port(self) -> "OLApplicationK8sConfig":
         """Raise an error if any caller-supplied port configuration clashes with the
@@ -1253,7 +1714,15 @@ class OLApplicationK8s(ComponentResource):
         # application_cmd_array / application_arg_array are used as-is.
         effective_extra_ports = list(ol_app_k8s_config.extra_container_ports)
         if ol_app_k8s_config.granian_config is not None:
-            gc = ol_app_k8s_config.granian_config
+            gc, granian_tuning = ol_app_k8s_config.granian_config.tuned(
+                ol_app_k8s_config.resource_requests, ol_app_k8s_config.resource_limits
+            )
+            if granian_tuning is not None:
+                log.info(
+                    f"{ol_app_k8s_config.application_name}: granian tuned from its "
+                    f"request profile\n{granian_tuning.explain()}",
+                    resource=self,
+                )
             # Derive workers_max_rss from the container memory limit when not explicit.
             # Formula: floor(memory_limit_bytes / workers * 0.9) MiB
             if (
@@ -1290,17 +1759,21 @@ class OLApplicationK8s(ComponentResource):
         # Config/secret content folded into a rolling-restart annotation on the
         # webapp/celery/beat pod templates. Kubernetes only restarts pods when their
         # pod template changes, so this catches config that's referenced by name
-        # (and therefore wouldn't otherwise show up in the pod spec diff).
+        # (and therefore wouldn't otherwise show up in the pod spec diff). Each
+        # Deployment hashes only what its own pods mount: the shared inputs, plus
+        # its entry in deployment_config_hash_inputs, plus (webapp only) the
+        # nginx/uwsgi config below.
         config_hash_sources: dict[str, str | Output[str]] = dict(
             ol_app_k8s_config.config_hash_inputs
         )
+        webapp_config_hash_sources: dict[str, str | Output[str]] = {}
 
         # Import nginx configuration as a configmap
         if ol_app_k8s_config.import_nginx_config:
             _nginx_conf_text = ol_app_k8s_config.project_root.joinpath(
                 effective_nginx_config_path
             ).read_text()
-            config_hash_sources["nginx.conf"] = _nginx_conf_text
+            webapp_config_hash_sources["nginx.conf"] = _nginx_conf_text
             application_nginx_configmap = kubernetes.core.v1.ConfigMap(
                 f"{ol_app_k8s_config.application_name}-application-{stack_info.env_suffix}-nginx-configmap",
                 metadata=kubernetes.meta.v1.ObjectMetaArgs(
@@ -1356,7 +1829,7 @@ class OLApplicationK8s(ComponentResource):
             _uwsgi_ini_text = ol_app_k8s_config.project_root.joinpath(
                 "files/uwsgi.ini"
             ).read_text()
-            config_hash_sources["uwsgi.ini"] = _uwsgi_ini_text
+            webapp_config_hash_sources["uwsgi.ini"] = _uwsgi_ini_text
             application_uwsgi_configmap = kubernetes.core.v1.ConfigMap(
                 f"{ol_app_k8s_config.application_name}-application-{stack_info.env_suffix}-uwsgi-configmap",
                 metadata=kubernetes.meta.v1.ObjectMetaArgs(
@@ -1393,6 +1866,38 @@ class OLApplicationK8s(ComponentResource):
         application_deployment_env_vars = build_application_env_vars(
             ol_app_k8s_config.application_config
         )
+        # The long-running processes reach the database through PgBouncer; the
+        # one-off ones (migrations, deploy commands, scheduled jobs) keep
+        # application_deployment_env_vars and its direct connection, because they
+        # are few, short-lived, and the likeliest to depend on session state that
+        # transaction pooling drops between statements.
+        pooled_env_vars = application_deployment_env_vars
+        self.pgbouncer: OLPgBouncer | None = None
+        if ol_app_k8s_config.pgbouncer_config is not None:
+            self.pgbouncer = OLPgBouncer(
+                f"{ol_app_k8s_config.application_name}-pgbouncer-{stack_info.env_suffix}",
+                ol_app_k8s_config.pgbouncer_config.model_copy(
+                    update={
+                        "application_name": ol_app_k8s_config.application_name,
+                        "namespace": ol_app_k8s_config.application_namespace,
+                        "labels": ol_app_k8s_config.k8s_global_labels,
+                        # Same pod security group as the application, which is what
+                        # the RDS security group admits.
+                        "pod_labels": {
+                            "ol.mit.edu/pod-security-group": ol_app_k8s_config.application_security_group_name.apply(
+                                truncate_k8s_metanames
+                            ),
+                        },
+                    }
+                ),
+                opts=resource_options,
+            )
+            # Last, so it overrides an application_config entry of the same name;
+            # env of any position overrides a URL arriving through envFrom.
+            pooled_env_vars = [
+                *application_deployment_env_vars,
+                *self.pgbouncer.client_env,
+            ]
         # Build a list of sensitive env vars for the deployment config via envFrom
         application_deployment_envfrom = []
         for secret_name in ol_app_k8s_config.env_from_secret_names:
@@ -1404,6 +1909,31 @@ class OLApplicationK8s(ComponentResource):
                 )
             )
 
+        def deployment_envfrom(
+            deployment_name: str,
+        ) -> list[kubernetes.core.v1.EnvFromSourceArgs]:
+            # The shared secrets, then the ones only this Deployment reads. Jobs
+            # and CronJobs get the shared list alone.
+            return [
+                *application_deployment_envfrom,
+                *(
+                    kubernetes.core.v1.EnvFromSourceArgs(
+                        secret_ref=kubernetes.core.v1.SecretEnvSourceArgs(
+                            name=secret_name,
+                        ),
+                    )
+                    for secret_name in (
+                        ol_app_k8s_config.deployment_env_from_secret_names.get(
+                            deployment_name, []
+                        )
+                    )
+                ),
+            ]
+
+        webapp_envfrom = deployment_envfrom(
+            webapp_deployment_name(ol_app_k8s_config.application_name)
+        )
+
         image_pull_policy = ol_app_k8s_config.image_pull_policy
         if (
             ol_app_k8s_config.application_docker_tag
@@ -1448,7 +1978,7 @@ class OLApplicationK8s(ComponentResource):
                     command=["python3", "manage.py", "migrate", "--noinput"],
                     image_pull_policy=image_pull_policy,
                     env=application_deployment_env_vars,
-                    env_from=application_deployment_envfrom,
+                    env_from=webapp_envfrom,
                     volume_mounts=[
                         *ol_app_k8s_config.extra_volume_mounts,
                         *ol_app_k8s_config.extra_init_volume_mounts,
@@ -1465,7 +1995,7 @@ class OLApplicationK8s(ComponentResource):
                     command=["python3", "manage.py", "collectstatic", "--noinput"],
                     image_pull_policy=image_pull_policy,
                     env=application_deployment_env_vars,
-                    env_from=application_deployment_envfrom,
+                    env_from=webapp_envfrom,
                     volume_mounts=[
                         kubernetes.core.v1.VolumeMountArgs(
                             name="staticfiles",
@@ -1527,18 +2057,23 @@ class OLApplicationK8s(ComponentResource):
                 ol_app_k8s_config.pod_security_context
             )
 
-        # Annotation applied to every pod template so that changes to config/secret
-        # content named in config_hash_sources (nginx/uwsgi config managed by this
-        # component, plus anything the caller adds via config_hash_inputs) trigger a
-        # rolling restart even though the pod spec itself is otherwise unchanged.
-        pod_config_hash_annotations: dict[str, Output[str]] = {}
-        if config_hash_sources:
-            pod_config_hash_annotations["ol.mit.edu/config-hash"] = Output.all(
-                **config_hash_sources
-            ).apply(
-                lambda values: hashlib.sha256(
-                    json.dumps(values, sort_keys=True).encode()
-                ).hexdigest()
+        # Annotations applied to the pod templates so that changes to config/secret
+        # content a Deployment reads trigger a rolling restart of that Deployment
+        # even though its pod spec is otherwise unchanged. Scheduled jobs pick up
+        # new config on their next run, so they only carry the shared hash.
+        pod_config_hash_annotations = config_hash_annotations(config_hash_sources)
+
+        def deployment_config_hash_annotations(
+            deployment_name: str, extra_sources: dict[str, str | Output[str]] | None
+        ) -> dict[str, Output[str]]:
+            return config_hash_annotations(
+                {
+                    **config_hash_sources,
+                    **(extra_sources or {}),
+                    **ol_app_k8s_config.deployment_config_hash_inputs.get(
+                        deployment_name, {}
+                    ),
+                }
             )
 
         _application_deployment_name = webapp_deployment_name(
@@ -1550,7 +2085,9 @@ class OLApplicationK8s(ComponentResource):
         self.webapp_deployment_name: str = _application_deployment_name
         self.celery_deployment_names: list[str] = []
         self.celery_deployments: list[kubernetes.apps.v1.Deployment] = []
+        self.celery_scaled_objects: list[kubernetes.apiextensions.CustomResource] = []
         self.beat_deployment_name: str | None = None
+        self.beat_deployment: kubernetes.apps.v1.Deployment | None = None
         self.scheduled_job_names: list[str] = []
         self.scheduled_jobs: list[kubernetes.batch.v1.CronJob] = []
         self.webapp_pod_monitor: kubernetes.apiextensions.CustomResource | None = None
@@ -1689,8 +2226,8 @@ class OLApplicationK8s(ComponentResource):
                 ),
                 command=effective_cmd_array,
                 args=effective_arg_array,
-                env=application_deployment_env_vars,
-                env_from=application_deployment_envfrom,
+                env=pooled_env_vars,
+                env_from=webapp_envfrom,
                 volume_mounts=webapp_volume_mounts,
                 # `is None` rather than a falsy check: an explicitly supplied
                 # empty mapping means "no probes at all", which the literal-dict
@@ -1734,7 +2271,10 @@ class OLApplicationK8s(ComponentResource):
                             "kubectl.kubernetes.io/default-container": (
                                 f"{ol_app_k8s_config.application_name}-app"
                             ),
-                            **pod_config_hash_annotations,
+                            **deployment_config_hash_annotations(
+                                _application_deployment_name,
+                                webapp_config_hash_sources,
+                            ),
                         },
                     ),
                     spec=kubernetes.core.v1.PodSpecArgs(
@@ -2242,7 +2782,10 @@ class OLApplicationK8s(ComponentResource):
                     template=kubernetes.core.v1.PodTemplateSpecArgs(
                         metadata=kubernetes.meta.v1.ObjectMetaArgs(
                             labels=celery_labels,
-                            annotations=pod_config_hash_annotations or None,
+                            annotations=deployment_config_hash_annotations(
+                                _celery_deployment_name, None
+                            )
+                            or None,
                         ),
                         # Ref: https://docs.celeryq.dev/en/stable/reference/cli.html#celery-worker
                         spec=kubernetes.core.v1.PodSpecArgs(
@@ -2294,7 +2837,7 @@ class OLApplicationK8s(ComponentResource):
                                         celery_worker_config.log_level,
                                         "--max-tasks-per-child",  # Max number of tasks the pool worker will process before being replaced
                                         "100",
-                                        "--concurrency=2",  # Don't try to use all cores on node
+                                        f"--concurrency={CELERY_WORKER_CONCURRENCY}",
                                         "--prefetch-multiplier=1",
                                     ],
                                     env=[
@@ -2306,9 +2849,11 @@ class OLApplicationK8s(ComponentResource):
                                             name="CELERY_TASK_REJECT_ON_WORKER_LOST",
                                             value="True",
                                         ),
-                                        *application_deployment_env_vars,
+                                        *pooled_env_vars,
                                     ],
-                                    env_from=application_deployment_envfrom,
+                                    env_from=deployment_envfrom(
+                                        _celery_deployment_name
+                                    ),
                                     resources=kubernetes.core.v1.ResourceRequirementsArgs(
                                         requests=celery_worker_config.resource_requests,
                                         limits=celery_worker_config.resource_limits,
@@ -2327,16 +2872,10 @@ class OLApplicationK8s(ComponentResource):
             )
             self.celery_deployments.append(_celery_deployment)
 
-            _celery_scaled_object = kubernetes.apiextensions.CustomResource(
-                f"{ol_app_k8s_config.application_name}-celery-worker-{celery_worker_config.worker_name}-{stack_info.env_suffix}-scaledobject",
-                api_version="keda.sh/v1alpha1",
-                kind="ScaledObject",
-                metadata=kubernetes.meta.v1.ObjectMetaArgs(
-                    name=_celery_deployment_name,
-                    namespace=ol_app_k8s_config.application_namespace,
-                    labels=celery_labels,
-                ),
-                spec=Output.all(
+            queue_scaling = celery_worker_config.queue_scaling
+            _celery_scaled_object_depends_on: list[Resource] = []
+            if queue_scaling is None:
+                _celery_scaled_object_spec = Output.all(
                     deployment_name=_celery_deployment_name,
                     celery_config=celery_worker_config,
                     redis_host=celery_worker_config.redis_host,
@@ -2388,11 +2927,87 @@ class OLApplicationK8s(ComponentResource):
                             },
                         ],
                     }
+                )
+            else:
+                _celery_redis_auth_name = truncate_k8s_metanames(
+                    f"{_celery_deployment_name}-keda-redis"
+                )
+                _celery_redis_secret_name = queue_scaling.redis_password_secret_name
+                _celery_redis_auth_depends_on: list[Resource] = []
+                # validate_redis_password guarantees a password when no Secret is named.
+                if (
+                    _celery_redis_secret_name is None
+                    and celery_worker_config.redis_password is not None
+                ):
+                    _celery_redis_secret_name = _celery_redis_auth_name
+                    _celery_redis_auth_depends_on.append(
+                        kubernetes.core.v1.Secret(
+                            f"{ol_app_k8s_config.application_name}-celery-worker-{celery_worker_config.worker_name}-{stack_info.env_suffix}-keda-redis-secret",
+                            metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                                name=_celery_redis_secret_name,
+                                namespace=ol_app_k8s_config.application_namespace,
+                                labels=celery_labels,
+                            ),
+                            type="Opaque",
+                            string_data={
+                                queue_scaling.redis_password_secret_key: Output.secret(
+                                    celery_worker_config.redis_password
+                                )
+                            },
+                            opts=resource_options,
+                        )
+                    )
+                _celery_scaled_object_depends_on.append(
+                    kubernetes.apiextensions.CustomResource(
+                        f"{ol_app_k8s_config.application_name}-celery-worker-{celery_worker_config.worker_name}-{stack_info.env_suffix}-keda-redis-auth",
+                        api_version="keda.sh/v1alpha1",
+                        kind="TriggerAuthentication",
+                        metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                            name=_celery_redis_auth_name,
+                            namespace=ol_app_k8s_config.application_namespace,
+                            labels=celery_labels,
+                        ),
+                        spec={
+                            "secretTargetRef": [
+                                {
+                                    "parameter": "password",
+                                    "name": _celery_redis_secret_name,
+                                    "key": queue_scaling.redis_password_secret_key,
+                                }
+                            ]
+                        },
+                        opts=resource_options.merge(
+                            ResourceOptions(depends_on=_celery_redis_auth_depends_on)
+                        ),
+                    )
+                )
+                _celery_scaled_object_spec = celery_worker_config.redis_host.apply(
+                    partial(
+                        celery_queue_scaled_object_spec,
+                        celery_worker_config,
+                        deployment_name=_celery_deployment_name,
+                        redis_trigger_authentication_name=_celery_redis_auth_name,
+                    )
+                )
+
+            _celery_scaled_object = kubernetes.apiextensions.CustomResource(
+                f"{ol_app_k8s_config.application_name}-celery-worker-{celery_worker_config.worker_name}-{stack_info.env_suffix}-scaledobject",
+                api_version="keda.sh/v1alpha1",
+                kind="ScaledObject",
+                metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                    name=_celery_deployment_name,
+                    namespace=ol_app_k8s_config.application_namespace,
+                    labels=celery_labels,
                 ),
+                spec=_celery_scaled_object_spec,
                 opts=resource_options.merge(
-                    ResourceOptions(delete_before_replace=True)
+                    ResourceOptions(
+                        delete_before_replace=True,
+                        depends_on=_celery_scaled_object_depends_on,
+                    )
                 ),
             )
+            self.celery_scaled_objects.append(_celery_scaled_object)
 
         if ol_app_k8s_config.celery_beat_config is not None:
             beat_config = ol_app_k8s_config.celery_beat_config
@@ -2412,7 +3027,7 @@ class OLApplicationK8s(ComponentResource):
                 ol_app_k8s_config.application_name
             )
             self.beat_deployment_name = _beat_deployment_name
-            _beat_deployment = kubernetes.apps.v1.Deployment(
+            self.beat_deployment = kubernetes.apps.v1.Deployment(
                 f"{ol_app_k8s_config.application_name}-celery-beat-{stack_info.env_suffix}",
                 metadata=kubernetes.meta.v1.ObjectMetaArgs(
                     name=_beat_deployment_name,
@@ -2427,7 +3042,10 @@ class OLApplicationK8s(ComponentResource):
                     template=kubernetes.core.v1.PodTemplateSpecArgs(
                         metadata=kubernetes.meta.v1.ObjectMetaArgs(
                             labels=beat_labels,
-                            annotations=pod_config_hash_annotations or None,
+                            annotations=deployment_config_hash_annotations(
+                                _beat_deployment_name, None
+                            )
+                            or None,
                         ),
                         spec=kubernetes.core.v1.PodSpecArgs(
                             service_account_name=ol_app_k8s_config.application_service_account_name,
@@ -2465,8 +3083,8 @@ class OLApplicationK8s(ComponentResource):
                                         "-l",
                                         beat_config.log_level,
                                     ],
-                                    env=application_deployment_env_vars,
-                                    env_from=application_deployment_envfrom,
+                                    env=pooled_env_vars,
+                                    env_from=deployment_envfrom(_beat_deployment_name),
                                     resources=kubernetes.core.v1.ResourceRequirementsArgs(
                                         requests=beat_config.resource_requests,
                                         limits=beat_config.resource_limits,
@@ -2492,7 +3110,8 @@ class OLApplicationK8s(ComponentResource):
             # can be slow must not perturb webapp scaling. The pod-security-group label
             # is kept because the SecurityGroupPolicy below selects on it, and without
             # it the job has no route to RDS/Mongo/the search cluster.
-            scheduled_job_labels = ol_app_k8s_config.k8s_global_labels | {
+            scheduled_job_labels: dict[str, str | Output[str]] = {
+                **ol_app_k8s_config.k8s_global_labels,
                 "ol.mit.edu/component": "scheduled-job",
                 "ol.mit.edu/application": f"{ol_app_k8s_config.application_name}",
                 "ol.mit.edu/pod-security-group": ol_app_k8s_config.application_security_group_name.apply(
@@ -2627,8 +3246,8 @@ class OLApplicationK8s(ComponentResource):
     def all_deployment_names(self) -> list[str]:
         """All Kubernetes Deployment names managed by this component.
 
-        Includes the webapp deployment, all celery worker deployments, and the
-        celery beat deployment (if configured).  Use this to populate
+        Includes the webapp deployment, all celery worker deployments, the
+        celery beat deployment and the PgBouncer deployment (if configured).  Use this to populate
         ``restart_targets`` on ``OLVaultK8SDynamicSecretConfig`` so that all
         pods restart when Vault dynamic credentials are rotated:
 
@@ -2642,9 +3261,14 @@ class OLApplicationK8s(ComponentResource):
                     for name in app.all_deployment_names
                 ],
             )
+
+        For a secret only some of these Deployments read, use the module-level
+        ``deployments_reading_secret`` instead.
         """
         names = [self.webapp_deployment_name]
         names.extend(self.celery_deployment_names)
         if self.beat_deployment_name:
             names.append(self.beat_deployment_name)
+        if self.pgbouncer is not None:
+            names.append(self.pgbouncer.deployment_name)
         return names
@@ -0,0 +1,540 @@
+"""A transaction-mode PgBouncer tier in front of an application's RDS database.
+
+This packages what `applications/dagster/__main__.py` learned the hard way, so an
+application gets connection multiplexing without re-deriving it:
+
+- **The pool is sized from the database, not guessed.** `max_db_connections` is
+  ``postgres_max_connections(instance class) x headroom / replicas``, and
+  ``default_pool_size`` is tied to it so there is one binding ceiling instead of the
+  smallest of three. Dagster's pool once held 4989 of 5000 backends for 88 minutes
+  because nothing bounded the aggregate.
+- **Rollouts cannot overcommit.** The per-pod cap is only correct while the running
+  pod count is at most ``replicas``, so the Deployment surges by zero.
+- **Config edits roll the pods.** An init container renders the ini once at boot, so
+  the template's hash is on the pod template; without it an edit deploys clean and
+  never takes effect.
+- **The pool is observable.** A pgbouncer_exporter sidecar and a PodMonitor expose
+  per-pod pool metrics -- per pod because a skewed pod saturates its own cap while
+  the aggregate still looks calm.
+
+Clients authenticate with ``auth_type = scram-sha-256`` against the same login
+PgBouncer uses for RDS, rendered into ``userlist.txt`` next to the ini. A ClusterIP
+Service is reachable from every pod in the cluster, so admitting any client would
+hand the application's database to anything that can resolve the Service name.
+"""
+
+import hashlib
+from functools import cached_property
+from typing import Any
+
+import pulumi_kubernetes as kubernetes
+from pulumi import ComponentResource, Output, ResourceOptions
+from pydantic import BaseModel, ConfigDict, Field, PositiveInt, field_validator
+
+from bridge.lib.magic_numbers import DEFAULT_POSTGRES_PORT, MAXIMUM_K8S_NAME_LENGTH
+from bridge.lib.versions import PGBOUNCER_EXPORTER_VERSION, PGBOUNCER_VERSION
+from ol_infrastructure.lib.aws.rds_helper import postgres_max_connections
+
+PGBOUNCER_PORT = 5432
+PGBOUNCER_EXPORTER_PORT = 9127
+
+
+def pgbouncer_deployment_name(application_name: str) -> str:
+    """Name of the PgBouncer Deployment (and Service) fronting an application."""
+    return f"{application_name}-pgbouncer"[:MAXIMUM_K8S_NAME_LENGTH].rstrip("-_.")
+
+
+def pgbouncer_pool_size(
+    max_connections: int, headroom_factor: float, replicas: int
+) -> int:
+    """Return the per-replica ``max_db_connections`` for a database's budget.
+
+    ``max_connections x headroom_factor`` is the aggregate every replica may open
+    together; each replica gets an equal share because PgBouncer has no way to
+    coordinate a shared limit. The headroom is for what is not pooled: RDS's reserved
+    and ``rdsadmin`` sessions, migrations, Vault's credential rotation logins and
+    ad-hoc psql. Below the 5000 cap it must also absorb ``postgres_max_connections``
+    overstating the real limit by ~8%.
+
+    Raises if the share rounds to zero, which a pool would treat as "unlimited".
+    """
+    per_replica = int(max_connections * headroom_factor // replicas)
+    if per_replica < 1:
+        msg = (
+            f"{max_connections} connections x {headroom_factor} headroom leaves no "
+            f"backends for each of {replicas} PgBouncer replicas"
+        )
+        raise ValueError(msg)
+    return per_replica
+
+
+class OLPgBouncerConfig(BaseModel):
+    """Where the pool connects, how large it may grow, and how clients find it.
+
+    ``credentials_secret_name`` names a Kubernetes Secret, usually rendered by
+    ``OLVaultK8SSecret`` from a Vault database role, holding the login PgBouncer uses
+    against RDS. Give that secret a restart target on
+    ``pgbouncer_deployment_name(application_name)``: the ini is rendered at pod start,
+    so rotated credentials only reach PgBouncer when its pods restart. Clients log in
+    with that same secret, so they pick up a rotation when they restart too.
+
+    ``application_name``, ``namespace``, ``labels`` and ``pod_labels`` say where the
+    pool runs; ``OLApplicationK8s`` fills them in from its own config.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    application_name: str | None = Field(
+        default=None,
+        description="Application the pool serves; names its Deployment and Service.",
+    )
+    namespace: str | None = None
+    labels: dict[str, str] = Field(default_factory=dict)
+    pod_labels: dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Extra pod labels only, e.g. the pod security group RDS admits. Not "
+            "part of the selector."
+        ),
+    )
+
+    db_host: str | Output[str]
+    db_port: PositiveInt = DEFAULT_POSTGRES_PORT
+    db_name: str
+    db_instance_class: str = Field(
+        description=(
+            "RDS instance class of the database, e.g. db.m7g.large. Its memory "
+            "determines max_connections, which the pool is sized against."
+        )
+    )
+    db_max_connections: PositiveInt | None = Field(
+        default=None,
+        description=(
+            "The database's max_connections, when a parameter group sets it "
+            "explicitly. Overrides the figure derived from db_instance_class."
+        ),
+    )
+    credentials_secret_name: str
+    username_key: str = "DB_USERNAME"
+    password_key: str = "DB_PASSWORD"  # noqa: S105  # pragma: allowlist secret
+    replicas: PositiveInt = 2
+    headroom_factor: float = Field(
+        default=0.85,
+        gt=0,
+        le=1,
+        description=(
+            "Fraction of max_connections the pool may hold across all replicas. "
+            "Other databases' pools on the same instance are NOT accounted for: "
+            "lower this if the instance is shared."
+        ),
+    )
+    min_pool_size: int = Field(
+        default=5,
+        ge=0,
+        description=(
+            "Backends each replica keeps open while idle. Size to the measured "
+            "per-replica peak, not above it -- parked backends are the number "
+            "CloudWatch DatabaseConnections reports, so an inflated floor hides "
+            "real demand."
+        ),
+    )
+    max_client_conn: PositiveInt = Field(
+        default=1000,
+        description=(
+            "Client sockets each replica accepts. Keep well above "
+            "max_db_connections: a queued client costs a socket, a refused one "
+            "costs a request."
+        ),
+    )
+    query_wait_timeout: PositiveInt = Field(
+        default=120,
+        description=(
+            "Seconds a client may queue for a backend before it is disconnected. "
+            "Never 0: the timeout is what breaks a pool deadlock."
+        ),
+    )
+    database_url_env_var: str = Field(
+        default="DATABASE_URL",
+        description="Env var the application reads its database URL from.",
+    )
+    database_url_scheme: str = "postgres"
+    resource_requests: dict[str, str] = Field(default={"cpu": "50m", "memory": "64Mi"})
+    resource_limits: dict[str, str] = Field(default={"memory": "128Mi"})
+
+    @field_validator("db_host")
+    @classmethod
+    def validate_db_host(cls, db_host: str | Output[str]) -> Output[str]:
+        """Ensure that the database host is unwrapped from the Pulumi Output."""
+        return Output.from_input(db_host)
+
+    @cached_property
+    def max_db_connections(self) -> int:
+        """The per-replica backend cap for this database, resolved once per config."""
+        max_connections = self.db_max_connections or postgres_max_connections(
+            self.db_instance_class
+        )
+        return pgbouncer_pool_size(max_connections, self.headroom_factor, self.replicas)
+
+
+def render_pgbouncer_ini(
+    config: OLPgBouncerConfig, db_host: str, max_db_connections: int
+) -> str:
+    """Render the pgbouncer.ini template for `config`.
+
+    ``${PGUSER}`` and ``${PGPASSWORD}`` stay literal here; the init container
+    substitutes them at pod start. That keeps credential rotation out of the
+    template's hash, so only real config changes roll the pods.
+    """
+    return "\n".join(
+        [
+            "[databases]",
+            f"{config.db_name} = host={db_host} port={config.db_port}"
+            f" dbname={config.db_name} user=${{PGUSER}} password=${{PGPASSWORD}}",
+            "",
+            "[pgbouncer]",
+            "listen_addr = 0.0.0.0",
+            f"listen_port = {PGBOUNCER_PORT}",
+            "auth_type = scram-sha-256",
+            "auth_file = /etc/pgbouncer/userlist.txt",
+            # The exporter logs in to the admin console with the pool's own login.
+            "stats_users = ${PGUSER}",
+            # Transaction mode is the point of the tier: session mode pins a backend
+            # per client connection, which Dagster measured at 782 clients on 759
+            # backends -- a proxy with a limit, not a pool. The application must not
+            # rely on session state (SET, advisory locks, LISTEN, server-side
+            # cursors) outside a transaction.
+            "pool_mode = transaction",
+            f"max_client_conn = {config.max_client_conn}",
+            # default_pool_size equals the cap and the reserve is off, so
+            # max_db_connections is the only ceiling and alerts measured against
+            # pgbouncer_databases_max_connections stay honest.
+            f"default_pool_size = {max_db_connections}",
+            f"min_pool_size = {min(config.min_pool_size, max_db_connections)}",
+            "reserve_pool_size = 0",
+            f"max_db_connections = {max_db_connections}",
+            # Fail loudly if a driver tries server-side prepared statements.
+            "max_prepared_statements = 0",
+            "server_connect_timeout = 15",
+            "server_reset_query =",
+            "server_check_query = ;",
+            "server_check_delay = 30",
+            "server_lifetime = 1800",
+            # Shorter than RDS's tcp_keepalives_idle (300s), so PgBouncer closes
+            # idle backends before RDS drops them silently.
+            "server_idle_timeout = 120",
+            f"query_wait_timeout = {config.query_wait_timeout}",
+            # Django without persistent connections opens one per request; logging
+            # each is most of the pod's log volume and none of its signal.
+            "log_connections = 0",
+            "log_disconnections = 0",
+            # pgbouncer_exporter's driver sends extra_float_digits on connect.
+            "ignore_startup_parameters = extra_float_digits",
+            "application_name_add_host = 1",
+            "",
+        ]
+    )
+
+
+def _credential_env(
+    config: OLPgBouncerConfig, user_env_var: str, password_env_var: str
+) -> list[kubernetes.core.v1.EnvVarArgs]:
+    """Env vars reading the pool's login from ``credentials_secret_name``."""
+    return [
+        kubernetes.core.v1.EnvVarArgs(
+            name=env_name,
+            value_from=kubernetes.core.v1.EnvVarSourceArgs(
+                secret_key_ref=kubernetes.core.v1.SecretKeySelectorArgs(
+                    name=config.credentials_secret_name,
+                    key=secret_key,
+                ),
+            ),
+        )
+        for env_name, secret_key in (
+            (user_env_var, config.username_key),
+            (password_env_var, config.password_key),
+        )
+    ]
+
+
+class OLPgBouncer(ComponentResource):
+    """PgBouncer Deployment, Service and PodMonitor for one application database.
+
+    ``client_env`` is the env an application container needs to connect through the
+    pool: the pool's login from ``credentials_secret_name`` and the database URL env
+    var built from it and pointed at the Service. Container ``env`` takes precedence
+    over ``envFrom``, so it overrides a direct URL from a Vault secret.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pgbouncer_config: OLPgBouncerConfig,
+        opts: ResourceOptions | None = None,
+    ):
+        super().__init__(
+            "ol:infrastructure:components:services:OLPgBouncer", name, None, opts
+        )
+        application_name = pgbouncer_config.application_name
+        namespace = pgbouncer_config.namespace
+        if application_name is None or namespace is None:
+            msg = "OLPgBouncerConfig needs application_name and namespace"
+            raise ValueError(msg)
+        resource_options = ResourceOptions(parent=self)
+        self.deployment_name = pgbouncer_deployment_name(application_name)
+        self.max_db_connections = pgbouncer_config.max_db_connections
+
+        # Deliberately narrow: a Deployment selector is immutable, so deriving it
+        # from a label set that grows would turn every new label into a replace.
+        selector_labels = {
+            "ol.mit.edu/application": application_name,
+            "ol.mit.edu/component": "pgbouncer",
+        }
+        resource_labels = pgbouncer_config.labels | selector_labels
+
+        ini_template = Output.from_input(pgbouncer_config.db_host).apply(
+            lambda host: render_pgbouncer_ini(
+                pgbouncer_config, host, self.max_db_connections
+            )
+        )
+        self.config_map = kubernetes.core.v1.ConfigMap(
+            f"{name}-configmap",
+            metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                name=f"{self.deployment_name}-config",
+                namespace=namespace,
+                labels=resource_labels,
+            ),
+            data={"pgbouncer.ini.template": ini_template},
+            # Fixed name, so a data change can only be delete-then-create.
+            opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
+        )
+
+        image = f"ghcr.io/cloudnative-pg/pgbouncer:{PGBOUNCER_VERSION}"
+        credential_env = _credential_env(pgbouncer_config, "PGUSER", "PGPASSWORD")
+        self.deployment = kubernetes.apps.v1.Deployment(
+            f"{name}-deployment",
+            metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                name=self.deployment_name,
+                namespace=namespace,
+                labels=resource_labels,
+            ),
+            spec=kubernetes.apps.v1.DeploymentSpecArgs(
+                replicas=pgbouncer_config.replicas,
+                # max_db_connections is a per-pod share of the budget; a surge pod
+                # would take a share nobody gave up.
+                strategy=kubernetes.apps.v1.DeploymentStrategyArgs(
+                    type="RollingUpdate",
+                    rolling_update=kubernetes.apps.v1.RollingUpdateDeploymentArgs(
+                        max_surge=0,
+                        max_unavailable=1,
+                    ),
+                ),
+                selector=kubernetes.meta.v1.LabelSelectorArgs(
+                    match_labels=selector_labels,
+                ),
+                template=kubernetes.core.v1.PodTemplateSpecArgs(
+                    metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                        labels=resource_labels | pgbouncer_config.pod_labels,
+                        annotations={
+                            "checksum/ol-pgbouncer-config": ini_template.apply(
+                                lambda text: hashlib.sha256(text.encode()).hexdigest()
+                            ),
+                        },
+                    ),
+                    spec=kubernetes.core.v1.PodSpecArgs(
+                        init_containers=[
+                            kubernetes.core.v1.ContainerArgs(
+                                name="render-config",
+                                image=image,
+                                command=[
+                                    "/bin/sh",
+                                    "-c",
+                                    "sed"
+                                    ' -e "s/\\${PGUSER}/$PGUSER/g"'
+                                    ' -e "s/\\${PGPASSWORD}/$PGPASSWORD/g"'
+                                    " /config-template/pgbouncer.ini.template"
+                                    " > /config-out/pgbouncer.ini"
+                                    # A plain-text entry; PgBouncer runs the SCRAM
+                                    # exchange against it.
+                                    ' && printf \'"%s" "%s"\\n\''
+                                    ' "$PGUSER" "$PGPASSWORD"'
+                                    " > /config-out/userlist.txt",
+                                ],
+                                env=credential_env,
+                                volume_mounts=[
+                                    kubernetes.core.v1.VolumeMountArgs(
+                                        name="config-template",
+                                        mount_path="/config-template",
+                                        read_only=True,
+                                    ),
+                                    kubernetes.core.v1.VolumeMountArgs(
+                                        name="config-out",
+                                        mount_path="/config-out",
+                                    ),
+                                ],
+                            ),
+                        ],
+                        containers=[
+                            kubernetes.core.v1.ContainerArgs(
+                                name="pgbouncer",
+                                image=image,
+                                ports=[
+                                    kubernetes.core.v1.ContainerPortArgs(
+                                        name="pgbouncer",
+                                        container_port=PGBOUNCER_PORT,
+                                        protocol="TCP",
+                                    ),
+                                ],
+                                volume_mounts=[
+                                    kubernetes.core.v1.VolumeMountArgs(
+                                        name="config-out",
+                                        mount_path="/etc/pgbouncer",
+                                    ),
+                                ],
+                                resources=kubernetes.core.v1.ResourceRequirementsArgs(
+                                    requests=pgbouncer_config.resource_requests,
+                                    limits=pgbouncer_config.resource_limits,
+                                ),
+                                liveness_probe=kubernetes.core.v1.ProbeArgs(
+                                    tcp_socket=kubernetes.core.v1.TCPSocketActionArgs(
+                                        port=PGBOUNCER_PORT,
+                                    ),
+                                    initial_delay_seconds=10,
+                                    period_seconds=10,
+                                ),
+                                readiness_probe=kubernetes.core.v1.ProbeArgs(
+                                    tcp_socket=kubernetes.core.v1.TCPSocketActionArgs(
+                                        port=PGBOUNCER_PORT,
+                                    ),
+                                    initial_delay_seconds=5,
+                                    period_seconds=5,
+                                ),
+                            ),
+                            # Reads the admin console over localhost as one of its
+                            # stats_users. Liveness only: a failing scrape must never
+                            # pull PgBouncer out of the Service.
+                            kubernetes.core.v1.ContainerArgs(
+                                name="pgbouncer-exporter",
+                                image=(
+                                    "quay.io/prometheuscommunity/pgbouncer-exporter:"
+                                    f"{PGBOUNCER_EXPORTER_VERSION}"
+                                ),
+                                env=[
+                                    *credential_env,
+                                    kubernetes.core.v1.EnvVarArgs(
+                                        name="PGBOUNCER_EXPORTER_CONNECTION_STRING",
+                                        value=(
+                                            "postgres://$(PGUSER):$(PGPASSWORD)"
+                                            f"@127.0.0.1:{PGBOUNCER_PORT}/pgbouncer"
+                                            "?sslmode=disable"
+                                        ),
+                                    ),
+                                ],
+                                ports=[
+                                    kubernetes.core.v1.ContainerPortArgs(
+                                        name="metrics",
+                                        container_port=PGBOUNCER_EXPORTER_PORT,
+                                        protocol="TCP",
+                                    ),
+                                ],
+                                resources=kubernetes.core.v1.ResourceRequirementsArgs(
+                                    requests={"cpu": "10m", "memory": "32Mi"},
+                                    limits={"memory": "64Mi"},
+                                ),
+                                liveness_probe=kubernetes.core.v1.ProbeArgs(
+                                    http_get=kubernetes.core.v1.HTTPGetActionArgs(
+                                        path="/metrics",
+                                        port=PGBOUNCER_EXPORTER_PORT,
+                                    ),
+                                    initial_delay_seconds=10,
+                                    period_seconds=30,
+                                    failure_threshold=3,
+                                ),
+                            ),
+                        ],
+                        volumes=[
+                            kubernetes.core.v1.VolumeArgs(
+                                name="config-template",
+                                config_map=kubernetes.core.v1.ConfigMapVolumeSourceArgs(
+                                    name=self.config_map.metadata.name,
+                                ),
+                            ),
+                            kubernetes.core.v1.VolumeArgs(
+                                name="config-out",
+                                empty_dir=kubernetes.core.v1.EmptyDirVolumeSourceArgs(),
+                            ),
+                        ],
+                    ),
+                ),
+            ),
+            opts=resource_options,
+        )
+
+        self.service = kubernetes.core.v1.Service(
+            f"{name}-service",
+            metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                name=self.deployment_name,
+                namespace=namespace,
+                labels=resource_labels,
+            ),
+            spec=kubernetes.core.v1.ServiceSpecArgs(
+                type="ClusterIP",
+                selector=selector_labels,
+                ports=[
+                    kubernetes.core.v1.ServicePortArgs(
+                        name="pgbouncer",
+                        port=PGBOUNCER_PORT,
+                        target_port=PGBOUNCER_PORT,
+                        protocol="TCP",
+                    ),
+                ],
+            ),
+            opts=resource_options,
+        )
+
+        self.pod_monitor = kubernetes.apiextensions.CustomResource(
+            f"{name}-pod-monitor",
+            api_version="monitoring.coreos.com/v1",
+            kind="PodMonitor",
+            metadata=kubernetes.meta.v1.ObjectMetaArgs(
+                name=self.deployment_name,
+                namespace=namespace,
+                labels=resource_labels,
+            ),
+            spec={
+                "selector": {"matchLabels": selector_labels},
+                "podMetricsEndpoints": [
+                    {
+                        "port": "metrics",
+                        "path": "/metrics",
+                        "scheme": "http",
+                        "interval": "30s",
+                    }
+                ],
+                "namespaceSelector": {"matchNames": [namespace]},
+            },
+            opts=resource_options,
+        )
+
+        self.host = f"{self.deployment_name}.{namespace}.svc.cluster.local"
+        # Kubernetes expands $(VAR) from env entries listed earlier in the same
+        # container, so the URL carries the login without it appearing in the spec.
+        self.client_env = [
+            *_credential_env(
+                pgbouncer_config, "OL_PGBOUNCER_USER", "OL_PGBOUNCER_PASSWORD"
+            ),
+            kubernetes.core.v1.EnvVarArgs(
+                name=pgbouncer_config.database_url_env_var,
+                value=(
+                    f"{pgbouncer_config.database_url_scheme}://"
+                    "$(OL_PGBOUNCER_USER):$(OL_PGBOUNCER_PASSWORD)@"
+                    f"{self.host}:{PGBOUNCER_PORT}/{pgbouncer_config.db_name}"
+                ),
+            ),
+        ]
+        self.register_outputs(
+            {
+                "deployment_name": self.deployment_name,
+                "host": self.host,
+                "max_db_connections": self.max_db_connections,
+            }
+        )
@@ -68,6 +68,8 @@ from ol_infrastructure.lib.aws.iam_helper import (
 from ol_infrastructure.lib.fastly import get_fastly_provider
 from ol_infrastructure.lib.ol_types import AWSBase
 from ol_infrastructure.lib.pulumi_helper import (
+    ResourceGroup,
+    ResourceGroups,
     make_stack_reference,
     parse_stack,
 )
@@ -81,6 +83,43 @@ from ol_infrastructure.lib.vault import setup_vault_provider
 eks_config = Config("eks")
 env_config = Config("environment")
 
+# What `eks:resource_groups` can restrict a preview to (see
+# ol_infrastructure.lib.pulumi_helper.ResourceGroups). The cluster, its node groups
+# and addons are always built; these are the cluster services installed on top.
+resource_groups = ResourceGroups(
+    "eks",
+    [
+        ResourceGroup(
+            "vault_secrets_operator",
+            targets=("**::*-eks-vault-*", "**::*-vault-secrets-operator-*"),
+        ),
+        ResourceGroup("external_dns", targets=("**::*-external-dns-*",)),
+        ResourceGroup("cert_manager", targets=("**::*-cert-manager-*",)),
+        ResourceGroup("core_dns", targets=("**::*-coredns-*",)),
+        ResourceGroup(
+            "aws_integrations",
+            requires=("cert_manager",),
+            targets=(
+                "**::*-aws-load-balancer-controller-*",
+                "**::*-aws-node-termination-handler-*",
+            ),
+        ),
+        ResourceGroup("vpa", targets=("**::*-vpa-helm-release",)),
+        # Traefik and APISIX, and the Gateway API CRDs they share.
+        ResourceGroup(
+            "gateways",
+            requires=("aws_integrations", "vpa"),
+            targets=(
+                "**::*-gateway*",
+                "**::*-traefik*",
+                "**::*-apisix-*",
+                "**::*-apache-apisix*",
+            ),
+        ),
+        ResourceGroup("metrics_server", targets=("**::*-metrics-server-*",)),
+    ],
+)
+
 stack_info = parse_stack()
 setup_vault_provider(stack_info)
 aws_account = aws.get_caller_identity()
@@ -988,52 +1027,56 @@ if eks_config.get_bool("efs_csi_provisioner"):
     export("efs_storageclass", "efs-sc")
 
 
-setup_vault_secrets_operator(
-    cluster_name=cluster_name,
-    cluster=cluster,
-    k8s_provider=k8s_provider,
-    operations_namespace=operations_namespace,
-    node_groups=node_groups,
-    stack_info=stack_info,
-    k8s_global_labels=k8s_global_labels,
-    operations_tolerations=operations_tolerations,
-    versions=VERSIONS,
-)
+if resource_groups.selected("vault_secrets_operator"):
+    setup_vault_secrets_operator(
+        cluster_name=cluster_name,
+        cluster=cluster,
+        k8s_provider=k8s_provider,
+        operations_namespace=operations_namespace,
+        node_groups=node_groups,
+        stack_info=stack_info,
+        k8s_global_labels=k8s_global_labels,
+        operations_tolerations=operations_tolerations,
+        versions=VERSIONS,
+    )
 
-setup_external_dns(
-    cluster_name=cluster_name,
-    cluster=cluster,
-    aws_account=aws_account,
-    aws_config=aws_config,
-    k8s_provider=k8s_provider,
-    operations_namespace=operations_namespace,
-    node_groups=node_groups,
-    k8s_global_labels=k8s_global_labels,
-    operations_tolerations=operations_tolerations,
-    versions=VERSIONS,
-    eks_config=eks_config,
-)
+if resource_groups.selected("external_dns"):
+    setup_external_dns(
+        cluster_name=cluster_name,
+        cluster=cluster,
+        aws_account=aws_account,
+        aws_config=aws_config,
+        k8s_provider=k8s_provider,
+        operations_namespace=operations_namespace,
+        node_groups=node_groups,
+        k8s_global_labels=k8s_global_labels,
+        operations_tolerations=operations_tolerations,
+        versions=VERSIONS,
+        eks_config=eks_config,
+    )
 
-cert_manager_release = setup_cert_manager(
-    cluster_name=cluster_name,
-    cluster=cluster,
-    aws_account=aws_account,
-    aws_config=aws_config,
-    k8s_provider=k8s_provider,
-    operations_namespace=operations_namespace,
-    node_groups=node_groups,
-    k8s_global_labels=k8s_global_labels,
-    operations_tolerations=operations_tolerations,
-    versions=VERSIONS,
-)
+if resource_groups.selected("cert_manager"):
+    cert_manager_release = setup_cert_manager(
+        cluster_name=cluster_name,
+        cluster=cluster,
+        aws_account=aws_account,
+        aws_config=aws_config,
+        k8s_provider=k8s_provider,
+        operations_namespace=operations_namespace,
+        node_groups=node_groups,
+        k8s_global_labels=k8s_global_labels,
+        operations_tolerations=operations_tolerations,
+        versions=VERSIONS,
+    )
 
-create_core_dns_resources(
-    cluster_name=cluster_name,
-    k8s_global_labels=k8s_global_labels,
-    k8s_provider=k8s_provider,
-    cluster=cluster,
-    node_groups=node_groups,
-)
+if resource_groups.selected("core_dns"):
+    create_core_dns_resources(
+        cluster_name=cluster_name,
+        k8s_global_labels=k8s_global_labels,
+        k8s_provider=k8s_provider,
+        cluster=cluster,
+        node_groups=node_groups,
+    )
 
 ############################################################
 # Setup Fastly provider (shared by Traefik and APISIX)
@@ -1044,115 +1087,119 @@ fastly_provider = cast(Any, get_fastly_provider(wrap_in_pulumi_options=False))
 # Setup AWS integrations
 # AWS Load Balancer Controller, AWS Node Termination Handler
 ############################################################
-lb_controller = setup_aws_integrations(
-    aws_account=aws_account,
-    cluster_name=cluster_name,
-    cluster=cluster,
-    aws_config=aws_config,
-    k8s_global_labels=k8s_global_labels,
-    k8s_provider=k8s_provider,
-    operations_tolerations=operations_tolerations,
-    target_vpc=target_vpc,
-    node_groups=node_groups,
-    versions=VERSIONS,
-    cert_manager=cert_manager_release,
-)
+if resource_groups.selected("aws_integrations"):
+    lb_controller = setup_aws_integrations(
+        aws_account=aws_account,
+        cluster_name=cluster_name,
+        cluster=cluster,
+        aws_config=aws_config,
+        k8s_global_labels=k8s_global_labels,
+        k8s_provider=k8s_provider,
+        operations_tolerations=operations_tolerations,
+        target_vpc=target_vpc,
+        node_groups=node_groups,
+        versions=VERSIONS,
+        cert_manager=cert_manager_release,
+    )
 
 ############################################################
 # Install VPA ahead of Traefik/APISIX so both gateways can be
 # configured with vertical autoscaling
 ############################################################
-vpa_release = setup_vpa(
-    cluster_name=cluster_name,
-    cluster=cluster,
-    k8s_provider=k8s_provider,
-    node_groups=node_groups,
-    k8s_global_labels=k8s_global_labels,
-    operations_tolerations=operations_tolerations,
-    versions=VERSIONS,
-)
+if resource_groups.selected("vpa"):
+    vpa_release = setup_vpa(
+        cluster_name=cluster_name,
+        cluster=cluster,
+        k8s_provider=k8s_provider,
+        node_groups=node_groups,
+        k8s_global_labels=k8s_global_labels,
+        operations_tolerations=operations_tolerations,
+        versions=VERSIONS,
+    )
 
-gateway_api_crds = setup_traefik(
-    cluster_name=cluster_name,
-    k8s_provider=k8s_provider,
-    operations_namespace=operations_namespace,
-    node_groups=node_groups,
-    prometheus_operator_crds=prometheus_operator_crds,
-    k8s_global_labels=k8s_global_labels,
-    operations_tolerations=operations_tolerations,
-    versions=VERSIONS,
-    eks_config=eks_config,
-    target_vpc=target_vpc,
-    aws_config=aws_config,
-    cluster=cluster,
-    lb_controller=lb_controller,
-    fastly_provider=fastly_provider,
-    vpa_release=vpa_release,
-    stack_info=stack_info,
-)
+if resource_groups.selected("gateways"):
+    gateway_api_crds = setup_traefik(
+        cluster_name=cluster_name,
+        k8s_provider=k8s_provider,
+        operations_namespace=operations_namespace,
+        node_groups=node_groups,
+        prometheus_operator_crds=prometheus_operator_crds,
+        k8s_global_labels=k8s_global_labels,
+        operations_tolerations=operations_tolerations,
+        versions=VERSIONS,
+        eks_config=eks_config,
+        target_vpc=target_vpc,
+        aws_config=aws_config,
+        cluster=cluster,
+        lb_controller=lb_controller,
+        fastly_provider=fastly_provider,
+        vpa_release=vpa_release,
+        stack_info=stack_info,
+    )
 
-setup_apisix(
-    cluster_name=cluster_name,
-    k8s_provider=k8s_provider,
-    operations_namespace=operations_namespace,
-    node_groups=node_groups,
-    gateway_api_crds=gateway_api_crds,
-    stack_info=stack_info,
-    k8s_global_labels=k8s_global_labels,
-    operations_tolerations=operations_tolerations,
-    versions=VERSIONS,
-    eks_config=eks_config,
-    target_vpc=target_vpc,
-    aws_config=aws_config,
-    cluster=cluster,
-    lb_controller=lb_controller,
-    fastly_provider=fastly_provider,
-    vpa_release=vpa_release,
-)
+    setup_apisix(
+        cluster_name=cluster_name,
+        k8s_provider=k8s_provider,
+        operations_namespace=operations_namespace,
+        node_groups=node_groups,
+        gateway_api_crds=gateway_api_crds,
+        stack_info=stack_info,
+        k8s_global_labels=k8s_global_labels,
+        operations_tolerations=operations_tolerations,
+        versions=VERSIONS,
+        eks_config=eks_config,
+        target_vpc=target_vpc,
+        aws_config=aws_config,
+        cluster=cluster,
+        lb_controller=lb_controller,
+        fastly_provider=fastly_provider,
+        vpa_release=vpa_release,
+    )
 
 ############################################################
 # Install and configure metrics-server
 ############################################################
-metrics_server_release = kubernetes.helm.v3.Release(
-    f"{cluster_name}-metrics-server-helm-release",
-    kubernetes.helm.v3.ReleaseArgs(
-        name="metrics-server",
-        chart="metrics-server",
-        namespace="kube-system",
-        repository_opts=kubernetes.helm.v3.RepositoryOptsArgs(
-            repo="https://kubernetes-sigs.github.io/metrics-server/",
-        ),
-        cleanup_on_fail=True,
-        skip_await=False,
-        values={
-            "commonLabels": k8s_global_labels,
-            "tolerations": operations_tolerations,
-            # Every HPA in the cluster depends on metrics-server for resource
-            # metrics. A single replica means any restart or node drain leaves
-            # all HPAs blind until it comes back.
-            "replicas": 2,
-            "podDisruptionBudget": {
-                "enabled": True,
-                "minAvailable": 1,
-            },
-            "resources": {
-                "requests": {
-                    "memory": "100Mi",
-                    "cpu": "25m",
+if resource_groups.selected("metrics_server"):
+    metrics_server_release = kubernetes.helm.v3.Release(
+        f"{cluster_name}-metrics-server-helm-release",
+        kubernetes.helm.v3.ReleaseArgs(
+            name="metrics-server",
+            chart="metrics-server",
+            namespace="kube-system",
+            repository_opts=kubernetes.helm.v3.RepositoryOptsArgs(
+                repo="https://kubernetes-sigs.github.io/metrics-server/",
+            ),
+            cleanup_on_fail=True,
+            skip_await=False,
+            values={
+                "commonLabels": k8s_global_labels,
+                "tolerations": operations_tolerations,
+                # Every HPA in the cluster depends on metrics-server for resource
+                # metrics. A single replica means any restart or node drain leaves
+                # all HPAs blind until it comes back.
+                "replicas": 2,
+                "podDisruptionBudget": {
+                    "enabled": True,
+                    "minAvailable": 1,
                 },
-                "limits": {
-                    "memory": "100Mi",
+                "resources": {
+                    "requests": {
+                        "memory": "100Mi",
+                        "cpu": "25m",
+                    },
+                    "limits": {
+                        "memory": "100Mi",
+                    },
                 },
             },
-        },
-    ),
-    opts=ResourceOptions(
-        provider=k8s_provider,
-        parent=cluster,
-        depends_on=[node_groups[0]],
-        delete_before_replace=True,
-    ),
-)
+        ),
+        opts=ResourceOptions(
+            provider=k8s_provider,
+            parent=cluster,
+            depends_on=[node_groups[0]],
+            delete_before_replace=True,
+        ),
+    )
 
 ############################################################
 # Configure AWS Backup for EKS cluster (if enabled)
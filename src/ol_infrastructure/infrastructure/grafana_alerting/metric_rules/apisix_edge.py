@@ -17,6 +17,17 @@ Two windows, because the two failure shapes need different ones:
   slow — a creep. 1% over 6h, confirmed for 30m. This is the one that would have
          caught api.mitxonline in week one, when it first crossed 5.5%.
 
+Recorded series
+---------------
+With `use_recording_rules` the fast rule reads the per-host series in
+lib/recording_rules.py rather than raw `apisix_http_status`, so each evaluation
+reads one series per host instead of every route, code and node. Its 10m window
+is the `avg_over_time` of the recorded 5m rate, which is that window's rate plus
+the 5m smoothing at its start: the rule effectively looks at ~15m. The slow rule
+always takes `rate()` over the raw counters: averaged over 6h, a recorded series
+that is absent while a host is idle overstates the rate, and it would have no
+6h history for the first six hours after the rules are deployed.
+
 Minimum-traffic gate
 --------------------
 A bare ratio fires forever on idle hosts. Measured 2026-08-07:
@@ -73,33 +84,41 @@ from collections.abc import Callable
 from pulumi import Input, ResourceOptions
 from pulumiverse_grafana import alerting
 
+from ol_infrastructure.lib.recording_rules import (
+    APISIX_HOST_5XX_RATE,
+    APISIX_HOST_REQUEST_RATE,
+    over_window,
+)
+
 # Requests/sec a host must sustain over the same window as the ratio before its
 # error ratio is treated as meaningful. See the module docstring for the measured
 # values this sits between.
 _MIN_RATE = "0.01"
 
 
-def _error_ratio_expr(window: str, threshold: str) -> str:
+def _error_ratio_expr(window: str, threshold: str, *, recorded: bool) -> str:
     """Build a gated 5xx-ratio expression for a single window.
 
     Returns series only for hosts that both carry real traffic and exceed the
     error threshold, so the rule fires per `matched_host`.
     """
-    return (
-        f"sum by (matched_host) (rate(apisix_http_status[{window}])) > {_MIN_RATE}"
-        " and "
-        f'sum by (matched_host) (rate(apisix_http_status{{code=~"5.."}}[{window}]))'
-        f" / sum by (matched_host) (rate(apisix_http_status[{window}]))"
-        f" > {threshold}"
-    )
+    requests = over_window(APISIX_HOST_REQUEST_RATE, window, recorded=recorded)
+    errors = over_window(APISIX_HOST_5XX_RATE, window, recorded=recorded)
+    return f"{requests} > {_MIN_RATE} and {errors} / {requests} > {threshold}"
 
 
 def create(
     folder_uid: Input[str],
     rd: Callable[[str], list[alerting.RuleGroupRuleDataArgs]],
     resource_opts: ResourceOptions,
+    *,
+    use_recording_rules: bool = False,
 ) -> None:
-    """Create APISIX edge 5xx rate alert rule groups."""
+    """Create APISIX edge 5xx rate alert rule groups.
+
+    `use_recording_rules` reads the recorded per-host series where the window
+    allows; only set it once the recording rules have been live for that long.
+    """
     alerting.RuleGroup(
         "apisix-edge-error-rate",
         name="apisix-edge-error-rate",
@@ -119,7 +138,9 @@ def create(
                     "summary": "{{ $labels.matched_host }} is returning over 5% 5xx at the APISIX edge",
                     "description": "More than 5% of requests to {{ $labels.matched_host }} returned a 5xx status at the APISIX edge over the last 10 minutes. This measures what clients actually receive, not one service's own view of itself.",
                 },
-                datas=rd(_error_ratio_expr("10m", "0.05")),
+                datas=rd(
+                    _error_ratio_expr("10m", "0.05", recorded=use_recording_rules)
+                ),
             ),
             alerting.RuleGroupRuleArgs(
                 name="APISIXEdge5xxRateSlow",
@@ -132,7 +153,7 @@ def create(
                     "summary": "{{ $labels.matched_host }} has been returning over 1% 5xx for hours",
                     "description": "More than 1% of requests to {{ $labels.matched_host }} returned a 5xx status at the APISIX edge over the last 6 hours. This catches a slow error-rate creep that a short-window threshold cannot: api.mitxonline.mit.edu climbed from 0% to 25% over four weeks in July 2026 without tripping any existing rule.",
                 },
-                datas=rd(_error_ratio_expr("6h", "0.01")),
+                datas=rd(_error_ratio_expr("6h", "0.01", recorded=use_recording_rules)),
             ),
         ],
         opts=resource_opts,
@@ -44,6 +44,15 @@ known state through the error instead of either paging on a blip or going
 silent through a genuine ongoing incident). See eks_general.py's docstring
 for the incident that prompted this.
 
+Testing
+-------
+Stage C is why a rule's PromQL must return a positive value, not merely a
+series: `sum(... == 0)` matches and still never fires. Every rule here and in
+log_rules is evaluated offline against fixture series by
+ol_infrastructure.lib.rule_harness; add a case to
+tests/ol_infrastructure/infrastructure/grafana_alerting/alert_rule_cases.yaml
+with a new rule, and run bin/check-alert-rules to see what each query costs.
+
 Sub-modules
 -----------
   eks_general  — Source: grafana-alerts/cortex-rules/eks_general.yaml
@@ -57,6 +66,8 @@ Sub-modules
                  Pairs with log_rules/dagster_database.py, which covers the
                  client side of the same relationship -- nothing here can see a
                  client that fails before it becomes a connection.
+  recording    — Recording rules for the shared series in lib/recording_rules.py,
+                 read by apisix_edge and by KEDA webapp triggers that opt in.
   synthetic_monitoring
                — Imported 2026-08 from three hand-made UI rules. Unlike the
                  others it takes no folder_uid: its rules live in the Synthetic
@@ -74,6 +85,7 @@ from ol_infrastructure.infrastructure.grafana_alerting.metric_rules import (
     dagster_pgbouncer,
     eks_general,
     linux_host,
+    recording,
     synthetic_monitoring,
 )
 
@@ -172,6 +184,7 @@ def create(resource_opts: ResourceOptions) -> None:
     def rd(expr: str) -> list[alerting.RuleGroupRuleDataArgs]:
         return _rule_data(expr, mimir_uid)
 
+    recording.create(alerts_folder.uid, mimir_uid, resource_opts)
     eks_general.create(alerts_folder.uid, rd, resource_opts)
     linux_host.create(alerts_folder.uid, rd, resource_opts)
     apisix_edge.create(alerts_folder.uid, rd, resource_opts)
@@ -211,6 +211,10 @@ def create(
             ),
             # --- Node readiness ---
             # Fires when a node's Ready condition == 0 (not ready).
+            #
+            # `count by`, not `sum by`: the filtered series all have the value 0,
+            # so their sum is 0 and stage C (value > 0, see base.py) never fired.
+            # Caught by the offline rule harness (lib/rule_harness).
             alerting.RuleGroupRuleArgs(
                 name="NodeNotReadyWarning",
                 condition="C",
@@ -222,7 +226,7 @@ def create(
                     "description": "Node {{ $labels.node }} in cluster {{ $labels.cluster }} has been in a not-ready state for more than 5 minutes."
                 },
                 datas=rd(
-                    'sum by (cluster, node) (kube_node_status_condition{cluster=~".*-(ci|qa)", condition="Ready", status="true"} == 0)'
+                    'count by (cluster, node) (kube_node_status_condition{cluster=~".*-(ci|qa)", condition="Ready", status="true"} == 0)'
                 ),
             ),
             alerting.RuleGroupRuleArgs(
@@ -236,7 +240,7 @@ def create(
                     "description": "Node {{ $labels.node }} in cluster {{ $labels.cluster }} has been in a not-ready state for more than 5 minutes."
                 },
                 datas=rd(
-                    'sum by (cluster, node) (kube_node_status_condition{cluster=~".*-(production)", condition="Ready", status="true"} == 0)'
+                    'count by (cluster, node) (kube_node_status_condition{cluster=~".*-(production)", condition="Ready", status="true"} == 0)'
                 ),
             ),
             # --- Pod crash looping ---
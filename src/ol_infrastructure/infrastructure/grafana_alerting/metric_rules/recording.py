@@ -0,0 +1,66 @@
+"""Grafana-managed recording rules for the series in lib/recording_rules.py.
+
+The definitions live in ``ol_infrastructure.lib.recording_rules`` because KEDA
+triggers read the same series; this only turns them into one rule group, written
+back to the stack's own Mimir datasource.
+
+A recording rule has a single data stage -- the query whose result is written
+under ``record.metric`` -- and none of the reduce/threshold stages in base.py,
+which exist only to turn a query into an alert condition.
+
+Evaluated every 60s, which is also the KEDA webapp polling interval: a trigger
+reading a recorded series sees a value at most one evaluation old.
+"""
+
+import json
+
+from pulumi import Input, ResourceOptions
+from pulumiverse_grafana import alerting
+
+from ol_infrastructure.lib.recording_rules import RECORDING_RULES, RecordingRule
+
+
+def _record_data(rule: RecordingRule, mimir_uid: str) -> alerting.RuleGroupRuleDataArgs:
+    return alerting.RuleGroupRuleDataArgs(
+        ref_id="A",
+        datasource_uid=mimir_uid,
+        relative_time_range=alerting.RuleGroupRuleDataRelativeTimeRangeArgs(
+            from_=600, to=0
+        ),
+        model=json.dumps(
+            {
+                "datasource": {"type": "prometheus", "uid": mimir_uid},
+                "expr": rule.expr,
+                "instant": True,
+                "intervalMs": 1000,
+                "maxDataPoints": 43200,
+                "refId": "A",
+            }
+        ),
+    )
+
+
+def create(
+    folder_uid: Input[str], mimir_uid: str, resource_opts: ResourceOptions
+) -> None:
+    """Create the recording rule group."""
+    alerting.RuleGroup(
+        "apisix-recording-rules",
+        name="apisix-recording-rules",
+        folder_uid=folder_uid,
+        interval_seconds=60,
+        rules=[
+            alerting.RuleGroupRuleArgs(
+                name=rule.record,
+                annotations={"description": rule.description},
+                record=alerting.RuleGroupRuleRecordArgs(
+                    metric=rule.record,
+                    from_="A",
+                    target_datasource_uid=mimir_uid,
+                ),
+                datas=[_record_data(rule, mimir_uid)],
+            )
+            for rule in RECORDING_RULES
+        ],
+        opts=resource_opts,
+    )
@@ -8,6 +8,7 @@ import pulumi_vault as vault
 from pulumi import Config, ResourceOptions, export
 from pulumi_aws import get_caller_identity
 
+from bridge.lib.vector import DEFAULT_DATA_DIR
 from bridge.lib.versions import VECTOR_VERSION
 from bridge.secrets.sops import read_yaml_secrets
 from ol_infrastructure.components.applications.eks import (
@@ -24,6 +25,12 @@ from ol_infrastructure.components.services.vault import (
     OLVaultK8SSecret,
     OLVaultK8SStaticSecretConfig,
 )
+from ol_infrastructure.infrastructure.vector_log_proxy.pipeline import (
+    BUFFER_VOLUME_SIZE_LIMIT,
+    FASTLY_LOG_PROXY_PORT,
+    HEROKU_LOG_PROXY_PORT,
+    vector_log_proxy_pipeline,
+)
 from ol_infrastructure.lib import pulumi_projects as projects
 from ol_infrastructure.lib.aws.eks_helper import cached_image_uri, setup_k8s_provider
 from ol_infrastructure.lib.k8s_vpa import make_vpa
@@ -53,10 +60,6 @@ cluster_name = f"{stack_info.env_prefix}-{stack_info.env_suffix}"
 namespace = "operations"
 application_name = "vector-log-proxy"
 
-# Ports for the proxy services (internal)
-HEROKU_LOG_PROXY_PORT = 9000
-FASTLY_LOG_PROXY_PORT = 9443
-
 aws_config = AWSBase(
     tags={
         "OU": vector_log_proxy_config.get("business_unit") or "operations",
@@ -241,103 +244,9 @@ vault.generic.Secret(
 #     Vector Configuration       #
 ##################################
 
-# Build Vector configuration
-# Fastly HTTPS Log Streaming Requirements (RFC 8615):
-# 1. HTTPS endpoint with valid TLS certificate (handled by Gateway API)
-# 2. Basic authentication (configured in http_server source)
-# 3. POST method support for log delivery (configured below)
-# 4. Domain ownership verification via /.well-known/fastly/logging/challenge
-#    (handled by Gateway redirect to S3 bucket with service ID hashes)
-# 5. Accept application/json content-type (handled by json codec)
-# Reference: https://www.fastly.com/documentation/guides/integrations/logging-endpoints/log-streaming-https/
-
-vector_config_template = """
-api:
-  enabled: false
-
-sources:
-  fastly_log_proxy:
-    type: http_server
-    address: 0.0.0.0:9443
-    auth:
-      password: ${FASTLY_PROXY_PASSWORD}
-      username: ${FASTLY_PROXY_USERNAME}
-    decoding:
-      codec: bytes
-
-  heroku_log_proxy:
-    type: heroku_logs
-    acknowledgements: false
-    address: 0.0.0.0:9000
-    decoding:
-      codec: bytes
-    auth:
-      password: "${HEROKU_PROXY_PASSWORD}"
-      username: "${HEROKU_PROXY_USERNAME}"
-    query_parameters:
-    - "app_name"
-    - "environment"
-    - "service"
-
-transforms:
-  fastly_drop_unwanted_logs:
-    type: remap
-    inputs:
-    - "fastly_log_proxy"
-    source: |
-      event, err = parse_json(.message)
-      if event != null {
-        .,err = merge(., event)
-        del(.message)
-      }
-
-  heroku_drop_unwanted_logs:
-    type: remap
-    inputs:
-    - "heroku_log_proxy"
-    source: |
-      # Drop all messages from uninteresting heroku apps
-      abort_match_boring_apps, err = (match_any(.app_name,
-        [r'ol-eng-library', r'.*wiki.*']))
-      if abort_match_boring_apps {
-        abort
-      }
-
-sinks:
-  ship_fastly_logs_to_grafana_cloud:
-    inputs:
-    - 'fastly_drop_unwanted_logs'
-    type: loki
-    auth:
-      strategy: basic
-      password: ${GRAFANA_CLOUD_API_KEY}
-      user: "${GRAFANA_CLOUD_LOKI_API_USER-loki}"
-    endpoint: https://logs-prod-us-central1.grafana.net
-    encoding:
-      codec: json
-    labels:
-      environment: "{{ environment }}"
-      application: "{{ application }}"
-      service: "fastly"
-    out_of_order_action: rewrite_timestamp
-
-  ship_heroku_logs_to_grafana_cloud:
-    inputs:
-    - 'heroku_drop_unwanted_logs'
-    type: loki
-    auth:
-      strategy: basic
-      password: ${GRAFANA_CLOUD_API_KEY}
-      user: "${GRAFANA_CLOUD_LOKI_API_USER-loki}"
-    endpoint: https://logs-prod-us-central1.grafana.net
-    encoding:
-      codec: json
-    labels:
-      environment: "{{ environment }}"
-      application: "{{ app_name }}"
-      service: "{{ service }}"
-    out_of_order_action: rewrite_timestamp
-"""
+# The pipeline, its sink buffering, log-volume reduction and the Fastly
+# requirements it meets are in pipeline.py. `log_reduction` in stack config
+# overrides the reduction per source, e.g. {"fastly": {"sample_rate": 20}}.
 
 vector_config_map = kubernetes.core.v1.ConfigMap(
     "vector-log-proxy-config",
@@ -347,7 +256,9 @@ vector_config_map = kubernetes.core.v1.ConfigMap(
         labels=k8s_global_labels,
     ),
     data={
-        "vector.yaml": vector_config_template,
+        "vector.yaml": vector_log_proxy_pipeline(
+            vector_log_proxy_config.get_object("log_reduction")
+        ).render(),
     },
 )
 
@@ -533,6 +444,10 @@ vector_deployment = kubernetes.apps.v1.Deployment(
                                 name="vector-config",
                                 mount_path="/etc/vector",
                             ),
+                            kubernetes.core.v1.VolumeMountArgs(
+                                name="vector-data",
+                                mount_path=DEFAULT_DATA_DIR,
+                            ),
                         ],
                         liveness_probe=kubernetes.core.v1.ProbeArgs(
                             tcp_socket=kubernetes.core.v1.TCPSocketActionArgs(
@@ -623,6 +538,13 @@ vector_deployment = kubernetes.apps.v1.Deployment(
                             name="vector-log-proxy-config",
                         ),
                     ),
+                    # Disk buffers for the Grafana Cloud sinks (see pipeline.py).
+                    kubernetes.core.v1.VolumeArgs(
+                        name="vector-data",
+                        empty_dir=kubernetes.core.v1.EmptyDirVolumeSourceArgs(
+                            size_limit=BUFFER_VOLUME_SIZE_LIMIT,
+                        ),
+                    ),
                     kubernetes.core.v1.VolumeArgs(
                         name="challenge-script",
                         config_map=kubernetes.core.v1.ConfigMapVolumeSourceArgs(
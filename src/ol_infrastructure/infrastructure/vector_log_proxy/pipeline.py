@@ -0,0 +1,276 @@
+"""The vector-log-proxy's Vector pipeline: Fastly and Heroku drains to Grafana Cloud.
+
+Fastly HTTPS Log Streaming Requirements (RFC 8615):
+1. HTTPS endpoint with valid TLS certificate (handled by Gateway API)
+2. Basic authentication (configured in http_server source)
+3. POST method support for log delivery (configured below)
+4. Domain ownership verification via /.well-known/fastly/logging/challenge
+   (handled by Gateway redirect to S3 bucket with service ID hashes)
+5. Accept application/json content-type (handled by json codec)
+Reference: https://www.fastly.com/documentation/guides/integrations/logging-endpoints/log-streaming-https/
+
+Both sources are pushed to, so a stalled sink is the drains' problem: with
+Vector's default blocking memory buffer, a slow Grafana Cloud backs requests up
+into Fastly and Heroku, which then retry and eventually drop on their side. Each
+sink here has a disk buffer that absorbs an outage of several minutes at normal
+volume and then sheds new events (`drop_newest`) rather than pushing back. The
+buffer lives on an emptyDir: it survives a container restart, not a pod deletion.
+
+Log-volume reduction
+--------------------
+Fastly also writes every request log, with every field, to S3; Loki does not
+need that copy too. Each source has a `LogReduction` (defaults below, overridden
+per stack by `vector_log_proxy:log_reduction`):
+
+  fastly -- drops the client-device and fine-grained geo fields, and keeps 1 in
+            10 requests that succeeded (status < 400); every 4xx and 5xx ships.
+  heroku -- samples Heroku router lines (status parsed into `router_status`) the
+            same way, and ships an app log line repeated by the same process
+            (retry loops, repeated tracebacks) once per minute.
+
+So Loki line counts for sampled statuses are a tenth of real traffic. Request
+counts and latency come from metrics instead, derived from every Fastly log
+before sampling: `fastly_requests_total` and `fastly_request_duration_seconds`,
+by application, environment, host and status class, with a `pod` label because
+each replica writes its own series. `host` is bounded by the domains each
+Fastly service answers for.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from bridge.lib.vector import (
+    DEFAULT_DATA_DIR,
+    MIB,
+    AggregateTransform,
+    Compression,
+    LogReduction,
+    LogToMetricTransform,
+    RemapTransform,
+    VectorBatch,
+    VectorBuffer,
+    VectorComponent,
+    VectorPipeline,
+    VectorRequest,
+    WhenFull,
+    grafana_cloud_loki_sink,
+    grafana_cloud_metrics_sink,
+)
+
+HEROKU_LOG_PROXY_PORT = 9000
+FASTLY_LOG_PROXY_PORT = 9443
+
+#: Per sink; the pod's buffer volume is sized for both plus headroom.
+SINK_BUFFER_BYTES = 1024 * MIB
+BUFFER_VOLUME_SIZE_LIMIT = "3Gi"
+
+DEFAULT_LOG_REDUCTION = {
+    "fastly": LogReduction(
+        drop_fields=[
+            "client_data",
+            "fastly_background_fetch",
+            "fastly_server",
+            "geo_city",
+            "geo_conn_speed",
+            "geo_conn_type",
+            "geo_country_code3",
+            "geo_country_name",
+            "geo_latitude",
+            "geo_longitude",
+            "geo_region",
+            "request_header_size_bytes",
+            "response_header_size_bytes",
+        ],
+        status_field="response_status",
+        sample_rate=10,
+    ),
+    "heroku": LogReduction(
+        status_field="router_status",
+        sample_rate=10,
+        dedupe_fields=["app_name", "proc_id", "message"],
+        dedupe_window_seconds=60,
+    ),
+}
+
+# Seconds; Fastly reports request_duration_usec.
+REQUEST_DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+
+def _sink_tuning() -> dict[str, Any]:
+    return {
+        "buffer": VectorBuffer.disk(SINK_BUFFER_BYTES, when_full=WhenFull.drop_newest),
+        "batch": VectorBatch(max_bytes=MIB, timeout_secs=1),
+        # Adaptive concurrency backs off as Grafana Cloud's latency rises instead
+        # of holding more requests open against it; a hung request is abandoned
+        # and retried after 30s rather than the default 60s.
+        "request": VectorRequest(
+            concurrency="adaptive", timeout_secs=30, retry_max_duration_secs=30
+        ),
+        "compression": Compression.snappy,
+    }
+
+
+def log_reduction(
+    overrides: Mapping[str, Mapping[str, Any]] | None = None,
+) -> dict[str, LogReduction]:
+    """Merge per-source overrides (stack config) onto the default reductions."""
+    overrides = overrides or {}
+    unknown = set(overrides) - set(DEFAULT_LOG_REDUCTION)
+    if unknown:
+        msg = f"log_reduction has no source(s) {sorted(unknown)}"
+        raise ValueError(msg)
+    return {
+        source: LogReduction.model_validate(
+            {**default.model_dump(), **overrides.get(source, {})}
+        )
+        for source, default in DEFAULT_LOG_REDUCTION.items()
+    }
+
+
+def _fastly_request_metrics(upstream: str) -> dict[str, VectorComponent]:
+    tags = {
+        "application": "{{ application }}",
+        "environment": "{{ environment }}",
+        "host": "{{ host }}",
+        "status_class": "{{ status_class }}",
+        "pod": "${HOSTNAME}",
+    }
+    return {
+        "fastly_request_metric_fields": RemapTransform(
+            inputs=[upstream],
+            source=(
+                "status = to_int(.response_status) ?? 0\n"
+                '.status_class = to_string(to_int(floor(status / 100))) + "xx"\n'
+                ".request_duration_seconds = "
+                "(to_float(.request_duration_usec) ?? 0.0) / 1000000.0\n"
+            ),
+        ),
+        "fastly_request_metrics": LogToMetricTransform(
+            inputs=["fastly_request_metric_fields"],
+            metrics=[
+                {
+                    "type": "counter",
+                    "field": "status_class",
+                    "namespace": "fastly",
+                    "name": "requests_total",
+                    "tags": tags,
+                },
+                {
+                    "type": "histogram",
+                    "field": "request_duration_seconds",
+                    "namespace": "fastly",
+                    "name": "request_duration_seconds",
+                    "tags": tags,
+                },
+            ],
+        ),
+        # One remote-write sample per series a minute, not one per request.
+        "fastly_request_metrics_aggregate": AggregateTransform(
+            inputs=["fastly_request_metrics"],
+            interval_ms=60_000,
+        ),
+    }
+
+
+def vector_log_proxy_pipeline(
+    reduction_overrides: Mapping[str, Mapping[str, Any]] | None = None,
+) -> VectorPipeline:
+    """Build the proxy's whole Vector config, mounted as /etc/vector/vector.yaml."""
+    reduction = log_reduction(reduction_overrides)
+    fastly_reduction, fastly_output = reduction["fastly"].transforms(
+        "fastly", "fastly_drop_unwanted_logs"
+    )
+    heroku_reduction, heroku_output = reduction["heroku"].transforms(
+        "heroku", "heroku_drop_unwanted_logs"
+    )
+    return VectorPipeline(
+        data_dir=DEFAULT_DATA_DIR,
+        api={"enabled": False},
+        sources={
+            "fastly_log_proxy": VectorComponent.model_validate(
+                {
+                    "type": "http_server",
+                    "address": f"0.0.0.0:{FASTLY_LOG_PROXY_PORT}",
+                    "auth": {
+                        "password": "${FASTLY_PROXY_PASSWORD}",
+                        "username": "${FASTLY_PROXY_USERNAME}",
+                    },
+                    "decoding": {"codec": "bytes"},
+                }
+            ),
+            "heroku_log_proxy": VectorComponent.model_validate(
+                {
+                    "type": "heroku_logs",
+                    "acknowledgements": False,
+                    "address": f"0.0.0.0:{HEROKU_LOG_PROXY_PORT}",
+                    "decoding": {"codec": "bytes"},
+                    "auth": {
+                        "password": "${HEROKU_PROXY_PASSWORD}",
+                        "username": "${HEROKU_PROXY_USERNAME}",
+                    },
+                    "query_parameters": ["app_name", "environment", "service"],
+                }
+            ),
+        },
+        transforms={
+            "fastly_drop_unwanted_logs": RemapTransform(
+                inputs=["fastly_log_proxy"],
+                source=(
+                    "event, err = parse_json(.message)\n"
+                    "if event != null {\n"
+                    "  .,err = merge(., event)\n"
+                    "  del(.message)\n"
+                    "}\n"
+                ),
+            ),
+            "heroku_drop_unwanted_logs": RemapTransform(
+                inputs=["heroku_log_proxy"],
+                source=(
+                    "# Drop all messages from uninteresting heroku apps\n"
+                    "abort_match_boring_apps, err = (match_any(.app_name,\n"
+                    "  [r'ol-eng-library', r'.*wiki.*']))\n"
+                    "if abort_match_boring_apps {\n"
+                    "  abort\n"
+                    "}\n"
+                    "\n"
+                    "# Router lines are logfmt; their status drives sampling.\n"
+                    'if .proc_id == "router" {\n'
+                    "  router, err = parse_key_value(.message)\n"
+                    "  if err == null {\n"
+                    "    .router_status = to_int(router.status) ?? null\n"
+                    "  }\n"
+                    "}\n"
+                ),
+            ),
+            **_fastly_request_metrics("fastly_drop_unwanted_logs"),
+            **fastly_reduction,
+            **heroku_reduction,
+        },
+        sinks={
+            "ship_fastly_logs_to_grafana_cloud": grafana_cloud_loki_sink(
+                [fastly_output],
+                labels={
+                    "environment": "{{ environment }}",
+                    "application": "{{ application }}",
+                    "service": "fastly",
+                },
+                **_sink_tuning(),
+            ),
+            "ship_heroku_logs_to_grafana_cloud": grafana_cloud_loki_sink(
+                [heroku_output],
+                labels={
+                    "environment": "{{ environment }}",
+                    "application": "{{ app_name }}",
+                    "service": "{{ service }}",
+                },
+                **_sink_tuning(),
+            ),
+            "ship_fastly_request_metrics_to_grafana_cloud": (
+                grafana_cloud_metrics_sink(
+                    ["fastly_request_metrics_aggregate"],
+                    buffer=VectorBuffer.memory(10_000, when_full=WhenFull.drop_newest),
+                    buckets=REQUEST_DURATION_BUCKETS,
+                )
+            ),
+        },
+    )
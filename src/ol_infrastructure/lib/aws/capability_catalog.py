@@ -0,0 +1,157 @@
+"""A checked-in snapshot of the AWS capabilities our config models validate against.
+
+`OLDBConfig`, `OLAmazonCacheConfig` and `OLLaunchTemplateConfig` check engines,
+engine versions and instance types while the model is being validated, and
+`OLAmazonDB` resolves the parameter group family for its engine version. Asking
+AWS each time made every preview pay for a page-through of
+DescribeDBEngineVersions, an uncached DescribeInstanceTypes per instance type, and
+it made validation fail outright with no AWS credentials.
+
+Those answers change on AWS's release cadence, not per run, so they are read from
+`capability_catalog.json` next to this module instead: RDS and ElastiCache engine
+versions with their parameter group families, and EC2 instance types with their
+vCPU count and memory. Refresh it with::
+
+    bin/refresh-aws-capability-catalog           # rewrite the catalog
+    bin/refresh-aws-capability-catalog --check   # exit 1 if it is out of date
+
+Set ``OL_AWS_LIVE_LOOKUPS=1`` to have the helpers in `rds_helper`,
+`elasticache_helper` and `ec2_helper` ask AWS instead, e.g. to try an engine
+version released since the last refresh.
+
+A version missing from the catalog still resolves its parameter group family
+from another version of the same release (``18.3`` from ``18.1``, ``11.8.4``
+from ``11.8.3``), since a live instance is often a minor version ahead of it.
+
+A catalog with no ``generated_at`` was seeded by hand with only the engines,
+versions and instance types this repo configures, and is not a listing of what AWS
+offers. Its instance types are still answered from it (their sizes are fixed), but
+anything it leaves out is asked of AWS, and so are engine version listings: from a
+partial list, ``max_minor_version`` would pick a stale minor version.
+"""
+
+import json
+import os
+from collections import defaultdict
+from datetime import UTC, datetime
+from functools import cache
+from pathlib import Path
+
+import boto3
+from pydantic import BaseModel, ConfigDict, PositiveInt
+
+CATALOG_FILE = Path(__file__).parent / "capability_catalog.json"
+LIVE_LOOKUPS_ENV_VAR = "OL_AWS_LIVE_LOOKUPS"
+CATALOG_REGION = "us-east-1"
+
+#: RDS also offers Oracle, SQL Server and Db2, with hundreds of versions between
+#: them; the catalog only carries the engines we run.
+RDS_ENGINES = ("aurora-mysql", "aurora-postgresql", "mariadb", "mysql", "postgres")
+
+
+class InstanceTypeSpec(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    vcpus: PositiveInt
+    memory_mib: PositiveInt
+
+
+class AWSCapabilityCatalog(BaseModel):
+    """Engine versions and instance types available in one region."""
+
+    model_config = ConfigDict(frozen=True)
+
+    region: str
+    #: When the refresh script wrote the catalog; None if it was seeded by hand.
+    generated_at: datetime | None = None
+    #: engine -> engine version -> parameter group family
+    rds_engines: dict[str, dict[str, str]]
+    cache_engines: dict[str, dict[str, str]]
+    instance_types: dict[str, InstanceTypeSpec]
+
+    @property
+    def complete(self) -> bool:
+        """Whether this lists everything AWS offered, not a hand-seeded subset."""
+        return self.generated_at is not None
+
+    def rds_parameter_group_family(self, engine: str, engine_version: str) -> str:
+        return _parameter_group_family(self.rds_engines, engine, engine_version)
+
+    def cache_parameter_group_family(self, engine: str, engine_version: str) -> str:
+        return _parameter_group_family(self.cache_engines, engine, engine_version)
+
+    def render(self) -> str:
+        """Serialize deterministically, so a refresh diffs only what AWS changed."""
+        return json.dumps(self.model_dump(mode="json"), indent=2, sort_keys=True) + "\n"
+
+
+def _parameter_group_family(
+    engines: dict[str, dict[str, str]], engine: str, engine_version: str
+) -> str:
+    versions = engines.get(engine, {})
+    if engine_version in versions:
+        return versions[engine_version]
+    release = engine_version.rsplit(".", maxsplit=1)[0]
+    for version, family in versions.items():
+        if version.rsplit(".", maxsplit=1)[0] == release:
+            return family
+    msg = (
+        f"{engine} {engine_version} is not in the AWS capability catalog. Run "
+        f"bin/refresh-aws-capability-catalog, or set {LIVE_LOOKUPS_ENV_VAR}=1."
+    )
+    raise ValueError(msg)
+
+
+def live_lookups_enabled() -> bool:
+    """Whether the AWS helpers should bypass the catalog and call AWS."""
+    return os.environ.get(LIVE_LOOKUPS_ENV_VAR, "").lower() in {"1", "true", "yes"}
+
+
+def engine_versions_from_catalog() -> bool:
+    """Whether engine version listings come from the catalog rather than AWS."""
+    return not live_lookups_enabled() and load_catalog().complete
+
+
+@cache
+def load_catalog(path: Path = CATALOG_FILE) -> AWSCapabilityCatalog:
+    """Read the checked-in catalog once per program."""
+    return AWSCapabilityCatalog.model_validate_json(path.read_text())
+
+
+def fetch_catalog(region: str = CATALOG_REGION) -> AWSCapabilityCatalog:
+    """Build a catalog from the live AWS APIs (used by the refresh script)."""
+    rds_client = boto3.client("rds", region_name=region)
+    cache_client = boto3.client("elasticache", region_name=region)
+    ec2_client = boto3.client("ec2", region_name=region)
+
+    rds_engines: dict[str, dict[str, str]] = defaultdict(dict)
+    for page in rds_client.get_paginator("describe_db_engine_versions").paginate(
+        Filters=[{"Name": "engine", "Values": list(RDS_ENGINES)}]
+    ):
+        for version in page["DBEngineVersions"]:
+            rds_engines[version["Engine"]][version["EngineVersion"]] = version[
+                "DBParameterGroupFamily"
+            ]
+
+    cache_engines: dict[str, dict[str, str]] = defaultdict(dict)
+    for page in cache_client.get_paginator("describe_cache_engine_versions").paginate():
+        for version in page["CacheEngineVersions"]:
+            cache_engines[version["Engine"]][version["EngineVersion"]] = version[
+                "CacheParameterGroupFamily"
+            ]
+
+    instance_types = {}
+    for page in ec2_client.get_paginator("describe_instance_types").paginate():
+        for instance_type in page["InstanceTypes"]:
+            instance_types[instance_type["InstanceType"]] = InstanceTypeSpec(
+                vcpus=instance_type["VCpuInfo"]["DefaultVCpus"],
+                memory_mib=instance_type["MemoryInfo"]["SizeInMiB"],
+            )
+
+    return AWSCapabilityCatalog(
+        region=region,
+        generated_at=datetime.now(tz=UTC).replace(microsecond=0),
+        rds_engines=dict(rds_engines),
+        cache_engines=dict(cache_engines),
+        instance_types=instance_types,
+    )
@@ -10,6 +10,12 @@ import pulumi
 from botocore.exceptions import ClientError
 from pulumi_aws import ec2
 
+from ol_infrastructure.lib.aws.capability_catalog import (
+    InstanceTypeSpec,
+    live_lookups_enabled,
+    load_catalog,
+)
+
 ec2_client = boto3.client("ec2")
 AWSFilterType = list[dict[str, str | list[str]]]
 
@@ -25,11 +31,38 @@ default_egress_args = [
 
 
 def is_valid_instance_type(instance_type):
+    """Whether ``instance_type`` exists, per the AWS capability catalog by default."""
+    return instance_type_spec(instance_type) is not None
+
+
+def instance_type_spec(instance_type: str) -> InstanceTypeSpec | None:
+    """Return the vCPUs and memory of an EC2 instance type, or None if there is none.
+
+    Read from the AWS capability catalog. EC2 is asked instead with live lookups
+    enabled, or for a type a hand-seeded catalog does not list.
+    """
+    if not live_lookups_enabled():
+        catalog = load_catalog()
+        if instance_type in catalog.instance_types:
+            return catalog.instance_types[instance_type]
+        if catalog.complete:
+            return None
+    return _describe_instance_type(instance_type)
+
+
+@lru_cache
+def _describe_instance_type(instance_type: str) -> InstanceTypeSpec | None:
     try:
-        ec2_client.describe_instance_types(InstanceTypes=[instance_type])
-        return True  # noqa: TRY300
+        (described,) = ec2_client.describe_instance_types(
+            InstanceTypes=[instance_type]
+        )["InstanceTypes"]
     except ClientError:
-        return False
+        # An unknown type raises InvalidInstanceType rather than returning nothing.
+        return None
+    return InstanceTypeSpec(
+        vcpus=described["VCpuInfo"]["DefaultVCpus"],
+        memory_mib=described["MemoryInfo"]["SizeInMiB"],
+    )
 
 
 @unique
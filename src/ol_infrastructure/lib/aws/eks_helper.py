@@ -11,6 +11,10 @@ from pulumi_aws import ec2
 from pulumi_kubernetes import Provider
 
 from ol_infrastructure.lib.aws.aws_helper import AWS_ACCOUNT_ID
+from ol_infrastructure.lib.provider_registry import (
+    get_or_create_provider,
+    register_provider_transformation,
+)
 
 eks_client = boto3.client("eks")
 ECR_DOCKERHUB_REGISTRY = f"{AWS_ACCOUNT_ID}.dkr.ecr.us-east-1.amazonaws.com/dockerhub"
@@ -158,14 +162,15 @@ def get_eks_addon_version(
     return max(versions, key=eks_addon_version_sort_key)
 
 
-@lru_cache
 def get_k8s_provider(
     kubeconfig: pulumi.Output[Any] | str,
     provider_name: str | None,
 ):
-    return Provider(
-        provider_name or "k8s-provider",
-        kubeconfig=kubeconfig,
+    # An Output kubeconfig is keyed by identity: pass the same Output (or the
+    # same string) to share a provider.
+    return get_or_create_provider(
+        ("kubernetes", kubeconfig, provider_name or "k8s-provider"),
+        lambda: Provider(provider_name or "k8s-provider", kubeconfig=kubeconfig),
     )
 
 
@@ -189,15 +194,16 @@ def setup_k8s_provider(
     kubeconfig: pulumi.Output[Any] | str | dict[str, object],
     provider_name: str | None = None,
 ):
-    # lru_cache requires hashable arguments; serialize dict kubeconfigs to JSON
+    # Provider registry keys must be hashable; serialize dict kubeconfigs to JSON
     if isinstance(kubeconfig, dict):
-        kubeconfig = json.dumps(kubeconfig)
-    pulumi.runtime.register_stack_transformation(
+        kubeconfig = json.dumps(kubeconfig, sort_keys=True)
+    register_provider_transformation(
+        ("kubernetes", kubeconfig, provider_name or "k8s-provider"),
         partial(
             set_k8s_provider,
             kubeconfig,
             provider_name,
-        )
+        ),
     )
 
 
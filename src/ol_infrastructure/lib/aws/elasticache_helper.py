@@ -3,6 +3,12 @@ from functools import lru_cache
 
 import boto3
 
+from ol_infrastructure.lib.aws.capability_catalog import (
+    engine_versions_from_catalog,
+    live_lookups_enabled,
+    load_catalog,
+)
+
 cache_client = boto3.client("elasticache")
 
 
@@ -11,10 +17,18 @@ def cache_engines() -> dict[str, list[str]]:
     """Generate a list of cache engines and their currently available versions
         on Elasticache.
 
+    Read from the AWS capability catalog unless live lookups are enabled or the
+    catalog was seeded by hand rather than generated.
+
     :returns: Dictionary of engine names and the list of available versions
 
     :rtype: Dict[str, List[str]]
     """
+    if engine_versions_from_catalog():
+        return {
+            engine: list(versions)
+            for engine, versions in load_catalog().cache_engines.items()
+        }
     all_engines_paginator = cache_client.get_paginator("describe_cache_engine_versions")
     engines_versions = defaultdict(list)
     for engines_page in all_engines_paginator.paginate():
@@ -39,6 +53,8 @@ def parameter_group_family(engine: str, engine_version: str) -> str:
 
     :rtype: str
     """
+    if not live_lookups_enabled():
+        return load_catalog().cache_parameter_group_family(engine, engine_version)
     engine_details = cache_client.describe_cache_engine_versions(
         Engine=engine, EngineVersion=engine_version
     )
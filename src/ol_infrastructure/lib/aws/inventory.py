@@ -0,0 +1,341 @@
+"""Paginated, multi-region AWS inventory snapshots for offline analysis.
+
+The orphan and stale-resource reports used to call each `describe_*` once, in one
+region, with no paginator -- so on a large account they silently reported on the first
+page and called it the whole estate. This module is the one place that talks to the
+APIs for those reports. It paginates every call, fans the (region, collection) pairs
+out over a thread pool, and returns a `Snapshot` that can be saved and queried again
+later without touching AWS.
+
+Failures are recorded on the snapshot rather than swallowed. A collection that could
+not be read is reported as missing, not as empty: an empty collection makes every
+security group look orphaned.
+
+    snapshot = collect()                    # every enabled region, every collection
+    snapshot.save(Path("inventory.json.gz"))
+    ...
+    snapshot = Snapshot.load(Path("inventory.json.gz"))
+    for volume in snapshot.items("volumes"):
+        ...
+"""
+
+import gzip
+import json
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Protocol
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+#: Bump when the snapshot layout changes, so an old file is rejected, not misread.
+SNAPSHOT_VERSION = 1
+#: Threads shared by every (region, collection) job. The describe APIs throttle per
+#: region and per service, so width across regions is cheap and width within one is not.
+DEFAULT_MAX_WORKERS = 16
+#: Adaptive retries back off on throttling instead of failing a page mid-collection.
+_BOTO_CONFIG = Config(retries={"max_attempts": 10, "mode": "adaptive"})
+
+
+class BotoSession(Protocol):
+    """The part of `boto3.Session` collection uses: a client per service and region."""
+
+    def client(
+        self, service_name: str, region_name: str | None = None, **kwargs: Any
+    ) -> Any: ...
+
+
+@dataclass(frozen=True)
+class Detail:
+    """A per-item follow-up call, for APIs whose list call omits what we need.
+
+    `request_key` is the parameter the follow-up takes, filled from the parent item's
+    `source_key` -- or from the parent itself when the list call returns bare names,
+    as `eks.list_clusters` does.
+    """
+
+    operation: str
+    request_key: str
+    result_key: str
+    source_key: str | None = None
+
+
+@dataclass(frozen=True)
+class Collection:
+    """One kind of resource, and how to list all of it in one region."""
+
+    service: str
+    operation: str
+    result_key: str
+    params: dict[str, Any] = field(default_factory=dict)
+    #: Flatten one level of wrapper, e.g. `Reservations[].Instances[]`.
+    nested_key: str | None = None
+    detail: Detail | None = None
+
+
+#: Everything the orphan, stale-SG and security-group usage reports read.
+COLLECTIONS: dict[str, Collection] = {
+    "addresses": Collection("ec2", "describe_addresses", "Addresses"),
+    "images": Collection(
+        "ec2", "describe_images", "Images", params={"Owners": ["self"]}
+    ),
+    "instances": Collection(
+        "ec2", "describe_instances", "Reservations", nested_key="Instances"
+    ),
+    "launch_template_versions": Collection(
+        "ec2",
+        "describe_launch_templates",
+        "LaunchTemplates",
+        detail=Detail(
+            "describe_launch_template_versions",
+            request_key="LaunchTemplateId",
+            source_key="LaunchTemplateId",
+            result_key="LaunchTemplateVersions",
+        ),
+    ),
+    "network_interfaces": Collection(
+        "ec2", "describe_network_interfaces", "NetworkInterfaces"
+    ),
+    "route_tables": Collection("ec2", "describe_route_tables", "RouteTables"),
+    "security_groups": Collection("ec2", "describe_security_groups", "SecurityGroups"),
+    "subnets": Collection("ec2", "describe_subnets", "Subnets"),
+    "volumes": Collection("ec2", "describe_volumes", "Volumes"),
+    "vpc_endpoints": Collection("ec2", "describe_vpc_endpoints", "VpcEndpoints"),
+    "auto_scaling_groups": Collection(
+        "autoscaling", "describe_auto_scaling_groups", "AutoScalingGroups"
+    ),
+    "launch_configurations": Collection(
+        "autoscaling", "describe_launch_configurations", "LaunchConfigurations"
+    ),
+    "db_instances": Collection("rds", "describe_db_instances", "DBInstances"),
+    "db_snapshots": Collection(
+        "rds", "describe_db_snapshots", "DBSnapshots", params={"SnapshotType": "manual"}
+    ),
+    "cache_clusters": Collection(
+        "elasticache", "describe_cache_clusters", "CacheClusters"
+    ),
+    "load_balancers": Collection("elbv2", "describe_load_balancers", "LoadBalancers"),
+    "eks_clusters": Collection(
+        "eks",
+        "list_clusters",
+        "clusters",
+        detail=Detail("describe_cluster", request_key="name", result_key="cluster"),
+    ),
+    "lambda_functions": Collection("lambda", "list_functions", "Functions"),
+}
+
+
+def _jsonable(value: Any) -> Any:
+    """Normalise a boto3 response to what JSON round-trips unchanged.
+
+    Applied at collection time, not just on save, so a live snapshot and one loaded
+    from disk hold identical values and callers need only one code path: timestamps
+    are always ISO-8601 strings.
+    """
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    return value
+
+
+def _pages(client: Any, operation: str, params: dict[str, Any]) -> Iterator[Any]:
+    """Yield every response page. Falls back to one call where AWS has no paginator."""
+    if client.can_paginate(operation):
+        yield from client.get_paginator(operation).paginate(**params)
+    else:
+        yield getattr(client, operation)(**params)
+
+
+def _list(
+    client: Any, operation: str, result_key: str, params: dict[str, Any]
+) -> Iterator[Any]:
+    for page in _pages(client, operation, params):
+        result = page.get(result_key)
+        if isinstance(result, list):
+            yield from result
+        elif result is not None:
+            yield result
+
+
+def _fetch(client: Any, collection: Collection) -> list[Any]:
+    """Return every item of `collection` from one regional client."""
+    items: Iterable[Any] = _list(
+        client, collection.operation, collection.result_key, dict(collection.params)
+    )
+    if collection.nested_key:
+        items = (
+            nested
+            for wrapper in items
+            for nested in wrapper.get(collection.nested_key, [])
+        )
+    if detail := collection.detail:
+        items = (
+            expanded
+            for parent in items
+            for expanded in _list(
+                client,
+                detail.operation,
+                detail.result_key,
+                {
+                    detail.request_key: parent[detail.source_key]
+                    if detail.source_key
+                    else parent
+                },
+            )
+        )
+    return list(items)
+
+
+@dataclass
+class Snapshot:
+    """A point-in-time inventory: `resources[region][collection] -> [item, ...]`.
+
+    Every item carries `_region`, so a query across regions keeps provenance. `errors`
+    lists every (region, collection) that could not be read; those collections are
+    absent from `resources`, never present-but-empty.
+    """
+
+    taken_at: str
+    account_id: str | None
+    regions: list[str]
+    resources: dict[str, dict[str, list[dict[str, Any]]]]
+    errors: list[dict[str, str]] = field(default_factory=list)
+
+    def items(
+        self, collection: str, *, region: str | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every item of `collection`, across all regions unless one is given."""
+        regions = [region] if region else self.regions
+        for name in regions:
+            yield from self.resources.get(name, {}).get(collection, [])
+
+    def is_complete(self, *collections: str) -> bool:
+        """Whether every region returned every one of `collections` without error."""
+        return not any(error["collection"] in collections for error in self.errors)
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot as JSON, gzip-compressed when `path` ends in `.gz`."""
+        payload = json.dumps(
+            {
+                "version": SNAPSHOT_VERSION,
+                "taken_at": self.taken_at,
+                "account_id": self.account_id,
+                "regions": self.regions,
+                "resources": self.resources,
+                "errors": self.errors,
+            }
+        ).encode()
+        path.write_bytes(gzip.compress(payload) if path.suffix == ".gz" else payload)
+
+    @classmethod
+    def load(cls, path: Path) -> "Snapshot":
+        """Read a snapshot written by `save`."""
+        raw = path.read_bytes()
+        data = json.loads(gzip.decompress(raw) if path.suffix == ".gz" else raw)
+        if data.get("version") != SNAPSHOT_VERSION:
+            msg = (
+                f"{path} is inventory snapshot version {data.get('version')}, "
+                f"expected {SNAPSHOT_VERSION}. Re-collect it."
+            )
+            raise ValueError(msg)
+        return cls(
+            taken_at=data["taken_at"],
+            account_id=data["account_id"],
+            regions=data["regions"],
+            resources=data["resources"],
+            errors=data["errors"],
+        )
+
+
+def enabled_regions(session: BotoSession | None = None) -> list[str]:
+    """Return the regions enabled for this account (opted-out regions excluded)."""
+    session = session or boto3.Session()
+    ec2 = session.client("ec2", config=_BOTO_CONFIG)
+    return sorted(region["RegionName"] for region in ec2.describe_regions()["Regions"])
+
+
+def collect(
+    regions: Iterable[str] | None = None,
+    collections: Iterable[str] | None = None,
+    *,
+    session: BotoSession | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Snapshot:
+    """Collect `collections` (default: all) from `regions` (default: all enabled).
+
+    Clients are built up front on the calling thread -- boto3 sessions are not
+    thread-safe, clients are -- and each (region, collection) pair is one job.
+    """
+    session = session or boto3.Session()
+    regions = sorted(regions) if regions else enabled_regions(session)
+    names = sorted(collections) if collections else sorted(COLLECTIONS)
+    if unknown := set(names) - set(COLLECTIONS):
+        msg = f"unknown collections {sorted(unknown)}; known: {sorted(COLLECTIONS)}"
+        raise ValueError(msg)
+
+    clients = {
+        (region, service): session.client(
+            service, region_name=region, config=_BOTO_CONFIG
+        )
+        for region in regions
+        for service in {COLLECTIONS[name].service for name in names}
+    }
+
+    def job(region: str, name: str) -> list[Any]:
+        collection = COLLECTIONS[name]
+        return _fetch(clients[region, collection.service], collection)
+
+    resources: dict[str, dict[str, list[dict[str, Any]]]] = {r: {} for r in regions}
+    errors: list[dict[str, str]] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            (region, name): pool.submit(job, region, name)
+            for region in regions
+            for name in names
+        }
+        for (region, name), future in futures.items():
+            try:
+                items = future.result()
+            except (BotoCoreError, ClientError) as error:
+                errors.append(
+                    {"region": region, "collection": name, "error": str(error)}
+                )
+                continue
+            resources[region][name] = [
+                {**_jsonable(item), "_region": region} for item in items
+            ]
+
+    try:
+        account_id = session.client("sts").get_caller_identity()["Account"]
+    except (BotoCoreError, ClientError):
+        account_id = None
+    return Snapshot(
+        taken_at=datetime.now(UTC).isoformat(),
+        account_id=account_id,
+        regions=regions,
+        resources=resources,
+        errors=errors,
+    )
+
+
+def tags_string(item: dict[str, Any]) -> str:
+    """Render an item's `Tags` as `k=v, k=v`, the form the CSV reports use."""
+    return ", ".join(f"{tag['Key']}={tag['Value']}" for tag in item.get("Tags", []))
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a snapshot timestamp, treating a naive one as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
@@ -4,10 +4,15 @@ from functools import lru_cache
 
 import boto3
 import pulumi
-from botocore.exceptions import ClientError
+
+from ol_infrastructure.lib.aws.capability_catalog import (
+    engine_versions_from_catalog,
+    live_lookups_enabled,
+    load_catalog,
+)
+from ol_infrastructure.lib.aws.ec2_helper import instance_type_spec
 
 rds_client = boto3.client("rds")
-ec2_client = boto3.client("ec2")
 
 # The RDS default parameter groups for PostgreSQL set
 # ``max_connections = LEAST({DBInstanceClassMemory/9531392}, 5000)``. These two
@@ -33,10 +38,18 @@ def db_engines() -> dict[str, list[str]]:
     """Generate a list of database engines and their currently available versions on
     RDS.
 
+    Read from the AWS capability catalog unless live lookups are enabled or the
+    catalog was seeded by hand rather than generated.
+
     :returns: Dictionary of engine names and the list of available versions
 
     :rtype: Dict[str, List[str]]
     """
+    if engine_versions_from_catalog():
+        return {
+            engine: list(versions)
+            for engine, versions in load_catalog().rds_engines.items()
+        }
     all_engines_paginator = rds_client.get_paginator("describe_db_engine_versions")
     engines_versions = defaultdict(list)
     for engines_page in all_engines_paginator.paginate():
@@ -80,18 +93,15 @@ def postgres_max_connections(db_instance_type: str) -> int:
     :rtype: int
     """
     # RDS instance classes are the EC2 class with a ``db.`` prefix, and the
-    # DescribeDBInstance APIs don't report instance memory, so resolve it from EC2.
-    try:
-        instance_types = ec2_client.describe_instance_types(
-            InstanceTypes=[db_instance_type.removeprefix("db.")]
-        )["InstanceTypes"]
-    except ClientError as exc:
-        # An unknown type raises InvalidInstanceType rather than returning an empty
-        # list. The instance class comes from Pulumi config, so a typo lands here, and
-        # AWS reports the stripped EC2 name -- report the value as configured instead.
+    # DescribeDBInstance APIs don't report instance memory, so resolve it from the
+    # EC2 instance type in the capability catalog.
+    spec = instance_type_spec(db_instance_type.removeprefix("db."))
+    if spec is None:
+        # The instance class comes from Pulumi config, so a typo lands here; report
+        # the value as configured rather than the stripped EC2 name.
         msg = f"No EC2 instance type matching RDS instance class {db_instance_type}"
-        raise ValueError(msg) from exc
-    memory_bytes = instance_types[0]["MemoryInfo"]["SizeInMiB"] * 1024 * 1024
+        raise ValueError(msg)
+    memory_bytes = spec.memory_mib * 1024 * 1024
     return min(
         memory_bytes // POSTGRES_BYTES_PER_CONNECTION, POSTGRES_MAX_CONNECTIONS_CAP
     )
@@ -119,6 +129,7 @@ def is_minor_version_change(current_version: str, desired_version: str) -> bool:
     )
 
 
+@lru_cache
 def max_minor_version(engine: str, major_version: int | str) -> str:
     """
     Given a database egine and the major version, determine the current maximum minor
@@ -156,6 +167,8 @@ def parameter_group_family(engine: str, engine_version: str) -> str:
 
     :rtype: str
     """
+    if not live_lookups_enabled():
+        return load_catalog().rds_parameter_group_family(engine, engine_version)
     engine_details = rds_client.describe_db_engine_versions(
         Engine=engine, EngineVersion=engine_version
     )
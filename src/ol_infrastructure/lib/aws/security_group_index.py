@@ -0,0 +1,227 @@
+"""Who uses this security group? A reverse-reference index over an inventory snapshot.
+
+The orphan reports used to build an `active_groups` set by hand from three or four
+resource types, which missed every other way a group is held: another group's rules,
+launch templates, load balancers, EKS, Lambda and VPC endpoints. Each of those makes
+the group undeletable, and most make it load-bearing. This walks one
+`inventory.Snapshot` once and records every reference, so each question after that is
+a dict lookup.
+
+    index = SecurityGroupIndex.from_snapshot(snapshot)
+    index.references("sg-0123")        # every resource and rule that names it
+    index.groups_in_vpc("vpc-0abc")
+    index.groups_with_tag("Name", "edxapp-web")
+    index.unused()                     # the orphan candidates
+"""
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from ol_infrastructure.lib.aws.inventory import Snapshot
+
+#: The snapshot collections a complete index reads.
+REFERENCE_COLLECTIONS = (
+    "security_groups",
+    "instances",
+    "network_interfaces",
+    "db_instances",
+    "cache_clusters",
+    "launch_template_versions",
+    "launch_configurations",
+    "load_balancers",
+    "eks_clusters",
+    "lambda_functions",
+    "vpc_endpoints",
+)
+
+
+@dataclass(frozen=True)
+class Reference:
+    """One thing that names a security group.
+
+    `kind` is the resource type (`instance`, `rds`, `sg-rule`, ...). For `sg-rule`,
+    `resource_id` is the group whose rule it is and `detail` says ingress or egress.
+    """
+
+    kind: str
+    resource_id: str
+    region: str
+    detail: str = ""
+
+
+def _ids(values: Iterable[Any], key: str | None = None) -> Iterator[str]:
+    for value in values or ():
+        group_id = value.get(key) if key else value
+        if group_id:
+            yield group_id
+
+
+def _launch_template_groups(version: dict[str, Any]) -> Iterator[str]:
+    data = version.get("LaunchTemplateData", {})
+    yield from _ids(data.get("SecurityGroupIds", []))
+    for interface in data.get("NetworkInterfaces", []):
+        yield from _ids(interface.get("Groups", []))
+
+
+def _eks_groups(cluster: dict[str, Any]) -> Iterator[str]:
+    config = cluster.get("resourcesVpcConfig", {})
+    yield from _ids(config.get("securityGroupIds", []))
+    if config.get("clusterSecurityGroupId"):
+        yield config["clusterSecurityGroupId"]
+
+
+#: collection -> (reference kind, id field, function yielding the group ids it holds)
+_EXTRACTORS: dict[str, tuple[str, str, Callable[[dict[str, Any]], Iterable[str]]]] = {
+    "instances": (
+        "instance",
+        "InstanceId",
+        lambda item: _ids(item.get("SecurityGroups", []), "GroupId"),
+    ),
+    "network_interfaces": (
+        "eni",
+        "NetworkInterfaceId",
+        lambda item: _ids(item.get("Groups", []), "GroupId"),
+    ),
+    "db_instances": (
+        "rds",
+        "DBInstanceIdentifier",
+        lambda item: _ids(item.get("VpcSecurityGroups", []), "VpcSecurityGroupId"),
+    ),
+    "cache_clusters": (
+        "elasticache",
+        "CacheClusterId",
+        lambda item: _ids(item.get("SecurityGroups", []), "SecurityGroupId"),
+    ),
+    "launch_template_versions": (
+        "launch-template",
+        "LaunchTemplateId",
+        _launch_template_groups,
+    ),
+    "launch_configurations": (
+        "launch-configuration",
+        "LaunchConfigurationName",
+        lambda item: _ids(item.get("SecurityGroups", [])),
+    ),
+    "load_balancers": (
+        "load-balancer",
+        "LoadBalancerName",
+        lambda item: _ids(item.get("SecurityGroups", [])),
+    ),
+    "eks_clusters": ("eks", "name", _eks_groups),
+    "lambda_functions": (
+        "lambda",
+        "FunctionName",
+        lambda item: _ids((item.get("VpcConfig") or {}).get("SecurityGroupIds", [])),
+    ),
+    "vpc_endpoints": (
+        "vpc-endpoint",
+        "VpcEndpointId",
+        lambda item: _ids(item.get("Groups", []), "GroupId"),
+    ),
+}
+
+
+@dataclass
+class SecurityGroupIndex:
+    """Security groups by id, plus every reference to each, keyed for O(1) lookup."""
+
+    groups: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _references: dict[str, set[Reference]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+    _by_vpc: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+    #: (key, value) and (key, None) both map, so a key-only query is a lookup too.
+    _by_tag: dict[tuple[str, str | None], set[str]] = field(
+        default_factory=lambda: defaultdict(set)
+    )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> "SecurityGroupIndex":
+        """Build the index in one pass over the snapshot's collections.
+
+        Raises if the snapshot could not read every collection the index draws on: a
+        missing collection would make every group it holds look unreferenced, and the
+        index's main consumer is a report of groups to delete.
+        """
+        if not snapshot.is_complete(*REFERENCE_COLLECTIONS):
+            missing = sorted(
+                {
+                    f"{error['region']}/{error['collection']}"
+                    for error in snapshot.errors
+                    if error["collection"] in REFERENCE_COLLECTIONS
+                }
+            )
+            msg = f"inventory snapshot is incomplete for the SG index: {missing}"
+            raise ValueError(msg)
+
+        index = cls()
+        for group in snapshot.items("security_groups"):
+            index._add_group(group)
+        for collection, (kind, id_key, extract) in _EXTRACTORS.items():
+            for item in snapshot.items(collection):
+                reference = Reference(kind, str(item.get(id_key)), item["_region"])
+                for group_id in extract(item):
+                    index._references[group_id].add(reference)
+        return index
+
+    def _add_group(self, group: dict[str, Any]) -> None:
+        group_id = group["GroupId"]
+        self.groups[group_id] = group
+        if vpc_id := group.get("VpcId"):
+            self._by_vpc[vpc_id].add(group_id)
+        for tag in group.get("Tags", []):
+            self._by_tag[tag["Key"], tag["Value"]].add(group_id)
+            self._by_tag[tag["Key"], None].add(group_id)
+        for direction, rules in (
+            ("ingress", group.get("IpPermissions", [])),
+            ("egress", group.get("IpPermissionsEgress", [])),
+        ):
+            reference = Reference("sg-rule", group_id, group["_region"], direction)
+            for rule in rules:
+                for pair in rule.get("UserIdGroupPairs", []):
+                    if (referenced := pair.get("GroupId")) and referenced != group_id:
+                        self._references[referenced].add(reference)
+
+    def references(self, group_id: str) -> set[Reference]:
+        """Return every resource and other-group rule that names `group_id`."""
+        return set(self._references.get(group_id, ()))
+
+    def groups_in_vpc(self, vpc_id: str) -> set[str]:
+        """Return the ids of every group in `vpc_id`."""
+        return set(self._by_vpc.get(vpc_id, ()))
+
+    def groups_with_tag(self, key: str, value: str | None = None) -> set[str]:
+        """Return the ids of groups tagged `key` (with `value`, if given)."""
+        return set(self._by_tag.get((key, value), ()))
+
+    def unused(self) -> set[str]:
+        """Return the groups nothing live depends on, excluding each VPC's `default`.
+
+        A group is in use if a resource is attached to it, or if the rules of an
+        IN-USE group reference it. Rule references from unused groups do not count:
+        two groups that only reference each other are a pair of orphans, deletable
+        together, and reporting neither would hide both.
+        """
+        in_use = {
+            group_id
+            for group_id, references in self._references.items()
+            if any(reference.kind != "sg-rule" for reference in references)
+        }
+        referenced_by: dict[str, set[str]] = defaultdict(set)
+        for group_id, references in self._references.items():
+            for reference in references:
+                if reference.kind == "sg-rule":
+                    referenced_by[reference.resource_id].add(group_id)
+        frontier = list(in_use)
+        while frontier:
+            for group_id in referenced_by.get(frontier.pop(), ()):
+                if group_id not in in_use:
+                    in_use.add(group_id)
+                    frontier.append(group_id)
+        return {
+            group_id
+            for group_id, group in self.groups.items()
+            if group_id not in in_use and group.get("GroupName") != "default"
+        }
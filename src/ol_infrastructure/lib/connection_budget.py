@@ -0,0 +1,273 @@
+"""Worst-case connection demand against what each RDS instance can accept.
+
+Every application sizes its own database concurrency -- Granian blocking threads,
+uwsgi processes x threads, celery prefork concurrency, SQLAlchemy pool sizes,
+PgBouncer caps -- and nothing adds those up per database. Each number looks modest
+on its own; at ``application_max_replicas`` they can exceed ``max_connections``,
+and the first anyone hears of it is a scale-out that starts refusing connections.
+
+A program describes its database's consumers and checks them at evaluation time,
+so an overcommitted configuration fails the preview instead of the database:
+
+    budget = DatabaseBudget(
+        database=db_instance_name,
+        instance_class=db_defaults["instance_size"],
+        consumers=consumers_from_application(app_config),
+    )
+    budget.check()   # raises ConnectionBudgetExceededError, and exports the plan
+
+``check`` also exports the budget as the ``database_connection_budgets.<database>``
+stack output, one per database so that a program checking several budgets keeps
+them all. ``bin/plan-db-connections`` merges them across stacks -- several programs
+can share one instance, and only the merged view shows their sum.
+
+Demand is an upper bound by design: every thread, process or pooled slot that
+*can* hold a connection is counted as holding one, at the maximum replica count.
+"""
+
+import configparser
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import pulumi
+
+from ol_infrastructure.components.services.k8s import (
+    CELERY_WORKER_CONCURRENCY,
+    OLApplicationK8sConfig,
+    celery_beat_deployment_name,
+    celery_worker_deployment_name,
+    scheduled_job_name,
+    webapp_deployment_name,
+)
+from ol_infrastructure.components.services.pgbouncer import pgbouncer_deployment_name
+from ol_infrastructure.lib.aws.rds_helper import postgres_max_connections
+
+#: Prefix of the stack outputs budgets are exported under, one per database; the
+#: planner CLI reads every output that carries it.
+BUDGET_STACK_OUTPUT = "database_connection_budgets"
+
+#: Share of ``max_connections`` applications may plan to use. The rest is for RDS's
+#: reserved and ``rdsadmin`` sessions, migrations, credential rotation and psql, and
+#: absorbs ``postgres_max_connections`` overstating small classes by ~8%.
+DEFAULT_HEADROOM_FACTOR = 0.9
+
+
+class ConnectionBudgetExceededError(ValueError):
+    """Raised when a database's planned consumers can exceed its budget."""
+
+
+@dataclass(frozen=True)
+class ConnectionConsumer:
+    """Something that opens connections: ``connections_per_replica`` x replicas."""
+
+    name: str
+    max_replicas: int
+    connections_per_replica: int
+    #: Where the figure comes from, for the report: "granian 2x32", "uwsgi 2x50".
+    source: str = ""
+
+    @property
+    def worst_case(self) -> int:
+        return self.max_replicas * self.connections_per_replica
+
+
+@dataclass
+class DatabaseBudget:
+    """One database instance and everything that connects to it."""
+
+    database: str
+    instance_class: str
+    consumers: list[ConnectionConsumer] = field(default_factory=list)
+    #: From the instance class when unset; set it when a parameter group pins it.
+    max_connections: int | None = None
+    headroom_factor: float = DEFAULT_HEADROOM_FACTOR
+
+    def __post_init__(self) -> None:
+        self.instance_class = str(self.instance_class)
+        if self.max_connections is None:
+            self.max_connections = postgres_max_connections(self.instance_class)
+
+    @property
+    def budget(self) -> int:
+        return int((self.max_connections or 0) * self.headroom_factor)
+
+    @property
+    def demand(self) -> int:
+        return sum(consumer.worst_case for consumer in self.consumers)
+
+    @property
+    def overcommit(self) -> int:
+        """Connections demand can exceed the budget by; zero or less is within it."""
+        return self.demand - self.budget
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DatabaseBudget":
+        return cls(
+            database=data["database"],
+            instance_class=data["instance_class"],
+            consumers=[ConnectionConsumer(**item) for item in data["consumers"]],
+            max_connections=data["max_connections"],
+            headroom_factor=data["headroom_factor"],
+        )
+
+    @property
+    def output_name(self) -> str:
+        """The stack output this budget is exported as."""
+        return f"{BUDGET_STACK_OUTPUT}.{self.database}"
+
+    def report(self) -> str:
+        """Render the budget and its consumers as a small plain-text table."""
+        status = f"OVERCOMMITTED by {self.overcommit}" if self.overcommit > 0 else "ok"
+        lines = [
+            f"{self.database} ({self.instance_class}): demand {self.demand} / "
+            f"budget {self.budget} of max_connections {self.max_connections} "
+            f"-- {status}"
+        ]
+        lines.extend(
+            f"  {consumer.worst_case:>6}  {consumer.max_replicas:>3} x "
+            f"{consumer.connections_per_replica:<4} {consumer.name}"
+            + (f"  [{consumer.source}]" if consumer.source else "")
+            for consumer in sorted(
+                self.consumers, key=lambda consumer: consumer.worst_case, reverse=True
+            )
+        )
+        return "\n".join(lines)
+
+    def check(self, *, enforce: bool = True) -> "DatabaseBudget":
+        """Export the budget, then fail the program if demand exceeds it.
+
+        With ``enforce=False`` an overcommit is a warning instead, for adopting the
+        check on a database that is already over and needs a plan to get under.
+        """
+        pulumi.export(self.output_name, self.to_dict())
+        if self.overcommit > 0:
+            if enforce:
+                raise ConnectionBudgetExceededError(self.report())
+            pulumi.log.warn(self.report())
+        return self
+
+
+def budgets_from_outputs(outputs: dict[str, Any]) -> list[DatabaseBudget]:
+    """Return the budgets among a stack's outputs (``pulumi stack output --json``)."""
+    return [
+        DatabaseBudget.from_dict(value)
+        for name, value in outputs.items()
+        if name.startswith(f"{BUDGET_STACK_OUTPUT}.")
+    ]
+
+
+def merge_budgets(budgets: list[DatabaseBudget]) -> list[DatabaseBudget]:
+    """Combine budgets for the same database, e.g. read from several stacks."""
+    merged: dict[str, DatabaseBudget] = {}
+    for budget in budgets:
+        if budget.database not in merged:
+            merged[budget.database] = DatabaseBudget(
+                database=budget.database,
+                instance_class=budget.instance_class,
+                max_connections=budget.max_connections,
+                headroom_factor=budget.headroom_factor,
+            )
+        target = merged[budget.database]
+        target.consumers.extend(
+            consumer
+            for consumer in budget.consumers
+            if consumer not in target.consumers
+        )
+        target.headroom_factor = min(target.headroom_factor, budget.headroom_factor)
+    return sorted(merged.values(), key=lambda budget: budget.overcommit, reverse=True)
+
+
+def uwsgi_connections_per_pod(uwsgi_ini: str) -> int:
+    """Return ``processes x threads`` from a uwsgi.ini, each defaulting to 1."""
+    parser = configparser.ConfigParser(
+        interpolation=None, strict=False, allow_no_value=True
+    )
+    parser.read_string(uwsgi_ini)
+    section = parser["uwsgi"] if parser.has_section("uwsgi") else {}
+    processes = int(section.get("processes") or section.get("workers") or 1)
+    threads = int(section.get("threads") or 1)
+    return processes * threads
+
+
+def _webapp_consumer(
+    config: OLApplicationK8sConfig, connections_per_pod: int | None
+) -> ConnectionConsumer:
+    name = webapp_deployment_name(config.application_name)
+    if connections_per_pod is not None:
+        return ConnectionConsumer(
+            name, config.application_max_replicas, connections_per_pod, "explicit"
+        )
+    granian = config.granian_config
+    if granian is not None:
+        granian, _ = granian.tuned(config.resource_requests, config.resource_limits)
+    if granian is not None and granian.interface == "wsgi":
+        # Django gives each request thread its own connection.
+        return ConnectionConsumer(
+            name,
+            config.application_max_replicas,
+            granian.workers * (granian.blocking_threads or 1),
+            f"granian {granian.workers}x{granian.blocking_threads}",
+        )
+    if granian is None and config.import_uwsgi_config:
+        uwsgi_ini = config.project_root.joinpath("files/uwsgi.ini").read_text()
+        return ConnectionConsumer(
+            name,
+            config.application_max_replicas,
+            uwsgi_connections_per_pod(uwsgi_ini),
+            "uwsgi processes x threads",
+        )
+    # ASGI apps and custom commands do not say how many connections they hold.
+    msg = (
+        f"cannot infer database connections per pod for {config.application_name}; "
+        "pass connections_per_pod"
+    )
+    raise ValueError(msg)
+
+
+def consumers_from_application(
+    config: OLApplicationK8sConfig, *, connections_per_pod: int | None = None
+) -> list[ConnectionConsumer]:
+    """Derive the connection consumers an ``OLApplicationK8s`` will run.
+
+    The webapp's per-pod figure comes from Granian (WSGI: workers x blocking
+    threads) or the project's uwsgi.ini; anything else needs
+    ``connections_per_pod``. Celery workers count their prefork concurrency at
+    ``max_replicas``, beat and each scheduled job one connection. With
+    ``pgbouncer_config`` set, the pooled processes are replaced by the pool's own
+    cap, which is the most they can open against RDS between them.
+    """
+    application = config.application_name
+    consumers = []
+    if config.pgbouncer_config is not None:
+        pool = config.pgbouncer_config
+        consumers.append(
+            ConnectionConsumer(
+                pgbouncer_deployment_name(application),
+                pool.replicas,
+                pool.max_db_connections,
+                "pgbouncer max_db_connections",
+            )
+        )
+    else:
+        consumers.append(_webapp_consumer(config, connections_per_pod))
+        consumers.extend(
+            ConnectionConsumer(
+                celery_worker_deployment_name(application, worker.worker_name or ""),
+                worker.max_replicas,
+                CELERY_WORKER_CONCURRENCY,
+                "celery --concurrency",
+            )
+            for worker in config.celery_worker_configs
+        )
+        if config.celery_beat_config is not None:
+            consumers.append(
+                ConnectionConsumer(celery_beat_deployment_name(application), 1, 1)
+            )
+    consumers.extend(
+        ConnectionConsumer(scheduled_job_name(application, job.name), 1, 1, "cronjob")
+        for job in config.scheduled_jobs
+    )
+    return consumers
@@ -1,9 +1,10 @@
-from pathlib import Path
-
 import pulumi
 import pulumi_consul as consul
 
-from bridge.secrets.sops import read_yaml_secrets
+from ol_infrastructure.lib.provider_registry import (
+    get_or_create_provider,
+    read_provider_credentials,
+)
 from ol_infrastructure.lib.pulumi_helper import StackInfo
 
 
@@ -13,15 +14,18 @@ def get_consul_provider(
     consul_address: str | None = None,
     provider_name: str = "consul-provider",
 ) -> consul.Provider | pulumi.ResourceOptions:
-    consul_config = pulumi.Config("consul")
-    consul_provider = consul.Provider(
-        provider_name,
-        address=consul_address or consul_config.get("address"),
-        scheme="https",
-        http_auth="pulumi:{}".format(
-            read_yaml_secrets(Path(f"pulumi/consul.{stack_info.env_suffix}.yaml"))[
-                "basic_auth_password"
-            ]
+    address = consul_address or pulumi.Config("consul").get("address")
+    consul_provider = get_or_create_provider(
+        ("consul", address, stack_info.env_suffix),
+        lambda: consul.Provider(
+            provider_name,
+            address=address,
+            scheme="https",
+            http_auth="pulumi:{}".format(
+                read_provider_credentials(
+                    f"pulumi/consul.{stack_info.env_suffix}.yaml"
+                )["basic_auth_password"]
+            ),
         ),
     )
     if wrap_in_pulumi_options:
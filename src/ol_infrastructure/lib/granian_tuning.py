@@ -0,0 +1,212 @@
+"""Size Granian's workers, blocking threads and backpressure from a measured profile.
+
+``GranianConfig`` otherwise resolves these from static defaults (1 worker, 8 blocking
+threads, 2x backpressure), or an app pins hand-tuned numbers nobody can trace back to
+a measurement. Given how long a request holds a thread, how much of that it spends off
+the GIL, and the CPU the pod is guaranteed, the right numbers follow from Little's law.
+
+Granian's metrics endpoint has no request-duration histogram (see
+docs/plans/granian-configuration-overhaul.md, "Validation"), so the profile is built
+from the counters it does export, per pod over a representative week::
+
+    # service_seconds: mean blocking-thread time per request
+    sum(rate(granian_blocking_busy_cumulative[7d]))
+      / sum(rate(granian_requests_handled[7d])) / 1e6
+    # peak_busy_threads: p99 of concurrently-busy threads per pod
+    quantile_over_time(0.99,
+      (sum by (pod) (rate(granian_blocking_busy_cumulative[5m])) / 1e6)[7d:5m])
+
+``io_wait_fraction`` is the share of ``service_seconds`` not spent on CPU: one minus
+container CPU seconds per request over ``service_seconds``. Apps behind APISIX also
+have real percentiles (``apisix_http_latency_bucket``) for ``p95_service_seconds``.
+
+The model, per worker process (each has its own GIL, so at most one core):
+
+- ``workers`` is the CPU request in whole cores, at least one, and no more than the
+  memory limit holds at ``worker_rss_mib`` each.
+- A worker saturates its core -- a whole one, since our webapps set no CPU limit, or
+  its share of the limit where one is set -- at ``core / cpu_seconds_per_request``
+  requests a second. By Little's law that many requests, each held for the tail
+  service time, keep ``core * p95 / cpu_seconds_per_request`` threads busy. Fewer
+  threads leave the core idle behind I/O; more only queue on the GIL.
+- ``blocking_threads`` is that, raised to the measured peak demand when the pod is
+  already seeing more, and capped at ``MAX_TUNED_BLOCKING_THREADS``.
+- ``backpressure`` adds a queue to the threads, as deep as drains in
+  ``max_queue_wait_seconds`` (default: one mean service time, which reproduces the
+  2x multiplier the static defaults use).
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Literal
+
+from pydantic import BaseModel, Field, PositiveFloat, PositiveInt, model_validator
+
+#: Past this many GIL-sharing threads per worker, add workers or replicas instead.
+MAX_TUNED_BLOCKING_THREADS = 64
+
+#: Share of the memory limit the workers' RSS caps may add up to, as for
+#: ``--workers-max-rss`` derived in ``OLApplicationK8s``.
+WORKER_MEMORY_SHARE = 0.9
+
+
+class GranianRequestProfile(BaseModel):
+    """A recorded request profile for one application's webapp pods."""
+
+    service_seconds: PositiveFloat = Field(
+        description="Mean time a request holds a blocking thread, in seconds."
+    )
+    p95_service_seconds: PositiveFloat | None = Field(
+        default=None,
+        description=(
+            "95th percentile service time, where the app has real percentiles. "
+            "Defaults to service_seconds."
+        ),
+    )
+    io_wait_fraction: float = Field(
+        ge=0,
+        lt=1,
+        description="Share of service time spent off the GIL, waiting on I/O.",
+    )
+    peak_busy_threads: PositiveFloat | None = Field(
+        default=None,
+        description="p99 of concurrently-busy blocking threads per pod, as measured.",
+    )
+    worker_rss_mib: PositiveInt | None = Field(
+        default=None,
+        description="Steady-state RSS of one worker, to cap workers by memory.",
+    )
+    source: str = Field(
+        default="",
+        description="Where and when this was measured, for the tuning explanation.",
+    )
+
+    @model_validator(mode="after")
+    def validate_tail(self) -> "GranianRequestProfile":
+        if (
+            self.p95_service_seconds is not None
+            and self.p95_service_seconds < self.service_seconds
+        ):
+            msg = (
+                f"p95_service_seconds={self.p95_service_seconds} is below "
+                f"service_seconds={self.service_seconds}; a tail shorter than the "
+                "mean means the two were measured over different windows."
+            )
+            raise ValueError(msg)
+        return self
+
+    @property
+    def tail_seconds(self) -> float:
+        return self.p95_service_seconds or self.service_seconds
+
+    @property
+    def cpu_seconds_per_request(self) -> float:
+        return self.service_seconds * (1 - self.io_wait_fraction)
+
+
+@dataclass(frozen=True)
+class GranianTuning:
+    """Concurrency settings tuned from a profile, and how each was arrived at."""
+
+    workers: int
+    blocking_threads: int | None
+    backpressure: int
+    explanation: list[str] = field(default_factory=list)
+
+    def explain(self) -> str:
+        return "\n".join(f"  {line}" for line in self.explanation)
+
+
+def tune_granian(  # noqa: PLR0913
+    profile: GranianRequestProfile,
+    *,
+    interface: Literal["wsgi", "asgi", "asginl"],
+    cpu_request_cores: float,
+    cpu_limit_cores: float | None = None,
+    memory_limit_bytes: int | None = None,
+    max_queue_wait_seconds: float | None = None,
+    workers: int | None = None,
+    blocking_threads: int | None = None,
+    backpressure: int | None = None,
+) -> GranianTuning:
+    """Derive workers, blocking threads and backpressure for one webapp pod.
+
+    ``workers``, ``blocking_threads`` and ``backpressure`` are pins: a value given
+    is kept as-is, and what is derived after it is derived from the pinned value.
+    """
+    if cpu_request_cores <= 0:
+        msg = "tuning Granian from a request profile needs a CPU request"
+        raise ValueError(msg)
+    notes = [
+        f"profile: {profile.service_seconds * 1000:.0f}ms mean service "
+        f"(p95 {profile.tail_seconds * 1000:.0f}ms), "
+        f"{profile.io_wait_fraction:.0%} I/O wait"
+        + (f" -- {profile.source}" if profile.source else "")
+    ]
+
+    if workers is not None:
+        notes.append(f"workers={workers} (pinned)")
+    else:
+        workers = max(1, math.floor(cpu_request_cores))
+        notes.append(
+            f"workers={workers}: {cpu_request_cores:g} CPU requested, one GIL each"
+        )
+        if memory_limit_bytes and profile.worker_rss_mib:
+            fits = math.floor(
+                memory_limit_bytes
+                * WORKER_MEMORY_SHARE
+                / 2**20
+                / profile.worker_rss_mib
+            )
+            if fits < workers:
+                workers = max(1, fits)
+                notes.append(
+                    f"  capped at {workers}: {profile.worker_rss_mib}MiB per worker "
+                    "in the memory limit"
+                )
+
+    core_share = min(1.0, cpu_limit_cores / workers) if cpu_limit_cores else 1.0
+    saturating = core_share * profile.tail_seconds / profile.cpu_seconds_per_request
+    concurrency = math.ceil(round(saturating, 6))
+    notes.append(
+        f"{saturating:.1f} requests in flight saturate {core_share:g} core per worker "
+        f"({profile.cpu_seconds_per_request * 1000:.0f}ms CPU each)"
+    )
+    if profile.peak_busy_threads is not None:
+        measured = math.ceil(profile.peak_busy_threads / workers)
+        if measured > concurrency:
+            concurrency = measured
+            notes.append(
+                f"  raised to {measured}: measured p99 demand exceeds it, so the pod "
+                "is CPU-bound at peak and wants more CPU or replicas"
+            )
+
+    if interface != "wsgi":
+        blocking_threads = None
+        in_flight = concurrency
+    elif blocking_threads is not None:
+        notes.append(f"blocking_threads={blocking_threads} (pinned)")
+        in_flight = blocking_threads
+    else:
+        blocking_threads = min(concurrency, MAX_TUNED_BLOCKING_THREADS)
+        notes.append(
+            f"blocking_threads={blocking_threads}"
+            + (
+                f" (capped from {concurrency}; add workers or replicas)"
+                if concurrency > MAX_TUNED_BLOCKING_THREADS
+                else ""
+            )
+        )
+        in_flight = blocking_threads
+
+    if backpressure is not None:
+        notes.append(f"backpressure={backpressure} (pinned)")
+    else:
+        queue_wait = max_queue_wait_seconds or profile.service_seconds
+        queue = math.ceil(round(in_flight * queue_wait / profile.service_seconds, 6))
+        backpressure = in_flight + queue
+        notes.append(
+            f"backpressure={backpressure}: {in_flight} in flight plus {queue} queued, "
+            f"which drain in {queue_wait * 1000:.0f}ms"
+        )
+    return GranianTuning(workers, blocking_threads, backpressure, notes)
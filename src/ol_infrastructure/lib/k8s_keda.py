@@ -1,4 +1,4 @@
-"""Shared KEDA autoscaling helpers for webapp deployments.
+"""Shared KEDA autoscaling helpers for webapp and celery worker deployments.
 
 Scales webapps on APISIX request-rate and p95 latency (via Prometheus) rather
 than CPU alone, with a CPU trigger retained as a backstop. CPU is a poor proxy
@@ -39,6 +39,7 @@ import pulumi_kubernetes as kubernetes
 from pulumi import ResourceOptions
 
 from ol_infrastructure.components.services.k8s import (
+    OLApplicationK8sCeleryQueueScalingConfig,
     OLApplicationK8sKedaWebappScalingConfig,
 )
 from ol_infrastructure.components.services.vault import (
@@ -47,6 +48,10 @@ from ol_infrastructure.components.services.vault import (
     OLVaultK8SStaticSecretConfig,
 )
 from ol_infrastructure.lib.pulumi_helper import StackInfo
+from ol_infrastructure.lib.recording_rules import (
+    route_p95_latency_query,
+    route_request_rate_query,
+)
 
 PROMETHEUS_SERVER = "https://prometheus-prod-10-prod-us-central-0.grafana.net/api/prom"
 
@@ -145,6 +150,8 @@ def build_webapp_keda_config(  # noqa: PLR0913
     cpu_threshold: str = DEFAULT_CPU_THRESHOLD,
     scale_down_stabilization_seconds: int = DEFAULT_SCALE_DOWN_SECONDS,
     scale_down_period_seconds: int = DEFAULT_SCALE_DOWN_SECONDS,
+    *,
+    use_recording_rules: bool = False,
 ) -> OLApplicationK8sKedaWebappScalingConfig:
     """Build a KEDA ScaledObject config driven by APISIX request rate and latency.
 
@@ -171,6 +178,10 @@ def build_webapp_keda_config(  # noqa: PLR0913
             apps with expensive cold starts; pass a smaller value where holding
             replicas that long is not worth the cost.
         scale_down_period_seconds: Evaluation period for the scale-down policy.
+        use_recording_rules: Query the series precomputed by the recording rules
+            in ``lib.recording_rules`` instead of raw APISIX metrics. Same
+            answers, a fraction of the Mimir query cost; only set it once those
+            rules are deployed to the environment's Grafana stack.
 
     Returns:
         A populated OLApplicationK8sKedaWebappScalingConfig.
@@ -185,11 +196,10 @@ def build_webapp_keda_config(  # noqa: PLR0913
     # webapp using this helper read single-digit-milli against a threshold of 20;
     # mit-learn would have needed ~11,500 rps to add one replica. Do not
     # reintroduce the divisor.
-    requests_query = f'sum(rate(apisix_http_status{{route=~"{route_matcher}"}}[5m]))'
-    latency_query = (
-        f"histogram_quantile(0.95,sum(rate("
-        f'apisix_http_latency_bucket{{route=~"{route_matcher}"}}[5m])) by (le))'
+    requests_query = route_request_rate_query(
+        route_matcher, recorded=use_recording_rules
     )
+    latency_query = route_p95_latency_query(route_matcher, recorded=use_recording_rules)
 
     triggers: list[dict[str, Any]] = [
         {
@@ -253,3 +263,40 @@ def build_webapp_keda_config(  # noqa: PLR0913
         trigger_authentication_name=trigger_auth_name,
         triggers=triggers,
     )
+
+
+def build_celery_queue_scaling(
+    *,
+    task_age_query: str | None = None,
+    max_task_age_seconds: int | None = None,
+    prometheus_trigger_auth_name: str | None = None,
+    **overrides: Any,
+) -> OLApplicationK8sCeleryQueueScalingConfig:
+    """Build a celery worker's queue-based scaling config.
+
+    Backlog scaling needs nothing beyond the worker's own broker settings. Passing
+    ``task_age_query`` adds a task-age trigger per queue against the same
+    Prometheus as the webapp triggers, authenticated with the
+    TriggerAuthentication from create_webapp_prometheus_trigger_auth -- it holds
+    the Grafana Cloud credentials, not anything webapp-specific, so one per
+    namespace serves both.
+
+    Args:
+        task_age_query: PromQL for a queue's oldest-task age in seconds, with
+            ``{queue}`` standing in for the queue name.
+        max_task_age_seconds: Age above which the worker scales out.
+        prometheus_trigger_auth_name: Name from
+            create_webapp_prometheus_trigger_auth.
+        overrides: Any other OLApplicationK8sCeleryQueueScalingConfig field.
+
+    Returns:
+        A populated OLApplicationK8sCeleryQueueScalingConfig.
+    """
+    if task_age_query is not None:
+        overrides |= {
+            "task_age_query": task_age_query,
+            "max_task_age_seconds": max_task_age_seconds,
+            "prometheus_server_address": PROMETHEUS_SERVER,
+            "prometheus_trigger_authentication_name": prometheus_trigger_auth_name,
+        }
+    return OLApplicationK8sCeleryQueueScalingConfig(**overrides)
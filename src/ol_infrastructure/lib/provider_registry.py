@@ -0,0 +1,63 @@
+"""One Pulumi provider per configuration for the life of a program.
+
+`setup_vault_provider` and `setup_k8s_provider` register stack transformations
+that hand every `vault:*` / `kubernetes:*` resource its provider, so the provider
+lookup runs once per resource -- dozens to hundreds of times in a program. The
+lookup has to be a dictionary hit, not a `sops --decrypt` and a new `Provider`.
+
+Providers are keyed on what they mean (address, namespace, options), not on how a
+caller spelled the arguments: `functools.lru_cache` keys `f(a, b)` and
+`f(a, b, c=None)` apart, and two providers built for one configuration collide on
+their resource name. The first caller's `provider_name` wins for a key.
+
+Credentials are decrypted once per file for the same reason.
+"""
+
+from collections.abc import Callable, Hashable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import pulumi
+
+from bridge.secrets.sops import read_yaml_secrets
+
+_providers: dict[Hashable, pulumi.ProviderResource] = {}
+_transformations: set[Hashable] = set()
+
+
+def get_or_create_provider(
+    key: Hashable, create: Callable[[], pulumi.ProviderResource]
+) -> Any:
+    """Return the provider registered under ``key``, creating it on first use."""
+    if key not in _providers:
+        _providers[key] = create()
+    return _providers[key]
+
+
+def register_provider_transformation(
+    key: Hashable,
+    transformation: pulumi.ResourceTransformation,
+) -> bool:
+    """Register ``transformation`` as a stack transformation once per ``key``.
+
+    Returns whether it was registered by this call.
+    """
+    if key in _transformations:
+        return False
+    pulumi.runtime.register_stack_transformation(transformation)
+    _transformations.add(key)
+    return True
+
+
+@cache
+def read_provider_credentials(sops_file: str) -> dict[str, Any]:
+    """Decrypt a provider credentials file once per program."""
+    return read_yaml_secrets(Path(sops_file))
+
+
+def clear() -> None:
+    """Forget every provider, transformation and credential (for tests)."""
+    _providers.clear()
+    _transformations.clear()
+    read_provider_credentials.cache_clear()
@@ -1,12 +1,14 @@
 """Helpers for working with Pulumi stack names and stack references."""
 
 import os
+import re
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from typing import Any
 
 import pulumi
 import pulumi.log
-from pulumi import Alias, ResourceOptions, StackReference, get_stack
+from pulumi import Alias, Config, ResourceOptions, StackReference, get_stack
 from pulumi.runtime import sync_await
 
 
@@ -201,6 +203,142 @@ def optional_stack_output_value(
     return default
 
 
+def preview_selection(config: Config, key: str) -> frozenset[str] | None:
+    """Return the names a restricted preview selects, or ``None`` for all of them.
+
+    ``key`` holds a list of names in ``config``. A program that builds only the
+    selected part of itself would have an update delete everything it left out,
+    so a selection is refused outside ``pulumi preview``.
+
+    :raises ValueError: If ``key`` is set and this is not a preview.
+    """
+    selection = config.get_object(key)
+    if not selection:
+        return None
+    if not pulumi.runtime.is_dry_run():
+        msg = (
+            f"{config.name}:{key} is set to {selection}; a restricted program would "
+            "delete everything it leaves out. Unset it before running an update."
+        )
+        raise ValueError(msg)
+    return frozenset(selection)
+
+
+@dataclass(frozen=True)
+class ResourceGroup:
+    """A named part of a Pulumi program that a preview can build on its own.
+
+    * ``requires`` — groups whose resources this group takes as inputs; they
+      are built whenever this group is.
+    * ``targets``  — URN globs, relative to ``urn:pulumi:<stack>::<project>::``,
+      that match the group's resources, e.g.
+      ``"**kubernetes:core/v1:ConfigMap::*"``. They become the ``--target``
+      flags that keep the preview's diff to the group, so they must match
+      everything the group builds, a component's children included (their
+      types are qualified by their ancestors', ``<parent type>$<type>``), and
+      nothing a group that may be left out builds.
+    """
+
+    name: str
+    requires: tuple[str, ...] = ()
+    targets: tuple[str, ...] = ()
+
+    def covers(self, urn: str) -> bool:
+        """Whether one of the group's targets matches ``urn``, as ``--target`` would.
+
+        Pulumi reads ``**`` as any run of characters and ``*`` as any run without
+        a ``:``, so ``*`` stays within a type token or a resource name.
+        """
+        relative = urn.split("::", 2)[-1]
+        return any(
+            re.fullmatch(
+                re.escape(target).replace(r"\*\*", ".*").replace(r"\*", "[^:]*"),
+                relative,
+            )
+            for target in self.targets
+        )
+
+
+class ResourceGroups:
+    """The resource groups of one program, and which of them this run builds.
+
+    Large programs declare their groups once and guard each group's
+    construction with :meth:`selected`::
+
+        groups = ResourceGroups(
+            "edxapp",
+            [
+                ResourceGroup("configmaps", targets=(...)),
+                ResourceGroup("workloads", requires=("configmaps",)),
+            ],
+        )
+        if groups.selected("configmaps"):
+            configmaps = create_k8s_configmaps(...)
+
+    By default every group is built. Setting ``<namespace>:resource_groups``
+    restricts a preview to the listed groups and the groups they require::
+
+        pulumi config set --path 'edxapp:resource_groups[0]' configmaps
+        pulumi preview --target ... # the flags the program logs
+
+    Unselected groups are never constructed, so a restricted preview evaluates
+    a fraction of the program; the logged ``--target`` flags keep Pulumi from
+    also reporting every unconstructed resource as a delete. A restricted
+    program refuses to run outside a preview. To deploy one group, unset the
+    selection and run ``pulumi up`` with the same ``--target`` flags.
+    """
+
+    config_key = "resource_groups"
+
+    def __init__(self, config_namespace: str, groups: Iterable[ResourceGroup]):
+        self.groups = {group.name: group for group in groups}
+        for group in self.groups.values():
+            self._check_names(group.requires, f"{group.name} requires")
+        config = Config(config_namespace)
+        selection = preview_selection(config, self.config_key)
+        self.selection: frozenset[str] | None = None
+        if selection is not None:
+            self._check_names(selection, f"{config.name}:{self.config_key}")
+            self.selection = self._with_requirements(selection)
+            pulumi.log.info(
+                f"Building resource groups {sorted(self.selection)}. To limit "
+                f"the diff to {sorted(selection)}, preview with: "
+                + " ".join(f"--target '{urn}'" for urn in self.target_urns(selection))
+            )
+
+    def _check_names(self, names: Iterable[str], source: str) -> None:
+        if unknown := sorted(set(names) - self.groups.keys()):
+            msg = (
+                f"{source} names unknown resource groups {unknown}; "
+                f"expected some of {sorted(self.groups)}"
+            )
+            raise ValueError(msg)
+
+    def _with_requirements(self, names: Iterable[str]) -> frozenset[str]:
+        closure: set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in closure:
+                closure.add(name)
+                pending.extend(self.groups[name].requires)
+        return frozenset(closure)
+
+    def selected(self, name: str) -> bool:
+        """Whether this run builds the group called ``name``."""
+        self._check_names([name], "selected()")
+        return self.selection is None or name in self.selection
+
+    def target_urns(self, names: Iterable[str]) -> list[str]:
+        """Return the ``--target`` URN globs for the named groups."""
+        prefix = f"urn:pulumi:{get_stack()}::{pulumi.get_project()}::"
+        return [
+            prefix + target
+            for name in sorted(names)
+            for target in self.groups[name].targets
+        ]
+
+
 def merge_otel_resource_attributes(
     env_vars: dict[str, Any],
     k8s_labels: dict[str, str],
@@ -0,0 +1,818 @@
+"""Measure what a Pulumi program costs to evaluate, offline, under mocks.
+
+`applications/dagster` and `applications/edxapp` take long enough to evaluate that
+previews time out in Concourse, and nothing says whether the time goes to imports,
+to a handful of heavy components, or to sheer resource count. This runs a program's
+`__main__.py` under `pulumi.runtime.set_mocks` and records, per program:
+
+- import time per module (from `python -X importtime`),
+- registered resources by type, and data-source calls by token,
+- time inside each `ComponentResource` subclass's constructor, total and self
+  (nested components are subtracted from their parent's self time),
+- evaluation wall time and peak RSS.
+
+Each program runs in its own interpreter: the Pulumi runtime's settings and root
+stack are process-global, import time is only measurable from a cold start, and
+peak RSS is per process.
+
+Nothing is deployed and no credentials are needed. Stack outputs, SOPS secrets and
+`secure:` config values are replaced with stubs: strings that read as their own
+path (`profiler-stub:organization/.../QA.vpc.id`) and that yield another stub when
+indexed by key. Stubs are concrete rather than unknown, so code behind an `.apply()`
+on a stack output runs and its resources are counted. Real outputs can be supplied
+as JSON (`pulumi stack output --json --show-secrets` per referenced stack, keyed by
+`organization/<project>/<stack>`); those take precedence. AWS lookups made outside
+the Pulumi engine are answered from the capability catalog where it has the answer
+(engine versions, instance types) and otherwise fail as access denied, which the
+helpers already fall back from.
+
+    profile = profile_program(Path("src/ol_infrastructure/applications/dagster"))
+    profile.components["...OLApplicationK8s"].self_seconds
+
+`compare_to_baseline` holds a profile to a recorded one within `Tolerances`; the
+benchmark suite in tests/benchmarks/program_evaluation is built on it.
+
+Constructor time is what runs synchronously in `__init__`. Work a component defers
+into `.apply()` callbacks runs later, on the event loop, and is counted in the
+program's evaluation time but not against the component.
+"""
+
+import json
+import os
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Self, cast
+
+import yaml
+
+SRC_ROOT = Path(__file__).resolve().parents[2]
+PROGRAMS_ROOT = SRC_ROOT / "ol_infrastructure"
+#: Prefixes every stubbed stack output, SOPS secret and `secure:` config value.
+STUB_PREFIX = "profiler-stub"
+_IMPORT_TIME_PREFIX = "import time:"
+#: Invoke results a program cannot do without. Any other invoke returns `{}`.
+_INVOKE_RESULTS: dict[str, dict[str, Any]] = {
+    "aws:index/getCallerIdentity:getCallerIdentity": {
+        "accountId": "123456789012",
+        "arn": "arn:aws:iam::123456789012:user/profiler",
+        "userId": "profiler",
+    },
+    "aws:index/getRegion:getRegion": {"name": "us-east-1", "region": "us-east-1"},
+    "aws:index/getPartition:getPartition": {
+        "partition": "aws",
+        "dnsSuffix": "amazonaws.com",
+    },
+    "aws:index/getAvailabilityZones:getAvailabilityZones": {
+        "names": ["us-east-1a", "us-east-1b", "us-east-1c"],
+        "zoneIds": ["use1-az1", "use1-az2", "use1-az4"],
+    },
+}
+#: Provider-computed outputs a program indexes into, by resource type. Every other
+#: resource's state is its inputs.
+_RESOURCE_OUTPUTS: dict[str, dict[str, Any]] = {
+    "aws:ses/domainDkim:DomainDkim": {
+        "dkimTokens": [f"{STUB_PREFIX}-dkim-{index}" for index in range(3)],
+    },
+    # No challenges: answering one would mean a Route 53 zone lookup.
+    "fastly:index/tlsSubscription:TlsSubscription": {"managedDnsChallenges": []},
+}
+#: Answer for the boto3 EKS lookups a program makes outside the Pulumi engine.
+_STUB_KUBERNETES_VERSION = "1.33"
+
+
+@dataclass
+class ComponentTiming:
+    """Constructor time for one `ComponentResource` class, summed over instances."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    #: Excluding time spent constructing nested components.
+    self_seconds: float = 0.0
+
+
+@dataclass
+class ImportTiming:
+    """One line of `-X importtime` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    #: 0 for an import the program (or the harness) made directly.
+    depth: int
+
+
+@dataclass
+class ProgramProfile:
+    """Everything measured for one program run."""
+
+    program: str
+    stack: str
+    ok: bool = False
+    error: str | None = None
+    wall_seconds: float = 0.0
+    evaluate_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    resources: dict[str, int] = field(default_factory=dict)
+    #: Every registered resource's URN, sorted: which resources, not just how many.
+    urns: list[str] = field(default_factory=list)
+    invokes: dict[str, int] = field(default_factory=dict)
+    components: dict[str, ComponentTiming] = field(default_factory=dict)
+    imports: list[ImportTiming] = field(default_factory=list)
+
+    @property
+    def resource_count(self) -> int:
+        """Registered resources, components included."""
+        return sum(self.resources.values())
+
+    @property
+    def import_seconds(self) -> float:
+        """Time spent importing, over every module loaded in the run."""
+        return sum(entry.self_us for entry in self.imports) / 1_000_000
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON-ready form, with the derived totals included."""
+        return {
+            **asdict(self),
+            "resource_count": self.resource_count,
+            "import_seconds": self.import_seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ProgramProfile":
+        """Rebuild a profile written by `to_dict`."""
+        fields = {
+            key: value
+            for key, value in data.items()
+            if key not in {"resource_count", "import_seconds"}
+        }
+        fields["components"] = {
+            name: ComponentTiming(**timing)
+            for name, timing in fields.get("components", {}).items()
+        }
+        fields["imports"] = [
+            ImportTiming(**entry) for entry in fields.get("imports", [])
+        ]
+        return cls(**fields)
+
+
+def discover_programs(root: Path = PROGRAMS_ROOT) -> list[Path]:
+    """Return every Pulumi program directory under `root`, sorted."""
+    return sorted(main.parent for main in root.rglob("__main__.py"))
+
+
+def resolve_program(program: str | Path) -> Path:
+    """Accept a program directory, or a path relative to `src/ol_infrastructure`."""
+    path = Path(program)
+    for candidate in (path, PROGRAMS_ROOT / path):
+        if (candidate / "__main__.py").is_file():
+            return candidate.resolve()
+    msg = f"{program} is not a Pulumi program directory (no __main__.py)"
+    raise ValueError(msg)
+
+
+def program_name(program_dir: Path) -> str:
+    """Return the program's path under `src/ol_infrastructure`, as reports name it."""
+    try:
+        return program_dir.resolve().relative_to(PROGRAMS_ROOT).as_posix()
+    except ValueError:
+        return program_dir.as_posix()
+
+
+def program_stacks(program_dir: Path) -> list[str]:
+    """Return the stacks a program has config for, from its `Pulumi.<stack>.yaml`."""
+    return sorted(
+        path.name.removeprefix("Pulumi.").removesuffix(".yaml")
+        for path in program_dir.glob("Pulumi.*.yaml")
+    )
+
+
+def resolve_stack(program_dir: Path, stack: str) -> str:
+    """Match `stack` exactly, else by its stage: `QA` selects `mitx.QA`.
+
+    Multi-tenant programs have no bare `QA` stack, and a sweep over every program
+    should not need a stack name per program. The first tenant, sorted, is used.
+    """
+    stacks = program_stacks(program_dir)
+    if stack in stacks:
+        return stack
+    for candidate in stacks:
+        if candidate.rsplit(".", 1)[-1] == stack:
+            return candidate
+    msg = f"{program_name(program_dir)} has no {stack} stack; it has {stacks}"
+    raise ValueError(msg)
+
+
+def parse_import_times(stderr: str) -> list[ImportTiming]:
+    """Parse `-X importtime` lines out of a child's stderr, ignoring everything else."""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith(_IMPORT_TIME_PREFIX):
+            continue
+        self_us, cumulative_us, module = line[len(_IMPORT_TIME_PREFIX) :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        name = module.rstrip()
+        stripped = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=stripped,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def profile_program(  # noqa: PLR0913
+    program_dir: Path,
+    *,
+    stack: str = "QA",
+    stack_outputs: Path | None = None,
+    env: Mapping[str, str | None] | None = None,
+    config: Mapping[str, Any] | None = None,
+    preview: bool = False,
+    timeout: float = 600,
+) -> ProgramProfile:
+    """Evaluate one program in a fresh interpreter and return what it cost.
+
+    A program that raises still returns a profile, with `ok=False` and the error;
+    what it registered before failing is kept, since a program that dies halfway is
+    usually the slow one being investigated. `env` is layered over this process's
+    environment; a `None` value unsets the variable. `config` is layered over the
+    stack's config, keyed `<namespace>:<key>` as `pulumi config` keys are.
+    `preview` has `pulumi.runtime.is_dry_run()` report a preview to the program.
+    """
+    program_dir = resolve_program(program_dir)
+    stack = resolve_stack(program_dir, stack)
+    with tempfile.TemporaryDirectory() as scratch:
+        result_path = Path(scratch) / "profile.json"
+        command = [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from ol_infrastructure.lib.pulumi_profiler import _worker_main; "
+            "_worker_main()",
+            str(program_dir),
+            stack,
+            str(result_path),
+            str(stack_outputs.resolve()) if stack_outputs else "",
+            json.dumps(dict(config or {})),
+            "preview" if preview else "",
+        ]
+        child_env = {
+            # boto3 calls made while evaluating need a region even to fail cleanly.
+            "AWS_DEFAULT_REGION": "us-east-1",
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(
+                filter(None, [str(SRC_ROOT), os.environ.get("PYTHONPATH")])
+            ),
+        }
+        for key, value in (env or {}).items():
+            if value is None:
+                child_env.pop(key, None)
+            else:
+                child_env[key] = value
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(  # noqa: S603
+                command,
+                cwd=program_dir,
+                env=child_env,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            return ProgramProfile(
+                program=program_name(program_dir),
+                stack=stack,
+                error=f"timed out after {timeout}s",
+                wall_seconds=time.perf_counter() - started,
+            )
+        wall_seconds = time.perf_counter() - started
+
+        if result_path.exists():
+            profile = ProgramProfile.from_dict(json.loads(result_path.read_text()))
+        else:
+            # The interpreter died before the worker could write anything.
+            tail = completed.stderr.strip().splitlines()[-5:]
+            profile = ProgramProfile(
+                program=program_name(program_dir),
+                stack=stack,
+                error="\n".join(
+                    line for line in tail if not line.startswith(_IMPORT_TIME_PREFIX)
+                ),
+            )
+    profile.wall_seconds = wall_seconds
+    profile.imports = parse_import_times(completed.stderr)
+    return profile
+
+
+@dataclass(frozen=True)
+class Tolerances:
+    """How far a benchmarked program may drift from its baseline and still pass."""
+
+    #: Wall time may grow to this multiple of the baseline.
+    wall_time_ratio: float = 1.75
+    #: ...and growth under this many seconds never fails: short runs are mostly noise.
+    wall_time_floor_seconds: float = 2.0
+    peak_rss_ratio: float = 1.5
+    #: Resource count may move this far in EITHER direction. A program that silently
+    #: stops declaring resources is as much a regression as one that adds hundreds.
+    resource_count_delta: int = 10
+
+
+@dataclass(frozen=True)
+class BenchmarkProgram:
+    """One entry of a benchmark suite."""
+
+    program: str
+    stack: str
+    #: Evaluation makes real, read-only AWS API calls (engine versions, instance
+    #: types, hosted zones ...) and cannot run without credentials.
+    requires_aws: bool = False
+    env: dict[str, str] = field(default_factory=dict)
+    #: Times this machine: its wall time against its baseline scales every other
+    #: program's baseline, so a slower CI runner does not read as a regression.
+    reference: bool = False
+
+
+def load_benchmark_suite(path: Path) -> tuple[Tolerances, list[BenchmarkProgram]]:
+    """Read a suite file: a `tolerances` mapping and a `programs` list."""
+    suite = yaml.safe_load(path.read_text())
+    return (
+        Tolerances(**suite.get("tolerances", {})),
+        [BenchmarkProgram(**entry) for entry in suite["programs"]],
+    )
+
+
+def reference_program(programs: list[BenchmarkProgram]) -> BenchmarkProgram | None:
+    """Return the suite's reference program, if it names one."""
+    return next((entry for entry in programs if entry.reference), None)
+
+
+def profile_reference(entry: BenchmarkProgram, *, runs: int = 3) -> ProgramProfile:
+    """Profile the reference program `runs` times and return the fastest run.
+
+    The fastest run is the one least disturbed by whatever else the machine was
+    doing, which is what a speed measurement wants.
+    """
+    profiles = [
+        profile_program(
+            resolve_program(entry.program), stack=entry.stack, env=entry.env
+        )
+        for _ in range(runs)
+    ]
+    failed = [profile for profile in profiles if not profile.ok]
+    if failed:
+        return failed[0]
+    return min(profiles, key=lambda profile: profile.wall_seconds)
+
+
+def machine_speed(reference: ProgramProfile, baseline: ProgramProfile) -> float:
+    """Return how much slower this machine ran the reference than the baseline did.
+
+    1.0 when either side has nothing to compare, so wall time is then held to the
+    baseline as recorded.
+    """
+    if not (reference.ok and baseline.wall_seconds > 0):
+        return 1.0
+    return reference.wall_seconds / baseline.wall_seconds
+
+
+def baseline_entry(profile: ProgramProfile) -> dict[str, Any]:
+    """Return the fields of `profile` a baseline keeps: the compared ones."""
+    return {
+        "program": profile.program,
+        "stack": profile.stack,
+        "ok": profile.ok,
+        "wall_seconds": round(profile.wall_seconds, 2),
+        "peak_rss_bytes": profile.peak_rss_bytes,
+        "resources": dict(sorted(profile.resources.items())),
+    }
+
+
+def compare_to_baseline(
+    profile: ProgramProfile,
+    baseline: ProgramProfile,
+    tolerances: Tolerances,
+    *,
+    speed: float = 1.0,
+) -> list[str]:
+    """Return one line per way `profile` regressed from `baseline`; empty if none.
+
+    `speed` is the reference program's wall time in this run over its baseline
+    wall time. The baseline's wall time is scaled by it before the tolerances
+    apply, so the comparison holds on a machine other than the one that recorded
+    the baseline.
+    """
+    if not profile.ok:
+        return [f"failed to evaluate: {profile.error}"]
+    regressions = []
+    expected_wall = baseline.wall_seconds * speed
+    wall_limit = max(
+        expected_wall * tolerances.wall_time_ratio,
+        expected_wall + tolerances.wall_time_floor_seconds,
+    )
+    if profile.wall_seconds > wall_limit:
+        scaled = f", x{speed:.2f} for this machine" if speed != 1.0 else ""
+        regressions.append(
+            f"wall time {profile.wall_seconds:.2f}s exceeds {wall_limit:.2f}s "
+            f"(baseline {baseline.wall_seconds:.2f}s{scaled})"
+        )
+    rss_limit = baseline.peak_rss_bytes * tolerances.peak_rss_ratio
+    if profile.peak_rss_bytes > rss_limit:
+        regressions.append(
+            f"peak RSS {profile.peak_rss_bytes / 2**20:.0f} MiB exceeds "
+            f"{rss_limit / 2**20:.0f} MiB "
+            f"(baseline {baseline.peak_rss_bytes / 2**20:.0f} MiB)"
+        )
+    delta = profile.resource_count - baseline.resource_count
+    if abs(delta) > tolerances.resource_count_delta:
+        changed = sorted(
+            (
+                (profile.resources.get(typ, 0) - baseline.resources.get(typ, 0), typ)
+                for typ in profile.resources.keys() | baseline.resources.keys()
+            ),
+            key=lambda item: (-abs(item[0]), item[1]),
+        )
+        detail = ", ".join(f"{typ} {count:+d}" for count, typ in changed[:5] if count)
+        regressions.append(
+            f"{profile.resource_count} resources, {delta:+d} against the baseline's "
+            f"{baseline.resource_count}: {detail}"
+        )
+    return regressions
+
+
+# -- Everything below runs inside the child interpreter. ---------------------------
+
+
+class _Stub(str):
+    """A stack output or SOPS document with every key present.
+
+    A `str`, so a leaf passed straight into a resource input type-checks and
+    serialises; keyed and indexed lookups descend instead of failing (a stubbed
+    list's first element is a stub too), while slices still cut the string.
+    Iterates and unpacks as empty, so a loop over a stubbed list declares nothing
+    rather than one resource per character, and contains everything, so a membership
+    check against a stubbed list (a namespace among a cluster's namespaces) passes.
+    """
+
+    __slots__ = ("_path",)
+    _path: str
+
+    def __new__(cls, path: str) -> Self:
+        stub = super().__new__(cls, f"{STUB_PREFIX}:{path}")
+        stub._path = path
+        return stub
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            return str.__getitem__(self, key)
+        if isinstance(key, int):
+            return _Stub(f"{self._path}[{key}]")
+        return _Stub(f"{self._path}.{key}")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __contains__(self, _item: object) -> bool:
+        return True
+
+    def get(self, key: Any, default: Any = None) -> Any:  # noqa: ARG002
+        return self[key]
+
+    def keys(self) -> list[str]:
+        return []
+
+    def items(self) -> list[tuple[str, Any]]:
+        return []
+
+
+class _StubOutputs(Mapping[str, Any]):
+    """A referenced stack's outputs: real where supplied, a `_Stub` everywhere else.
+
+    A `Mapping` but deliberately not a `dict`: `Output.apply` rebuilds a returned
+    non-empty dict as a plain one, which would drop the fallback.
+    """
+
+    def __init__(self, stack: str, outputs: dict[str, Any]) -> None:
+        self._stack = stack
+        self._outputs = outputs
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._outputs:
+            return self._outputs[key]
+        return _Stub(f"{self._stack}.{key}")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._outputs)
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def get(self, key: str, default: Any = None) -> Any:  # noqa: ARG002
+        return self[key]
+
+
+def _dump_stubs_as_strings() -> None:
+    """Let programs that render YAML (edxapp's ConfigMaps) write stubs out.
+
+    PyYAML matches representers on the exact type, so a `str` subclass is otherwise
+    rejected by every dumper.
+    """
+    for representer in (yaml.representer.SafeRepresenter, yaml.representer.Representer):
+        representer.add_representer(
+            _Stub, yaml.representer.SafeRepresenter.represent_str
+        )
+
+
+def _stub_sops() -> None:
+    from bridge.secrets import sops  # noqa: PLC0415
+
+    def read_secrets(sops_file: Path) -> dict[str, Any]:
+        # Every keyed lookup a decrypted document answers, a `_Stub` answers too.
+        return cast("dict[str, Any]", _Stub(str(sops_file)))
+
+    def set_env_secrets(sops_file: Path) -> None:  # noqa: ARG001
+        return
+
+    sops.read_yaml_secrets = read_secrets
+    sops.read_json_secrets = read_secrets
+    sops.set_env_secrets = set_env_secrets
+
+
+def _stub_aws_lookups() -> None:
+    """Answer the lookups programs make while they evaluate, without AWS or network.
+
+    These are plain API calls, not invokes, so the mock monitor never sees them.
+    Every database reads as not yet created, as on a first deploy, and EKS reports
+    one Kubernetes version and offers whichever addon version is pinned. Engine
+    versions come from the capability catalog even when it is only hand-seeded:
+    which minor version is newest does not change what a program costs. Any other
+    AWS call fails as access denied, which the lookups that tolerate a missing
+    resource already handle; one that does not names the call in the profile's
+    error. HTTP fetches of public documents (the RDS CA bundle) get a stub body.
+    """
+    import httpx  # noqa: PLC0415
+    from botocore.client import BaseClient  # noqa: PLC0415
+    from botocore.exceptions import ClientError  # noqa: PLC0415
+
+    from ol_infrastructure.lib.aws import (  # noqa: PLC0415
+        eks_helper,
+        elasticache_helper,
+        rds_helper,
+    )
+    from ol_infrastructure.lib.aws.capability_catalog import (  # noqa: PLC0415
+        load_catalog,
+    )
+
+    def make_api_call(_client: Any, operation_name: str, _params: Any) -> Any:
+        error = {"Code": "AccessDenied", "Message": "profiled without AWS"}
+        raise ClientError({"Error": error}, operation_name)
+
+    def get(url: str, **_kwargs: Any) -> httpx.Response:
+        return httpx.Response(200, text=_Stub(url), request=httpx.Request("GET", url))
+
+    def get_rds_instance(instance_name: str) -> dict[str, str]:  # noqa: ARG001
+        return {}
+
+    # The helpers these replace are `lru_cache`d; caching the stubs keeps the same
+    # type on the module attribute.
+    @lru_cache
+    def get_cluster_version(*, use_default: bool = True) -> str:  # noqa: ARG001
+        return _STUB_KUBERNETES_VERSION
+
+    @lru_cache
+    def get_eks_addon_version(
+        addon_name: str,
+        cluster_version: str | None = None,  # noqa: ARG001
+        pinned_version: str | None = None,
+    ) -> str:
+        return pinned_version or _Stub(f"eks-addon.{addon_name}")
+
+    BaseClient._make_api_call = make_api_call  # noqa: SLF001
+    httpx.get = get  # type: ignore[assignment]
+
+    @lru_cache
+    def db_engines() -> dict[str, list[str]]:
+        return {engine: list(v) for engine, v in load_catalog().rds_engines.items()}
+
+    @lru_cache
+    def cache_engines() -> dict[str, list[str]]:
+        return {engine: list(v) for engine, v in load_catalog().cache_engines.items()}
+
+    rds_helper.db_engines = db_engines
+    elasticache_helper.cache_engines = cache_engines
+    rds_helper.get_rds_instance = get_rds_instance
+    eks_helper.get_cluster_version = get_cluster_version
+    eks_helper.get_eks_addon_version = get_eks_addon_version
+
+
+def _stub_stack_outputs() -> None:
+    """Make every `StackReference` answer for outputs its mock state does not hold.
+
+    `get_output`, `require_output` and `get_output_details` all read through
+    `outputs`, so wrapping that one property covers every way a program asks.
+    """
+    import pulumi  # noqa: PLC0415
+
+    init = pulumi.StackReference.__init__
+
+    @wraps(init)
+    def wrapper(self: Any, name: str, stack_name: str | None = None, opts=None):
+        init(self, name, stack_name, opts)
+        target = stack_name if stack_name is not None else name
+        self.outputs = self.outputs.apply(
+            lambda outputs: _StubOutputs(target, outputs or {})
+        )
+
+    pulumi.StackReference.__init__ = wrapper  # type: ignore[method-assign]
+
+
+def _stack_config(program_dir: Path, stack: str) -> tuple[str, dict[str, str]]:
+    """Return the project name and the stack's config, as the engine would pass it."""
+    project = yaml.safe_load((program_dir / "Pulumi.yaml").read_text())["name"]
+    stack_file = program_dir / f"Pulumi.{stack}.yaml"
+    raw = yaml.safe_load(stack_file.read_text()) if stack_file.exists() else None
+    config = {}
+    for key, value in ((raw or {}).get("config") or {}).items():
+        full_key = key if ":" in key else f"{project}:{key}"
+        if isinstance(value, dict) and set(value) == {"secure"}:
+            # Secure values are read as strings and as objects; this parses as both,
+            # and is long enough for the token validators that check length.
+            config[full_key] = json.dumps({STUB_PREFIX: "secure"})
+        elif isinstance(value, str):
+            config[full_key] = value
+        else:
+            config[full_key] = json.dumps(value)
+    return project, config
+
+
+def _mocks(stack_outputs: dict[str, Any], profile: ProgramProfile) -> Any:
+    import pulumi  # noqa: PLC0415
+
+    resources = profile.resources
+    invokes = profile.invokes
+
+    class ProfilingMocks(pulumi.runtime.Mocks):
+        def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+            resources[args.typ] = resources.get(args.typ, 0) + 1
+            if args.typ == "pulumi:pulumi:StackReference":
+                name = args.inputs.get("name") or args.name
+                state = dict(args.inputs)
+                if name in stack_outputs:
+                    state["outputs"] = stack_outputs[name]
+                    state["secretOutputNames"] = []
+                return [name, state]
+            # Providers hand policy documents back as JSON strings, however they
+            # were given; a dict in the state fails the output's type check.
+            state = {
+                key: json.dumps(value)
+                if key.lower().endswith("policy") and isinstance(value, dict)
+                else value
+                for key, value in args.inputs.items()
+            }
+            return [f"{args.name}_id", state | _RESOURCE_OUTPUTS.get(args.typ, {})]
+
+        def call(self, args: pulumi.runtime.MockCallArgs):
+            invokes[args.token] = invokes.get(args.token, 0) + 1
+            return _INVOKE_RESULTS.get(args.token, {})
+
+    return ProfilingMocks()
+
+
+def _monitor(mocks: Any) -> Any:
+    """Return a mock monitor that builds URNs as the engine does.
+
+    `MockMonitor` prefixes a child's type with its parent's own type, and with the
+    root stack's; the engine qualifies it with all of its ancestors' but the stack's.
+    A profile's URNs are then the ones `pulumi preview --target` matches.
+    """
+    from pulumi.runtime.mocks import MockMonitor  # noqa: PLC0415
+    from pulumi.runtime.settings import get_project, get_stack  # noqa: PLC0415
+
+    class EngineUrnMonitor(MockMonitor):
+        def make_urn(self, parent: str, type_: str, name: str) -> str:
+            if parent:
+                parent_type = parent.split("::")[2]
+                if parent_type != "pulumi:pulumi:Stack":
+                    type_ = f"{parent_type}${type_}"
+            return f"urn:pulumi:{get_stack()}::{get_project()}::{type_}::{name}"
+
+    return EngineUrnMonitor(mocks)
+
+
+def _time_component_constructors(timings: dict[str, ComponentTiming]) -> None:
+    """Wrap `__init__` of every `ComponentResource` subclass defined from now on."""
+    import pulumi  # noqa: PLC0415
+
+    #: [instance, seconds spent in nested component constructors]
+    active: list[list[Any]] = []
+
+    def timed(init: Callable[..., None]) -> Callable[..., None]:
+        @wraps(init)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> None:
+            if active and active[-1][0] is self:
+                # A `super().__init__` within the same construction.
+                init(self, *args, **kwargs)
+                return
+            frame = [self, 0.0]
+            active.append(frame)
+            started = time.perf_counter()
+            try:
+                init(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                active.pop()
+                if active:
+                    active[-1][1] += elapsed
+                cls = type(self)
+                timing = timings.setdefault(
+                    f"{cls.__module__}.{cls.__qualname__}", ComponentTiming()
+                )
+                timing.count += 1
+                timing.total_seconds += elapsed
+                timing.self_seconds += elapsed - frame[1]
+
+        return wrapper
+
+    def init_subclass(cls: type[Any], **kwargs: Any) -> None:
+        # ComponentResource inherits object's hook, which only rejects stray keywords.
+        object.__init_subclass__(**kwargs)
+        if "__init__" in cls.__dict__:
+            cls.__init__ = timed(cls.__dict__["__init__"])
+
+    pulumi.ComponentResource.__init_subclass__ = classmethod(init_subclass)  # type: ignore[assignment,method-assign]
+
+
+def _worker_main() -> None:
+    """Child entry point.
+
+    Arguments: `<program_dir> <stack> <result.json> <outputs.json or ""> <config
+    JSON> <"preview" or "">`.
+    """
+    program_dir, stack, result_path, outputs_path, overrides, preview = sys.argv[1:7]
+    program_dir_path = Path(program_dir)
+    profile = ProgramProfile(program=program_name(program_dir_path), stack=stack)
+
+    import pulumi  # noqa: PLC0415
+    from pulumi.runtime.stack import run_pulumi_func  # noqa: PLC0415
+    from pulumi.runtime.sync_await import _sync_await  # noqa: PLC0415
+
+    stack_outputs = json.loads(Path(outputs_path).read_text()) if outputs_path else {}
+    project, config = _stack_config(program_dir_path, stack)
+    for key, value in json.loads(overrides).items():
+        config[key] = value if isinstance(value, str) else json.dumps(value)
+    pulumi.runtime.set_all_config(config)
+    mocks = _mocks(stack_outputs, profile)
+    monitor = _monitor(mocks)
+    pulumi.runtime.set_mocks(
+        mocks, project=project, stack=stack, preview=False, monitor=monitor
+    )
+    if preview:
+        # The program sees a preview, of a stack whose resources already exist: the
+        # SDK (which asks `settings.is_dry_run`) still resolves outputs as in an
+        # update, so resources a program builds inside `apply` are evaluated too.
+        pulumi.runtime.is_dry_run = lambda: True
+    # Parameterized SDKs (sdks/rootly, sdks/qdrant-cloud) check this flag without
+    # asking the monitor. The mock monitor answers RegisterPackage, but under mocks
+    # nothing records that it does.
+    pulumi.runtime.settings.SETTINGS.feature_support["parameterization"] = True
+    _stub_sops()
+    _dump_stubs_as_strings()
+    _stub_aws_lookups()
+    _stub_stack_outputs()
+    _time_component_constructors(profile.components)
+
+    sys.path.insert(0, str(program_dir_path))
+
+    def run_program() -> None:
+        runpy.run_path(str(program_dir_path / "__main__.py"), run_name="__main__")
+
+    started = time.perf_counter()
+    try:
+        _sync_await(run_pulumi_func(run_program))
+        profile.ok = True
+    except BaseException as error:  # noqa: BLE001  # SystemExit from a program too
+        profile.error = f"{type(error).__name__}: {error}"
+    profile.evaluate_seconds = time.perf_counter() - started
+    profile.urns = sorted(monitor.get_registered_resources())
+
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    profile.peak_rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    Path(result_path).write_text(json.dumps(profile.to_dict()))
+    # Skip interpreter teardown: pending Pulumi tasks and gRPC threads can hang it.
+    os._exit(0)
@@ -0,0 +1,135 @@
+"""Prometheus recording rules shared by KEDA triggers and Grafana alert rules.
+
+Every webapp ScaledObject ran ``rate(apisix_http_status[5m])`` and a
+``histogram_quantile`` over ``apisix_http_latency_bucket`` against Mimir each
+polling interval, and the APISIX edge alert rules computed the same rates again,
+per host, in three places per expression. Each of those touches every raw APISIX
+series -- one per route, status code, node and (for latency) bucket.
+
+The rules here precompute the aggregations once a minute, in the Grafana stack
+(``infrastructure/grafana_alerting/metric_rules/recording.py``), into a handful
+of low-cardinality series. KEDA and the alert rules then read those, so both act
+on the same numbers and a query touches tens of series instead of thousands.
+
+Names follow the Prometheus ``level:metric:operations`` convention. A window up
+to ``MAX_RECORDED_WINDOW`` may be taken as ``avg_over_time`` of the 5m series:
+an average of rates sampled every minute is that window's rate to within the 5m
+smoothing at its start. Longer windows are computed from the raw counters.
+A recorded series has no sample while its source is idle, so over hours
+``avg_over_time`` averages only the busy minutes and overstates the rate, and
+it has no history at all for that long after the rules are first deployed.
+
+**Recorded series only exist once the recording rules are deployed** to the
+Grafana stack for that environment. A KEDA trigger against a missing series
+errors rather than scaling, so webapps opt in with
+``build_webapp_keda_config(use_recording_rules=True)`` after the rules are live,
+and the APISIX edge alerts with ``apisix_edge.create(use_recording_rules=True)``.
+"""
+
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RecordingRule:
+    """One recorded series: the metric it is written as and the PromQL behind it."""
+
+    record: str
+    expr: str
+    description: str
+
+    def selector(self, matchers: str = "") -> str:
+        """Return the recorded series with optional label matchers, e.g. route=~"x"."""
+        return f"{self.record}{{{matchers}}}" if matchers else self.record
+
+    def raw_over(self, window: str) -> str:
+        """Return the rule's own expression, computed over ``window`` instead."""
+        return self.expr.replace(f"[{RATE_WINDOW}]", f"[{window}]")
+
+
+#: Matches every rate window below; KEDA's triggers and the rules agree on it.
+RATE_WINDOW = "5m"
+#: Longest window answered from a recorded series. See the module docstring.
+MAX_RECORDED_WINDOW = "1h"
+_DURATION_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+APISIX_ROUTE_REQUEST_RATE = RecordingRule(
+    record=f"route:apisix_http_status:rate{RATE_WINDOW}",
+    expr=f"sum by (route) (rate(apisix_http_status[{RATE_WINDOW}]))",
+    description="Requests per second per APISIX route.",
+)
+APISIX_ROUTE_LATENCY_BUCKET_RATE = RecordingRule(
+    record=f"route_type_le:apisix_http_latency_bucket:rate{RATE_WINDOW}",
+    # Keeps `type` (request, upstream, apisix) rather than choosing one: the KEDA
+    # latency trigger has always summed all three, and a recorded query that
+    # answered a different question would move scaling when a webapp opts in.
+    expr=(
+        f"sum by (route, type, le) (rate(apisix_http_latency_bucket[{RATE_WINDOW}]))"
+    ),
+    description=(
+        "Request latency histogram buckets per APISIX route, as rates, for "
+        "histogram_quantile over any set of routes."
+    ),
+)
+APISIX_HOST_REQUEST_RATE = RecordingRule(
+    record=f"matched_host:apisix_http_status:rate{RATE_WINDOW}",
+    expr=f"sum by (matched_host) (rate(apisix_http_status[{RATE_WINDOW}]))",
+    description="Requests per second per public host at the APISIX edge.",
+)
+APISIX_HOST_5XX_RATE = RecordingRule(
+    record=f"matched_host:apisix_http_status_5xx:rate{RATE_WINDOW}",
+    expr=(
+        "sum by (matched_host) ("
+        f'rate(apisix_http_status{{code=~"5.."}}[{RATE_WINDOW}]))'
+    ),
+    description="5xx responses per second per public host at the APISIX edge.",
+)
+
+RECORDING_RULES: tuple[RecordingRule, ...] = (
+    APISIX_ROUTE_REQUEST_RATE,
+    APISIX_ROUTE_LATENCY_BUCKET_RATE,
+    APISIX_HOST_REQUEST_RATE,
+    APISIX_HOST_5XX_RATE,
+)
+
+
+def _seconds(duration: str) -> int:
+    match = re.fullmatch(r"(\d+)([smhd])", duration)
+    if match is None:
+        msg = f"unsupported PromQL duration {duration!r}"
+        raise ValueError(msg)
+    return int(match.group(1)) * _DURATION_SECONDS[match.group(2)]
+
+
+def over_window(rule: RecordingRule, window: str, *, recorded: bool) -> str:
+    """Return ``rule``'s rate over ``window``.
+
+    Recorded, a window up to ``MAX_RECORDED_WINDOW`` reads the 5m series; any
+    longer window, and every window when not recorded, is ``rule``'s own
+    expression over the raw counters.
+    """
+    if not recorded or _seconds(window) > _seconds(MAX_RECORDED_WINDOW):
+        return rule.raw_over(window)
+    if window == RATE_WINDOW:
+        return rule.selector()
+    return f"avg_over_time({rule.selector()}[{window}])"
+
+
+def route_request_rate_query(route_matcher: str, *, recorded: bool) -> str:
+    """Total requests per second across the routes ``route_matcher`` matches."""
+    if recorded:
+        rates = APISIX_ROUTE_REQUEST_RATE.selector(f'route=~"{route_matcher}"')
+        return f"sum({rates})"
+    return f'sum(rate(apisix_http_status{{route=~"{route_matcher}"}}[{RATE_WINDOW}]))'
+
+
+def route_p95_latency_query(route_matcher: str, *, recorded: bool) -> str:
+    """p95 request latency in ms across the routes ``route_matcher`` matches."""
+    if recorded:
+        buckets = APISIX_ROUTE_LATENCY_BUCKET_RATE.selector(f'route=~"{route_matcher}"')
+        return f"histogram_quantile(0.95,sum({buckets}) by (le))"
+    return (
+        f"histogram_quantile(0.95,sum(rate("
+        f'apisix_http_latency_bucket{{route=~"{route_matcher}"}}[{RATE_WINDOW}])) '
+        "by (le))"
+    )
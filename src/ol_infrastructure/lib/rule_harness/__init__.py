@@ -0,0 +1,20 @@
+"""Offline test harness for the Grafana alert rules in grafana_alerting.
+
+The rules encode PromQL and LogQL with thresholds baked in, and until now the only
+place they ran was production: a rule that never fires, or fires on the wrong
+label set, or scans six hours of raw series every minute, was found when it
+missed an incident or showed up on the Grafana Cloud bill.
+
+This evaluates each rule -- collected from the same ``create()`` functions the
+stack deploys -- against synthetic or recorded series and log lines, checks which
+instances fire and when, and reports what each evaluation reads. Cases live in
+tests/ol_infrastructure/infrastructure/grafana_alerting/alert_rule_cases.yaml;
+``bin/check-alert-rules`` prints the per-rule cost table.
+
+- ``query``: parser for the PromQL and LogQL subset the rules use.
+- ``evaluator``: instant-query evaluation against fixtures, with Prometheus's
+  and Loki's semantics where outcomes depend on them.
+- ``fixtures``: series and log-stream stores, promtool series notation, and
+  recorded ``query_range`` responses.
+- ``rules``: rule collection, Grafana's firing model, cases and cost.
+"""
@@ -0,0 +1,648 @@
+"""Instant-query evaluation of parsed PromQL and LogQL against fixtures.
+
+Follows Prometheus's semantics where a rule's outcome depends on them: the 5m
+lookback for instant selectors, ``rate``/``increase`` extrapolation and counter
+resets, label handling and one-to-one/group_left matching in binary operators,
+and comparison operators filtering rather than returning booleans.
+
+LogQL follows Loki's: parsed labels join the stream's (suffixed ``_extracted``
+on a clash), ``label_format dst=src`` renames, and a metric query whose result
+still carries an ``__error__`` label fails, as Loki's does, instead of counting
+lines a parser could not read.
+"""
+
+import json
+import math
+import operator
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from ol_infrastructure.lib.rule_harness.fixtures import (
+    STALE,
+    LogStore,
+    SelectCost,
+    SeriesStore,
+)
+from ol_infrastructure.lib.rule_harness.query import (
+    COMPARISONS,
+    SET_OPERATORS,
+    Aggregate,
+    Binary,
+    Call,
+    LabelFilter,
+    LabelFormat,
+    LineFilter,
+    LineFormat,
+    LogParser,
+    LogSelector,
+    Node,
+    NumberLiteral,
+    QuerySyntaxError,
+    StringLiteral,
+    Unary,
+    VectorMatching,
+    VectorSelector,
+    parse_query,
+)
+
+#: Prometheus's default lookback for instant selectors.
+LOOKBACK_SECONDS = 300
+
+
+class QueryEvaluationError(ValueError):
+    """A query that parses but fails to evaluate, as it would in Mimir or Loki."""
+
+
+class Sample(NamedTuple):
+    labels: dict[str, str]
+    value: float
+
+
+Vector = list[Sample]
+#: A series' samples inside a range selector, stale markers dropped.
+Window = list[tuple[float, float]]
+_LabelKey = tuple[tuple[str, str], ...]
+
+_ARITHMETIC: dict[str, Callable[[float, float], float]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": lambda a, b: a / b if b else math.copysign(math.inf, a) if a else math.nan,
+    "%": lambda a, b: math.fmod(a, b) if b else math.nan,
+    "^": operator.pow,
+}
+_COMPARE: dict[str, Callable[[float, float], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+_TEMPLATE_FIELD = re.compile(r"{{\s*\.(\w+)\s*}}")
+_LOGFMT_PAIR = re.compile(r'([^\s=]+)=("(?:\\.|[^"\\])*"|\S*)')
+_INVALID_LABEL_CHARS = re.compile(r"[^A-Za-z0-9_]")
+
+
+def _key(labels: dict[str, str]) -> _LabelKey:
+    return tuple(sorted(labels.items()))
+
+
+def _without_name(labels: dict[str, str]) -> dict[str, str]:
+    return {k: v for k, v in labels.items() if k != "__name__"}
+
+
+@dataclass
+class Evaluator:
+    """Evaluate queries at a point in fixture time, counting what each one reads."""
+
+    series: SeriesStore = field(default_factory=SeriesStore)
+    logs: LogStore = field(default_factory=LogStore)
+    cost: SelectCost = field(default_factory=SelectCost)
+
+    def evaluate(self, query: str | Node, at: float, *, logql: bool = False):
+        """Return the instant vector (or scalar) ``query`` yields at ``at``."""
+        node = parse_query(query, logql=logql) if isinstance(query, str) else query
+        self.cost = SelectCost()
+        return self._eval(node, at)
+
+    def _eval(self, node: Node, at: float):  # noqa: PLR0911
+        if isinstance(node, NumberLiteral):
+            return node.value
+        if isinstance(node, StringLiteral):
+            msg = "string literals are only valid as function arguments"
+            raise QueryEvaluationError(msg)
+        if isinstance(node, VectorSelector):
+            if node.range_seconds is not None:
+                msg = "a range vector must be passed to a function"
+                raise QueryEvaluationError(msg)
+            return self._instant_selector(node, at)
+        if isinstance(node, LogSelector):
+            msg = "a log query must be wrapped in a range aggregation"
+            raise QueryEvaluationError(msg)
+        if isinstance(node, Unary):
+            operand = self._eval(node.expr, at)
+            if isinstance(operand, float):
+                return -operand
+            return [Sample(_without_name(s.labels), -s.value) for s in operand]
+        if isinstance(node, Aggregate):
+            return self._aggregate(node, self._vector(node.expr, at))
+        if isinstance(node, Binary):
+            return self._binary(
+                node, self._eval(node.lhs, at), self._eval(node.rhs, at)
+            )
+        return self._call(node, at)
+
+    def _vector(self, node: Node, at: float) -> Vector:
+        result = self._eval(node, at)
+        if not isinstance(result, list):
+            msg = f"expected an instant vector, got a scalar from {node}"
+            raise QueryEvaluationError(msg)
+        return result
+
+    def _instant_selector(self, node: VectorSelector, at: float) -> Vector:
+        end = at - node.offset_seconds
+        result = []
+        for labels, window in self.series.select(
+            node.matchers, end - LOOKBACK_SECONDS, end, self.cost
+        ):
+            if window and window[-1][1] is not STALE:
+                result.append(Sample(labels, window[-1][1]))
+        return result
+
+    def _range(self, node: Node, at: float):
+        if isinstance(node, VectorSelector) and node.range_seconds is not None:
+            end = at - node.offset_seconds
+            windows = [
+                (labels, [s for s in window if s[1] is not STALE])
+                for labels, window in self.series.select(
+                    node.matchers, end - node.range_seconds, end, self.cost
+                )
+            ]
+            return node.range_seconds, windows
+        msg = f"expected a range vector, got {node}"
+        raise QueryEvaluationError(msg)
+
+    # Functions ---------------------------------------------------------------
+
+    def _call(self, node: Call, at: float):  # noqa: C901, PLR0911, PLR0912
+        name, args = node.name, node.args
+        if name == "time":
+            return float(at)
+        if args and isinstance(args[-1], LogSelector):
+            return self._log_range_aggregation(name, args[-1], at)
+        if name in _RANGE_FUNCTIONS:
+            range_seconds, windows = self._range(args[0], at)
+            result = []
+            for labels, window in windows:
+                value = _RANGE_FUNCTIONS[name](window, at, range_seconds)
+                if value is not None:
+                    keep_name = name == "last_over_time"
+                    result.append(
+                        Sample(labels if keep_name else _without_name(labels), value)
+                    )
+            return result
+        if name in _MATH_FUNCTIONS:
+            return [
+                Sample(_without_name(s.labels), _MATH_FUNCTIONS[name](s.value))
+                for s in self._vector(args[0], at)
+            ]
+        if name in {"clamp_min", "clamp_max"}:
+            bound = self._eval(args[1], at)
+            pick = max if name == "clamp_min" else min
+            return [
+                Sample(_without_name(s.labels), pick(s.value, bound))
+                for s in self._vector(args[0], at)
+            ]
+        if name == "absent":
+            if self._vector(args[0], at):
+                return []
+            labels = {}
+            if isinstance(args[0], VectorSelector):
+                labels = {
+                    m.name: m.value
+                    for m in args[0].matchers
+                    if m.op == "=" and m.name != "__name__"
+                }
+            return [Sample(labels, 1.0)]
+        if name == "vector":
+            return [Sample({}, self._eval(args[0], at))]
+        if name == "scalar":
+            vector = self._vector(args[0], at)
+            return vector[0].value if len(vector) == 1 else math.nan
+        if name == "histogram_quantile":
+            return _histogram_quantile(
+                self._eval(args[0], at), self._vector(args[1], at)
+            )
+        msg = f"function {name}() is not supported by the rule harness"
+        raise QuerySyntaxError(msg)
+
+    # Aggregation -------------------------------------------------------------
+
+    def _aggregate(self, node: Aggregate, vector: Vector) -> Vector:
+        groups: dict[_LabelKey, tuple[dict[str, str], list[float]]] = {}
+        for sample in vector:
+            if node.without:
+                labels = {
+                    k: v
+                    for k, v in sample.labels.items()
+                    if k not in node.grouping and k != "__name__"
+                }
+            else:
+                labels = {k: v for k, v in sample.labels.items() if k in node.grouping}
+            groups.setdefault(_key(labels), (labels, []))[1].append(sample.value)
+        reduce = _AGGREGATIONS[node.op]
+        return [Sample(labels, reduce(values)) for labels, values in groups.values()]
+
+    # Binary operators --------------------------------------------------------
+
+    def _binary(self, node: Binary, lhs, rhs):
+        scalar_lhs, scalar_rhs = isinstance(lhs, float), isinstance(rhs, float)
+        if node.op in SET_OPERATORS:
+            if scalar_lhs or scalar_rhs:
+                msg = f"{node.op} is only defined between instant vectors"
+                raise QueryEvaluationError(msg)
+            return _set_operation(node.op, lhs, rhs, node.matching)
+        if scalar_lhs and scalar_rhs:
+            if node.op in COMPARISONS:
+                if not node.return_bool:
+                    msg = "comparisons between scalars must use bool"
+                    raise QueryEvaluationError(msg)
+                return float(_COMPARE[node.op](lhs, rhs))
+            return _ARITHMETIC[node.op](lhs, rhs)
+        if scalar_lhs or scalar_rhs:
+            return self._vector_scalar(node, lhs, rhs, scalar_lhs=scalar_lhs)
+        return _vector_vector(node, lhs, rhs)
+
+    def _vector_scalar(self, node: Binary, lhs, rhs, *, scalar_lhs: bool) -> Vector:
+        vector, scalar = (rhs, lhs) if scalar_lhs else (lhs, rhs)
+        result = []
+        for sample in vector:
+            a, b = (scalar, sample.value) if scalar_lhs else (sample.value, scalar)
+            if node.op in COMPARISONS:
+                matched = _COMPARE[node.op](a, b)
+                if node.return_bool:
+                    result.append(Sample(_without_name(sample.labels), float(matched)))
+                elif matched:
+                    result.append(sample)
+            else:
+                result.append(
+                    Sample(_without_name(sample.labels), _ARITHMETIC[node.op](a, b))
+                )
+        return result
+
+    # LogQL -------------------------------------------------------------------
+
+    def _log_range_aggregation(self, name: str, node: LogSelector, at: float) -> Vector:
+        if node.range_seconds is None:
+            msg = f"{name}() needs a log range, e.g. [5m]"
+            raise QueryEvaluationError(msg)
+        if name not in _LOG_RANGE_FUNCTIONS:
+            msg = f"log range function {name}() is not supported by the rule harness"
+            raise QuerySyntaxError(msg)
+        counts: dict[_LabelKey, tuple[dict[str, str], float]] = {}
+        for stream_labels, entries in self.logs.select(
+            node.matchers, at - node.range_seconds, at, self.cost
+        ):
+            for _, line in entries:
+                processed = _run_pipeline(node.stages, stream_labels, line)
+                if processed is None:
+                    continue
+                labels, line_out = processed
+                weight = len(line_out.encode()) if name.startswith("bytes") else 1
+                key = _key(labels)
+                counts[key] = (labels, counts.get(key, (labels, 0))[1] + weight)
+        for labels, _ in counts.values():
+            # Checked here, not on the final result: Loki fails the query even
+            # when an outer aggregation would drop the __error__ label.
+            if labels.get("__error__"):
+                msg = (
+                    f"pipeline error: {labels['__error__']} for series {labels}; "
+                    'filter it with `__error__=""`'
+                )
+                raise QueryEvaluationError(msg)
+        divisor = node.range_seconds if name in {"rate", "bytes_rate"} else 1
+        return [Sample(labels, total / divisor) for labels, total in counts.values()]
+
+
+def _set_operation(
+    op: str, lhs: Vector, rhs: Vector, matching: VectorMatching
+) -> Vector:
+    rhs_signatures = {_signature(s.labels, matching) for s in rhs}
+    if op == "and":
+        return [s for s in lhs if _signature(s.labels, matching) in rhs_signatures]
+    if op == "unless":
+        return [s for s in lhs if _signature(s.labels, matching) not in rhs_signatures]
+    lhs_signatures = {_signature(s.labels, matching) for s in lhs}
+    return lhs + [
+        s for s in rhs if _signature(s.labels, matching) not in lhs_signatures
+    ]
+
+
+def _signature(
+    labels: dict[str, str], matching: VectorMatching
+) -> tuple[str, ...] | _LabelKey:
+    if matching.on:
+        return tuple(labels.get(name, "") for name in matching.labels)
+    return _key(
+        {
+            k: v
+            for k, v in labels.items()
+            if k not in matching.labels and k != "__name__"
+        }
+    )
+
+
+def _vector_vector(node: Binary, lhs: Vector, rhs: Vector) -> Vector:  # noqa: C901
+    matching = node.matching
+    if matching.card == "one-to-many":
+        # Evaluate as group_left with the sides swapped, then swap back.
+        swapped = Binary(
+            _SWAPPED.get(node.op, node.op),
+            node.rhs,
+            node.lhs,
+            node.return_bool,
+            VectorMatching(
+                matching.on, matching.labels, "many-to-one", matching.include
+            ),
+        )
+        if node.op not in _SWAPPED and node.op not in {"+", "*", "==", "!="}:
+            msg = f"group_right with {node.op} is not supported by the rule harness"
+            raise QuerySyntaxError(msg)
+        return _vector_vector(swapped, rhs, lhs)
+
+    one_side: dict[tuple[str, ...] | _LabelKey, Sample] = {}
+    for sample in rhs:
+        signature = _signature(sample.labels, matching)
+        if signature in one_side:
+            msg = (
+                "found duplicate series for the match group "
+                f"{dict(zip(matching.labels, signature)) if matching.on else signature}"
+                " on the right hand-side of the operation; many-to-many matching "
+                "not allowed"
+            )
+            raise QueryEvaluationError(msg)
+        one_side[signature] = sample
+
+    result: Vector = []
+    seen: set[tuple[str, ...] | _LabelKey] = set()
+    for sample in lhs:
+        signature = _signature(sample.labels, matching)
+        other = one_side.get(signature)
+        if other is None:
+            continue
+        if matching.card == "one-to-one":
+            if signature in seen:
+                msg = (
+                    "multiple matches for labels: many-to-one matching must be "
+                    "explicit (group_left/group_right)"
+                )
+                raise QueryEvaluationError(msg)
+            seen.add(signature)
+        labels = _result_labels(node, sample.labels, other.labels)
+        if node.op in COMPARISONS:
+            matched = _COMPARE[node.op](sample.value, other.value)
+            if node.return_bool:
+                result.append(Sample(labels, float(matched)))
+            elif matched:
+                result.append(Sample(labels, sample.value))
+        else:
+            result.append(
+                Sample(labels, _ARITHMETIC[node.op](sample.value, other.value))
+            )
+    return result
+
+
+_SWAPPED = {">": "<", "<": ">", ">=": "<=", "<=": ">="}
+
+
+def _result_labels(
+    node: Binary, lhs: dict[str, str], rhs: dict[str, str]
+) -> dict[str, str]:
+    matching = node.matching
+    labels = dict(lhs)
+    if node.op not in COMPARISONS or node.return_bool:
+        labels.pop("__name__", None)
+    if matching.card == "one-to-one":
+        if matching.on:
+            labels = {k: v for k, v in labels.items() if k in matching.labels}
+        else:
+            labels = {k: v for k, v in labels.items() if k not in matching.labels}
+    for name in matching.include:
+        if name in rhs:
+            labels[name] = rhs[name]
+        else:
+            labels.pop(name, None)
+    return labels
+
+
+# Range functions -------------------------------------------------------------
+
+
+def _extrapolated(
+    window: Window, at: float, range_seconds: float, *, counter: bool, rate: bool
+) -> float | None:
+    """Prometheus's extrapolatedRate, for rate(), increase() and delta()."""
+    if len(window) < 2:  # noqa: PLR2004
+        return None
+    (first_t, first_v), (last_t, last_v) = window[0], window[-1]
+    result = last_v - first_v
+    if counter:
+        previous = first_v
+        for _, value in window[1:]:
+            if value < previous:
+                result += previous
+            previous = value
+    range_start = at - range_seconds
+    to_start, to_end = first_t - range_start, at - last_t
+    sampled = last_t - first_t
+    average_interval = sampled / (len(window) - 1)
+    if counter and result > 0 and first_v >= 0:
+        to_start = min(to_start, sampled * (first_v / result))
+    threshold = average_interval * 1.1
+    extrapolate_to = sampled
+    extrapolate_to += to_start if to_start < threshold else average_interval / 2
+    extrapolate_to += to_end if to_end < threshold else average_interval / 2
+    result *= extrapolate_to / sampled
+    return result / range_seconds if rate else result
+
+
+def _irate(window: Window, _at: float, _range: float) -> float | None:
+    if len(window) < 2:  # noqa: PLR2004
+        return None
+    (t0, v0), (t1, v1) = window[-2], window[-1]
+    return (v1 if v1 < v0 else v1 - v0) / (t1 - t0)
+
+
+def _over_time(reduce: Callable[[list[float]], float]):
+    def apply(window: Window, _at: float, _range: float) -> float | None:
+        return reduce([v for _, v in window]) if window else None
+
+    return apply
+
+
+_RANGE_FUNCTIONS: dict[str, Callable[[Window, float, float], float | None]] = {
+    "rate": lambda w, at, r: _extrapolated(w, at, r, counter=True, rate=True),
+    "increase": lambda w, at, r: _extrapolated(w, at, r, counter=True, rate=False),
+    "delta": lambda w, at, r: _extrapolated(w, at, r, counter=False, rate=False),
+    "irate": _irate,
+    "avg_over_time": _over_time(lambda vs: sum(vs) / len(vs)),
+    "min_over_time": _over_time(min),
+    "max_over_time": _over_time(max),
+    "sum_over_time": _over_time(sum),
+    "count_over_time": _over_time(lambda vs: float(len(vs))),
+    "last_over_time": _over_time(lambda vs: vs[-1]),
+    "present_over_time": _over_time(lambda _: 1.0),
+}
+_MATH_FUNCTIONS: dict[str, Callable[[float], float]] = {
+    "abs": abs,
+    "ceil": lambda v: float(math.ceil(v)) if math.isfinite(v) else v,
+    "floor": lambda v: float(math.floor(v)) if math.isfinite(v) else v,
+}
+_AGGREGATIONS: dict[str, Callable[[list[float]], float]] = {
+    "sum": sum,
+    "avg": lambda vs: sum(vs) / len(vs),
+    "min": min,
+    "max": max,
+    "count": lambda vs: float(len(vs)),
+    "group": lambda _: 1.0,
+}
+_LOG_RANGE_FUNCTIONS = frozenset(
+    {"count_over_time", "rate", "bytes_over_time", "bytes_rate"}
+)
+
+
+def _histogram_quantile(q: float, buckets: Vector) -> Vector:
+    groups: dict[_LabelKey, tuple[dict[str, str], list[tuple[float, float]]]] = {}
+    for sample in buckets:
+        labels = {k: v for k, v in sample.labels.items() if k not in {"le", "__name__"}}
+        bound = float(sample.labels["le"])
+        groups.setdefault(_key(labels), (labels, []))[1].append((bound, sample.value))
+    result = []
+    for labels, points in groups.values():
+        points.sort()
+        if len(points) < 2 or not math.isinf(points[-1][0]):  # noqa: PLR2004
+            result.append(Sample(labels, math.nan))
+            continue
+        rank = q * points[-1][1]
+        lower_bound, lower_count = 0.0, 0.0
+        for bound, count in points:
+            if count >= rank:
+                if math.isinf(bound):
+                    value = points[-2][0]
+                elif bound <= 0 or count == lower_count:
+                    value = bound
+                else:
+                    value = lower_bound + (bound - lower_bound) * (
+                        (rank - lower_count) / (count - lower_count)
+                    )
+                result.append(Sample(labels, value))
+                break
+            lower_bound, lower_count = bound, count
+    return result
+
+
+# LogQL pipeline ----------------------------------------------------------------
+
+
+def _run_pipeline(  # noqa: C901, PLR0912
+    stages, stream_labels: dict[str, str], line: str
+) -> tuple[dict[str, str], str] | None:
+    labels = dict(stream_labels)
+
+    def extract(name: str, value: str) -> None:
+        name = _INVALID_LABEL_CHARS.sub("_", name)
+        if name in stream_labels:
+            name = f"{name}_extracted"
+        labels[name] = value
+
+    for stage in stages:
+        if isinstance(stage, LineFilter):
+            if stage.op in {"|=", "!="}:
+                found = stage.value in line
+            else:
+                found = re.search(stage.value, line) is not None
+            if found != (stage.op in {"|=", "|~"}):
+                return None
+        elif isinstance(stage, LogParser):
+            _parse_line(stage, line, labels, extract)
+        elif isinstance(stage, LabelFilter):
+            if not _label_filter(stage, labels):
+                return None
+        elif isinstance(stage, LineFormat):
+            line = _render(stage.template, labels)
+        elif isinstance(stage, LabelFormat):
+            for destination, source, is_template in stage.assignments:
+                if is_template:
+                    labels[destination] = _render(source, labels)
+                else:
+                    labels[destination] = labels.pop(source, "")
+    return labels, line
+
+
+def _parse_line(  # noqa: C901
+    stage: LogParser,
+    line: str,
+    labels: dict[str, str],
+    extract: Callable[[str, str], None],
+) -> None:
+    if stage.kind == "json":
+        try:
+            document = json.loads(line)
+        except ValueError:
+            document = None
+        if not isinstance(document, dict):
+            labels["__error__"] = "JSONParserErr"
+            return
+        for name, value in _flatten(document):
+            extract(name, value)
+    elif stage.kind == "logfmt":
+        for name, value in _LOGFMT_PAIR.findall(line):
+            extract(name, json.loads(value) if value.startswith('"') else value)
+    elif stage.kind == "pattern":
+        match = _pattern_regex(stage.argument).match(line)
+        if match:
+            for name, value in match.groupdict().items():
+                extract(name, value)
+    else:
+        match = re.search(stage.argument, line)
+        if match:
+            for name, value in match.groupdict().items():
+                extract(name, value or "")
+
+
+def _flatten(document: dict[str, Any], prefix: str = "") -> Iterator[tuple[str, str]]:
+    for name, value in document.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{key}_")
+        elif isinstance(value, bool):
+            yield key, "true" if value else "false"
+        elif isinstance(value, str):
+            yield key, value
+        elif isinstance(value, int | float):
+            yield key, json.dumps(value)
+
+
+def _pattern_regex(pattern: str) -> re.Pattern[str]:
+    parts = re.split(r"(<\w+>)", pattern)
+    regex = []
+    for index, part in enumerate(parts):
+        if not part:
+            continue
+        if re.fullmatch(r"<\w+>", part):
+            name = part[1:-1]
+            last = index == len(parts) - 1 or (
+                index == len(parts) - 2 and not parts[-1]
+            )
+            capture = ".*" if last else ".*?"
+            regex.append(f"({capture})" if name == "_" else f"(?P<{name}>{capture})")
+        else:
+            regex.append(re.escape(part))
+    return re.compile("".join(regex))
+
+
+def _label_filter(stage: LabelFilter, labels: dict[str, str]) -> bool:
+    value = labels.get(stage.name, "")
+    if isinstance(stage.value, float):
+        try:
+            number = float(value)
+        except ValueError:
+            labels["__error__"] = "LabelFilterErr"
+            return True
+        return _COMPARE[stage.op](number, stage.value)
+    if stage.op in {"=", "=="}:
+        return value == stage.value
+    if stage.op == "!=":
+        return value != stage.value
+    matched = re.fullmatch(stage.value, value) is not None
+    return matched if stage.op == "=~" else not matched
+
+
+def _render(template: str, labels: dict[str, str]) -> str:
+    if "{{" in _TEMPLATE_FIELD.sub("", template):
+        msg = f"only {{{{.label}}}} substitutions are supported in {template!r}"
+        raise QuerySyntaxError(msg)
+    return _TEMPLATE_FIELD.sub(lambda m: labels.get(m[1], ""), template)
@@ -0,0 +1,235 @@
+"""Time-series and log-stream fixtures the rule evaluator reads.
+
+Times are seconds from the start of the fixture: the first sample of every series
+is at 0 unless it says otherwise. Series use promtool's expanding notation, so a
+fixture reads the way the rule-testing docs for Prometheus do::
+
+    series: 'pgbouncer_up{namespace="dagster", pod="p1"}'
+    values: '1x9 0x19'        # ten 1s, then twenty 0s, one a minute
+
+Fixtures can also be *recorded*: the JSON body of a Prometheus or Loki
+``/api/v1/query_range`` response loads into the same stores, shifted so its first
+timestamp is 0. That is how a rule is checked against the traffic that once made
+it misfire, rather than against what someone imagined that traffic looked like.
+"""
+
+import json
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ol_infrastructure.lib.rule_harness.query import (
+    Matcher,
+    QuerySyntaxError,
+    parse_matchers,
+)
+
+#: Stands in for a value in a series that has gone stale: the series is absent
+#: from instant queries from that sample on, exactly as after a staleness marker.
+STALE = None
+
+_EXPANDING = re.compile(
+    r"^(?P<start>[-+]?(\d+(\.\d+)?|\.\d+)(e[-+]?\d+)?)"
+    r"(?P<step>[-+](\d+(\.\d+)?|\.\d+)(e[-+]?\d+)?)?x(?P<times>\d+)$"
+)
+_REPEATED_BLANK = re.compile(r"^_x(?P<times>\d+)$")
+
+
+def expand_values(notation: str) -> list[float | None]:
+    """Expand promtool's series notation into one value per interval.
+
+    ``a+bxn`` is ``a, a+b, ... a+n*b`` (n+1 values), ``axn`` is ``a`` n+1 times,
+    ``_`` is a missed scrape, ``_xn`` n missed scrapes, and ``stale`` marks the
+    series stale.
+    """
+    values: list[float | None] = []
+    for term in notation.split():
+        if term == "_":
+            values.append(_MISSING)
+        elif term == "stale":
+            values.append(STALE)
+        elif blank := _REPEATED_BLANK.match(term):
+            values.extend([_MISSING] * int(blank["times"]))
+        elif expanding := _EXPANDING.match(term):
+            start = float(expanding["start"])
+            step = float(expanding["step"] or 0)
+            values.extend(start + step * i for i in range(int(expanding["times"]) + 1))
+        else:
+            try:
+                values.append(float(term))
+            except ValueError:
+                msg = f"cannot read {term!r} in series values {notation!r}"
+                raise QuerySyntaxError(msg) from None
+    return values
+
+
+class _Missing(float):
+    """A missed scrape: it takes up an interval but writes no sample."""
+
+
+_MISSING = _Missing("nan")
+
+
+def parse_series_labels(selector: str) -> dict[str, str]:
+    """Read ``metric{a="b"}`` (equality matchers only) into a label set."""
+    name, _, rest = selector.strip().partition("{")
+    labels = {"__name__": name.strip()} if name.strip() else {}
+    if rest:
+        for matcher in parse_matchers("{" + rest):
+            if matcher.op != "=":
+                msg = f"fixture series labels must use '=': {selector!r}"
+                raise QuerySyntaxError(msg)
+            labels[matcher.name] = matcher.value
+    return labels
+
+
+@dataclass
+class Series:
+    labels: dict[str, str]
+    samples: list[tuple[float, float | None]]
+
+
+@dataclass
+class LogStream:
+    labels: dict[str, str]
+    entries: list[tuple[float, str]]
+
+
+@dataclass
+class SelectCost:
+    """What one query evaluation read: the numbers behind a rule's cost report.
+
+    For LogQL, ``series_touched`` counts streams and ``samples_scanned`` lines.
+    """
+
+    series_touched: int = 0
+    samples_scanned: int = 0
+
+    def add(self, series: int, samples: int) -> None:
+        self.series_touched += series
+        self.samples_scanned += samples
+
+
+@dataclass
+class SeriesStore:
+    """Metric samples for PromQL, indexed by nothing: fixtures are small."""
+
+    series: list[Series] = field(default_factory=list)
+
+    def add(
+        self, labels: dict[str, str], samples: Iterable[tuple[float, float | None]]
+    ) -> None:
+        self.series.append(Series(dict(labels), sorted(samples, key=lambda s: s[0])))
+
+    def add_notation(
+        self, selector: str, values: str, *, interval: float = 60, start: float = 0
+    ) -> None:
+        self.add(
+            parse_series_labels(selector),
+            (
+                (start + i * interval, value)
+                for i, value in enumerate(expand_values(values))
+                if not isinstance(value, _Missing)
+            ),
+        )
+
+    def select(
+        self, matchers: Iterable[Matcher], start: float, end: float, cost: SelectCost
+    ) -> Iterator[tuple[dict[str, str], list[tuple[float, float | None]]]]:
+        """Yield each matching series with its samples in ``(start, end]``."""
+        matchers = tuple(matchers)
+        for series in self.series:
+            if all(m.matches(series.labels.get(m.name, "")) for m in matchers):
+                window = [s for s in series.samples if start < s[0] <= end]
+                cost.add(1, len(window))
+                yield series.labels, window
+
+    @property
+    def end(self) -> float:
+        return max((s.samples[-1][0] for s in self.series if s.samples), default=0)
+
+    @classmethod
+    def from_query_range(cls, response: dict[str, Any] | str | Path) -> "SeriesStore":
+        """Load a recorded Prometheus ``query_range`` matrix response."""
+        data = _load_json(response)["data"]
+        if data["resultType"] != "matrix":
+            msg = f"expected a matrix response, got {data['resultType']}"
+            raise ValueError(msg)
+        origin = min(
+            (float(t) for result in data["result"] for t, _ in result["values"]),
+            default=0,
+        )
+        store = cls()
+        for result in data["result"]:
+            store.add(
+                result["metric"],
+                ((float(t) - origin, float(v)) for t, v in result["values"]),
+            )
+        return store
+
+
+@dataclass
+class LogStore:
+    """Log lines for LogQL, one entry per line with its stream's labels."""
+
+    streams: list[LogStream] = field(default_factory=list)
+
+    def add(self, labels: dict[str, str], entries: Iterable[tuple[float, str]]) -> None:
+        self.streams.append(
+            LogStream(dict(labels), sorted(entries, key=lambda e: e[0]))
+        )
+
+    def add_lines(
+        self,
+        selector: str,
+        line: str,
+        *,
+        count: int = 1,
+        every: float = 60,
+        start: float = 0,
+    ) -> None:
+        """Add ``count`` copies of ``line``, ``every`` seconds apart from ``start``."""
+        self.add(
+            parse_series_labels(selector),
+            ((start + i * every, line) for i in range(count)),
+        )
+
+    def select(
+        self, matchers: Iterable[Matcher], start: float, end: float, cost: SelectCost
+    ) -> Iterator[tuple[dict[str, str], list[tuple[float, str]]]]:
+        """Yield each matching stream with its lines in ``(start, end]``."""
+        matchers = tuple(matchers)
+        for stream in self.streams:
+            if all(m.matches(stream.labels.get(m.name, "")) for m in matchers):
+                window = [e for e in stream.entries if start < e[0] <= end]
+                cost.add(1, len(window))
+                yield stream.labels, window
+
+    @property
+    def end(self) -> float:
+        return max((s.entries[-1][0] for s in self.streams if s.entries), default=0)
+
+    @classmethod
+    def from_query_range(cls, response: dict[str, Any] | str | Path) -> "LogStore":
+        """Load a recorded Loki ``query_range`` streams response."""
+        data = _load_json(response)["data"]
+        if data["resultType"] != "streams":
+            msg = f"expected a streams response, got {data['resultType']}"
+            raise ValueError(msg)
+        nanoseconds = [int(t) for r in data["result"] for t, _ in r["values"]]
+        origin = min(nanoseconds, default=0)
+        store = cls()
+        for result in data["result"]:
+            store.add(
+                result["stream"],
+                (((int(t) - origin) / 1e9, line) for t, line in result["values"]),
+            )
+        return store
+
+
+def _load_json(response: dict[str, Any] | str | Path) -> dict[str, Any]:
+    if isinstance(response, dict):
+        return response
+    return json.loads(Path(response).read_text())
@@ -0,0 +1,480 @@
+"""Parser for the PromQL and LogQL our Grafana rules are written in.
+
+Not a complete implementation of either language: it covers what the rules in
+``infrastructure/grafana_alerting`` use, and fails loudly -- with
+``QuerySyntaxError`` -- on anything else, so a rule that reaches for a new
+function or stage gets support added here rather than silently mis-evaluated.
+
+LogQL is parsed by the same grammar. The one difference is what ``{...}`` means:
+a series selector in PromQL, and in LogQL a stream selector followed by a
+pipeline of line filters, parsers, label filters and formatters.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import NoReturn
+
+_DURATION_UNITS = {
+    "ms": 0.001,
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 604800,
+    "y": 31536000,
+}
+_DURATION = re.compile(r"(\d+(ms|s|m|h|d|w|y))+")
+
+AGGREGATIONS = frozenset({"sum", "avg", "min", "max", "count", "group"})
+_PRECEDENCE = {
+    "or": 1,
+    "and": 2,
+    "unless": 2,
+    "==": 3,
+    "!=": 3,
+    ">": 3,
+    "<": 3,
+    ">=": 3,
+    "<=": 3,
+    "+": 4,
+    "-": 4,
+    "*": 5,
+    "/": 5,
+    "%": 5,
+    "^": 6,
+}
+COMPARISONS = frozenset({"==", "!=", ">", "<", ">=", "<="})
+SET_OPERATORS = frozenset({"and", "or", "unless"})
+
+_TOKEN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<str>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`[^`]*`)
+    | (?P<dur>(?:\d+(?:ms|[smhdwy]))+(?![\w.]))
+    | (?P<num>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+    | (?P<ident>[A-Za-z_:][\w:]*)
+    | (?P<op>==|!=|=~|!~|>=|<=|\|=|\|~|[-+*/%^(){}\[\],=<>|])
+    """,
+    re.VERBOSE,
+)
+
+
+class QuerySyntaxError(ValueError):
+    """A query the harness cannot parse, or uses something it does not support."""
+
+
+def parse_duration(text: str) -> float:
+    """Return a Prometheus duration such as ``5m`` or ``1h30m`` in seconds."""
+    if not _DURATION.fullmatch(text):
+        msg = f"invalid duration {text!r}"
+        raise QuerySyntaxError(msg)
+    return sum(
+        int(amount) * _DURATION_UNITS[unit]
+        for amount, unit in re.findall(r"(\d+)(ms|s|m|h|d|w|y)", text)
+    )
+
+
+@dataclass(frozen=True)
+class Matcher:
+    name: str
+    op: str
+    value: str
+
+    def matches(self, candidate: str) -> bool:
+        if self.op == "=":
+            return candidate == self.value
+        if self.op == "!=":
+            return candidate != self.value
+        matched = re.fullmatch(self.value, candidate) is not None
+        return matched if self.op == "=~" else not matched
+
+
+@dataclass(frozen=True)
+class NumberLiteral:
+    value: float
+
+
+@dataclass(frozen=True)
+class StringLiteral:
+    value: str
+
+
+@dataclass(frozen=True)
+class VectorSelector:
+    matchers: tuple[Matcher, ...]
+    range_seconds: float | None = None
+    offset_seconds: float = 0
+
+
+@dataclass(frozen=True)
+class LineFilter:
+    op: str
+    value: str
+
+
+@dataclass(frozen=True)
+class LogParser:
+    kind: str
+    argument: str = ""
+
+
+@dataclass(frozen=True)
+class LabelFilter:
+    name: str
+    op: str
+    value: str | float
+
+
+@dataclass(frozen=True)
+class LineFormat:
+    template: str
+
+
+@dataclass(frozen=True)
+class LabelFormat:
+    #: (destination, source label or template, whether it is a template)
+    assignments: tuple[tuple[str, str, bool], ...]
+
+
+LogStage = LineFilter | LogParser | LabelFilter | LineFormat | LabelFormat
+
+
+@dataclass(frozen=True)
+class LogSelector:
+    matchers: tuple[Matcher, ...]
+    stages: tuple[LogStage, ...] = ()
+    range_seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class Call:
+    name: str
+    args: tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    op: str
+    expr: "Node"
+    grouping: tuple[str, ...] = ()
+    without: bool = False
+
+
+@dataclass(frozen=True)
+class VectorMatching:
+    on: bool = False
+    labels: tuple[str, ...] = ()
+    card: str = "one-to-one"
+    include: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Binary:
+    op: str
+    lhs: "Node"
+    rhs: "Node"
+    return_bool: bool = False
+    matching: VectorMatching = field(default_factory=VectorMatching)
+
+
+@dataclass(frozen=True)
+class Unary:
+    op: str
+    expr: "Node"
+
+
+Node = (
+    NumberLiteral
+    | StringLiteral
+    | VectorSelector
+    | LogSelector
+    | Call
+    | Aggregate
+    | Binary
+    | Unary
+)
+
+
+def walk(node: Node):
+    """Yield ``node`` and every node beneath it."""
+    yield node
+    children: tuple[Node, ...] = ()
+    if isinstance(node, Call):
+        children = node.args
+    elif isinstance(node, Aggregate | Unary):
+        children = (node.expr,)
+    elif isinstance(node, Binary):
+        children = (node.lhs, node.rhs)
+    for child in children:
+        yield from walk(child)
+
+
+def _unquote(token: str) -> str:
+    if token[0] == "`":
+        return token[1:-1]
+    if token[0] == "'":
+        token = '"' + token[1:-1].replace('\\"', '"').replace('"', '\\"') + '"'
+    return json.loads(token)
+
+
+class _Parser:
+    def __init__(self, text: str, *, logql: bool):
+        self.text = text
+        self.logql = logql
+        self.tokens: list[tuple[str, str, int]] = []
+        position = 0
+        while position < len(text):
+            token = _TOKEN.match(text, position)
+            if token is None or token.lastgroup is None:
+                self._fail(f"unexpected {text[position]!r}", position)
+            if token.lastgroup != "ws":
+                self.tokens.append((token.lastgroup, token.group(), position))
+            position = token.end()
+        self.tokens.append(("eof", "", len(text)))
+        self.index = 0
+
+    def _fail(self, message: str, position: int | None = None) -> NoReturn:
+        if position is None:
+            position = self.tokens[self.index][2]
+        msg = f"{message} at position {position} in {self.text!r}"
+        raise QuerySyntaxError(msg)
+
+    @property
+    def _peek(self) -> tuple[str, str, int]:
+        return self.tokens[self.index]
+
+    def _next(self) -> tuple[str, str, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _at(self, *texts: str) -> bool:
+        kind, text, _ = self._peek
+        return kind in {"op", "ident"} and text in texts
+
+    def _expect(self, text: str) -> None:
+        if not self._at(text):
+            self._fail(f"expected {text!r}, found {self._peek[1]!r}")
+        self.index += 1
+
+    def _expect_kind(self, kind: str) -> str:
+        if self._peek[0] != kind:
+            self._fail(f"expected {kind}, found {self._peek[1]!r}")
+        return self._next()[1]
+
+    def parse(self) -> Node:
+        node = self._expr(0)
+        if self._peek[0] != "eof":
+            self._fail(f"unexpected {self._peek[1]!r}")
+        return node
+
+    def _binary_operator(self) -> str | None:
+        kind, text, _ = self._peek
+        if (kind == "op" and text in _PRECEDENCE) or (
+            kind == "ident" and text in SET_OPERATORS
+        ):
+            return text
+        return None
+
+    def _expr(self, min_precedence: int) -> Node:
+        lhs = self._unary()
+        while (op := self._binary_operator()) and _PRECEDENCE[op] >= min_precedence:
+            self.index += 1
+            return_bool = False
+            if self._at("bool"):
+                self.index += 1
+                return_bool = True
+            matching = self._vector_matching()
+            # ^ is right-associative; everything else binds left.
+            next_min = _PRECEDENCE[op] + (op != "^")
+            lhs = Binary(op, lhs, self._expr(next_min), return_bool, matching)
+        return lhs
+
+    def _vector_matching(self) -> VectorMatching:
+        if not self._at("on", "ignoring"):
+            return VectorMatching()
+        on = self._next()[1] == "on"
+        labels = self._label_list()
+        card = "one-to-one"
+        include: tuple[str, ...] = ()
+        if self._at("group_left", "group_right"):
+            card = "many-to-one" if self._next()[1] == "group_left" else "one-to-many"
+            if self._at("("):
+                include = self._label_list()
+        return VectorMatching(on, labels, card, include)
+
+    def _label_list(self) -> tuple[str, ...]:
+        self._expect("(")
+        labels = []
+        while not self._at(")"):
+            labels.append(self._expect_kind("ident"))
+            if not self._at(")"):
+                self._expect(",")
+        self._expect(")")
+        return tuple(labels)
+
+    def _unary(self) -> Node:
+        if self._at("-", "+"):
+            op = self._next()[1]
+            operand = self._expr(_PRECEDENCE["^"])
+            return operand if op == "+" else Unary("-", operand)
+        return self._primary()
+
+    def _primary(self) -> Node:  # noqa: C901, PLR0911
+        kind, text, _ = self._peek
+        if kind == "num":
+            self.index += 1
+            return NumberLiteral(float(text))
+        if kind == "str":
+            self.index += 1
+            return StringLiteral(_unquote(text))
+        if self._at("("):
+            self.index += 1
+            node = self._expr(0)
+            self._expect(")")
+            if self._at("["):
+                if not isinstance(node, LogSelector) or node.range_seconds is not None:
+                    self._fail("subqueries are not supported")
+                return LogSelector(node.matchers, node.stages, self._range())
+            return node
+        if self._at("{"):
+            return self._selector(None)
+        if kind == "ident":
+            self.index += 1
+            if text in AGGREGATIONS and self._at("(", "by", "without"):
+                return self._aggregate(text)
+            if self._at("("):
+                return self._call(text)
+            if text in {"Inf", "NaN"}:
+                return NumberLiteral(float(text.lower()))
+            return self._selector(text)
+        return self._fail(f"unexpected {text!r}")
+
+    def _range(self) -> float:
+        self._expect("[")
+        seconds = parse_duration(self._expect_kind("dur"))
+        self._expect("]")
+        return seconds
+
+    def _matchers(self) -> tuple[Matcher, ...]:
+        self._expect("{")
+        matchers = []
+        while not self._at("}"):
+            name = self._expect_kind("ident")
+            op = self._next()[1]
+            if op not in {"=", "!=", "=~", "!~"}:
+                self._fail(f"invalid matcher operator {op!r}")
+            matchers.append(Matcher(name, op, _unquote(self._expect_kind("str"))))
+            if not self._at("}"):
+                self._expect(",")
+        self._expect("}")
+        return tuple(matchers)
+
+    def _selector(self, metric: str | None) -> Node:
+        if self.logql:
+            if metric is not None:
+                self._fail(f"LogQL has no metric selectors, found {metric!r}")
+            matchers = self._matchers()
+            stages = self._pipeline()
+            range_seconds = self._range() if self._at("[") else None
+            return LogSelector(matchers, stages, range_seconds)
+        matchers = (Matcher("__name__", "=", metric),) if metric else ()
+        if self._at("{"):
+            matchers += self._matchers()
+        if not matchers:
+            self._fail("a selector needs a metric name or matchers")
+        range_seconds = self._range() if self._at("[") else None
+        offset = 0.0
+        if self._at("offset"):
+            self.index += 1
+            offset = parse_duration(self._expect_kind("dur"))
+        return VectorSelector(matchers, range_seconds, offset)
+
+    def _aggregate(self, op: str) -> Aggregate:
+        grouping: tuple[str, ...] = ()
+        without = False
+        if self._at("by", "without"):
+            without = self._next()[1] == "without"
+            grouping = self._label_list()
+        self._expect("(")
+        expr = self._expr(0)
+        self._expect(")")
+        if self._at("by", "without"):
+            without = self._next()[1] == "without"
+            grouping = self._label_list()
+        return Aggregate(op, expr, grouping, without)
+
+    def _call(self, name: str) -> Call:
+        self._expect("(")
+        args = []
+        while not self._at(")"):
+            args.append(self._expr(0))
+            if not self._at(")"):
+                self._expect(",")
+        self._expect(")")
+        return Call(name, tuple(args))
+
+    def _pipeline(self) -> tuple[LogStage, ...]:
+        stages: list[LogStage] = []
+        while True:
+            kind, text, _ = self._peek
+            following = self.tokens[self.index + 1][0]
+            if kind == "op" and text in {"|=", "|~", "!=", "!~"} and following == "str":
+                self.index += 1
+                stages.append(LineFilter(text, _unquote(self._next()[1])))
+            elif self._at("|"):
+                self.index += 1
+                stages.append(self._stage())
+            else:
+                return tuple(stages)
+
+    def _stage(self) -> LogStage:  # noqa: C901, PLR0911
+        name = self._expect_kind("ident")
+        if name in {"json", "logfmt"} and not self._at(*_LABEL_FILTER_OPS):
+            return LogParser(name)
+        if name in {"pattern", "regexp"}:
+            return LogParser(name, _unquote(self._expect_kind("str")))
+        if name == "line_format":
+            return LineFormat(_unquote(self._expect_kind("str")))
+        if name == "label_format":
+            assignments = []
+            while True:
+                destination = self._expect_kind("ident")
+                self._expect("=")
+                kind, text, _ = self._next()
+                if kind not in {"ident", "str"}:
+                    self._fail(f"invalid label_format source {text!r}")
+                is_template = kind == "str"
+                assignments.append(
+                    (destination, _unquote(text) if is_template else text, is_template)
+                )
+                if not self._at(","):
+                    return LabelFormat(tuple(assignments))
+                self.index += 1
+        op = self._next()[1]
+        if op not in _LABEL_FILTER_OPS:
+            self._fail(f"unsupported pipeline stage {name!r}")
+        kind, text, _ = self._next()
+        if kind == "str":
+            return LabelFilter(name, op, _unquote(text))
+        if kind == "num" and op in {">", ">=", "<", "<=", "==", "!="}:
+            return LabelFilter(name, op, float(text))
+        return self._fail(f"unsupported label filter value {text!r}")
+
+
+_LABEL_FILTER_OPS = ("=", "!=", "=~", "!~", ">", ">=", "<", "<=", "==")
+
+
+def parse_query(text: str, *, logql: bool = False) -> Node:
+    """Parse a PromQL (or, with ``logql``, LogQL) expression."""
+    return _Parser(text, logql=logql).parse()
+
+
+def parse_matchers(text: str) -> tuple[Matcher, ...]:
+    """Parse a bare ``{a="b", ...}`` matcher list."""
+    parser = _Parser(text, logql=False)
+    matchers = parser._matchers()  # noqa: SLF001
+    if parser._peek[0] != "eof":  # noqa: SLF001
+        parser._fail("unexpected trailing input")  # noqa: SLF001
+    return matchers
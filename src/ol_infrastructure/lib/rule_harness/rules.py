@@ -0,0 +1,411 @@
+"""Run the repo's Grafana alert rules against fixtures, offline.
+
+Rules are collected by calling each ``metric_rules``/``log_rules`` module's
+``create()`` with ``alerting.RuleGroup`` swapped for a recorder, so what is tested
+is exactly what the stack would deploy, thresholds and all.
+
+An instance fires the way Grafana fires it (see metric_rules/base.py): stage A's
+query returns the series, stage C keeps those whose value is above 0, and ``for``
+holds each one pending until it has passed at every evaluation across that long.
+``keep_firing_for`` and ``missing_series_evals_to_resolve`` only shape how an
+alert resolves and are not modelled.
+
+Raw series first go through the recording rules in ``lib.recording_rules``,
+sampled once a minute, so rules reading recorded series are tested against the
+raw metrics the recorded ones are built from.
+"""
+
+import importlib
+import math
+import pkgutil
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, cast
+from unittest import mock
+
+import yaml
+from pulumiverse_grafana import alerting
+from pydantic import BaseModel, Field, PositiveInt
+
+from ol_infrastructure.infrastructure.grafana_alerting import log_rules, metric_rules
+from ol_infrastructure.infrastructure.grafana_alerting.metric_rules import (
+    synthetic_monitoring,
+)
+from ol_infrastructure.lib.recording_rules import RECORDING_RULES, RecordingRule
+from ol_infrastructure.lib.rule_harness.evaluator import Evaluator, Sample
+from ol_infrastructure.lib.rule_harness.fixtures import (
+    LogStore,
+    SelectCost,
+    SeriesStore,
+)
+from ol_infrastructure.lib.rule_harness.query import (
+    LogSelector,
+    Node,
+    VectorSelector,
+    parse_duration,
+    parse_query,
+    walk,
+)
+
+#: The longest window any rule may read. 6h is the slow burn-rate window; past
+#: it, a rule should read a recorded series rather than scan raw samples.
+MAX_RANGE_SECONDS = 6 * 3600
+#: Selectors per rule: each is a separate fetch from Mimir or Loki.
+MAX_SELECTORS = 4
+
+#: Modules in metric_rules/log_rules that define no alert rules of their own
+#: with the shared ``create(folder_uid, rd, resource_opts)`` signature.
+_NOT_ALERT_RULE_MODULES = frozenset({"base", "recording", "synthetic_monitoring"})
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    group: str
+    name: str
+    expr: str
+    logql: bool
+    for_seconds: float
+    interval_seconds: int
+
+    @cached_property
+    def node(self) -> Node:
+        return parse_query(self.expr, logql=self.logql)
+
+
+def _bare_query(expr: str) -> list[alerting.RuleGroupRuleDataArgs]:
+    """Stand in for base.py's rule-data builder: keep the query itself as the data."""
+    return cast("list[alerting.RuleGroupRuleDataArgs]", [expr])
+
+
+@contextmanager
+def _recording_rule_groups() -> Iterator[list[tuple[str, int, list[Any]]]]:
+    # The rules are RuleGroupRuleArgs whose datas hold the bare query strings.
+    captured: list[tuple[str, int, list[Any]]] = []
+
+    def record(_resource_name, *, name, rules, interval_seconds, **_):
+        captured.append((name, interval_seconds, rules))
+
+    with mock.patch.object(alerting, "RuleGroup", record):
+        yield captured
+
+
+def collect_alert_rules() -> list[AlertRule]:
+    """Return every alert rule the grafana_alerting stack defines."""
+    collected: list[AlertRule] = []
+    for package, logql in ((metric_rules, False), (log_rules, True)):
+        with _recording_rule_groups() as groups:
+            for module_info in pkgutil.iter_modules(package.__path__):
+                if module_info.name in _NOT_ALERT_RULE_MODULES:
+                    continue
+                module = importlib.import_module(
+                    f"{package.__name__}.{module_info.name}"
+                )
+                module.create("harness", _bare_query, None)
+            if package is metric_rules:
+                # Created for production only, in the Synthetic Monitoring
+                # folder -- so not through create(), which checks the stack.
+                for check in synthetic_monitoring._CHECKS:  # noqa: SLF001
+                    alerting.RuleGroup(
+                        check.resource_name,
+                        name=check.group_name,
+                        interval_seconds=300,
+                        rules=synthetic_monitoring._rules(  # noqa: SLF001
+                            check, _bare_query
+                        ),
+                    )
+        collected.extend(
+            AlertRule(
+                group=group,
+                name=rule.name,
+                expr=rule.datas[0],
+                logql=logql,
+                for_seconds=parse_duration(rule.for_) if rule.for_ else 0,
+                interval_seconds=interval,
+            )
+            for group, interval, rules in groups
+            for rule in rules
+        )
+    return collected
+
+
+def record_series(
+    store: SeriesStore,
+    until: float,
+    rules: tuple[RecordingRule, ...] = RECORDING_RULES,
+    interval: int = 60,
+) -> SeriesStore:
+    """Return ``store`` plus what ``rules`` record from it, every ``interval``."""
+    evaluator = Evaluator(series=store)
+    recorded: dict[
+        tuple[tuple[str, str], ...], tuple[dict[str, str], list[tuple[float, float]]]
+    ] = {}
+    for at in range(0, int(until) + 1, interval):
+        for rule in rules:
+            for sample in evaluator.evaluate(rule.expr, at):
+                labels = {**sample.labels, "__name__": rule.record}
+                key = tuple(sorted(labels.items()))
+                recorded.setdefault(key, (labels, []))[1].append((at, sample.value))
+    combined = SeriesStore(list(store.series))
+    for labels, samples in recorded.values():
+        combined.add(labels, samples)
+    return combined
+
+
+@dataclass
+class RuleEvaluation:
+    rule: AlertRule
+    at: float
+    firing: list[dict[str, str]]
+    cost: SelectCost
+
+
+def evaluate_rule(rule: AlertRule, evaluator: Evaluator, at: float) -> RuleEvaluation:
+    """Return the instances of ``rule`` firing at ``at``, with what it cost to find.
+
+    ``cost`` is for the one evaluation at ``at``, which is what each evaluation
+    interval costs in Mimir or Loki.
+    """
+    # Pending from the first passing evaluation, firing at the first one at least
+    # ``for`` after it: so for=1m at a 15m interval still takes two evaluations.
+    pending_evaluations = math.ceil(rule.for_seconds / rule.interval_seconds)
+    times = [at - i * rule.interval_seconds for i in range(pending_evaluations, -1, -1)]
+    pending: dict[tuple[tuple[str, str], ...], dict[str, str]] | None = None
+    for time in times:
+        result = evaluator.evaluate(rule.node, time, logql=rule.logql)
+        if isinstance(result, float):
+            result = [Sample({}, result)]
+        passing = {
+            tuple(sorted(s.labels.items())): s.labels for s in result if s.value > 0
+        }
+        if time < 0:
+            passing = {}
+        pending = (
+            passing
+            if pending is None
+            else {key: labels for key, labels in passing.items() if key in pending}
+        )
+    return RuleEvaluation(rule, at, list((pending or {}).values()), evaluator.cost)
+
+
+@dataclass(frozen=True)
+class RuleCost:
+    """A rule's query cost: its shape, and what it read from the fixtures."""
+
+    rule: AlertRule
+    selectors: int
+    max_range_seconds: float
+    series_touched: int | None = None
+    samples_scanned: int | None = None
+
+    def problems(self) -> list[str]:
+        problems = []
+        if self.max_range_seconds > MAX_RANGE_SECONDS:
+            problems.append(
+                f"reads a {self.max_range_seconds / 3600:g}h window "
+                f"(limit {MAX_RANGE_SECONDS / 3600:g}h)"
+            )
+        if self.selectors > MAX_SELECTORS:
+            problems.append(f"{self.selectors} selectors (limit {MAX_SELECTORS})")
+        return problems
+
+
+def rule_cost(rule: AlertRule, evaluations: Sequence[RuleEvaluation] = ()) -> RuleCost:
+    """Measure ``rule``'s query, and the most any of ``evaluations`` read."""
+    selectors = [
+        node
+        for node in walk(rule.node)
+        if isinstance(node, VectorSelector | LogSelector)
+    ]
+    return RuleCost(
+        rule=rule,
+        selectors=len(selectors),
+        max_range_seconds=max((s.range_seconds or 0 for s in selectors), default=0),
+        series_touched=max((e.cost.series_touched for e in evaluations), default=None),
+        samples_scanned=max(
+            (e.cost.samples_scanned for e in evaluations), default=None
+        ),
+    )
+
+
+# Cases -------------------------------------------------------------------------
+
+
+class SeriesFixture(BaseModel):
+    series: str = Field(description='A series, e.g. pgbouncer_up{pod="p1"}.')
+    values: str = Field(description="promtool expanding notation, e.g. '1x9 0x20'.")
+
+
+class LogLinesFixture(BaseModel):
+    stream: str = Field(description='Stream labels, e.g. {namespace="dagster"}.')
+    line: str
+    count: PositiveInt = 1
+    every: str = "1m"
+    start: str = "0m"
+
+
+class ExpectedAlerts(BaseModel):
+    at: str = Field(description="When to evaluate, from the start of the fixture.")
+    firing: list[dict[str, str]] = Field(
+        default_factory=list,
+        description=(
+            "One label subset per instance expected to fire; none means silent."
+        ),
+    )
+
+
+class RuleCase(BaseModel):
+    """Fixtures for one rule and what it should do with them."""
+
+    name: str
+    rule: str
+    interval: str = "1m"
+    series: list[SeriesFixture] = Field(default_factory=list)
+    recorded_series: Path | None = Field(
+        default=None,
+        description="A Prometheus query_range response, relative to the case file.",
+    )
+    logs: list[LogLinesFixture] = Field(default_factory=list)
+    recorded_logs: Path | None = Field(
+        default=None,
+        description="A Loki query_range response, relative to the case file.",
+    )
+    expect: list[ExpectedAlerts]
+
+    def evaluator(self, base_dir: Path) -> Evaluator:
+        interval = parse_duration(self.interval)
+        series = (
+            SeriesStore.from_query_range(base_dir / self.recorded_series)
+            if self.recorded_series
+            else SeriesStore()
+        )
+        for fixture in self.series:
+            series.add_notation(fixture.series, fixture.values, interval=interval)
+        logs = (
+            LogStore.from_query_range(base_dir / self.recorded_logs)
+            if self.recorded_logs
+            else LogStore()
+        )
+        for lines in self.logs:
+            logs.add_lines(
+                lines.stream,
+                lines.line,
+                count=lines.count,
+                every=parse_duration(lines.every),
+                start=parse_duration(lines.start),
+            )
+        until = max(parse_duration(expected.at) for expected in self.expect)
+        return Evaluator(series=record_series(series, until), logs=logs)
+
+
+@dataclass
+class CaseResult:
+    case: RuleCase
+    expected: ExpectedAlerts
+    evaluation: RuleEvaluation
+
+    @property
+    def passed(self) -> bool:
+        firing = list(self.evaluation.firing)
+        if len(firing) != len(self.expected.firing):
+            return False
+        for subset in self.expected.firing:
+            match = next(
+                (
+                    labels
+                    for labels in firing
+                    if all(labels.get(k) == v for k, v in subset.items())
+                ),
+                None,
+            )
+            if match is None:
+                return False
+            firing.remove(match)
+        return True
+
+    def describe(self) -> str:
+        return (
+            f"{self.case.rule} [{self.case.name}] at {self.expected.at}: expected "
+            f"{self.expected.firing or 'silence'}, got "
+            f"{self.evaluation.firing or 'silence'}"
+        )
+
+
+def load_cases(path: Path) -> list[RuleCase]:
+    return [RuleCase.model_validate(case) for case in yaml.safe_load(path.read_text())]
+
+
+def run_case(
+    case: RuleCase, rules: dict[str, AlertRule], base_dir: Path
+) -> list[CaseResult]:
+    if case.rule not in rules:
+        msg = f"case {case.name!r} names unknown rule {case.rule!r}"
+        raise KeyError(msg)
+    evaluator = case.evaluator(base_dir)
+    return [
+        CaseResult(
+            case,
+            expected,
+            evaluate_rule(rules[case.rule], evaluator, parse_duration(expected.at)),
+        )
+        for expected in case.expect
+    ]
+
+
+@dataclass
+class HarnessReport:
+    results: list[CaseResult] = field(default_factory=list)
+    costs: list[RuleCost] = field(default_factory=list)
+
+    @property
+    def failures(self) -> list[CaseResult]:
+        return [result for result in self.results if not result.passed]
+
+    @property
+    def over_budget(self) -> list[RuleCost]:
+        return [cost for cost in self.costs if cost.problems()]
+
+    def table(self) -> str:
+        tested = {result.case.rule for result in self.results}
+        rows = [("rule", "lang", "sel", "range", "series", "samples", "cases")]
+        rows.extend(
+            (
+                f"{cost.rule.group}/{cost.rule.name}",
+                "logql" if cost.rule.logql else "promql",
+                str(cost.selectors),
+                _format_seconds(cost.max_range_seconds),
+                "-" if cost.series_touched is None else str(cost.series_touched),
+                "-" if cost.samples_scanned is None else str(cost.samples_scanned),
+                "yes" if cost.rule.name in tested else "-",
+            )
+            for cost in self.costs
+        )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(cell.ljust(width) for cell, width in zip(row, widths))
+            for row in rows
+        )
+
+
+def run_harness(case_files: list[Path]) -> HarnessReport:
+    """Run every case in ``case_files`` and measure every rule."""
+    rules = collect_alert_rules()
+    by_name = {rule.name: rule for rule in rules}
+    report = HarnessReport()
+    for path in case_files:
+        for case in load_cases(path):
+            report.results.extend(run_case(case, by_name, path.parent))
+    for rule in rules:
+        evaluations = [r.evaluation for r in report.results if r.case.rule == rule.name]
+        report.costs.append(rule_cost(rule, evaluations))
+    return report
+
+
+def _format_seconds(seconds: float) -> str:
+    if not seconds:
+        return "-"
+    if seconds % 3600 == 0:
+        return f"{seconds / 3600:g}h"
+    return f"{seconds / 60:g}m"
@@ -6,14 +6,17 @@
 
 import json
 from enum import Enum
-from functools import lru_cache, partial
-from pathlib import Path
+from functools import partial
 from string import Template
 
 import pulumi
 import pulumi_vault
 
-from bridge.secrets.sops import read_yaml_secrets
+from ol_infrastructure.lib.provider_registry import (
+    get_or_create_provider,
+    read_provider_credentials,
+    register_provider_transformation,
+)
 from ol_infrastructure.lib.pulumi_helper import StackInfo
 
 postgres_role_statements = {
@@ -380,32 +383,34 @@ class VaultPKIKeyTypeBits(int, Enum):
     ec = 256
 
 
-@lru_cache
 def get_vault_provider(
     vault_address: str,
     vault_env_namespace: str,
     provider_name: str | None = None,
     skip_child_token: bool | None = None,  # noqa: FBT001
 ) -> pulumi_vault.Provider:
-    pulumi_vault_creds = read_yaml_secrets(
-        Path().joinpath(
-            # We are forcing the assumption that the Vault cluster is in the operations
-            # environment/namespace.(TMM 2021-10-19)
-            "pulumi",
-            f"vault.{vault_env_namespace}.yaml",
+    def create() -> pulumi_vault.Provider:
+        pulumi_vault_creds = read_provider_credentials(
+            # We are forcing the assumption that the Vault cluster is in the
+            # operations environment/namespace.(TMM 2021-10-19)
+            f"pulumi/vault.{vault_env_namespace}.yaml"
         )
-    )
-    return pulumi_vault.Provider(
-        provider_name or "vault-provider",
-        address=vault_address,
-        add_address_to_env=True,
-        skip_child_token=skip_child_token,
-        token="",
-        auth_login_userpass=pulumi_vault.ProviderAuthLoginUserpassArgs(
-            mount="pulumi",
-            username=pulumi_vault_creds["auth_username"],
-            password=pulumi.Output.secret(pulumi_vault_creds["auth_password"]),
-        ),
+        return pulumi_vault.Provider(
+            provider_name or "vault-provider",
+            address=vault_address,
+            add_address_to_env=True,
+            skip_child_token=skip_child_token,
+            token="",
+            auth_login_userpass=pulumi_vault.ProviderAuthLoginUserpassArgs(
+                mount="pulumi",
+                username=pulumi_vault_creds["auth_username"],
+                password=pulumi.Output.secret(pulumi_vault_creds["auth_password"]),
+            ),
+        )
+
+    return get_or_create_provider(
+        ("vault", vault_address, vault_env_namespace, bool(skip_child_token)),
+        create,
     )
 
 
@@ -438,13 +443,14 @@ def setup_vault_provider(
     else:
         vault_address = pulumi.Config("vault").require("address")
         vault_env_namespace = pulumi.Config("vault_server").require("env_namespace")
-    pulumi.runtime.register_stack_transformation(
+    register_provider_transformation(
+        ("vault", vault_address, vault_env_namespace, bool(skip_child_token)),
         partial(
             set_vault_provider,
             vault_address,
             vault_env_namespace,
             skip_child_token=skip_child_token,
-        )
+        ),
     )
     return get_vault_provider(
         vault_address, vault_env_namespace, skip_child_token=skip_child_token
@@ -4,8 +4,16 @@ This is the Pulumi-side reader for the same files `bin/github-org-inventory` wri
 Both use the identical resolution rules, which is what makes the empty-diff gate
 reachable -- if they disagreed, the code would declare something the crawl never
 recorded.
+
+Parsing ~320 YAML files dominated preview startup, so the merged fleet is cached on
+disk (see `load_fleet`). Only the PARSE is cached: the validators run on every load,
+cached or not, because they are what stand between a typo and a revoked grant.
 """
 
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import Any
 
@@ -14,9 +22,27 @@ import yaml
 DATA_DIR = Path(__file__).parent / "data"
 REPOS_DIR = DATA_DIR / "repos"
 
+#: libyaml's C loader is ~8x faster on this data and parses it identically. PyYAML
+#: built without libyaml lacks the attribute, so fall back rather than require it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+#: Where the parsed, merged fleet is kept between runs. Outside the repo on purpose:
+#: the Pulumi program runs with the project directory as its cwd, and a cache file
+#: there would show up in `git status` for everyone.
+CACHE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "ol-infrastructure"
+    / "github-fleet.json"
+)
+
+
+def _load_yaml(path: Path) -> Any:
+    return yaml.load(path.read_text(), Loader=_YAML_LOADER)  # noqa: S506
+
+
 #: Team slug -> numeric id, written by `bin/github-org-inventory crawl`. Required
 #: because `TeamRepository` state records the numeric id. See repository.py.
-TEAM_IDS: dict[str, int] = yaml.safe_load((DATA_DIR / "teams.yaml").read_text())
+TEAM_IDS: dict[str, int] = _load_yaml(DATA_DIR / "teams.yaml")
 
 
 def _resolve(archetypes: dict[str, Any], name: str) -> dict[str, Any]:
@@ -46,8 +72,8 @@ TEAM_PERMISSIONS = frozenset({"pull", "triage", "push", "maintain", "admin"})
 COLLABORATOR_ROLES = frozenset({"read", "triage", "write", "maintain", "admin"})
 
 
-def _check_permission_values(fleet: list[dict[str, Any]]) -> None:
-    """Fail if any grant carries a permission outside its field's vocabulary.
+def _check_permission_values(repo: dict[str, Any]) -> list[str]:
+    """Return each grant on `repo` whose permission is outside its field's vocabulary.
 
     Two consumers index these values unguarded, and both should. `repository.py`
     passes `permission` straight to `TeamRepository`, and `audit.classify_direct_grants`
@@ -62,32 +88,28 @@ def _check_permission_values(fleet: list[dict[str, Any]]) -> None:
     So this keeps the loud failure and adds what a bare KeyError lacks: which repo,
     which field, which value, and every offender in one run rather than the first one
     encountered several hundred repos into a preview. Same reasoning as
-    `_check_team_references` above.
+    `_check_team_references` below.
     """
-    bad = sorted(
-        {
-            f"{repo['name']}: teams.{slug} = {perm!r}"
-            for repo in fleet
-            for slug, perm in (repo.get("teams") or {}).items()
-            if perm not in TEAM_PERMISSIONS
-        }
-        | {
-            f"{repo['name']}: _direct_collaborators.{login} = {role!r}"
-            for repo in fleet
-            for login, role in (repo.get("_direct_collaborators") or {}).items()
-            if role not in COLLABORATOR_ROLES
-        }
+    return [
+        f"{repo['name']}: teams.{slug} = {perm!r}"
+        for slug, perm in (repo.get("teams") or {}).items()
+        if perm not in TEAM_PERMISSIONS
+    ] + [
+        f"{repo['name']}: _direct_collaborators.{login} = {role!r}"
+        for login, role in (repo.get("_direct_collaborators") or {}).items()
+        if role not in COLLABORATOR_ROLES
+    ]
+
+
+def _permission_values_message(bad: list[str]) -> str:
+    return (
+        "fleet data carries permission values outside the allowed vocabulary:\n  "
+        + "\n  ".join(bad)
+        + f"\nTeam grants must be one of {sorted(TEAM_PERMISSIONS)}; "
+        f"direct collaborator roles one of {sorted(COLLABORATOR_ROLES)}. "
+        "Note `pull`/`push` for teams vs `read`/`write` for collaborators -- "
+        "GitHub uses different words for the same two rungs."
     )
-    if bad:
-        message = (
-            "fleet data carries permission values outside the allowed vocabulary:\n  "
-            + "\n  ".join(bad)
-            + f"\nTeam grants must be one of {sorted(TEAM_PERMISSIONS)}; "
-            f"direct collaborator roles one of {sorted(COLLABORATOR_ROLES)}. "
-            "Note `pull`/`push` for teams vs `read`/`write` for collaborators -- "
-            "GitHub uses different words for the same two rungs."
-        )
-        raise ValueError(message)
 
 
 #: Every PUBLIC repo grants these, per policy 2026-08-10. Enforced rather than
@@ -97,8 +119,32 @@ def _check_permission_values(fleet: list[dict[str, Any]]) -> None:
 REQUIRED_PUBLIC_TEAMS = frozenset({"odl-engineering", "odl-engineering-owners"})
 
 
-def _check_public_repo_teams(fleet: list[dict[str, Any]]) -> None:
-    """Fail if an active public repo does not grant the two required teams.
+def _check_visibility_recorded(repo: dict[str, Any]) -> list[str]:
+    """Return `repo`'s name if it is active and records no visibility at all.
+
+    VISIBILITY IS REQUIRED, NOT ASSUMED. A repo with no visibility signal cannot be
+    checked by `_check_public_repo_teams`, and silently skipping it is the failure mode
+    this project keeps hitting -- unmeasured and compliant look identical. `_visibility`
+    is written on every repo by the crawl and `visibility` comes from the archetype, so
+    an active repo missing both is hand-authored data that has to say which it is.
+    """
+    if repo.get("archived") or repo.get("_visibility") or repo.get("visibility"):
+        return []
+    return [repo["name"]]
+
+
+def _visibility_recorded_message(unknown: list[str]) -> str:
+    return (
+        "active repos with no visibility recorded, so the public-team policy "
+        "cannot be checked:\n  "
+        + "\n  ".join(unknown)
+        + "\nAdd `_visibility` (or `visibility`), or re-run "
+        "`bin/github-org-inventory crawl --refresh`."
+    )
+
+
+def _check_public_repo_teams(repo: dict[str, Any]) -> list[str]:
+    """Return a finding if `repo` is active, public, and lacks a required team.
 
     Scoped to ACTIVE PUBLIC repos, matching the policy exactly:
 
@@ -107,48 +153,29 @@ def _check_public_repo_teams(fleet: list[dict[str, Any]]) -> None:
       private   deliberately exempt. `access-forge` and `gwarek` are devops-only
                 because that is the intent, not an oversight.
 
-    VISIBILITY IS REQUIRED, NOT ASSUMED. A repo with no visibility signal cannot be
-    checked, and silently skipping it is the failure mode this project keeps hitting --
-    unmeasured and compliant look identical. `_visibility` is written on every repo by
-    the crawl and `visibility` comes from the archetype, so an active repo missing both
-    is hand-authored data that has to say which it is.
+    A repo with no visibility at all is `_check_visibility_recorded`'s to report; it
+    runs first, so skipping it here never lets one through.
     """
-    unknown: list[str] = []
-    missing: list[str] = []
-    for repo in fleet:
-        if repo.get("archived"):
-            continue
-        visibility = repo.get("_visibility") or repo.get("visibility")
-        if not visibility:
-            unknown.append(repo["name"])
-            continue
-        if visibility != "public":
-            continue
-        absent = REQUIRED_PUBLIC_TEAMS - set(repo.get("teams") or {})
-        if absent:
-            missing.append(f"{repo['name']}: missing {sorted(absent)}")
-    if unknown:
-        message = (
-            "active repos with no visibility recorded, so the public-team policy "
-            "cannot be checked:\n  "
-            + "\n  ".join(sorted(unknown))
-            + "\nAdd `_visibility` (or `visibility`), or re-run "
-            "`bin/github-org-inventory crawl --refresh`."
-        )
-        raise ValueError(message)
-    if missing:
-        message = (
-            "public repos must grant "
-            f"{sorted(REQUIRED_PUBLIC_TEAMS)} (policy 2026-08-10):\n  "
-            + "\n  ".join(sorted(missing))
-            + "\n`teams` REPLACES the archetype's grants rather than merging into "
-            "them, so a repo declaring its own block must restate both."
-        )
-        raise ValueError(message)
+    if repo.get("archived"):
+        return []
+    if (repo.get("_visibility") or repo.get("visibility")) != "public":
+        return []
+    absent = REQUIRED_PUBLIC_TEAMS - set(repo.get("teams") or {})
+    return [f"{repo['name']}: missing {sorted(absent)}"] if absent else []
+
+
+def _public_repo_teams_message(missing: list[str]) -> str:
+    return (
+        "public repos must grant "
+        f"{sorted(REQUIRED_PUBLIC_TEAMS)} (policy 2026-08-10):\n  "
+        + "\n  ".join(missing)
+        + "\n`teams` REPLACES the archetype's grants rather than merging into "
+        "them, so a repo declaring its own block must restate both."
+    )
 
 
-def _check_dependabot_requires_alerts(fleet: list[dict[str, Any]]) -> None:
-    """Fail if a repo asks for Dependabot security updates with alerts off.
+def _check_dependabot_requires_alerts(repo: dict[str, Any]) -> list[str]:
+    """Return `repo`'s name if it asks for Dependabot security updates with alerts off.
 
     GitHub refuses that combination outright -- `/automated-security-fixes` answers 422
     unless vulnerability alerts are enabled -- so it is unsatisfiable data, not a
@@ -161,26 +188,27 @@ def _check_dependabot_requires_alerts(fleet: list[dict[str, Any]]) -> None:
     cannot have would simply get no resource and no complaint. Failing here keeps the
     skip from turning an impossible request into a silent one.
     """
-    conflicting = sorted(
-        repo["name"]
-        for repo in fleet
-        if not repo.get("archived")
+    if (
+        not repo.get("archived")
         and repo.get("dependabot_security_updates")
         and not repo.get("vulnerability_alerts")
+    ):
+        return [repo["name"]]
+    return []
+
+
+def _dependabot_requires_alerts_message(conflicting: list[str]) -> str:
+    return (
+        "repos request dependabot_security_updates with vulnerability_alerts "
+        "disabled, which GitHub rejects (422):\n  "
+        + "\n  ".join(conflicting)
+        + "\nEnable vulnerability_alerts on these repos, or drop the "
+        "dependabot_security_updates request."
     )
-    if conflicting:
-        message = (
-            "repos request dependabot_security_updates with vulnerability_alerts "
-            "disabled, which GitHub rejects (422):\n  "
-            + "\n  ".join(conflicting)
-            + "\nEnable vulnerability_alerts on these repos, or drop the "
-            "dependabot_security_updates request."
-        )
-        raise ValueError(message)
 
 
-def _check_team_references(fleet: list[dict[str, Any]]) -> None:
-    """Fail if any repo grants to a team slug absent from teams.yaml.
+def _check_team_references(repo: dict[str, Any]) -> list[str]:
+    """Return each grant on `repo` to a team slug absent from teams.yaml.
 
     repository.py looks up `TEAM_IDS[team_slug]` unguarded, and must: the numeric id
     is required for a non-destructive TeamRepository, so an unknown slug is data we
@@ -194,39 +222,130 @@ def _check_team_references(fleet: list[dict[str, Any]]) -> None:
     Grants come from the merged dict because archetypes carry `teams` too, so a bad
     slug in archetypes.yaml would fan out across every repo that extends it.
     """
-    unknown = sorted(
-        {
-            f"{repo['name']}: {slug!r}"
-            for repo in fleet
-            for slug in (repo.get("teams") or {})
-            if slug not in TEAM_IDS
-        }
+    return [
+        f"{repo['name']}: {slug!r}"
+        for slug in (repo.get("teams") or {})
+        if slug not in TEAM_IDS
+    ]
+
+
+def _team_references_message(unknown: list[str]) -> str:
+    return (
+        "fleet data grants to teams that are not in teams.yaml:\n  "
+        + "\n  ".join(unknown)
+        + "\nIf a team was renamed or created, re-run "
+        "`bin/github-org-inventory crawl` to refresh teams.yaml."
     )
-    if unknown:
-        message = (
-            "fleet data grants to teams that are not in teams.yaml:\n  "
-            + "\n  ".join(unknown)
-            + "\nIf a team was renamed or created, re-run "
-            "`bin/github-org-inventory crawl` to refresh teams.yaml."
-        )
-        raise ValueError(message)
 
 
-def load_fleet() -> list[dict[str, Any]]:
-    """Return one merged dict per repo: archetype defaults under its own values.
+#: Each per-repo check paired with the message it raises, in the order they report.
+#: `validate_fleet` walks the fleet ONCE and runs every check on each repo, then
+#: raises for the first check with offenders -- naming all of them, not just the first.
+_VALIDATORS: tuple[
+    tuple[Callable[[dict[str, Any]], list[str]], Callable[[list[str]], str]], ...
+] = (
+    (_check_team_references, _team_references_message),
+    (_check_permission_values, _permission_values_message),
+    (_check_visibility_recorded, _visibility_recorded_message),
+    (_check_public_repo_teams, _public_repo_teams_message),
+    (_check_dependabot_requires_alerts, _dependabot_requires_alerts_message),
+)
 
-    MUST use pathlib rather than glob.glob or a shell glob. The org's `.github`
-    repo lands at `repos/.github.yaml`, a dotfile, which `glob.glob("*.yaml")`
-    silently skips -- 315 instead of 316. A repo missing from the fleet looks
-    exactly like one nobody has gotten to yet. See data/README.md.
+
+def validate_fleet(fleet: Iterable[dict[str, Any]]) -> None:
+    """Run every `_check_*` over the fleet in one pass, raising on any offender."""
+    found: list[set[str]] = [set() for _ in _VALIDATORS]
+    for repo in fleet:
+        for offenders, (check, _) in zip(found, _VALIDATORS, strict=True):
+            offenders.update(check(repo))
+    for offenders, (_, message) in zip(found, _VALIDATORS, strict=True):
+        if offenders:
+            raise ValueError(message(sorted(offenders)))
+
+
+def _fleet_inputs(repo_files: list[Path]) -> list[Path]:
+    """Return every file the merged fleet is derived from, in a stable order.
+
+    This module itself is included so a change to the merge rules (`_resolve`, the
+    `{**archetype, **declared}` layering) invalidates the cache like a data change.
+    """
+    return [
+        Path(__file__),
+        DATA_DIR / "archetypes.yaml",
+        DATA_DIR / "archetypes-proposed.yaml",
+        *repo_files,
+    ]
+
+
+def _stamps(paths: list[Path]) -> list[list[Any]]:
+    """Return `[name, mtime_ns, size]` per input: the cheap half of the cache key."""
+    stamps = []
+    for path in paths:
+        stat = path.stat()
+        stamps.append([path.name, stat.st_mtime_ns, stat.st_size])
+    return stamps
+
+
+def _digest(paths: list[Path]) -> str:
+    """Return a content hash over every input: the authoritative half of the key.
+
+    mtimes alone are not trustworthy here -- a fresh checkout or a `git switch` and
+    back rewrites every mtime without changing a byte, and CI never has a warm mtime.
     """
-    raw = yaml.safe_load((DATA_DIR / "archetypes.yaml").read_text())
-    archetypes = raw["archetypes"]
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _read_cache(paths: list[Path]) -> list[dict[str, Any]] | None:
+    """Return the cached fleet if it was built from exactly these inputs, else None.
+
+    Matching mtimes and sizes short-circuit the check. Otherwise the content hash
+    decides, and a hit refreshes the stored stamps so the next run takes the fast path.
+    """
+    try:
+        cached = json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+    stamps = _stamps(paths)
+    if cached.get("stamps") == stamps:
+        return cached["fleet"]
+    if cached.get("digest") != _digest(paths):
+        return None
+    cached["stamps"] = stamps
+    _write_cache(cached)
+    return cached["fleet"]
+
+
+def _write_cache(cached: dict[str, Any]) -> None:
+    """Best-effort write. An unwritable cache costs speed, never correctness."""
+    try:
+        payload = json.dumps(cached)
+    except TypeError:
+        # YAML can produce values JSON cannot hold (dates, for one). Caching a lossy
+        # copy would make a warm run see different data than a cold one.
+        return
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_FILE.with_suffix(".tmp")
+        tmp.write_text(payload)
+        tmp.replace(CACHE_FILE)
+    except OSError:
+        return
+
+
+def _parse_fleet(repo_files: list[Path]) -> list[dict[str, Any]]:
+    """Parse and merge the fleet from disk."""
+    archetypes = _load_yaml(DATA_DIR / "archetypes.yaml")["archetypes"]
     effective = {name: _resolve(archetypes, name) for name in archetypes}
 
     fleet: list[dict[str, Any]] = []
-    for path in sorted(REPOS_DIR.glob("*.yaml")):
-        declared = yaml.safe_load(path.read_text())
+    for path in repo_files:
+        declared = _load_yaml(path)
         archetype = declared["archetype"]
         if archetype not in effective:
             message = f"{path.name} names archetype {archetype!r}, which is not defined"
@@ -234,13 +353,8 @@ def load_fleet() -> list[dict[str, Any]]:
         merged = {**effective[archetype], **declared}
         fleet.append(merged)
 
-    _check_team_references(fleet)
-    _check_permission_values(fleet)
-    _check_public_repo_teams(fleet)
-    _check_dependabot_requires_alerts(fleet)
-
     # The dotfile trap is silent by construction, so assert rather than trust.
-    assignments = yaml.safe_load((DATA_DIR / "archetypes-proposed.yaml").read_text())
+    assignments = _load_yaml(DATA_DIR / "archetypes-proposed.yaml")
     expected = sum(len(names) for names in assignments.values())
     if len(fleet) != expected:
         found = {repo["name"] for repo in fleet}
@@ -252,3 +366,28 @@ def load_fleet() -> list[dict[str, Any]]:
         )
         raise ValueError(message)
     return fleet
+
+
+def load_fleet(*, use_cache: bool = True) -> list[dict[str, Any]]:
+    """Return one merged dict per repo: archetype defaults under its own values.
+
+    MUST use pathlib rather than glob.glob or a shell glob. The org's `.github`
+    repo lands at `repos/.github.yaml`, a dotfile, which `glob.glob("*.yaml")`
+    silently skips -- 315 instead of 316. A repo missing from the fleet looks
+    exactly like one nobody has gotten to yet. See data/README.md.
+
+    The merged fleet is served from `CACHE_FILE` when every input is unchanged, and
+    `validate_fleet` runs either way -- teams.yaml is not a cache input, and a cache
+    that skipped validation would let a bad grant through on the second run.
+    """
+    repo_files = sorted(REPOS_DIR.glob("*.yaml"))
+    paths = _fleet_inputs(repo_files)
+    fleet = _read_cache(paths) if use_cache else None
+    if fleet is None:
+        fleet = _parse_fleet(repo_files)
+        if use_cache:
+            _write_cache(
+                {"stamps": _stamps(paths), "digest": _digest(paths), "fleet": fleet}
+            )
+    validate_fleet(fleet)
+    return fleet
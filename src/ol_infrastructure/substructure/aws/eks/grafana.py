@@ -68,6 +68,76 @@ stage.match {
 """
 
 
+def _omnigraph_maintenance_metrics_alloy_config() -> str:
+    """
+    Alloy River stages that turn the omnigraph maintenance sweeps' per-graph
+    log line into Prometheus gauges.
+
+    Each graph's optimize/cleanup run logs (applications/omnigraph/
+    maintenance.py):
+      omnigraph_maintenance command=optimize graph=council succeeded=1
+        duration_seconds=41 finished=1760000000
+
+    A CronJob pod is gone long before anything could scrape it, so its log line
+    is the only channel out. Gauges rather than counters or histograms: the
+    question is "how long did each graph take last time", and metric.gauge
+    with action "set" answers it without the reset blind spots described in
+    _keycloak_olapps_idp_login_redact_alloy_config. max_idle_duration spans a
+    week plus a day so the weekly cleanup's series outlive the gap between its
+    runs. Each series lives on the alloy-logs pod of the node the Job ran on,
+    so aggregate with max by (command, graph).
+
+    command and graph are promoted to labels for these lines only: two
+    commands by one graph per managed repo is a small, bounded set.
+    """
+    return r"""
+stage.match {
+  selector = "{namespace=\"omnigraph\"} |= \"omnigraph_maintenance \""
+  pipeline_name = "omnigraph_maintenance_metrics"
+
+  stage.regex {
+    expression = `^omnigraph_maintenance command=(?P<command>\S+) graph=(?P<graph>\S+) succeeded=(?P<succeeded>[01]) duration_seconds=(?P<duration_seconds>\d+) finished=(?P<finished>\d+)`
+  }
+
+  stage.labels {
+    values = {
+      command = "",
+      graph   = "",
+    }
+  }
+
+  stage.metrics {
+    metric.gauge {
+      name              = "omnigraph_maintenance_graph_duration_seconds"
+      description       = "Wall time of the last omnigraph optimize/cleanup run, per graph"
+      prefix            = ""
+      source            = "duration_seconds"
+      action            = "set"
+      max_idle_duration = "192h"
+    }
+
+    metric.gauge {
+      name              = "omnigraph_maintenance_graph_succeeded"
+      description       = "1 if the last omnigraph optimize/cleanup run for the graph succeeded"
+      prefix            = ""
+      source            = "succeeded"
+      action            = "set"
+      max_idle_duration = "192h"
+    }
+
+    metric.gauge {
+      name              = "omnigraph_maintenance_graph_last_run_timestamp_seconds"
+      description       = "Unix time the last omnigraph optimize/cleanup run for the graph finished"
+      prefix            = ""
+      source            = "finished"
+      action            = "set"
+      max_idle_duration = "192h"
+    }
+  }
+}
+"""
+
+
 def _keycloak_olapps_idp_login_redact_alloy_config() -> str:
     """
     Alloy River stages that redact PII from olapps-realm brokered-login
@@ -432,7 +502,8 @@ def setup_grafana(
                     "enabled": True,
                     "collector": "alloy-logs",
                     "extraLogProcessingStages": _apisix_cookie_metrics_alloy_config()
-                    + _keycloak_olapps_idp_login_redact_alloy_config(),
+                    + _keycloak_olapps_idp_login_redact_alloy_config()
+                    + _omnigraph_maintenance_metrics_alloy_config(),
                 },
                 "applicationObservability": {
                     "enabled": True,
@@ -17,6 +17,7 @@ from ol_infrastructure.substructure.keycloak.ol_platform_engineering import (
     create_ol_platform_engineering_realm,
 )
 from ol_infrastructure.substructure.keycloak.olapps import create_olapps_realm
+from ol_infrastructure.substructure.keycloak.realm_builder import realm_selected
 
 stack_info = parse_stack()
 env_name = f"keycloak-{stack_info.env_suffix}"
@@ -69,53 +70,57 @@ fetch_realm_public_key_partial = partial(
     keycloak_url,
 )
 
-create_ol_platform_engineering_realm(
-    keycloak_provider,
-    keycloak_url,
-    env_name,
-    stack_info,
-    mit_email_password,
-    mit_email_username,
-    mit_email_host,
-    session_secret,
-    fetch_realm_public_key_partial,
-)
-create_ol_data_platform_realm(
-    keycloak_provider,
-    keycloak_url,
-    env_name,
-    stack_info,
-    mit_email_password,
-    mit_email_username,
-    mit_email_host,
-    mit_touchstone_cert,
-    session_secret,
-    fetch_realm_public_key_partial,
-)
-create_olapps_realm(
-    keycloak_provider,
-    keycloak_url,
-    env_name,
-    stack_info,
-    mailgun_email_password,
-    mailgun_email_username,
-    mailgun_email_host,
-    mit_touchstone_cert,
-    session_secret,
-    fetch_realm_public_key_partial,
-)
-mit_ldap_bind_password = keycloak_realm_config.require_secret(
-    "ol-mit-ldap-bind-password"
-)
-create_ol_mit_realm(
-    keycloak_provider,
-    keycloak_url,
-    env_name,
-    stack_info,
-    mit_email_password,
-    mit_email_username,
-    mit_email_host,
-    mit_ldap_bind_password,
-    session_secret,
-    fetch_realm_public_key_partial,
-)
+if realm_selected("ol-platform-engineering"):
+    create_ol_platform_engineering_realm(
+        keycloak_provider,
+        keycloak_url,
+        env_name,
+        stack_info,
+        mit_email_password,
+        mit_email_username,
+        mit_email_host,
+        session_secret,
+        fetch_realm_public_key_partial,
+    )
+if realm_selected("ol-data-platform"):
+    create_ol_data_platform_realm(
+        keycloak_provider,
+        keycloak_url,
+        env_name,
+        stack_info,
+        mit_email_password,
+        mit_email_username,
+        mit_email_host,
+        mit_touchstone_cert,
+        session_secret,
+        fetch_realm_public_key_partial,
+    )
+if realm_selected("olapps"):
+    create_olapps_realm(
+        keycloak_provider,
+        keycloak_url,
+        env_name,
+        stack_info,
+        mailgun_email_password,
+        mailgun_email_username,
+        mailgun_email_host,
+        mit_touchstone_cert,
+        session_secret,
+        fetch_realm_public_key_partial,
+    )
+if realm_selected("ol-mit"):
+    mit_ldap_bind_password = keycloak_realm_config.require_secret(
+        "ol-mit-ldap-bind-password"
+    )
+    create_ol_mit_realm(
+        keycloak_provider,
+        keycloak_url,
+        env_name,
+        stack_info,
+        mit_email_password,
+        mit_email_username,
+        mit_email_host,
+        mit_ldap_bind_password,
+        session_secret,
+        fetch_realm_public_key_partial,
+    )
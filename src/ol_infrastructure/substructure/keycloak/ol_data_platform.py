@@ -4,10 +4,132 @@ import json
 
 import pulumi_keycloak as keycloak
 import pulumi_vault as vault
-from pulumi import Config, InvokeOptions, Output, ResourceOptions
+from pulumi import Config, Output, ResourceOptions
 
+from ol_infrastructure.substructure.keycloak.realm_builder import (
+    CompositeRole,
+    OIDCClient,
+    RealmBuilder,
+)
 
-def create_ol_data_platform_realm(  # noqa: C901, PLR0912, PLR0913, PLR0915
+OL_DATA_PLATFORM_CLIENTS = (
+    OIDCClient(
+        app="superset",
+        client_id="ol-superset-client",
+        # Needed to use for Superset API access
+        direct_access_grants_enabled=True,
+        service_accounts_enabled=True,
+        # Lets users calling the Superset API have their tokens validated and
+        # user details looked up via the Keycloak admin API.
+        realm_management_roles=("view-realm", "view-users"),
+    ),
+    OIDCClient(
+        app="openmetadata",
+        client_id="ol-open_metadata-client",
+        implicit_flow_enabled=True,
+        service_accounts_enabled=True,
+        vault_name="open_metadata",
+    ),
+    OIDCClient(
+        app="starrocks",
+        client_id="ol-starrocks-client",
+        # Standard flow for browser-based auth, service accounts for API access
+        standard_flow_enabled=None,
+        direct_access_grants_enabled=False,
+        service_accounts_enabled=True,
+        # Lets users calling the StarRocks SQL API have their tokens validated
+        # and user details looked up via the Keycloak admin API.
+        realm_management_roles=("view-realm", "view-users", "view-clients"),
+    ),
+)
+
+# Realm roles granting each Superset client role; the Superset role each one
+# maps to is in the description.
+SUPERSET_REALM_ROLES = (
+    CompositeRole(
+        "ol-platform-admin-role",
+        "ol-platform-admin",
+        "Full administrative access to all data and platform resources - "
+        "maps to superset_admin",
+        "ol_platform_admin",
+    ),
+    CompositeRole(
+        "ol-researcher-role",
+        "ol-researcher",
+        "Research role with ML capabilities and broad data access - "
+        "maps to superset_researcher",
+        "ol_researcher",
+    ),
+    CompositeRole(
+        "ol-data-engineer-role",
+        "ol-data-engineer",
+        "Data engineering role with limited production access - maps to superset_alpha",
+        "ol_data_engineer",
+    ),
+    CompositeRole(
+        "ol-data-analyst-role",
+        "ol-data-analyst",
+        "Data analyst role with read-only access to production data - "
+        "maps to superset_gamma",
+        "ol_data_analyst",
+    ),
+    CompositeRole(
+        "ol-instructor",
+        "ol-instructor",
+        "Instructor role with limited access to educational data",
+        "ol_instructor",
+    ),
+    CompositeRole(
+        "ol-business-analyst",
+        "ol-business-analyst",
+        "Business analyst role similar to existing business_intelligence "
+        "and finance roles",
+        "ol_business_analyst",
+    ),
+)
+
+STARROCKS_REALM_ROLES = (
+    CompositeRole(
+        "ol-starrocks-platform-admin-composite",
+        "ol-starrocks-admin",
+        "StarRocks administrator with full access",
+        "ol_platform_admin",
+    ),
+    CompositeRole(
+        "ol-starrocks-data-engineer-composite",
+        "ol-starrocks-engineer",
+        "StarRocks data engineer with write access",
+        "ol_data_engineer",
+    ),
+    CompositeRole(
+        "ol-starrocks-data-analyst-composite",
+        "ol-starrocks-analyst",
+        "StarRocks data analyst with read-only access",
+        "ol_data_analyst",
+    ),
+    CompositeRole(
+        "ol-starrocks-researcher-composite",
+        "ol-starrocks-researcher",
+        "StarRocks researcher with read-only access to analytics and research data",
+        "ol_researcher",
+    ),
+    CompositeRole(
+        "ol-starrocks-instructor-composite",
+        "ol-starrocks-instructor",
+        "StarRocks instructor with read-only access to gold-tier course data",
+        "ol_instructor",
+    ),
+    CompositeRole(
+        "ol-starrocks-business-analyst-composite",
+        "ol-starrocks-business-analyst",
+        "StarRocks business analyst with read-only access to"
+        " operational and gold-tier data",
+        "ol_business_analyst",
+    ),
+)
+
+
+def create_ol_data_platform_realm(  # noqa: PLR0913, PLR0915
     keycloak_provider: keycloak.Provider,
     keycloak_url: str,
     env_name: str,
@@ -122,101 +244,32 @@ def create_ol_data_platform_realm(  # noqa: C901, PLR0912, PLR0913, PLR0915
     )
 
     # SUPERSET [START] # noqa: ERA001
-    ol_data_platform_superset_client = keycloak.openid.Client(
-        "ol-data-platform-superset-client",
-        name="ol-data-platform-superset-client",
-        realm_id=ol_data_platform_realm.id,
-        client_id="ol-superset-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-data-platform-superset-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        # Needed to use for Superset API access
-        direct_access_grants_enabled=True,
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=True,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "ol-data-platform-superset-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    ol_data_platform_superset_client_roles = (
-        keycloak_realm_config.get_object("ol-data-platform-superset-client-roles") or []
-    )
-    ol_data_platform_superset_client_role_refs = {}
-    for role in ol_data_platform_superset_client_roles:
-        role_ref = keycloak.Role(
-            f"ol-data-platform-superset-client-{role}",
-            name=role,
-            realm_id=ol_data_platform_realm.id,
-            client_id=ol_data_platform_superset_client.id,
-            opts=resource_options,
-        )
-        ol_data_platform_superset_client_role_refs[role] = role_ref
-
-    vault.generic.Secret(
-        "ol-data-platform-superset-client-vault-oidc-credentials",
-        path="secret-operations/sso/superset",
-        data_json=Output.all(
-            url=ol_data_platform_superset_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_data_platform_superset_client.client_id,
-            client_secret=ol_data_platform_superset_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_data_platform_superset_client.realm_id,
-            realm_name="ol-data-platform",
-            realm_public_key=ol_data_platform_superset_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
-
-    # Provision service account with necessary roles for API operations
-    # This enables users calling the Superset API to have their tokens validated
-    # and user details looked up via Keycloak admin API
-    realm_mgmt_client = keycloak.openid.get_client(
-        realm_id="ol-data-platform",
-        client_id="realm-management",
-        opts=InvokeOptions(provider=keycloak_provider),
+    realm = RealmBuilder(
+        ol_data_platform_realm,
+        "ol-data-platform",
+        keycloak_provider,
+        keycloak_url,
+        session_secret,
+        fetch_realm_public_key_partial,
     )
-
-    for resource_name, role in [
-        ("ol-superset-service-account-view-realm", "view-realm"),
-        ("ol-superset-service-account-view-users", "view-users"),
-    ]:
-        keycloak.openid.ClientServiceAccountRole(
-            resource_name,
-            realm_id=ol_data_platform_realm.id,
-            service_account_user_id=ol_data_platform_superset_client.service_account_user_id,
-            client_id=realm_mgmt_client.id,
-            role=role,
-            opts=resource_options,
-        )
+    clients = realm.oidc_clients(OL_DATA_PLATFORM_CLIENTS)
+    superset = clients.get("superset")
+    starrocks = clients.get("starrocks")
 
     # Grant the service account the ol_platform_admin Superset client role so that
     # client_credentials JWTs include it in the role_keys claim (via the
     # UserClientRoleProtocolMapper on the ol_roles scope). Superset's
     # CustomSsoSecurityManager.load_user_jwt syncs roles from role_keys on every
     # JWT request, which maps ol_platform_admin → Admin via AUTH_ROLES_MAPPING.
-    if "ol_platform_admin" in ol_data_platform_superset_client_role_refs:
+    if superset and "ol_platform_admin" in superset.roles:
         keycloak.openid.ClientServiceAccountRole(
             "ol-superset-service-account-platform-admin",
             realm_id=ol_data_platform_realm.id,
-            service_account_user_id=ol_data_platform_superset_client.service_account_user_id,
-            client_id=ol_data_platform_superset_client.id,
+            service_account_user_id=superset.client.service_account_user_id,
+            client_id=superset.client.id,
             role="ol_platform_admin",
             opts=resource_options.merge(
-                ResourceOptions(
-                    depends_on=[
-                        ol_data_platform_superset_client_role_refs["ol_platform_admin"]
-                    ]
-                )
+                ResourceOptions(depends_on=[superset.roles["ol_platform_admin"]])
             ),
         )
 
@@ -243,86 +296,8 @@ def create_ol_data_platform_realm(  # noqa: C901, PLR0912, PLR0913, PLR0915
     )
 
     # Create realm roles for ol-data-platform
-    keycloak.Role(
-        "ol-platform-admin-role",
-        realm_id=ol_data_platform_realm.id,
-        name="ol-platform-admin",
-        description=(
-            "Full administrative access to all data and platform resources - "
-            "maps to superset_admin"
-        ),
-        composite_roles=[
-            ol_data_platform_superset_client_role_refs["ol_platform_admin"].id
-        ],
-        opts=resource_options,
-    )
-
-    keycloak.Role(
-        "ol-researcher-role",
-        realm_id=ol_data_platform_realm.id,
-        name="ol-researcher",
-        description=(
-            "Research role with ML capabilities and broad data access - "
-            "maps to superset_researcher"
-        ),
-        composite_roles=[
-            ol_data_platform_superset_client_role_refs["ol_researcher"].id
-        ],
-        opts=resource_options,
-    )
-
-    keycloak.Role(
-        "ol-data-engineer-role",
-        realm_id=ol_data_platform_realm.id,
-        name="ol-data-engineer",
-        description=(
-            "Data engineering role with limited production access - "
-            "maps to superset_alpha"
-        ),
-        composite_roles=[
-            ol_data_platform_superset_client_role_refs["ol_data_engineer"].id
-        ],
-        opts=resource_options,
-    )
-
-    keycloak.Role(
-        "ol-data-analyst-role",
-        realm_id=ol_data_platform_realm.id,
-        name="ol-data-analyst",
-        description=(
-            "Data analyst role with read-only access to production data - "
-            "maps to superset_gamma"
-        ),
-        composite_roles=[
-            ol_data_platform_superset_client_role_refs["ol_data_analyst"].id
-        ],
-        opts=resource_options,
-    )
-
-    keycloak.Role(
-        "ol-instructor",
-        realm_id=ol_data_platform_realm.id,
-        name="ol-instructor",
-        description="Instructor role with limited access to educational data",
-        composite_roles=[
-            ol_data_platform_superset_client_role_refs["ol_instructor"].id
-        ],
-        opts=resource_options,
-    )
-
-    keycloak.Role(
-        "ol-business-analyst",
-        realm_id=ol_data_platform_realm.id,
-        name="ol-business-analyst",
-        description=(
-            "Business analyst role similar to existing business_intelligence "
-            "and finance roles"
-        ),
-        composite_roles=[
-            ol_data_platform_superset_client_role_refs["ol_business_analyst"].id
-        ],
-        opts=resource_options,
-    )
+    if superset:
+        realm.composite_roles(superset, SUPERSET_REALM_ROLES)
 
     ol_data_platform_role_keys_openid_client_scope = keycloak.openid.ClientScope(
         "ol-data-platform-role-keys-openid-client-scope",
@@ -355,32 +330,33 @@ def create_ol_data_platform_realm(  # noqa: C901, PLR0912, PLR0913, PLR0915
     # explicitly for all tokens issued through this client, including the
     # service-account client_credentials token used for API access.
     # See https://issues.redhat.com/browse/KEYCLOAK-6638
-    keycloak.openid.AudienceProtocolMapper(
-        "ol-data-platform-superset-audience-mapper",
-        realm_id=ol_data_platform_realm.id,
-        client_id=ol_data_platform_superset_client.id,
-        name="audience",
-        included_client_audience=ol_data_platform_superset_client.client_id,
-        add_to_id_token=True,
-        add_to_access_token=True,
-        opts=resource_options,
-    )
+    if superset:
+        keycloak.openid.AudienceProtocolMapper(
+            "ol-data-platform-superset-audience-mapper",
+            realm_id=ol_data_platform_realm.id,
+            client_id=superset.client.id,
+            name="audience",
+            included_client_audience=superset.client.client_id,
+            add_to_id_token=True,
+            add_to_access_token=True,
+            opts=resource_options,
+        )
 
-    keycloak.openid.ClientDefaultScopes(
-        "ol-data-platform-superset-client-default-scopes",
-        realm_id=ol_data_platform_realm.id,
-        client_id=ol_data_platform_superset_client.id,
-        default_scopes=[
-            "acr",
-            "basic",
-            "email",
-            "ol_roles",
-            "profile",
-            "roles",
-            "web-origins",
-        ],
-        opts=resource_options,
-    )
+        keycloak.openid.ClientDefaultScopes(
+            "ol-data-platform-superset-client-default-scopes",
+            realm_id=ol_data_platform_realm.id,
+            client_id=superset.client.id,
+            default_scopes=[
+                "acr",
+                "basic",
+                "email",
+                "ol_roles",
+                "profile",
+                "roles",
+                "web-origins",
+            ],
+            opts=resource_options,
+        )
 
     keycloak.openid.ClientDefaultScopes(
         "ol-data-platform-superset-cli-client-default-scopes",
@@ -400,274 +376,69 @@ def create_ol_data_platform_realm(  # noqa: C901, PLR0912, PLR0913, PLR0915
 
     # SUPERSET [END] # noqa: ERA001
 
-    # OPENMETADATA [START] # noqa: ERA001
-    ol_data_platform_openmetadata_client = keycloak.openid.Client(
-        "ol-data-platform-openmetadata-client",
-        name="ol-data-platform-openmetadata-client",
-        realm_id="ol-data-platform",
-        client_id="ol-open_metadata-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-data-platform-openmetadata-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=True,
-        service_accounts_enabled=True,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "ol-data-platform-openmetadata-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    ol_data_platform_openmetadata_client_roles = (
-        keycloak_realm_config.get_object("ol-data-platform-openmetadata-client-roles")
-        or []
-    )
-    for role in ol_data_platform_openmetadata_client_roles:
-        keycloak.Role(
-            f"ol-data-platform-openmetadata-client-{role}",
-            name=role,
-            realm_id="ol-data-platform",
-            client_id=ol_data_platform_openmetadata_client.id,
-            opts=resource_options,
-        )
-    vault.generic.Secret(
-        "ol-data-platform-openmetadata-client-vault-oidc-credentials",
-        path="secret-operations/sso/open_metadata",
-        data_json=Output.all(
-            url=ol_data_platform_openmetadata_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_data_platform_openmetadata_client.client_id,
-            client_secret=ol_data_platform_openmetadata_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_data_platform_openmetadata_client.realm_id,
-            realm_name="ol-data-platform",
-            realm_public_key=ol_data_platform_openmetadata_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
-    # OPENMETADATA [END] # noqa: ERA001
-
     # STARROCKS [START] # noqa: ERA001
-    ol_data_platform_starrocks_redirect_uris = (
-        keycloak_realm_config.get_object("ol-data-platform-starrocks-redirect-uris")
-        or []
-    )
-    ol_data_platform_starrocks_client = keycloak.openid.Client(
-        "ol-data-platform-starrocks-client",
-        name="ol-data-platform-starrocks-client",
-        realm_id=ol_data_platform_realm.id,
-        client_id="ol-starrocks-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-data-platform-starrocks-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        # Standard flow for browser-based auth, service accounts for API access
-        direct_access_grants_enabled=False,
-        standard_flow_enabled=bool(ol_data_platform_starrocks_redirect_uris),
-        implicit_flow_enabled=False,
-        service_accounts_enabled=True,
-        valid_redirect_uris=ol_data_platform_starrocks_redirect_uris,
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    ol_data_platform_starrocks_client_roles = (
-        keycloak_realm_config.get_object("ol-data-platform-starrocks-client-roles")
-        or []
-    )
-    ol_data_platform_starrocks_client_role_refs = {}
-    for role in ol_data_platform_starrocks_client_roles:
-        role_ref = keycloak.Role(
-            f"ol-data-platform-starrocks-client-{role}",
-            name=role,
-            realm_id=ol_data_platform_realm.id,
-            client_id=ol_data_platform_starrocks_client.id,
-            opts=resource_options,
-        )
-        ol_data_platform_starrocks_client_role_refs[role] = role_ref
-
-    vault.generic.Secret(
-        "ol-data-platform-starrocks-client-vault-oidc-credentials",
-        path="secret-operations/sso/starrocks",
-        data_json=Output.all(
-            url=ol_data_platform_starrocks_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_data_platform_starrocks_client.client_id,
-            client_secret=ol_data_platform_starrocks_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_data_platform_starrocks_client.realm_id,
-            realm_name="ol-data-platform",
-            realm_public_key=ol_data_platform_starrocks_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
-
-    # Provision service account with necessary roles for API operations
-    # This enables users calling the StarRocks SQL API to have their tokens validated
-    # and user details looked up via Keycloak admin API
-    for resource_name, role in [
-        ("ol-starrocks-service-account-view-realm", "view-realm"),
-        ("ol-starrocks-service-account-view-users", "view-users"),
-        ("ol-starrocks-service-account-view-clients", "view-clients"),
-    ]:
-        keycloak.openid.ClientServiceAccountRole(
-            resource_name,
-            realm_id=ol_data_platform_realm.id,
-            service_account_user_id=ol_data_platform_starrocks_client.service_account_user_id,
-            client_id=realm_mgmt_client.id,
-            role=role,
-            opts=resource_options,
-        )
-
     # Map composite realm roles to StarRocks client roles
-    if "ol_platform_admin" in ol_data_platform_starrocks_client_role_refs:
-        keycloak.Role(
-            "ol-starrocks-platform-admin-composite",
+    if starrocks:
+        realm.composite_roles(starrocks, STARROCKS_REALM_ROLES)
+
+        # Emit StarRocks client roles as a role_keys claim in the JWT so that
+        # external tooling and future StarRocks group-provider integration can
+        # read the user's StarRocks role without parsing resource_access.<client>.
+        keycloak.openid.UserClientRoleProtocolMapper(
+            "ol-data-platform-starrocks-role-keys-mapper",
+            claim_name="role_keys",
             realm_id=ol_data_platform_realm.id,
-            name="ol-starrocks-admin",
-            description="StarRocks administrator with full access",
-            composite_roles=[
-                ol_data_platform_starrocks_client_role_refs["ol_platform_admin"].id
-            ],
+            add_to_access_token=True,
+            add_to_id_token=True,
+            add_to_userinfo=True,
+            claim_value_type="String",
+            client_id=starrocks.client.id,
+            client_id_for_role_mappings="ol-starrocks-client",
+            multivalued=True,
+            name="starrocks-role-keys",
             opts=resource_options,
         )
 
-    if "ol_data_engineer" in ol_data_platform_starrocks_client_role_refs:
-        keycloak.Role(
-            "ol-starrocks-data-engineer-composite",
+        # NOTE: the shared "ol_roles" scope is intentionally NOT included here. That
+        # scope carries a role_keys mapper for ol-superset-client roles; combining it
+        # with the StarRocks role_keys mapper above (which maps ol-starrocks-client
+        # roles to the same claim) would put two mappers on the same role_keys claim
+        # for this client, and Keycloak would emit only one of them.  The dedicated
+        # starrocks-role-keys mapper is a direct client mapper, so it applies without
+        # needing the ol_roles scope.
+        keycloak.openid.ClientDefaultScopes(
+            "ol-data-platform-starrocks-client-default-scopes",
             realm_id=ol_data_platform_realm.id,
-            name="ol-starrocks-engineer",
-            description="StarRocks data engineer with write access",
-            composite_roles=[
-                ol_data_platform_starrocks_client_role_refs["ol_data_engineer"].id
+            client_id=starrocks.client.id,
+            default_scopes=[
+                "acr",
+                "basic",
+                "email",
+                "profile",
+                "roles",
+                "web-origins",
             ],
             opts=resource_options,
         )
 
-    if "ol_data_analyst" in ol_data_platform_starrocks_client_role_refs:
-        keycloak.Role(
-            "ol-starrocks-data-analyst-composite",
+        # StarRocks 4.x rejects '@' in usernames.  Expose the Kerberos short username
+        # stored in the "saml_uid" user attribute (populated by the Touchstone SAML
+        # uid mapper above) as the "starrocks_username" JWT claim so that the
+        # StarRocks security integration principal_field can reference it.
+        keycloak.openid.UserAttributeProtocolMapper(
+            "ol-data-platform-starrocks-client-username-mapper",
+            name="starrocks-username",
             realm_id=ol_data_platform_realm.id,
-            name="ol-starrocks-analyst",
-            description="StarRocks data analyst with read-only access",
-            composite_roles=[
-                ol_data_platform_starrocks_client_role_refs["ol_data_analyst"].id
-            ],
+            client_id=starrocks.client.id,
+            user_attribute="saml_uid",
+            claim_name="starrocks_username",
+            claim_value_type="String",
+            add_to_id_token=True,
+            add_to_access_token=True,
+            add_to_userinfo=True,
             opts=resource_options,
         )
 
-    if "ol_researcher" in ol_data_platform_starrocks_client_role_refs:
-        keycloak.Role(
-            "ol-starrocks-researcher-composite",
-            realm_id=ol_data_platform_realm.id,
-            name="ol-starrocks-researcher",
-            description=(
-                "StarRocks researcher with read-only access to analytics"
-                " and research data"
-            ),
-            composite_roles=[
-                ol_data_platform_starrocks_client_role_refs["ol_researcher"].id
-            ],
-            opts=resource_options,
-        )
-
-    if "ol_instructor" in ol_data_platform_starrocks_client_role_refs:
-        keycloak.Role(
-            "ol-starrocks-instructor-composite",
-            realm_id=ol_data_platform_realm.id,
-            name="ol-starrocks-instructor",
-            description=(
-                "StarRocks instructor with read-only access to gold-tier course data"
-            ),
-            composite_roles=[
-                ol_data_platform_starrocks_client_role_refs["ol_instructor"].id
-            ],
-            opts=resource_options,
-        )
-
-    if "ol_business_analyst" in ol_data_platform_starrocks_client_role_refs:
-        keycloak.Role(
-            "ol-starrocks-business-analyst-composite",
-            realm_id=ol_data_platform_realm.id,
-            name="ol-starrocks-business-analyst",
-            description=(
-                "StarRocks business analyst with read-only access to"
-                " operational and gold-tier data"
-            ),
-            composite_roles=[
-                ol_data_platform_starrocks_client_role_refs["ol_business_analyst"].id
-            ],
-            opts=resource_options,
-        )
-
-    # Emit StarRocks client roles as a role_keys claim in the JWT so that
-    # external tooling and future StarRocks group-provider integration can
-    # read the user's StarRocks role without parsing resource_access.<client>.
-    keycloak.openid.UserClientRoleProtocolMapper(
-        "ol-data-platform-starrocks-role-keys-mapper",
-        claim_name="role_keys",
-        realm_id=ol_data_platform_realm.id,
-        add_to_access_token=True,
-        add_to_id_token=True,
-        add_to_userinfo=True,
-        claim_value_type="String",
-        client_id=ol_data_platform_starrocks_client.id,
-        client_id_for_role_mappings="ol-starrocks-client",
-        multivalued=True,
-        name="starrocks-role-keys",
-        opts=resource_options,
-    )
-
-    # NOTE: the shared "ol_roles" scope is intentionally NOT included here. That
-    # scope carries a role_keys mapper for ol-superset-client roles; combining it
-    # with the StarRocks role_keys mapper above (which maps ol-starrocks-client
-    # roles to the same claim) would put two mappers on the same role_keys claim
-    # for this client, and Keycloak would emit only one of them.  The dedicated
-    # starrocks-role-keys mapper is a direct client mapper, so it applies without
-    # needing the ol_roles scope.
-    keycloak.openid.ClientDefaultScopes(
-        "ol-data-platform-starrocks-client-default-scopes",
-        realm_id=ol_data_platform_realm.id,
-        client_id=ol_data_platform_starrocks_client.id,
-        default_scopes=[
-            "acr",
-            "basic",
-            "email",
-            "profile",
-            "roles",
-            "web-origins",
-        ],
-        opts=resource_options,
-    )
-
-    # StarRocks 4.x rejects '@' in usernames.  Expose the Kerberos short username
-    # stored in the "saml_uid" user attribute (populated by the Touchstone SAML
-    # uid mapper above) as the "starrocks_username" JWT claim so that the
-    # StarRocks security integration principal_field can reference it.
-    keycloak.openid.UserAttributeProtocolMapper(
-        "ol-data-platform-starrocks-client-username-mapper",
-        name="starrocks-username",
-        realm_id=ol_data_platform_realm.id,
-        client_id=ol_data_platform_starrocks_client.id,
-        user_attribute="saml_uid",
-        claim_name="starrocks_username",
-        claim_value_type="String",
-        add_to_id_token=True,
-        add_to_access_token=True,
-        add_to_userinfo=True,
-        opts=resource_options,
-    )
-
     # Public client for CLI / developer PKCE flows (no client secret required).
     # Used by the starrocks-auth helper script to obtain access tokens for
     # interactive dbt runs and direct mysql connections without exposing the
@@ -4,7 +4,20 @@ import json
 
 import pulumi_keycloak as keycloak
 import pulumi_vault as vault
-from pulumi import Alias, Config, InvokeOptions, Output, ResourceOptions
+from pulumi import Alias, Config, Output, ResourceOptions
+
+from ol_infrastructure.substructure.keycloak.realm_builder import (
+    OIDCClient,
+    RealmBuilder,
+)
+
+OL_PLATFORM_ENGINEERING_CLIENTS = (
+    OIDCClient(app="airbyte", client_id="ol-airbyte-client"),
+    OIDCClient(app="jupyterhub", client_id="ol-jupyterhub-client"),
+    OIDCClient(app="dagster", client_id="ol-dagster-client"),
+    OIDCClient(app="concourse", client_id="ol-concourse-client"),
+    OIDCClient(app="leek", client_id="ol-leek-client"),
+)
 
 
 def create_ol_platform_engineering_realm(  # noqa: PLR0913, PLR0915
@@ -128,46 +141,15 @@ def create_ol_platform_engineering_realm(  # noqa: PLR0913, PLR0915
         opts=resource_options,
     )
 
-    # AIRBYTE [START] # noqa: ERA001
-    ol_platform_engineering_airbyte_client = keycloak.openid.Client(
-        "ol-platform-engineering-airbyte-client",
-        name="ol-platform-engineering-airbyte-client",
-        realm_id="ol-platform-engineering",
-        client_id="ol-airbyte-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-platform-engineering-airbyte-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=False,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "ol-platform-engineering-airbyte-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    vault.generic.Secret(
-        "ol-platform-engineering-airbyte-client-vault-oidc-credentials",
-        path="secret-operations/sso/airbyte",
-        data_json=Output.all(
-            url=ol_platform_engineering_airbyte_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_platform_engineering_airbyte_client.client_id,
-            client_secret=ol_platform_engineering_airbyte_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_platform_engineering_airbyte_client.realm_id,
-            realm_name="ol-platform-engineering",
-            realm_public_key=ol_platform_engineering_airbyte_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
+    realm = RealmBuilder(
+        ol_platform_engineering_realm,
+        "ol-platform-engineering",
+        keycloak_provider,
+        keycloak_url,
+        session_secret,
+        fetch_realm_public_key_partial,
     )
-    # AIRBYTE [END] # noqa: ERA001
+    clients = realm.oidc_clients(OL_PLATFORM_ENGINEERING_CLIENTS)
 
     # OPIK [START] # noqa: ERA001
     # Opik (Comet LLM observability) has no native OIDC in its open-source
@@ -338,18 +320,13 @@ def create_ol_platform_engineering_realm(  # noqa: PLR0913, PLR0915
     # Secret, and nothing about its job requires the ability to change a single
     # thing in the realm. (An earlier revision also granted `query-groups`, for
     # resolving a `witan-users` group that no longer exists.)
-    witan_realm_mgmt_client = keycloak.openid.get_client(
-        realm_id="ol-platform-engineering",
-        client_id="realm-management",
-        opts=InvokeOptions(provider=keycloak_provider),
-    )
     keycloak.openid.ClientServiceAccountRole(
         "ol-platform-engineering-witan-token-sync-view-users",
         realm_id=ol_platform_engineering_realm.id,
         service_account_user_id=(
             ol_platform_engineering_witan_token_sync_client.service_account_user_id
         ),
-        client_id=witan_realm_mgmt_client.id,
+        client_id=realm.realm_management_client.id,
         role="view-users",
         opts=resource_options,
     )
@@ -442,184 +419,24 @@ def create_ol_platform_engineering_realm(  # noqa: PLR0913, PLR0915
     )
     # WITAN [END] # noqa: ERA001
 
-    # JUPYTERHUB [START] # noqa: ERA001
-    ol_platform_engineering_jupyterhub_client = keycloak.openid.Client(
-        "ol-platform-engineering-jupyterhub-client",
-        name="ol-platform-engineering-jupyterhub-client",
-        realm_id="ol-platform-engineering",
-        client_id="ol-jupyterhub-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-platform-engineering-jupyterhub-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=False,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "ol-platform-engineering-jupyterhub-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    vault.generic.Secret(
-        "ol-platform-engineering-jupyterhub-client-vault-oidc-credentials",
-        path="secret-operations/sso/jupyterhub",
-        data_json=Output.all(
-            url=ol_platform_engineering_jupyterhub_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_platform_engineering_jupyterhub_client.client_id,
-            client_secret=ol_platform_engineering_jupyterhub_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_platform_engineering_jupyterhub_client.realm_id,
-            realm_name="ol-platform-engineering",
-            realm_public_key=ol_platform_engineering_jupyterhub_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
-    # JUPYTERHUB [END] # noqa: ERA001
-
-    # DAGSTER [START] # noqa: ERA001
-    ol_platform_engineering_dagster_client = keycloak.openid.Client(
-        "ol-platform-engineering-dagster-client",
-        name="ol-platform-engineering-dagster-client",
-        realm_id="ol-platform-engineering",
-        client_id="ol-dagster-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-platform-engineering-dagster-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=False,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "ol-platform-engineering-dagster-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    vault.generic.Secret(
-        "ol-platform-engineering-dagster-client-vault-oidc-credentials",
-        path="secret-operations/sso/dagster",
-        data_json=Output.all(
-            url=ol_platform_engineering_dagster_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_platform_engineering_dagster_client.client_id,
-            client_secret=ol_platform_engineering_dagster_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_platform_engineering_dagster_client.realm_id,
-            realm_name="ol-platform-engineering",
-            realm_public_key=ol_platform_engineering_dagster_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
-    # DAGSTER [END] # noqa: ERA001
-
     # CONCOURSE [START] # noqa: ERA001
-    ol_platform_engineering_concourse_client = keycloak.openid.Client(
-        "ol-platform-engineering-concourse-client",
-        name="ol-platform-engineering-concourse-client",
-        realm_id="ol-platform-engineering",
-        client_id="ol-concourse-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-platform-engineering-concourse-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=False,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "ol-platform-engineering-concourse-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    vault.generic.Secret(
-        "ol-platform-engineering-concourse-client-vault-oidc-credentials",
-        path="secret-operations/sso/concourse",
-        data_json=Output.all(
-            url=ol_platform_engineering_concourse_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_platform_engineering_concourse_client.client_id,
-            client_secret=ol_platform_engineering_concourse_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_platform_engineering_concourse_client.realm_id,
-            realm_name="ol-platform-engineering",
-            realm_public_key=ol_platform_engineering_concourse_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
     # Map realm roles (e.g. admin, developer) into the "groups" claim so that
     # Concourse can use them for team membership via CONCOURSE_OIDC_GROUPS_KEY.
-    keycloak.openid.UserRealmRoleProtocolMapper(
-        "ol-platform-engineering-concourse-realm-role-groups-mapper",
-        realm_id=ol_platform_engineering_concourse_client.realm_id,
-        client_id=ol_platform_engineering_concourse_client.id,
-        name="Realm Role Groups Mapper",
-        claim_name="groups",
-        multivalued=True,
-        add_to_id_token=True,
-        add_to_access_token=True,
-        add_to_userinfo=True,
-        opts=resource_options,
-    )
+    if concourse := clients.get("concourse"):
+        keycloak.openid.UserRealmRoleProtocolMapper(
+            "ol-platform-engineering-concourse-realm-role-groups-mapper",
+            realm_id=concourse.client.realm_id,
+            client_id=concourse.client.id,
+            name="Realm Role Groups Mapper",
+            claim_name="groups",
+            multivalued=True,
+            add_to_id_token=True,
+            add_to_access_token=True,
+            add_to_userinfo=True,
+            opts=resource_options,
+        )
     # CONCOURSE [END] # noqa: ERA001
 
-    # LEEK [START] # noqa: ERA001
-    ol_platform_engineering_leek_client = keycloak.openid.Client(
-        "ol-platform-engineering-leek-client",
-        name="ol-platform-engineering-leek-client",
-        realm_id="ol-platform-engineering",
-        client_id="ol-leek-client",
-        client_secret=keycloak_realm_config.get(
-            "ol-platform-engineering-leek-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=False,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "ol-platform-engineering-leek-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    vault.generic.Secret(
-        "ol-platform-engineering-leek-client-vault-oidc-credentials",
-        path="secret-operations/sso/leek",
-        data_json=Output.all(
-            url=ol_platform_engineering_leek_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=ol_platform_engineering_leek_client.client_id,
-            client_secret=ol_platform_engineering_leek_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=ol_platform_engineering_leek_client.realm_id,
-            realm_name="ol-platform-engineering",
-            realm_public_key=ol_platform_engineering_leek_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
-    # LEEK [END] # noqa: ERA001
-
     # GWAREK [START] # noqa: ERA001
     # Guarded like OL ANALYTICS API and MIT LEARN in olapps.py: gwarek is a
     # Production-only application (applications/gwarek has only a
@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pulumi_keycloak as keycloak
 import pulumi_vault as vault
-from pulumi import Config, InvokeOptions, Output, ResourceOptions
+from pulumi import Config, Output, ResourceOptions
 
 from ol_infrastructure.substructure.keycloak.org_flows import (
     create_organization_browser_flows,
@@ -21,6 +21,59 @@ from ol_infrastructure.substructure.keycloak.org_sso_helpers import (
     onboard_oidc_org,
     onboard_saml_org,
 )
+from ol_infrastructure.substructure.keycloak.realm_builder import (
+    OIDCClient,
+    RealmBuilder,
+)
+
+# Keycloak names these clients after their client ids rather than
+# <realm>-<app>-client. The SCIM and Admin API clients further down publish
+# their credentials elsewhere, or without a config secret, so stay hand-written.
+OLAPPS_CLIENTS = (
+    OIDCClient(
+        app="learn-ai", client_id="ol-learn-ai-client", name="ol-learn-ai-client"
+    ),
+    # ol-analytics-api is the B2B multi-tenant analytics gateway serving MIT
+    # Learn's org-manager dashboard. It lives in the olapps realm (not
+    # alongside dagster/opik in ol-platform-engineering) because its
+    # b2b_dashboard tenant auth checks require the "organization" claim in
+    # X-Userinfo, and only olapps has create_organization_scope() wired up
+    # (see org_flows.py).
+    #
+    # ol-analytics-api has no CI deployment (see
+    # applications/ol_analytics_api/__main__.py), so Pulumi.CI.yaml never
+    # defines olapps-ol-analytics-api-client-secret/-redirect-uris. Without
+    # requires_secret, `pulumi up` against the CI keycloak stack would create a
+    # CONFIDENTIAL client with a null secret and null valid_redirect_uris.
+    OIDCClient(
+        app="ol-analytics-api",
+        client_id="ol-analytics-api-client",
+        name="ol-analytics-api-client",
+        requires_secret=True,
+    ),
+    OIDCClient(
+        app="mitlearn",
+        client_id="ol-mitlearn-client",
+        name="ol-mitlearn-client",
+        web_origins=("+",),
+        requires_secret=True,
+    ),
+    OIDCClient(
+        app="open-discussions",
+        client_id="ol-open-discussions-client",
+        name="ol-open-discussions-client",
+    ),
+)
+
+OLAPPS_DEFAULT_SCOPES = [
+    "acr",
+    "email",
+    "profile",
+    "roles",
+    "web-origins",
+    "ol-profile",
+    "organization",
+]
 
 
 def create_olapps_realm(  # noqa: PLR0913, PLR0915
@@ -311,202 +364,43 @@ def create_olapps_realm(  # noqa: PLR0913, PLR0915
         claim_name="name",
     )
 
-    # Learn AI [START]
-    olapps_learn_ai_client = keycloak.openid.Client(
-        "olapps-learn-ai-client",
-        name="ol-learn-ai-client",
-        realm_id="olapps",
-        client_id="ol-learn-ai-client",
-        client_secret=keycloak_realm_config.get("olapps-learn-ai-client-secret"),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=False,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "olapps-learn-ai-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    keycloak.openid.ClientDefaultScopes(
-        "olapps-learn-ai-client-default-scopes",
-        realm_id="olapps",
-        client_id=olapps_learn_ai_client.id,
-        default_scopes=[
-            "acr",
-            "email",
-            "profile",
-            "roles",
-            "web-origins",
-            "ol-profile",
-            "organization",
-        ],
-    )
-    olapps_learn_ai_client_roles = (
-        keycloak_realm_config.get_object("olapps-learn-ai-client-roles") or []
+    realm = RealmBuilder(
+        ol_apps_realm,
+        "olapps",
+        keycloak_provider,
+        keycloak_url,
+        session_secret,
+        fetch_realm_public_key_partial,
     )
-    for role in olapps_learn_ai_client_roles:
-        keycloak.Role(
-            f"olapps-learn-ai-client-{role}",
-            name=role,
+    clients = realm.oidc_clients(OLAPPS_CLIENTS)
+
+    # Learn AI [START]
+    if learn_ai := clients.get("learn-ai"):
+        keycloak.openid.ClientDefaultScopes(
+            "olapps-learn-ai-client-default-scopes",
             realm_id="olapps",
-            client_id=olapps_learn_ai_client.id,
-            opts=resource_options,
+            client_id=learn_ai.client.id,
+            default_scopes=OLAPPS_DEFAULT_SCOPES,
         )
-    vault.generic.Secret(
-        "olapps-learn-ai-client-vault-oidc-credentials",
-        path="secret-operations/sso/learn-ai",
-        data_json=Output.all(
-            url=olapps_learn_ai_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=olapps_learn_ai_client.client_id,
-            client_secret=olapps_learn_ai_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=olapps_learn_ai_client.realm_id,
-            realm_name="olapps",
-            realm_public_key=olapps_learn_ai_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
     # Learn AI [END]
 
     # OL ANALYTICS API [START]
-    # ol-analytics-api is the B2B multi-tenant analytics gateway serving MIT
-    # Learn's org-manager dashboard. It lives in the olapps realm (not
-    # alongside dagster/opik in ol-platform-engineering) because its
-    # b2b_dashboard tenant auth checks require the "organization" claim in
-    # X-Userinfo, and only olapps has create_organization_scope() wired up
-    # (see org_flows.py). Follows the olapps-learn-ai-client pattern.
-    #
-    # Guarded like MIT LEARN below: ol-analytics-api has no CI deployment (see
-    # applications/ol_analytics_api/__main__.py), so Pulumi.CI.yaml never
-    # defines olapps-ol-analytics-api-client-secret/-redirect-uris. Without
-    # this guard, `pulumi up` against the CI keycloak stack would create a
-    # CONFIDENTIAL client with a null secret and null valid_redirect_uris.
-    if keycloak_realm_config.get("olapps-ol-analytics-api-client-secret"):
-        olapps_ol_analytics_api_client = keycloak.openid.Client(
-            "olapps-ol-analytics-api-client",
-            name="ol-analytics-api-client",
-            realm_id="olapps",
-            client_id="ol-analytics-api-client",
-            client_secret=keycloak_realm_config.get(
-                "olapps-ol-analytics-api-client-secret"
-            ),
-            enabled=True,
-            access_type="CONFIDENTIAL",
-            standard_flow_enabled=True,
-            implicit_flow_enabled=False,
-            service_accounts_enabled=False,
-            valid_redirect_uris=keycloak_realm_config.get_object(
-                "olapps-ol-analytics-api-redirect-uris"
-            ),
-            opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-        )
+    if ol_analytics_api := clients.get("ol-analytics-api"):
         keycloak.openid.ClientDefaultScopes(
             "olapps-ol-analytics-api-client-default-scopes",
             realm_id="olapps",
-            client_id=olapps_ol_analytics_api_client.id,
-            default_scopes=[
-                "acr",
-                "email",
-                "profile",
-                "roles",
-                "web-origins",
-                "ol-profile",
-                "organization",
-            ],
-        )
-        vault.generic.Secret(
-            "olapps-ol-analytics-api-client-vault-oidc-credentials",
-            path="secret-operations/sso/ol-analytics-api",
-            data_json=Output.all(
-                url=olapps_ol_analytics_api_client.realm_id.apply(
-                    lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-                ),
-                client_id=olapps_ol_analytics_api_client.client_id,
-                client_secret=olapps_ol_analytics_api_client.client_secret,
-                # This is included for the case where we are using traefik-forward-auth.
-                # It requires a random secret value to be present which is independent
-                # of the OAuth credentials.
-                secret=session_secret,
-                realm_id=olapps_ol_analytics_api_client.realm_id,
-                realm_name="olapps",
-                realm_public_key=olapps_ol_analytics_api_client.realm_id.apply(
-                    fetch_realm_public_key_partial
-                ),
-            ).apply(json.dumps),
+            client_id=ol_analytics_api.client.id,
+            default_scopes=OLAPPS_DEFAULT_SCOPES,
         )
     # OL ANALYTICS API [END]
 
     # MIT LEARN [START]
-    if keycloak_realm_config.get("olapps-mitlearn-client-secret"):
-        olapps_mitlearn_client = keycloak.openid.Client(
-            "olapps-mitlearn-client",
-            name="ol-mitlearn-client",
-            realm_id="olapps",
-            client_id="ol-mitlearn-client",
-            client_secret=keycloak_realm_config.get("olapps-mitlearn-client-secret"),
-            enabled=True,
-            access_type="CONFIDENTIAL",
-            standard_flow_enabled=True,
-            implicit_flow_enabled=False,
-            service_accounts_enabled=False,
-            valid_redirect_uris=keycloak_realm_config.get_object(
-                "olapps-mitlearn-client-redirect-uris"
-            ),
-            web_origins=["+"],
-            opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-        )
+    if mitlearn := clients.get("mitlearn"):
         keycloak.openid.ClientDefaultScopes(
             "olapps-mitlearn-client-default-scopes",
             realm_id="olapps",
-            client_id=olapps_mitlearn_client.id,
-            default_scopes=[
-                "acr",
-                "email",
-                "profile",
-                "roles",
-                "web-origins",
-                "ol-profile",
-                "organization",
-            ],
-        )
-        olapps_mitlearn_client_roles = keycloak_realm_config.get_object(
-            "olapps-mitlearn-client-roles"
-        )
-        if olapps_mitlearn_client_roles:
-            for role in olapps_mitlearn_client_roles:
-                keycloak.Role(
-                    f"olapps-mitlearn-client-{role}",
-                    name=role,
-                    realm_id="olapps",
-                    client_id=olapps_mitlearn_client.id,
-                    opts=resource_options,
-                )
-        vault.generic.Secret(
-            "olapps-mitlearn-client-vault-oidc-credentials",
-            path="secret-operations/sso/mitlearn",
-            data_json=Output.all(
-                url=olapps_mitlearn_client.realm_id.apply(
-                    lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-                ),
-                client_id=olapps_mitlearn_client.client_id,
-                client_secret=olapps_mitlearn_client.client_secret,
-                # This is included for the case where we are using traefik-forward-auth.
-                # It requires a random secret value to be present which is independent
-                # of the OAuth credentials.
-                secret=session_secret,
-                realm_id=olapps_mitlearn_client.realm_id,
-                realm_name="olapps",
-                realm_public_key=olapps_mitlearn_client.realm_id.apply(
-                    fetch_realm_public_key_partial
-                ),
-            ).apply(json.dumps),
+            client_id=mitlearn.client.id,
+            default_scopes=OLAPPS_DEFAULT_SCOPES,
         )
 
         # Service account client for MIT Learn's use of the Keycloak Admin API.
@@ -531,11 +425,6 @@ def create_olapps_realm(  # noqa: PLR0913, PLR0915
             valid_redirect_uris=[],
             opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
         )
-        mitlearn_realm_management_client = keycloak.openid.get_client(
-            realm_id=ol_apps_realm.id,
-            client_id="realm-management",
-            opts=InvokeOptions(provider=keycloak_provider),
-        )
         # Least privilege: view/query users is what reading federated identities
         # needs, manage-users is what writing the email opt-in attribute needs.
         # The realm-wide view-realm/manage-realm roles are deliberately omitted.
@@ -548,7 +437,7 @@ def create_olapps_realm(  # noqa: PLR0913, PLR0915
                 resource_name,
                 realm_id=ol_apps_realm.id,
                 service_account_user_id=olapps_mitlearn_admin_client.service_account_user_id,
-                client_id=mitlearn_realm_management_client.id,
+                client_id=realm.realm_management_client.id,
                 role=role,
                 opts=resource_options,
             )
@@ -571,47 +460,6 @@ def create_olapps_realm(  # noqa: PLR0913, PLR0915
         )
     # MIT LEARN [END]
 
-    # OPEN DISCUSSIONS [START]
-    olapps_open_discussions_client = keycloak.openid.Client(
-        "olapps-open-discussions-client",
-        name="ol-open-discussions-client",
-        realm_id="olapps",
-        client_id="ol-open-discussions-client",
-        client_secret=keycloak_realm_config.get(
-            "olapps-open-discussions-client-secret"
-        ),
-        enabled=True,
-        access_type="CONFIDENTIAL",
-        standard_flow_enabled=True,
-        implicit_flow_enabled=False,
-        service_accounts_enabled=False,
-        valid_redirect_uris=keycloak_realm_config.get_object(
-            "olapps-open-discussions-client-redirect-uris"
-        ),
-        opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
-    )
-    vault.generic.Secret(
-        "olapps-open-discussions-client-vault-oidc-credentials",
-        path="secret-operations/sso/open-discussions",
-        data_json=Output.all(
-            url=olapps_open_discussions_client.realm_id.apply(
-                lambda realm_id: f"{keycloak_url}/realms/{realm_id}"
-            ),
-            client_id=olapps_open_discussions_client.client_id,
-            client_secret=olapps_open_discussions_client.client_secret,
-            # This is included for the case where we are using traefik-forward-auth.
-            # It requires a random secret value to be present which is independent
-            # of the OAuth credentials.
-            secret=session_secret,
-            realm_id=olapps_open_discussions_client.realm_id,
-            realm_name="olapps",
-            realm_public_key=olapps_open_discussions_client.realm_id.apply(
-                fetch_realm_public_key_partial
-            ),
-        ).apply(json.dumps),
-    )
-    # OPEN DISCUSSIONS [END]
-
     # MITXONLINE SCIM [START]
     olapps_mitxonline_client = keycloak.openid.Client(
         "olapps-mitxonline-client",
@@ -671,13 +519,6 @@ def create_olapps_realm(  # noqa: PLR0913, PLR0915
         opts=resource_options.merge(ResourceOptions(delete_before_replace=True)),
     )
 
-    # Get realm-management client to assign roles
-    realm_management_client = keycloak.openid.get_client(
-        realm_id=ol_apps_realm.id,
-        client_id="realm-management",
-        opts=InvokeOptions(provider=keycloak_provider),
-    )
-
     # Assign required service account roles for Keycloak Admin API access
     # These roles allow the client to list/view realms, users, and organizations
     # Refactored repetitive role assignments into a loop for maintainability
@@ -691,7 +532,7 @@ def create_olapps_realm(  # noqa: PLR0913, PLR0915
             resource_name,
             realm_id=ol_apps_realm.id,
             service_account_user_id=olapps_mitxonline_b2b_client.service_account_user_id,
-            client_id=realm_management_client.id,
+            client_id=realm.realm_management_client.id,
             role=role,
             opts=resource_options,
         )
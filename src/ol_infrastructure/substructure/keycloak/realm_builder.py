@@ -0,0 +1,242 @@
+"""Declarative OIDC clients and role matrices for the Keycloak realm modules.
+
+Most applications in a realm get the same four things: an OIDC client whose
+secret and redirect URIs come from ``keycloak_realm`` config, the client roles
+listed in config, a few ``realm-management`` roles for its service account, and
+its credentials published to ``secret-operations/sso/<app>`` for the
+application to read. The realm modules used to spell that out by hand for each
+application. They now declare it as an `OIDCClient` and let `RealmBuilder` emit
+the resources, with the same logical names and inputs as the hand-written
+blocks, so adopting a spec is a no-op diff. Anything an application needs
+beyond that (mappers, scopes, extra roles) stays imperative next to its spec.
+
+Config reads and the ``realm-management`` client lookup are derived once per
+realm and cached, rather than re-read by every block that needs them.
+
+TARGETED PREVIEWS
+
+``keycloak:realms`` and ``keycloak:clients`` (lists of realm names and client
+ids) restrict which realms and spec-declared clients the program builds::
+
+    pulumi config set --path 'keycloak:realms[0]' ol-data-platform
+    pulumi config set --path 'keycloak:clients[0]' ol-starrocks-client
+    pulumi preview --target '**ol-data-platform-starrocks-client*'
+
+Everything left out would be deleted by an update, so a restricted program
+refuses to run outside ``pulumi preview``.
+"""
+
+import json
+from collections.abc import Callable, Iterable
+from functools import cache, cached_property
+from typing import NamedTuple
+
+import pulumi_keycloak as keycloak
+import pulumi_vault as vault
+from pulumi import Config, InvokeOptions, Output, ResourceOptions
+from pydantic import BaseModel, ConfigDict
+
+from ol_infrastructure.lib.pulumi_helper import preview_selection
+
+
+def _targeted(key: str) -> frozenset[str] | None:
+    return preview_selection(Config("keycloak"), key)
+
+
+def realm_selected(realm_name: str) -> bool:
+    """Whether this run builds ``realm_name`` (see TARGETED PREVIEWS)."""
+    selection = _targeted("realms")
+    return selection is None or realm_name in selection
+
+
+class OIDCClient(BaseModel):
+    """An application's OIDC client, its roles and its published credentials.
+
+    ``app`` names everything derived from the spec: the Pulumi resources
+    (``<realm>-<app>-client``, ``<realm>-<app>-client-<role>``, ...), the
+    ``keycloak_realm`` config keys (``<realm>-<app>-client-secret``,
+    ``<realm>-<app>-redirect-uris``, ``<realm>-<app>-client-roles``) and, unless
+    ``vault_name`` overrides it, the Vault path ``secret-operations/sso/<app>``.
+    The client's Keycloak name is ``<realm>-<app>-client`` unless ``name``
+    overrides it.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    app: str
+    client_id: str
+    name: str | None = None
+    #: ``None`` enables the standard flow only when redirect URIs are configured.
+    standard_flow_enabled: bool | None = True
+    implicit_flow_enabled: bool = False
+    #: ``None`` leaves the provider default in place.
+    direct_access_grants_enabled: bool | None = None
+    service_accounts_enabled: bool = False
+    #: ``None`` leaves the provider default in place.
+    web_origins: tuple[str, ...] | None = None
+    #: realm-management roles granted to the client's service account.
+    realm_management_roles: tuple[str, ...] = ()
+    vault_name: str | None = None
+    #: Skip the client on stacks whose config has no secret for it, i.e. those
+    #: the application is not deployed to.
+    requires_secret: bool = False
+
+    @property
+    def service_account_role_prefix(self) -> str:
+        return f"{self.client_id.removesuffix('-client')}-service-account"
+
+
+class CompositeRole(NamedTuple):
+    """A realm role that grants one client role."""
+
+    resource_name: str
+    name: str
+    description: str
+    client_role: str
+
+
+class BuiltClient(NamedTuple):
+    """The resources an `OIDCClient` spec produced that callers build on."""
+
+    client: keycloak.openid.Client
+    #: client role name -> Role, for the roles listed in config.
+    roles: dict[str, keycloak.Role]
+
+
+class RealmBuilder:
+    """Emit the resources declared by `OIDCClient` specs for one realm."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        realm: keycloak.Realm,
+        realm_name: str,
+        keycloak_provider: keycloak.Provider,
+        keycloak_url: str,
+        session_secret: str,
+        fetch_realm_public_key: Callable[[str], str],
+    ):
+        self.realm = realm
+        self.realm_name = realm_name
+        self.keycloak_provider = keycloak_provider
+        self.keycloak_url = keycloak_url
+        self.session_secret = session_secret
+        self.fetch_realm_public_key = fetch_realm_public_key
+        self.resource_options = ResourceOptions(provider=keycloak_provider)
+        self._config = Config("keycloak_realm")
+
+    @cached_property
+    def realm_management_client(self) -> keycloak.openid.AwaitableGetClientResult:
+        return keycloak.openid.get_client(
+            realm_id=self.realm_name,
+            client_id="realm-management",
+            opts=InvokeOptions(provider=self.keycloak_provider),
+        )
+
+    @cache  # noqa: B019 - one builder per realm for the life of the program
+    def client_roles(self, app: str) -> tuple[str, ...]:
+        """Return the client roles config declares for ``app``."""
+        return tuple(
+            self._config.get_object(f"{self.realm_name}-{app}-client-roles") or []
+        )
+
+    @cached_property
+    def _selected_clients(self) -> frozenset[str] | None:
+        return _targeted("clients")
+
+    def oidc_clients(self, specs: Iterable[OIDCClient]) -> dict[str, BuiltClient]:
+        """Build every selected spec, keyed by ``app``."""
+        return {
+            spec.app: self.oidc_client(spec)
+            for spec in specs
+            if (
+                self._selected_clients is None
+                or spec.client_id in self._selected_clients
+            )
+            and (
+                not spec.requires_secret
+                or self._config.get(f"{self.realm_name}-{spec.app}-client-secret")
+            )
+        }
+
+    def oidc_client(self, spec: OIDCClient) -> BuiltClient:
+        """Build one spec, whether or not ``keycloak:clients`` selects it."""
+        prefix = f"{self.realm_name}-{spec.app}"
+        redirect_uris = self._config.get_object(f"{prefix}-redirect-uris")
+        if spec.standard_flow_enabled is None:
+            redirect_uris = redirect_uris or []
+        client = keycloak.openid.Client(
+            f"{prefix}-client",
+            name=spec.name or f"{prefix}-client",
+            realm_id=self.realm.id,
+            client_id=spec.client_id,
+            client_secret=self._config.get(f"{prefix}-client-secret"),
+            enabled=True,
+            access_type="CONFIDENTIAL",
+            standard_flow_enabled=(
+                bool(redirect_uris)
+                if spec.standard_flow_enabled is None
+                else spec.standard_flow_enabled
+            ),
+            implicit_flow_enabled=spec.implicit_flow_enabled,
+            direct_access_grants_enabled=spec.direct_access_grants_enabled,
+            service_accounts_enabled=spec.service_accounts_enabled,
+            valid_redirect_uris=redirect_uris,
+            web_origins=None if spec.web_origins is None else list(spec.web_origins),
+            opts=self.resource_options.merge(
+                ResourceOptions(delete_before_replace=True)
+            ),
+        )
+        roles = {
+            role: keycloak.Role(
+                f"{prefix}-client-{role}",
+                name=role,
+                realm_id=self.realm.id,
+                client_id=client.id,
+                opts=self.resource_options,
+            )
+            for role in self.client_roles(spec.app)
+        }
+        for role in spec.realm_management_roles:
+            keycloak.openid.ClientServiceAccountRole(
+                f"{spec.service_account_role_prefix}-{role}",
+                realm_id=self.realm.id,
+                service_account_user_id=client.service_account_user_id,
+                client_id=self.realm_management_client.id,
+                role=role,
+                opts=self.resource_options,
+            )
+        vault.generic.Secret(
+            f"{prefix}-client-vault-oidc-credentials",
+            path=f"secret-operations/sso/{spec.vault_name or spec.app}",
+            data_json=Output.all(
+                url=client.realm_id.apply(
+                    lambda realm_id: f"{self.keycloak_url}/realms/{realm_id}"
+                ),
+                client_id=client.client_id,
+                client_secret=client.client_secret,
+                # This is included for the case where we are using
+                # traefik-forward-auth. It requires a random secret value to be
+                # present which is independent of the OAuth credentials.
+                secret=self.session_secret,
+                realm_id=client.realm_id,
+                realm_name=self.realm_name,
+                realm_public_key=client.realm_id.apply(self.fetch_realm_public_key),
+            ).apply(json.dumps),
+        )
+        return BuiltClient(client=client, roles=roles)
+
+    def composite_roles(
+        self, built: BuiltClient, composites: Iterable[CompositeRole]
+    ) -> None:
+        """Create the realm roles whose client role config declares."""
+        for composite in composites:
+            if composite.client_role not in built.roles:
+                continue
+            keycloak.Role(
+                composite.resource_name,
+                realm_id=self.realm.id,
+                name=composite.name,
+                description=composite.description,
+                composite_roles=[built.roles[composite.client_role].id],
+                opts=self.resource_options,
+            )
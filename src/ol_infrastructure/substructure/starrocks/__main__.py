@@ -29,6 +29,8 @@ The SQL setup Command resources require the mysql client on the Pulumi runner
 import hashlib
 import json
 import re
+import shlex
+import sys
 from pathlib import Path
 
 import pulumi
@@ -788,14 +790,16 @@ if oidc_enabled:
     _group_file_path = "groups/groups.txt"
     _k8s_namespace = "starrocks"
 
-    # Write the kubeconfig to a temp file so kubectl can reach the cluster.
-    # The Concourse worker does not have a default kubeconfig for the data
-    # EKS cluster; we pull the config from the cluster stack reference and
-    # inject it via KUBECONFIG rather than relying on ambient credentials.
+    # Write the kubeconfig to a temp file so the script's Kubernetes client can
+    # reach the cluster. The Concourse worker does not have a default kubeconfig
+    # for the data EKS cluster; we pull the config from the cluster stack
+    # reference and inject it via KUBECONFIG rather than relying on ambient
+    # credentials. The script imports httpx and kubernetes, so it runs under
+    # this program's interpreter, whose environment has both, not bare python3.
     _group_sync_run = (
         "_kf=$(mktemp)"
         ' && printf \'%s\' "$KUBECONFIG_CONTENT" > "$_kf"'
-        f' && KUBECONFIG="$_kf" python3 {_sync_script}'
+        f' && KUBECONFIG="$_kf" {shlex.quote(sys.executable)} {_sync_script}'
         f" --namespace={_k8s_namespace}"
         f" --configmap={_group_file_cm}"
         '; _rc=$?; rm -f "$_kf"; exit $_rc'
@@ -805,7 +809,7 @@ if oidc_enabled:
         create=_group_sync_run,
         update=_group_sync_run,
         # On destroy the ConfigMap is owned and deleted by the applications stack;
-        # no kubectl delete needed here.
+        # nothing to delete here.
         environment={
             "KEYCLOAK_ISSUER_URL": _oidc_issuer_url,
             "KEYCLOAK_CLIENT_ID": _oidc_client_id,
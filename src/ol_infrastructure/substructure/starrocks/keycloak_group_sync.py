@@ -13,17 +13,39 @@ Required environment variables:
 The ol-starrocks-client service account holds view-realm and view-users on the
 realm-management client (see substructure/keycloak/ol_data_platform.py), so
 its client credentials are sufficient to enumerate role memberships.
+
+The roles are fetched concurrently over one keep-alive HTTP client, and the
+ConfigMap is only patched when its role memberships differ from the live ones:
+every write makes StarRocks reload its group file, so an unchanged sync must
+not touch it. That keeps a no-op run to a handful of Keycloak GETs and
+one ConfigMap read, cheap enough to run on a tight schedule.
 """
 
 import argparse
-import json
 import os
-import subprocess
 import sys
-import urllib.error
-import urllib.parse
-import urllib.request
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Protocol
+
+import httpx
+from kubernetes import client, config
+
+
+class ConfigMapApi(Protocol):
+    """The ConfigMap calls of `client.CoreV1Api` that the sync makes."""
+
+    def read_namespaced_config_map(
+        self, name: str, namespace: str
+    ) -> client.V1ConfigMap: ...
+
+    def patch_namespaced_config_map(
+        self, name: str, namespace: str, body: dict[str, Any]
+    ) -> object: ...
+
+    def create_namespaced_config_map(
+        self, namespace: str, body: client.V1ConfigMap
+    ) -> object: ...
+
 
 _GOVERNANCE_ROLES: tuple[str, ...] = (
     "ol_business_analyst",
@@ -36,19 +58,52 @@ _GOVERNANCE_ROLES: tuple[str, ...] = (
 
 
 _PAGE_SIZE = 100
+_HTTP_TIMEOUT_SECONDS = 30
+_GROUPS_KEY = "groups.txt"
 
 
-def _api_get(url: str, headers: dict[str, str]) -> Any:
-    """GET url and return the parsed JSON body; exit on HTTP error."""
-    req = urllib.request.Request(url, headers=headers)  # noqa: S310
-    try:
-        with urllib.request.urlopen(req) as resp:  # noqa: S310
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as exc:
-        sys.exit(f"Keycloak API error {exc.code} for {url}: {exc.read().decode()}")
+def _keycloak_client(issuer: str, client_id: str, client_secret: str) -> httpx.Client:
+    """Return an admin API client for the realm, authenticated as the service account.
 
+    One client is shared by every request (including the concurrent role
+    fetches), so they reuse pooled keep-alive connections instead of opening a
+    new one per page.
+    """
+    base_url, _, realm_path = issuer.partition("/realms/")
+    pool_size = len(_GOVERNANCE_ROLES)
+    http = httpx.Client(
+        base_url=f"{base_url}/admin/realms/{realm_path.rstrip('/')}",
+        timeout=_HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        ),
+    )
+    resp = http.post(
+        f"{issuer}/protocol/openid-connect/token",
+        data={
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": client_secret,
+        },
+    )
+    if resp.is_error:
+        http.close()
+        sys.exit(f"Token request failed: {resp.status_code} {resp.text}")
+    http.headers["Authorization"] = f"Bearer {resp.json()['access_token']}"
+    return http
+
+
+def _api_get(
+    http: httpx.Client, path: str, params: dict[str, Any] | None = None
+) -> Any:
+    """GET path and return the parsed JSON body; exit on HTTP error."""
+    resp = http.get(path, params=params)
+    if resp.is_error:
+        sys.exit(f"Keycloak API error {resp.status_code} for {resp.url}: {resp.text}")
+    return resp.json()
 
-def _api_get_all(url: str, headers: dict[str, str]) -> list[Any]:
+
+def _api_get_all(http: httpx.Client, path: str) -> list[Any]:
     """GET a paginated Keycloak collection, following first/max until exhausted.
 
     The Keycloak Admin API caps role-membership endpoints at max=100 by default,
@@ -56,9 +111,8 @@ def _api_get_all(url: str, headers: dict[str, str]) -> list[Any]:
     """
     results: list[Any] = []
     first = 0
-    sep = "&" if "?" in url else "?"
     while True:
-        page = _api_get(f"{url}{sep}first={first}&max={_PAGE_SIZE}", headers)
+        page = _api_get(http, path, {"first": first, "max": _PAGE_SIZE})
         if not page:
             break
         results.extend(page)
@@ -68,6 +122,64 @@ def _api_get_all(url: str, headers: dict[str, str]) -> list[Any]:
     return results
 
 
+def fetch_role_members(http: httpx.Client, client_uuid: str) -> dict[str, list[str]]:
+    """Return the sorted usernames holding each governance role, one thread per role."""
+
+    def usernames(role: str) -> list[str]:
+        users = _api_get_all(http, f"/clients/{client_uuid}/roles/{role}/users")
+        return sorted(u["username"] for u in users if u.get("username"))
+
+    with ThreadPoolExecutor(max_workers=len(_GOVERNANCE_ROLES)) as pool:
+        members = pool.map(usernames, _GOVERNANCE_ROLES)
+        return dict(zip(_GOVERNANCE_ROLES, members, strict=True))
+
+
+def render_groups(members: dict[str, list[str]]) -> str:
+    """Render the group file, skipping roles with no members."""
+    return "\n".join(
+        f"{role}:{','.join(usernames)}"
+        for role, usernames in members.items()
+        if usernames
+    )
+
+
+def _memberships(groups: str) -> set[tuple[str, frozenset[str]]]:
+    """Parse a group file into (role, usernames) pairs, ignoring line order."""
+    return {
+        (role, frozenset(usernames.split(",")))
+        for role, _, usernames in (
+            line.partition(":") for line in groups.splitlines() if line
+        )
+    }
+
+
+def apply_groups(core_v1: ConfigMapApi, namespace: str, name: str, groups: str) -> bool:
+    """Write groups to the ConfigMap unless it already holds them.
+
+    Returns whether the ConfigMap was written.
+    """
+    try:
+        live = core_v1.read_namespaced_config_map(name, namespace)
+    except client.exceptions.ApiException as exc:
+        if exc.status != 404:  # noqa: PLR2004
+            raise
+        core_v1.create_namespaced_config_map(
+            namespace,
+            client.V1ConfigMap(
+                metadata=client.V1ObjectMeta(name=name, namespace=namespace),
+                data={_GROUPS_KEY: groups},
+            ),
+        )
+        return True
+    live_groups = (live.data or {}).get(_GROUPS_KEY, "")
+    if _memberships(live_groups) == _memberships(groups):
+        return False
+    core_v1.patch_namespaced_config_map(
+        name, namespace, {"data": {_GROUPS_KEY: groups}}
+    )
+    return True
+
+
 def main() -> None:
     """Fetch Keycloak role memberships and apply them to a Kubernetes ConfigMap."""
     parser = argparse.ArgumentParser(
@@ -77,67 +189,30 @@ def main() -> None:
     parser.add_argument("--configmap", required=True, help="ConfigMap name to write")
     args = parser.parse_args()
 
-    issuer = os.environ["KEYCLOAK_ISSUER_URL"].rstrip("/")
-    client_id = os.environ["KEYCLOAK_CLIENT_ID"]
-    client_secret = os.environ["KEYCLOAK_CLIENT_SECRET"]
+    with _keycloak_client(
+        os.environ["KEYCLOAK_ISSUER_URL"].rstrip("/"),
+        os.environ["KEYCLOAK_CLIENT_ID"],
+        os.environ["KEYCLOAK_CLIENT_SECRET"],
+    ) as http:
+        clients = _api_get(http, "/clients", {"clientId": "ol-starrocks-client"})
+        if not clients:
+            sys.exit("ol-starrocks-client not found in Keycloak realm")
+        groups = render_groups(fetch_role_members(http, clients[0]["id"]))
 
-    base_url, _, realm_path = issuer.partition("/realms/")
-    realm = realm_path.rstrip("/")
-    admin_base = f"{base_url}/admin/realms/{realm}"
-
-    token_body = urllib.parse.urlencode(
-        {
-            "grant_type": "client_credentials",
-            "client_id": client_id,
-            "client_secret": client_secret,
-        }
-    ).encode()
     try:
-        with urllib.request.urlopen(  # noqa: S310
-            urllib.request.Request(  # noqa: S310
-                f"{issuer}/protocol/openid-connect/token",
-                data=token_body,
-                method="POST",
-            )
-        ) as resp:
-            access_token = json.loads(resp.read())["access_token"]
-    except urllib.error.HTTPError as exc:
-        sys.exit(f"Token request failed: {exc.code} {exc.read().decode()}")
-
-    headers = {"Authorization": f"Bearer {access_token}"}
-
-    clients = _api_get(f"{admin_base}/clients?clientId=ol-starrocks-client", headers)
-    if not clients:
-        sys.exit("ol-starrocks-client not found in Keycloak realm")
-    client_uuid = clients[0]["id"]
-
-    lines: list[str] = []
-    for role in _GOVERNANCE_ROLES:
-        users = _api_get_all(
-            f"{admin_base}/clients/{client_uuid}/roles/{role}/users", headers
+        config.load_incluster_config()
+    except config.ConfigException:
+        config.load_kube_config()
+    try:
+        written = apply_groups(
+            client.CoreV1Api(), args.namespace, args.configmap, groups
         )
-        usernames = sorted(u["username"] for u in users if u.get("username"))
-        if usernames:
-            lines.append(f"{role}:{','.join(usernames)}")
-
-    manifest = {
-        "apiVersion": "v1",
-        "kind": "ConfigMap",
-        "metadata": {"name": args.configmap, "namespace": args.namespace},
-        "data": {"groups.txt": "\n".join(lines)},
-    }
-    result = subprocess.run(
-        ["kubectl", "apply", "--validate=false", "-f", "-"],  # noqa: S607
-        input=json.dumps(manifest).encode(),
-        capture_output=True,
-        check=False,
+    except client.exceptions.ApiException as exc:
+        sys.exit(f"ConfigMap update failed ({exc.status}):\n{exc.body}")
+    state = "updated" if written else "unchanged"
+    sys.stdout.write(
+        f"configmap/{args.configmap} {state} ({len(_memberships(groups))} roles)\n"
     )
-    if result.returncode != 0:
-        sys.exit(
-            f"kubectl apply failed (exit {result.returncode}):\n"
-            f"{result.stderr.decode()}"
-        )
-    sys.stdout.write(result.stdout.decode().strip() + "\n")
 
 
 if __name__ == "__main__":
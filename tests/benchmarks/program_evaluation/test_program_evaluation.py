@@ -0,0 +1,80 @@
+"""Evaluation-cost regression benchmarks for the programs in suite.yaml.
+
+Each program is evaluated under mocks (see `ol_infrastructure.lib.pulumi_profiler`)
+and compared to baseline.json. A refactor of a shared module that doubles a
+program's evaluation time, or silently changes how many resources it declares, fails
+here instead of surfacing as a slow or surprising Concourse preview.
+
+Deselected by default (`-m 'not benchmark'` in pyproject.toml): each program costs
+seconds in a fresh interpreter.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from ol_infrastructure.lib import pulumi_profiler
+from ol_infrastructure.lib.pulumi_profiler import ProgramProfile
+
+SUITE_DIR = Path(__file__).parent
+TOLERANCES, PROGRAMS = pulumi_profiler.load_benchmark_suite(SUITE_DIR / "suite.yaml")
+BASELINE = json.loads((SUITE_DIR / "baseline.json").read_text())
+#: Programs that call AWS while evaluating are opt-in: they need real credentials.
+RUN_AWS = os.environ.get("OL_BENCHMARK_AWS") == "1"
+#: Captured at collection, before tests/conftest.py swaps in dummy AWS credentials
+#: for the session; the programs get the real ones back (or none at all).
+AWS_ENV = {
+    key: os.environ.get(key)
+    for key in (
+        "AWS_ACCESS_KEY_ID",
+        "AWS_SECRET_ACCESS_KEY",
+        "AWS_SECURITY_TOKEN",
+        "AWS_SESSION_TOKEN",
+    )
+}
+
+
+REFERENCE = pulumi_profiler.reference_program(PROGRAMS)
+
+
+@pytest.fixture(scope="module")
+def speed():
+    """How much slower this run evaluates the reference program than the baseline.
+
+    Measured in this run, on this machine, so wall times recorded elsewhere are
+    compared like for like.
+    """
+    if REFERENCE is None or REFERENCE.program not in BASELINE:
+        return 1.0
+    return pulumi_profiler.machine_speed(
+        pulumi_profiler.profile_reference(REFERENCE),
+        ProgramProfile.from_dict(BASELINE[REFERENCE.program]),
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("entry", PROGRAMS, ids=[entry.program for entry in PROGRAMS])
+def test_program_evaluation_within_baseline(entry, speed):
+    if entry.requires_aws and not RUN_AWS:
+        pytest.skip("needs read-only AWS credentials; set OL_BENCHMARK_AWS=1")
+    if entry.program not in BASELINE:
+        pytest.skip(
+            "no baseline recorded; run "
+            "`bin/profile-pulumi-programs benchmark --update-baseline`"
+        )
+
+    profile = pulumi_profiler.profile_program(
+        pulumi_profiler.resolve_program(entry.program),
+        stack=entry.stack,
+        env={**AWS_ENV, **entry.env},
+    )
+    regressions = pulumi_profiler.compare_to_baseline(
+        profile,
+        ProgramProfile.from_dict(BASELINE[entry.program]),
+        TOLERANCES,
+        speed=speed,
+    )
+
+    assert not regressions, f"{entry.program}: " + "; ".join(regressions)
@@ -0,0 +1,243 @@
+import shutil
+
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from bilder.components.vector.models import VectorConfig
+from bilder.components.vector.pipelines import (
+    global_log_sink,
+    global_metric_sink,
+    stand_in_funnels,
+)
+from bridge.lib.vector import (
+    DISK_BUFFER_MIN_BYTES,
+    MIB,
+    LogReduction,
+    RemapTransform,
+    VectorBatch,
+    VectorBuffer,
+    VectorComponent,
+    VectorPipeline,
+    WhenFull,
+    check_vector_config,
+    grafana_cloud_loki_sink,
+)
+from ol_infrastructure.infrastructure.vector_log_proxy.pipeline import (
+    log_reduction,
+    vector_log_proxy_pipeline,
+)
+
+
+def _pipeline(**sink_options) -> VectorPipeline:
+    return VectorPipeline(
+        sources={
+            "drain": VectorComponent.model_validate(
+                {"type": "heroku_logs", "address": "0.0.0.0:9000"}
+            )
+        },
+        sinks={
+            "loki": grafana_cloud_loki_sink(
+                ["drain"], labels={"service": "heroku"}, **sink_options
+            )
+        },
+    )
+
+
+def test_render_keeps_sink_fields_and_source_options():
+    config = yaml.safe_load(
+        _pipeline(
+            buffer=VectorBuffer.disk(512 * MIB, when_full=WhenFull.drop_newest),
+            batch=VectorBatch(max_bytes=MIB, timeout_secs=5),
+        ).render()
+    )
+
+    assert config["sources"]["drain"] == {
+        "type": "heroku_logs",
+        "address": "0.0.0.0:9000",
+    }
+    sink = config["sinks"]["loki"]
+    assert sink["type"] == "loki"
+    assert sink["labels"] == {"service": "heroku"}
+    assert sink["compression"] == "snappy"
+    assert sink["buffer"] == {
+        "type": "disk",
+        "max_size": 512 * MIB,
+        "when_full": "drop_newest",
+    }
+    assert sink["batch"] == {"max_bytes": MIB, "timeout_secs": 5}
+    assert "request" not in sink
+    assert "transforms" not in config
+
+
+def test_multiline_programs_render_as_block_literals():
+    pipeline = VectorPipeline(
+        transforms={"parse": RemapTransform(inputs=["drain"], source="a = 1\nb = 2\n")}
+    )
+
+    assert "source: |\n      a = 1\n      b = 2\n" in pipeline.render()
+
+
+def test_typed_transforms_render_their_own_fields():
+    config = yaml.safe_load(
+        VectorPipeline(
+            transforms=LogReduction(
+                status_field="status", sample_rate=5, dedupe_fields=["message"]
+            ).transforms("app", "parse")[0]
+        ).render()
+    )
+
+    assert config["transforms"]["app_sample"]["rate"] == 5
+    assert config["transforms"]["app_dedupe"]["fields"] == {"match": ["message"]}
+
+
+def test_host_log_sink_keeps_vectors_default_buffer_unless_asked():
+    (sink,) = global_log_sink(VectorConfig().global_log_sink_buffer).sinks.values()
+    assert sink.buffer is None
+
+    (sink,) = global_log_sink(VectorBuffer.disk(512 * MIB)).sinks.values()
+    assert sink.buffer == VectorBuffer.disk(512 * MIB)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"type": "disk", "max_size": DISK_BUFFER_MIN_BYTES - 1},
+        {"type": "disk", "max_size": DISK_BUFFER_MIN_BYTES, "max_events": 10},
+        {"type": "memory", "max_size": DISK_BUFFER_MIN_BYTES},
+    ],
+)
+def test_buffer_rejects_sizes_vector_would(options):
+    with pytest.raises(ValidationError):
+        VectorBuffer(**options)
+
+
+def test_log_proxy_sinks_shed_load_instead_of_blocking_the_drains():
+    config = yaml.safe_load(vector_log_proxy_pipeline().render())
+
+    assert config["data_dir"] == "/var/lib/vector"
+    for sink in config["sinks"].values():
+        if sink["type"] != "loki":
+            continue
+        assert sink["buffer"]["type"] == "disk"
+        assert sink["buffer"]["when_full"] == "drop_newest"
+        assert sink["request"]["concurrency"] == "adaptive"
+
+
+def test_reduction_chains_enabled_stages_in_order():
+    transforms, output = LogReduction(
+        drop_fields=["client_data", "geo.city"],
+        status_field="response_status",
+        sample_rate=10,
+        dedupe_fields=["message"],
+    ).transforms("fastly", "parse")
+
+    assert list(transforms) == ["fastly_drop_fields", "fastly_sample", "fastly_dedupe"]
+    assert transforms["fastly_drop_fields"].inputs == ["parse"]
+    assert transforms["fastly_sample"].inputs == ["fastly_drop_fields"]
+    assert transforms["fastly_dedupe"].inputs == ["fastly_sample"]
+    assert output == "fastly_dedupe"
+    assert transforms["fastly_drop_fields"].source == (
+        "del(.client_data)\ndel(.geo.city)\n"
+    )
+    assert "status >= 400" in transforms["fastly_sample"].exclude
+
+
+def test_dedupe_window_joins_the_match_key_and_is_dropped_after():
+    transforms, output = LogReduction(
+        dedupe_fields=["message"], dedupe_window_seconds=60
+    ).transforms("heroku", "parse")
+
+    assert list(transforms) == [
+        "heroku_dedupe_window",
+        "heroku_dedupe",
+        "heroku_dedupe_window_drop",
+    ]
+    assert "/ 60" in transforms["heroku_dedupe_window"].source
+    assert transforms["heroku_dedupe"].fields == {
+        "match": ["message", "_dedupe_window"]
+    }
+    assert transforms["heroku_dedupe_window_drop"].source == "del(._dedupe_window)\n"
+    assert output == "heroku_dedupe_window_drop"
+
+
+def test_reduction_with_every_stage_off_passes_through():
+    assert LogReduction().transforms("heroku", "parse") == ({}, "parse")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"sample_rate": 10},
+        {"sample_rate": 1, "status_field": "status"},
+        {"drop_fields": ["a; abort"]},
+        {"dedupe_window_seconds": 60},
+        {"dedupe_fields": ["message"], "dedupe_window_seconds": 0},
+    ],
+)
+def test_reduction_rejects_unsafe_stages(options):
+    with pytest.raises(ValidationError):
+        LogReduction(**options)
+
+
+def test_log_proxy_metrics_count_every_request_before_sampling():
+    config = yaml.safe_load(vector_log_proxy_pipeline().render())
+    transforms, sinks = config["transforms"], config["sinks"]
+
+    assert transforms["fastly_request_metric_fields"]["inputs"] == [
+        "fastly_drop_unwanted_logs"
+    ]
+    assert transforms["fastly_drop_fields"]["inputs"] == ["fastly_drop_unwanted_logs"]
+    assert sinks["ship_fastly_logs_to_grafana_cloud"]["inputs"] == ["fastly_sample"]
+    assert sinks["ship_heroku_logs_to_grafana_cloud"]["inputs"] == [
+        "heroku_dedupe_window_drop"
+    ]
+    assert sinks["ship_fastly_request_metrics_to_grafana_cloud"]["inputs"] == [
+        "fastly_request_metrics_aggregate"
+    ]
+
+
+def test_log_reduction_overrides_merge_per_source():
+    reduction = log_reduction({"fastly": {"sample_rate": 20}})
+
+    assert reduction["fastly"].sample_rate == 20
+    assert reduction["fastly"].drop_fields
+    assert reduction["heroku"].sample_rate == 10
+    with pytest.raises(ValueError, match="no source"):
+        log_reduction({"fastyl": {}})
+
+
+@pytest.mark.skipif(shutil.which("vector") is None, reason="needs the vector binary")
+def test_log_proxy_config_passes_vector_validate():
+    result = check_vector_config({"vector.yaml": vector_log_proxy_pipeline()})
+
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+@pytest.mark.skipif(shutil.which("vector") is None, reason="needs the vector binary")
+def test_log_proxy_with_every_reduction_stage_passes_vector_validate():
+    """The default config leaves fastly's dedupe off; check those VRL programs too."""
+    pipeline = vector_log_proxy_pipeline(
+        {"fastly": {"dedupe_fields": ["message"], "dedupe_window_seconds": 60}}
+    )
+    result = check_vector_config({"vector.yaml": pipeline})
+
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+@pytest.mark.skipif(shutil.which("vector") is None, reason="needs the vector binary")
+@pytest.mark.parametrize(
+    "log_buffer", [None, VectorBuffer.disk(512 * MIB)], ids=["default", "disk"]
+)
+def test_bilder_global_sinks_pass_vector_validate(log_buffer):
+    result = check_vector_config(
+        {
+            "funnels.yaml": stand_in_funnels(),
+            "global_log_sink.yaml": global_log_sink(log_buffer),
+            "global_metric_sink.yaml": global_metric_sink(
+                VectorConfig().global_metric_sink_buffer
+            ),
+        }
+    )
+
+    assert result.returncode == 0, result.stdout + result.stderr
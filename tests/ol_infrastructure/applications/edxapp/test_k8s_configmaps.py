@@ -0,0 +1,93 @@
+"""Tests for the content hashes edxapp stamps on its pod templates.
+
+Each pod template carries a hash of only the ConfigMaps its service reads, so a
+change to a CMS-only document must not roll LMS pods and vice versa.
+"""
+
+import hashlib
+import json
+import os
+
+# Set AWS environment variables before importing boto3-dependent modules
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import pytest
+
+from ol_infrastructure.applications.edxapp.config_builder import render_yaml
+from ol_infrastructure.applications.edxapp.k8s_configmaps import (
+    EdxappConfigMaps,
+    _digest,
+)
+
+CONFIG_NAMES = {
+    "general_config_name": "50-general-config-yaml",
+    "interpolated_config_name": "60-interpolated-config-yaml",
+    "cms_general_config_name": "71-cms-general-config-yaml",
+    "cms_interpolated_config_name": "72-cms-interpolated-config-yaml",
+    "lms_general_config_name": "81-lms-general-config-yaml",
+    "lms_interpolated_config_name": "82-lms-interpolated-config-yaml",
+    "waffle_flags_yaml_config_name": "waffle-flags-yaml",
+    "ssh_known_hosts_config_name": "ssh-known-hosts",
+    "settings_override_config_name": "ol-settings-override",
+}
+
+
+@pytest.fixture
+def config_maps() -> EdxappConfigMaps:
+    resources = dict.fromkeys(
+        (
+            "general",
+            "interpolated",
+            "cms_general",
+            "cms_interpolated",
+            "lms_general",
+            "lms_interpolated",
+            "waffle_flags_yaml",
+            "ssh_known_hosts",
+            "settings_override",
+        )
+    )
+    return EdxappConfigMaps(
+        **resources,
+        **CONFIG_NAMES,
+        content_hashes={name: f"hash-of-{name}" for name in CONFIG_NAMES.values()},
+    )
+
+
+def test_content_hash_ignores_key_order():
+    """Rebuilding the same data in another order must not roll any pods."""
+    documents = {"b": "second", "a": "first"}
+    assert _digest(documents) == (
+        hashlib.sha256(json.dumps(documents, sort_keys=True).encode()).hexdigest()
+    )
+    assert _digest(documents) == _digest(dict(reversed(documents.items())))
+
+
+@pytest.mark.parametrize(
+    ("service", "own", "other"),
+    [
+        ("lms", "lms", "cms"),
+        ("cms", "cms", "lms"),
+    ],
+)
+def test_service_hashes_cover_only_that_service(config_maps, service, own, other):
+    hashes = config_maps.service_content_hashes(service)
+    assert set(hashes) == {
+        CONFIG_NAMES["general_config_name"],
+        CONFIG_NAMES["interpolated_config_name"],
+        CONFIG_NAMES["waffle_flags_yaml_config_name"],
+        CONFIG_NAMES["ssh_known_hosts_config_name"],
+        CONFIG_NAMES["settings_override_config_name"],
+        CONFIG_NAMES[f"{own}_general_config_name"],
+        CONFIG_NAMES[f"{own}_interpolated_config_name"],
+    }
+    assert CONFIG_NAMES[f"{other}_general_config_name"] not in hashes
+
+
+def test_render_yaml_expands_repeated_values():
+    """Shared sub-dicts are written out in full, never as anchors and aliases."""
+    shared = {"ENGINE": "django.db.backends.mysql"}
+    rendered = render_yaml({"default": shared, "read_replica": shared})
+    assert "&" not in rendered
+    assert "*" not in rendered
+    assert rendered.count("django.db.backends.mysql") == 2
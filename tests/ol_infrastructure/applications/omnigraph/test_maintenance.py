@@ -13,15 +13,21 @@ CLI actually receive) and a substring assertion would pass on a script that
 does not run.
 """
 
+import os
 import shutil
 import subprocess
 from pathlib import Path
 
 import pytest
 
+from ol_infrastructure.applications.omnigraph.data_tier import SERVER_MEMORY_LIMIT
 from ol_infrastructure.applications.omnigraph.maintenance import (
+    _MEMORY_LIMIT_MIB,
     DEFAULT_CLEANUP_OLDER_THAN,
+    DEFAULT_PARALLELISM,
+    MAX_PARALLELISM,
     _sweep_script,
+    create_maintenance,
 )
 
 GRAPHS = ["council", "code-bridge", "code-github-com-mitodl-ol-django"]
@@ -62,7 +68,11 @@ def run_sweep(tmp_path: Path):
     bin_dir.mkdir()
     calls_file = tmp_path / "calls.txt"
 
-    def _run(script: str, fail_for: tuple[str, ...] = ()) -> SweepResult:
+    def _run(
+        script: str,
+        fail_for: tuple[str, ...] = (),
+        extra_env: dict[str, str] | None = None,
+    ) -> SweepResult:
         # Records one line of tab-separated argv per invocation, then fails for
         # the named graphs. Written per-run because the failure set is part of
         # the stub.
@@ -89,8 +99,11 @@ def run_sweep(tmp_path: Path):
             capture_output=True,
             text=True,
             env={
-                "PATH": str(bin_dir),
+                # The stub shadows any real omnigraph; the system path is only
+                # there for `date`, which times each graph.
+                "PATH": f"{bin_dir}{os.pathsep}{os.defpath}",
                 "OMNIGRAPH_STORAGE_ROOT": STORAGE_ROOT,
+                **(extra_env or {}),
             },
             check=False,
         )
@@ -263,3 +276,100 @@ def test_every_failed_graph_is_named(run_sweep):
 
     assert result.returncode == 1
     assert result.graphs_swept() == GRAPHS
+
+
+def test_each_graph_logs_its_metrics_line(run_sweep):
+    """Alloy derives the per-graph gauges from this line; its shape is the API."""
+    result = run_sweep(
+        _sweep_script("optimize", [], ["council", "code-bridge"]),
+        fail_for=("code-bridge",),
+    )
+
+    lines = sorted(
+        line for line in result.stdout.splitlines() if line.startswith("omnigraph_")
+    )
+    assert len(lines) == 2
+    for line, graph, succeeded in (
+        (lines[0], "code-bridge", "0"),
+        (lines[1], "council", "1"),
+    ):
+        fields = dict(field.split("=", 1) for field in line.split()[1:])
+        assert fields["command"] == "optimize"
+        assert fields["graph"] == graph
+        assert fields["succeeded"] == succeeded
+        assert int(fields["duration_seconds"]) >= 0
+        assert int(fields["finished"]) > 0
+
+
+def test_a_parallel_sweep_covers_every_graph_once(run_sweep):
+    result = run_sweep(_sweep_script("optimize", [], GRAPHS, parallelism=2))
+
+    assert result.returncode == 0
+    assert sorted(result.graphs_swept()) == sorted(GRAPHS)
+    assert "all graphs completed" in result.stdout
+
+
+def test_a_parallel_sweep_still_names_every_failure(run_sweep):
+    """Failures are read back from ``wait``, so none may be lost to a reap."""
+    result = run_sweep(
+        _sweep_script("optimize", [], GRAPHS, parallelism=2),
+        fail_for=("council", "code-github-com-mitodl-ol-django"),
+    )
+
+    assert result.returncode == 1
+    assert sorted(result.graphs_swept()) == sorted(GRAPHS)
+
+
+@pytest.mark.parametrize("shards", [2, 3, 5])
+def test_shards_partition_the_graph_list(run_sweep, shards):
+    """Every graph lands in exactly one shard, however the list divides."""
+    swept = []
+    for index in range(shards):
+        result = run_sweep(
+            _sweep_script("optimize", [], GRAPHS, shards=shards),
+            extra_env={"JOB_COMPLETION_INDEX": str(index)},
+        )
+        assert result.returncode == 0
+        assert f"(shard {index} of {shards})" in result.stdout
+        swept.extend(result.graphs_swept())
+
+    assert sorted(swept) == sorted(GRAPHS)
+
+
+def test_a_maintenance_pod_stays_below_the_server_limit():
+    """Maintenance must lose an eviction race to the serving pod, not win it."""
+    amount, unit = SERVER_MEMORY_LIMIT[:-2], SERVER_MEMORY_LIMIT[-2:]
+    server_limit_mib = int(amount) * {"Mi": 1, "Gi": 1024}[unit]
+
+    assert server_limit_mib > _MEMORY_LIMIT_MIB
+    assert DEFAULT_PARALLELISM <= MAX_PARALLELISM
+
+
+def _create(**concurrency):
+    return create_maintenance(
+        stack_info=None,
+        namespace="omnigraph",
+        k8s_global_labels={},
+        image="omnigraph-server",
+        service_account_name="omnigraph-server",
+        aws_region="us-east-1",
+        storage_uri=None,
+        graph_ids=GRAPHS,
+        optimize_schedule="20 3 * * *",
+        cleanup_schedule="20 4 * * 0",
+        cleanup_older_than=DEFAULT_CLEANUP_OLDER_THAN,
+        depends_on=[],
+        **concurrency,
+    )
+
+
+@pytest.mark.parametrize("setting", ["parallelism", "shards"])
+def test_concurrency_below_one_is_refused(setting):
+    """Zero would render a sweep that maintains nothing and exits 0."""
+    with pytest.raises(ValueError, match=setting):
+        _create(**{setting: 0})
+
+
+def test_parallelism_beyond_one_pods_memory_is_refused():
+    with pytest.raises(ValueError, match="raise shards instead"):
+        _create(parallelism=MAX_PARALLELISM + 1)
@@ -15,12 +15,14 @@ from typing import Any, ClassVar
 import pytest
 
 from ol_infrastructure.applications.omnigraph.scripts.sync_actor_tokens import (
+    _POOL,
     SyncError,
     derive_actor_id,
     is_service_account,
     read_token_map,
     realm_users,
     reconcile,
+    write_token_map,
 )
 
 SERVICE_TOKENS = {"svc-witan-ci": "ci-token"}  # pragma: allowlist secret
@@ -136,6 +138,19 @@ class _StubHandler(BaseHTTPRequestHandler):
     """Serves whatever ``routes`` maps the path to: (status, body)."""
 
     routes: ClassVar[dict[str, Any]] = {}
+    writes: ClassVar[list[tuple[str, Any]]] = []
+    connections: ClassVar[int] = 0
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        _StubHandler.writes.append((self.path, json.loads(self.rfile.read(length))))
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
 
     def do_GET(self):
         status, body = self.routes.get(self.path, (404, ""))
@@ -150,12 +165,24 @@ class _StubHandler(BaseHTTPRequestHandler):
         pass
 
 
-@pytest.fixture
-def stub_server():
-    server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+class _KeepAliveStubHandler(_StubHandler):
+    """The same stub, holding connections open the way Vault and Keycloak do."""
+
+    protocol_version = "HTTP/1.1"
+
+
+@pytest.fixture(params=[_StubHandler, _KeepAliveStubHandler], ids=["close", "keep"])
+def stub_server(request):
+    handler = request.param
+    handler.connections = 0
+    _StubHandler.writes = []
+    server = HTTPServer(("127.0.0.1", 0), handler)
     thread = Thread(target=server.serve_forever, daemon=True)
     thread.start()
     yield server, f"http://127.0.0.1:{server.server_port}"
+    # A pooled keep-alive connection holds the single-threaded server inside
+    # its handler, where shutdown() would wait on it forever.
+    _POOL.close()
     server.shutdown()
 
 
@@ -236,3 +263,59 @@ def test_realm_users_pages_to_the_end(stub_server):
 
     assert len(users) == 101
     assert users[-1]["id"] == "u100"
+
+
+ACTOR_TOKENS_PATH = "secret-operations/witan/actor-tokens"  # pragma: allowlist secret
+
+
+def _stored(tokens: dict[str, str]) -> tuple[int, dict[str, Any]]:
+    return 200, {"data": {"tokens_json": json.dumps(tokens)}}
+
+
+def test_requests_in_a_run_share_a_connection(stub_server):
+    server, base = stub_server
+    _StubHandler.routes = {f"/v1/{ACTOR_TOKENS_PATH}": _stored({"act-a": "t"})}
+
+    for _ in range(3):
+        read_token_map(base, "token", ACTOR_TOKENS_PATH)
+
+    handler = server.RequestHandlerClass
+    # A server that closes after each response gets a fresh connection each
+    # time; one that keeps it open is reused rather than re-handshaken.
+    assert handler.connections == (1 if handler.protocol_version == "HTTP/1.1" else 3)
+
+
+def test_write_token_map_replaces_an_unchanged_map(stub_server):
+    _, base = stub_server
+    current = {"svc-witan-ci": "ci-token"}  # pragma: allowlist secret
+    _StubHandler.routes = {f"/v1/{ACTOR_TOKENS_PATH}": _stored(current)}
+    desired = {**current, "act-alice": "new"}
+
+    write_token_map(base, "token", ACTOR_TOKENS_PATH, desired, expected=current)
+
+    assert _StubHandler.writes == [
+        (
+            f"/v1/{ACTOR_TOKENS_PATH}",
+            {"tokens_json": json.dumps(desired, sort_keys=True)},
+        )
+    ]
+
+
+def test_write_token_map_refuses_a_map_changed_since_it_was_read(stub_server):
+    # Stands in for the check-and-set kv-v1 does not have: an overlapping run
+    # (the deploy-time bootstrap Job) already wrote its own freshly minted
+    # tokens, and replacing them would silently drop them.
+    _, base = stub_server
+    read = {"svc-witan-ci": "ci-token"}  # pragma: allowlist secret
+    written_meanwhile = {**read, "act-alice": "theirs"}
+    _StubHandler.routes = {f"/v1/{ACTOR_TOKENS_PATH}": _stored(written_meanwhile)}
+
+    with pytest.raises(SyncError, match="changed while this run was reconciling"):
+        write_token_map(
+            base,
+            "token",
+            ACTOR_TOKENS_PATH,
+            {**read, "act-alice": "ours"},
+            expected=read,
+        )
+    assert _StubHandler.writes == []
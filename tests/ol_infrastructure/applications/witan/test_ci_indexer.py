@@ -0,0 +1,135 @@
+"""Tests for the change check in front of the witan CI indexer.
+
+The check decides which repos get cloned at all, and both of its failure modes
+are silent: skip a repo whose head moved and its shared graph quietly goes
+stale; record a head after a failed index and the failure is never retried.
+The script runs for real under ``/bin/sh`` with stub ``git`` and
+``witan-ci-index`` commands on PATH.
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ol_infrastructure.applications.witan.ci_indexer import CHANGE_DRIVEN_SCRIPT
+
+REPOS = [
+    "https://github.com/mitodl/ol-infrastructure",
+    "https://github.com/mitodl/mitxonline",
+]
+
+
+class Indexer:
+    """Stubbed GitHub heads and entrypoint, and the state dir between runs."""
+
+    def __init__(self, tmp_path: Path):
+        self.bin_dir = tmp_path / "bin"
+        self.bin_dir.mkdir()
+        self.state_dir = tmp_path / "state"
+        self.heads_dir = tmp_path / "heads"
+        self.heads_dir.mkdir()
+        self.calls_file = tmp_path / "indexed.txt"
+        self.fail_file = tmp_path / "fail.txt"
+        self.calls_file.write_text("")
+        self.fail_file.write_text("")
+        # `git ls-remote <repo> HEAD` answers from heads/<basename>, and fails
+        # like an unreachable repo when there is no such file.
+        self._stub(
+            "git",
+            f'f="{self.heads_dir}/$(basename "$2")"\n'
+            '[ -f "$f" ] || exit 128\n'
+            'printf "%s\\tHEAD\\n" "$(cat "$f")"\n',
+        )
+        self._stub(
+            "witan-ci-index",
+            f'echo "$WITAN_CODE_CI_REPOS" >> "{self.calls_file}"\n'
+            f'! grep -qx "$WITAN_CODE_CI_REPOS" "{self.fail_file}"\n',
+        )
+
+    def _stub(self, name: str, body: str) -> None:
+        path = self.bin_dir / name
+        path.write_text(f"#!/bin/sh\n{body}")
+        path.chmod(0o755)
+
+    def set_head(self, repo: str, sha: str) -> None:
+        (self.heads_dir / repo.rsplit("/", 1)[-1]).write_text(sha)
+
+    def run(
+        self,
+        *,
+        image: str = "witan@sha256:1",
+        max_age: int = 86400,
+        fail_for: tuple[str, ...] = (),
+    ) -> tuple[int, list[str]]:
+        self.calls_file.write_text("")
+        self.fail_file.write_text("".join(f"{repo}\n" for repo in fail_for))
+        completed = subprocess.run(  # noqa: S603
+            [shutil.which("sh") or "/bin/sh", "-c", CHANGE_DRIVEN_SCRIPT],
+            capture_output=True,
+            text=True,
+            env={
+                "PATH": f"{self.bin_dir}{os.pathsep}{os.defpath}",
+                "WITAN_CODE_CI_REPOS": " ".join(REPOS),
+                "WITAN_CODE_CI_STATE_DIR": str(self.state_dir),
+                "WITAN_CODE_CI_IMAGE": image,
+                "WITAN_CODE_CI_MAX_AGE_SECONDS": str(max_age),
+            },
+            check=False,
+        )
+        return completed.returncode, self.calls_file.read_text().split()
+
+
+@pytest.fixture
+def indexer(tmp_path: Path) -> Indexer:
+    stub = Indexer(tmp_path)
+    for repo in REPOS:
+        stub.set_head(repo, "a" * 40)
+    return stub
+
+
+def test_first_run_indexes_every_repo(indexer):
+    assert indexer.run() == (0, REPOS)
+
+
+def test_unmoved_heads_are_skipped(indexer):
+    indexer.run()
+    assert indexer.run() == (0, [])
+
+
+def test_only_the_moved_repo_is_indexed(indexer):
+    indexer.run()
+    indexer.set_head(REPOS[1], "b" * 40)
+    assert indexer.run() == (0, [REPOS[1]])
+
+
+def test_a_failed_index_is_retried_next_run(indexer):
+    """The head is recorded only after a successful index."""
+    returncode, _ = indexer.run(fail_for=(REPOS[0],))
+    assert returncode == 1
+    assert indexer.run() == (0, [REPOS[0]])
+
+
+def test_one_failure_does_not_skip_the_rest(indexer):
+    assert indexer.run(fail_for=(REPOS[0],)) == (1, REPOS)
+
+
+def test_an_unreadable_head_is_never_unchanged(indexer):
+    """A private repo ls-remote cannot see is indexed every run, not skipped."""
+    indexer.run()
+    (indexer.heads_dir / REPOS[0].rsplit("/", 1)[-1]).unlink()
+    assert indexer.run() == (0, [REPOS[0]])
+    assert indexer.run() == (0, [REPOS[0]])
+
+
+def test_a_new_image_reindexes_everything(indexer):
+    indexer.run()
+    assert indexer.run(image="witan@sha256:2") == (0, REPOS)
+
+
+def test_records_expire(indexer):
+    """A graph rebuilt underneath the indexer catches up without manual resets."""
+    indexer.run()
+    assert indexer.run(max_age=0) == (0, REPOS)
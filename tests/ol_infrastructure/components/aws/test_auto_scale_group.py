@@ -8,7 +8,6 @@ This test validates:
 
 import asyncio
 import os
-from unittest import mock
 
 # Set AWS environment variables before importing boto3-dependent modules
 os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
@@ -18,13 +17,7 @@ os.environ["AWS_SECRET_ACCESS_KEY"] = (
     "testing"  # pragma: allowlist secret  # noqa: S105
 )
 
-# Mock the is_valid_instance_type function globally to avoid AWS API calls
-_mock_patcher = mock.patch(
-    "ol_infrastructure.lib.aws.ec2_helper.is_valid_instance_type", return_value=True
-)
-_mock_patcher.start()
-
-import pulumi  # noqa: E402
+import pulumi
 
 # Python 3.14+ compatibility: ensure event loop exists for set_mocks()
 try:
@@ -33,7 +26,7 @@ except RuntimeError:
     asyncio.set_event_loop(asyncio.new_event_loop())
 
 # Import the component (mocks will be set by conftest fixture)
-from ol_infrastructure.components.aws.auto_scale_group import (  # noqa: E402
+from ol_infrastructure.components.aws.auto_scale_group import (
     BlockDeviceMapping,
     OLAutoScaleGroupConfig,
     OLAutoScaling,
@@ -0,0 +1,175 @@
+"""Tests for queue-based KEDA scaling of celery workers."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pulumi
+
+try:
+    asyncio.get_event_loop()
+except RuntimeError:
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+class K8sMocks(pulumi.runtime.Mocks):
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        return [args.name + "_id", args.inputs]
+
+    def call(self, args: pulumi.runtime.MockCallArgs):  # noqa: ARG002
+        return {}
+
+
+pulumi.runtime.set_mocks(K8sMocks())
+
+import pytest  # noqa: E402
+from pydantic import ValidationError  # noqa: E402
+
+from ol_infrastructure.components.services.k8s import (  # noqa: E402
+    OLApplicationK8s,
+    OLApplicationK8sCeleryQueueScalingConfig,
+    OLApplicationK8sCeleryWorkerConfig,
+    OLApplicationK8sConfig,
+    celery_queue_scaled_object_spec,
+)
+from ol_infrastructure.lib.k8s_keda import (  # noqa: E402
+    PROMETHEUS_SERVER,
+    build_celery_queue_scaling,
+)
+
+REDIS_PASSWORD = "not-a-secret"  # noqa: S105  # pragma: allowlist secret
+
+
+def _worker(**overrides: object) -> OLApplicationK8sCeleryWorkerConfig:
+    defaults: dict[str, object] = {
+        "queue_name": "default",
+        "redis_host": pulumi.Output.from_input("redis.example"),
+        "redis_password": REDIS_PASSWORD,
+        "queue_scaling": OLApplicationK8sCeleryQueueScalingConfig(),
+    }
+    return OLApplicationK8sCeleryWorkerConfig.model_validate(defaults | overrides)
+
+
+def _spec(worker: OLApplicationK8sCeleryWorkerConfig) -> dict[str, Any]:
+    return celery_queue_scaled_object_spec(
+        worker,
+        "redis.example",
+        deployment_name="myapp-default-celery-worker",
+        redis_trigger_authentication_name="myapp-default-celery-worker-keda-redis",
+    )
+
+
+def test_one_backlog_trigger_per_consumed_queue():
+    spec = _spec(_worker(queue_name="default,hubspot_sync"))
+
+    assert [t["metadata"]["listName"] for t in spec["triggers"]] == [
+        "default",
+        "hubspot_sync",
+    ]
+    trigger = spec["triggers"][0]
+    assert trigger["metadata"]["listLength"] == "10"
+    assert trigger["metadata"]["address"] == "redis.example:6379"
+    assert trigger["authenticationRef"] == {
+        "name": "myapp-default-celery-worker-keda-redis"
+    }
+    assert "password" not in trigger["metadata"]
+
+
+def test_worker_consuming_every_queue_scales_on_its_name():
+    worker = _worker(queue_name=None, worker_name="all")
+    assert worker.scaling_queues() == ["all"]
+
+
+def test_scale_to_zero_drops_the_floor():
+    worker = _worker(
+        min_replicas=2,
+        queue_scaling=OLApplicationK8sCeleryQueueScalingConfig(
+            scale_to_zero=True, activation_backlog=1
+        ),
+    )
+    spec = _spec(worker)
+    assert spec["minReplicaCount"] == 0
+    assert spec["triggers"][0]["metadata"]["activationListLength"] == "1"
+    assert _spec(_worker(min_replicas=2))["minReplicaCount"] == 2
+
+
+def test_scale_up_is_immediate():
+    behavior = _spec(_worker())["advanced"]["horizontalPodAutoscalerConfig"]["behavior"]
+    assert behavior["scaleUp"]["stabilizationWindowSeconds"] == 0
+    assert behavior["scaleDown"]["stabilizationWindowSeconds"] == 300
+
+
+def test_task_age_adds_a_value_trigger_per_queue():
+    scaling = build_celery_queue_scaling(
+        task_age_query='max(celery_queue_oldest_task_age_seconds{queue="{queue}"})',
+        max_task_age_seconds=120,
+        prometheus_trigger_auth_name="myapp-webapp-prometheus-auth-trigger",
+    )
+    spec = _spec(_worker(queue_name="a,b", queue_scaling=scaling))
+
+    age = [t for t in spec["triggers"] if t["type"] == "prometheus"]
+    assert len(age) == 2
+    assert age[1]["metricType"] == "Value"
+    assert age[1]["metadata"]["serverAddress"] == PROMETHEUS_SERVER
+    assert age[1]["metadata"]["threshold"] == "120"
+    assert [trigger["metadata"]["query"] for trigger in age] == [
+        'max(celery_queue_oldest_task_age_seconds{queue="a"})',
+        'max(celery_queue_oldest_task_age_seconds{queue="b"})',
+    ]
+
+
+def test_task_age_needs_every_piece():
+    with pytest.raises(ValidationError, match="missing"):
+        OLApplicationK8sCeleryQueueScalingConfig(
+            task_age_query="age{queue='{queue}'}", max_task_age_seconds=60
+        )
+    with pytest.raises(ValidationError, match="placeholder"):
+        build_celery_queue_scaling(
+            task_age_query="age",
+            max_task_age_seconds=60,
+            prometheus_trigger_auth_name="auth",
+        )
+
+
+def test_password_may_come_from_an_existing_secret():
+    scaling = OLApplicationK8sCeleryQueueScalingConfig(
+        redis_password_secret_name="redis-creds"  # pragma: allowlist secret
+    )
+    assert _worker(redis_password=None, queue_scaling=scaling).redis_password is None
+    with pytest.raises(ValidationError, match="redis_password is required"):
+        _worker(redis_password=None)
+
+
+@pulumi.runtime.test
+def test_component_authenticates_through_a_trigger_authentication():
+    app = OLApplicationK8s(
+        OLApplicationK8sConfig(
+            application_name="queued",
+            application_namespace="queued-ns",
+            application_image_repository="registry.example.com/queued",
+            application_docker_tag="latest",
+            application_security_group_id=pulumi.Output.from_input("sg-test"),
+            application_security_group_name=pulumi.Output.from_input("queued-sg"),
+            application_lb_service_name="queued-service",
+            application_lb_service_port_name="http",
+            application_config={},
+            env_from_secret_names=["queued-secret"],
+            vault_k8s_resource_auth_name="queued-vault-auth",
+            project_root=Path("/tmp/queued"),  # noqa: S108
+            import_nginx_config=False,
+            k8s_global_labels={"ol.mit.edu/environment": "qa"},
+            celery_worker_configs=[_worker()],
+        )
+    )
+
+    def check(spec):
+        (trigger,) = spec["triggers"]
+        assert trigger["authenticationRef"] == {
+            "name": "queued-default-celery-worker-keda-redis"
+        }
+        assert REDIS_PASSWORD not in str(spec)
+
+    (scaled_object,) = app.celery_scaled_objects
+    return scaled_object.spec.apply(check)
@@ -15,10 +15,11 @@ Note:
     instantiate OLApplicationK8s or assert on full Kubernetes pod specs (e.g.,
     sidecars, init containers, volumes, or pod_security_context), nor do they
     assert on autoscaling resources such as HPAs or KEDA ScaledObjects. The
-    exceptions are test_default_container_annotation_set_to_app_container, which
-    instantiates OLApplicationK8s under Pulumi mocks to verify the Deployment's
-    pod template annotations, and the container_security_context tests at the
-    end of the module, which assert on the rendered container specs.
+    exceptions are test_default_container_annotation_set_to_app_container and the
+    config-hash tests, which instantiate OLApplicationK8s under Pulumi mocks to
+    verify the Deployments' pod template annotations, and the
+    container_security_context tests at the end of the module, which assert on
+    the rendered container specs.
 """
 
 from __future__ import annotations
@@ -61,7 +62,15 @@ from ol_infrastructure.components.services.k8s import (  # noqa: E402
     OLApplicationK8sCeleryWorkerConfig,
     OLApplicationK8sConfig,
     OLApplicationK8sKedaWebappScalingConfig,
+    application_deployment_names,
+    celery_beat_deployment_name,
+    celery_worker_deployment_name,
     default_probe_configs,
+    deployments_reading_secret,
+)
+from ol_infrastructure.components.services.pgbouncer import (  # noqa: E402
+    OLPgBouncerConfig,
+    pgbouncer_deployment_name,
 )
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
@@ -566,6 +575,211 @@ def test_config_hash_annotation_changes_with_input():
     ).apply(check)
 
 
+def _worker_config(worker_name: str = "default") -> OLApplicationK8sCeleryWorkerConfig:
+    return OLApplicationK8sCeleryWorkerConfig(
+        worker_name=worker_name,
+        redis_host=pulumi.Output.from_input("redis.example.com"),
+        redis_password="hunter2",  # pragma: allowlist secret
+    )
+
+
+def _config_hash(deployment):
+    return deployment.spec.template.metadata.annotations.apply(
+        lambda a: (a or {}).get("ol.mit.edu/config-hash")
+    )
+
+
+@pulumi.runtime.test
+def test_nginx_config_hash_is_webapp_only():
+    """Only the webapp mounts nginx.conf, so only the webapp rolls when it changes."""
+    project_root = Path(tempfile.mkdtemp())
+    (project_root / "files").mkdir()
+    (project_root / "files" / "web.conf").write_text("server { listen 8071; }\n")
+    app = OLApplicationK8s(
+        _base_config(
+            application_name="nginxhash",
+            project_root=project_root,
+            import_nginx_config=True,
+            celery_worker_configs=[_worker_config()],
+            celery_beat_config=OLApplicationK8sCeleryBeatConfig(),
+        )
+    )
+
+    def check(hashes):
+        webapp_hash, worker_hash, beat_hash = hashes
+        assert webapp_hash is not None
+        assert worker_hash is None
+        assert beat_hash is None
+
+    return pulumi.Output.all(
+        _config_hash(app.application_deployment),
+        _config_hash(app.celery_deployments[0]),
+        _config_hash(app.beat_deployment),
+    ).apply(check)
+
+
+@pulumi.runtime.test
+def test_deployment_config_hash_inputs_roll_only_their_deployment():
+    app = OLApplicationK8s(
+        _base_config(
+            application_name="scopedhash",
+            config_hash_inputs={"shared": "1"},
+            celery_worker_configs=[_worker_config("default"), _worker_config("bulk")],
+            deployment_config_hash_inputs={
+                celery_worker_deployment_name("scopedhash", "bulk"): {"bulk": "1"},
+            },
+        )
+    )
+
+    def check(hashes):
+        webapp_hash, default_hash, bulk_hash = hashes
+        assert webapp_hash == default_hash
+        assert bulk_hash not in {None, webapp_hash}
+
+    return pulumi.Output.all(
+        _config_hash(app.application_deployment),
+        *(_config_hash(deployment) for deployment in app.celery_deployments),
+    ).apply(check)
+
+
+def test_deployment_config_hash_inputs_reject_unknown_deployment():
+    with pytest.raises(ValidationError, match="unknown Deployment"):
+        _base_config(
+            application_name="myapp",
+            deployment_config_hash_inputs={
+                celery_beat_deployment_name("myapp"): {"schedule": "1"}
+            },
+        )
+
+
+@pulumi.runtime.test
+def test_deployments_reading_secret_matches_the_built_component():
+    worker_configs = [_worker_config()]
+    beat_config = OLApplicationK8sCeleryBeatConfig()
+    app = OLApplicationK8s(
+        _base_config(
+            application_name="secretreaders",
+            celery_worker_configs=worker_configs,
+            celery_beat_config=beat_config,
+        )
+    )
+    assert (
+        deployments_reading_secret(
+            "secretreaders",
+            worker_configs,
+            beat_config,
+            secret_name="myapp-secret",  # pragma: allowlist secret
+            env_from_secret_names=["myapp-secret"],
+        )
+        == app.all_deployment_names
+    )
+
+
+def _env_from_secret_names(containers, container_name):
+    container = next(c for c in containers if c["name"] == container_name)
+    return [source["secret_ref"]["name"] for source in container["env_from"]]
+
+
+@pulumi.runtime.test
+def test_deployment_env_from_secret_names_mount_and_restart_only_their_deployment():
+    worker_configs = [_worker_config("default"), _worker_config("bulk")]
+    bulk_deployment_name = celery_worker_deployment_name("scopedsecret", "bulk")
+    per_deployment = {bulk_deployment_name: ["bulk-secret"]}
+    app = OLApplicationK8s(
+        _base_config(
+            application_name="scopedsecret",
+            celery_worker_configs=worker_configs,
+            deployment_env_from_secret_names=per_deployment,
+        )
+    )
+    assert deployments_reading_secret(
+        "scopedsecret",
+        worker_configs,
+        secret_name="bulk-secret",  # pragma: allowlist secret
+        env_from_secret_names=["myapp-secret"],
+        deployment_env_from_secret_names=per_deployment,
+    ) == [bulk_deployment_name]
+
+    def check(containers):
+        webapp, default, bulk = containers
+        assert _env_from_secret_names(webapp, "scopedsecret-app") == ["myapp-secret"]
+        assert _env_from_secret_names(default, "celery-worker") == ["myapp-secret"]
+        assert _env_from_secret_names(bulk, "celery-worker") == [
+            "myapp-secret",
+            "bulk-secret",
+        ]
+
+    return pulumi.Output.all(
+        app.application_deployment.spec.template.spec.containers,
+        *(
+            deployment.spec.template.spec.containers
+            for deployment in app.celery_deployments
+        ),
+    ).apply(check)
+
+
+def test_deployment_env_from_secret_names_reject_unknown_deployment():
+    with pytest.raises(ValidationError, match="unknown Deployment"):
+        _base_config(
+            application_name="myapp",
+            deployment_env_from_secret_names={
+                celery_beat_deployment_name("myapp"): ["beat-secret"]
+            },
+        )
+
+
+def test_deployments_reading_secret_follows_secret_volumes():
+    worker_configs = [_worker_config()]
+    volumes = [
+        kubernetes.core.v1.VolumeArgs(
+            name="certs",
+            secret=kubernetes.core.v1.SecretVolumeSourceArgs(secret_name="certs"),
+        )
+    ]
+    assert deployments_reading_secret(
+        "myapp", worker_configs, secret_name="certs", extra_volumes=volumes
+    ) == application_deployment_names("myapp", worker_configs)
+
+
+def test_deployments_reading_secret_rejects_a_secret_nothing_mounts():
+    with pytest.raises(ValueError, match="reads secret 'stray'"):
+        deployments_reading_secret(
+            "myapp",
+            secret_name="stray",  # pragma: allowlist secret
+            env_from_secret_names=["myapp-secret"],
+        )
+
+
+def test_deployments_reading_secret_restarts_pgbouncer_only_for_its_credentials():
+    pgbouncer_config = OLPgBouncerConfig(
+        db_host="myapp-db.example.rds.amazonaws.com",
+        db_name="myapp",
+        db_instance_class="db.m7g.large",
+        db_max_connections=900,
+        credentials_secret_name="myapp-db-creds",  # pragma: allowlist secret
+    )
+
+    def reading(secret_name, env_from_secret_names=("myapp-secret",)):
+        return deployments_reading_secret(
+            "myapp",
+            pgbouncer_config=pgbouncer_config,
+            secret_name=secret_name,
+            env_from_secret_names=env_from_secret_names,
+        )
+
+    assert reading("myapp-secret") == ["myapp-app"]
+    assert reading("myapp-db-creds") == [pgbouncer_deployment_name("myapp")]
+    assert reading("myapp-db-creds", ["myapp-db-creds"]) == [
+        "myapp-app",
+        pgbouncer_deployment_name("myapp"),
+    ]
+    # An Output cannot be compared before deployment; restart rather than miss.
+    assert reading(pulumi.Output.from_input("myapp-secret")) == [
+        "myapp-app",
+        pgbouncer_deployment_name("myapp"),
+    ]
+
+
 # ─── validate_no_duplicate_metrics_port ────────────────────────────────────────
 # Gap 1: extra_container_ports conflicts
 
@@ -2,7 +2,8 @@
 
 Covers the blocking_threads/backpressure resolution matrix (wsgi/asgi x
 None/explicit), the CLI defaults that track Granian's own, and the synth-time
-workers_max_rss derivation from the container memory limit.
+workers_max_rss derivation from the container memory limit, and tuning from a
+request profile.
 """
 
 from __future__ import annotations
@@ -16,6 +17,7 @@ from bridge.lib.magic_numbers import (
     DEFAULT_WSGI_BLOCKING_THREADS,
 )
 from ol_infrastructure.components.services.k8s import GranianConfig
+from ol_infrastructure.lib.granian_tuning import GranianRequestProfile
 
 
 def arg_value(args: list[str], flag: str) -> str | None:
@@ -162,3 +164,35 @@ def test_workers_max_rss_explicit_is_emitted_verbatim():
 def test_workers_max_rss_absent_when_unresolved():
     """The component resolves this at synth time; the model alone emits nothing."""
     assert "--workers-max-rss" not in GranianConfig().build_args()
+
+
+# ─── request_profile ──────────────────────────────────────────────────────────
+
+PROFILE = GranianRequestProfile(service_seconds=0.1, io_wait_fraction=0.7)
+
+
+def test_profile_defers_resolution_until_resources_are_known():
+    gc = GranianConfig(request_profile=PROFILE)
+    assert gc.blocking_threads is None
+    assert gc.backpressure is None
+
+
+def test_tuned_applies_the_profile_to_the_container_resources():
+    gc, tuning = GranianConfig(request_profile=PROFILE).tuned(
+        {"cpu": "2", "memory": "4Gi"}, {"memory": "4Gi"}
+    )
+    assert tuning is not None
+    args = gc.build_args()
+    assert arg_value(args, "--workers") == "2"
+    assert arg_value(args, "--blocking-threads") == "4"
+    assert arg_value(args, "--backpressure") == "8"
+
+
+def test_tuned_keeps_explicit_workers():
+    gc, _ = GranianConfig(request_profile=PROFILE, workers=1).tuned({"cpu": "2"}, {})
+    assert gc.workers == 1
+
+
+def test_tuned_is_a_no_op_without_a_profile():
+    gc = GranianConfig()
+    assert gc.tuned({"cpu": "2"}, {}) == (gc, None)
@@ -0,0 +1,244 @@
+"""Tests for the PgBouncer tier OLApplicationK8s provisions from pgbouncer_config.
+
+The sizing is the part that has gone wrong before: Dagster's pool held 4989 of
+5000 backends for 88 minutes because nothing bounded the aggregate. So the
+arithmetic, and the one-ceiling shape of the rendered ini, are asserted directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pulumi
+
+try:
+    asyncio.get_event_loop()
+except RuntimeError:
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+class K8sMocks(pulumi.runtime.Mocks):
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        return [args.name + "_id", args.inputs]
+
+    def call(self, args: pulumi.runtime.MockCallArgs):  # noqa: ARG002
+        return {}
+
+
+pulumi.runtime.set_mocks(K8sMocks())
+
+import pytest  # noqa: E402
+
+from ol_infrastructure.components.services.k8s import (  # noqa: E402
+    OLApplicationK8s,
+    OLApplicationK8sCeleryWorkerConfig,
+    OLApplicationK8sConfig,
+    application_deployment_names,
+)
+from ol_infrastructure.components.services.pgbouncer import (  # noqa: E402
+    OLPgBouncer,
+    OLPgBouncerConfig,
+    pgbouncer_pool_size,
+    render_pgbouncer_ini,
+)
+
+
+def _pgbouncer_config(**overrides: object) -> OLPgBouncerConfig:
+    defaults: dict[str, object] = {
+        "db_host": "myapp-db.example.rds.amazonaws.com",
+        "db_name": "myapp",
+        "db_instance_class": "db.m7g.large",
+        "db_max_connections": 900,
+        "credentials_secret_name": "myapp-db-creds",  # pragma: allowlist secret
+    }
+    return OLPgBouncerConfig.model_validate(defaults | overrides)
+
+
+def _app_config(**overrides: object) -> OLApplicationK8sConfig:
+    defaults: dict[str, object] = {
+        "application_name": "myapp",
+        "application_namespace": "myapp-ns",
+        "application_image_repository": "registry.example.com/myapp",
+        "application_docker_tag": "latest",
+        "application_security_group_id": pulumi.Output.from_input("sg-test"),
+        "application_security_group_name": pulumi.Output.from_input("myapp-sg"),
+        "application_lb_service_name": "myapp-service",
+        "application_lb_service_port_name": "http",
+        "application_config": {},
+        "env_from_secret_names": ["myapp-secret"],
+        "vault_k8s_resource_auth_name": "myapp-vault-auth",
+        "project_root": "/tmp/myapp",  # noqa: S108
+        "import_nginx_config": False,
+        "k8s_global_labels": {"ol.mit.edu/environment": "qa"},
+        "pgbouncer_config": _pgbouncer_config(),
+    }
+    return OLApplicationK8sConfig.model_validate(defaults | overrides)
+
+
+def _env(container: dict[str, Any]) -> dict[str, str | None]:
+    return {env["name"]: env.get("value") for env in container.get("env") or []}
+
+
+# ─── Sizing ───────────────────────────────────────────────────────────────────
+
+
+def test_pool_size_is_a_per_replica_share_of_the_headroom():
+    # 900 x 0.85 = 765 across 2 replicas
+    assert pgbouncer_pool_size(900, 0.85, 2) == 382
+
+
+def test_pool_size_aggregate_never_exceeds_the_budget():
+    for replicas in range(1, 12):
+        assert pgbouncer_pool_size(5000, 0.85, replicas) * replicas <= 4250
+
+
+def test_pool_size_refuses_a_zero_share():
+    with pytest.raises(ValueError, match="no backends"):
+        pgbouncer_pool_size(10, 0.5, 6)
+
+
+def test_explicit_max_connections_overrides_the_instance_class():
+    config = _pgbouncer_config(db_max_connections=400, replicas=4)
+    assert config.max_db_connections == 85
+
+
+# ─── Rendered ini ─────────────────────────────────────────────────────────────
+
+
+def _ini_settings(text: str) -> dict[str, str]:
+    return {
+        key.strip(): value.strip()
+        for key, value in (
+            line.split("=", 1)
+            for line in text.splitlines()
+            if " = " in line and not line.startswith("myapp")
+        )
+    }
+
+
+def test_ini_has_one_binding_ceiling():
+    settings = _ini_settings(render_pgbouncer_ini(_pgbouncer_config(), "db", 382))
+
+    assert settings["pool_mode"] == "transaction"
+    assert settings["default_pool_size"] == settings["max_db_connections"] == "382"
+    assert settings["reserve_pool_size"] == "0"
+    assert settings["query_wait_timeout"] != "0"
+
+
+def test_ini_leaves_credentials_for_the_init_container():
+    text = render_pgbouncer_ini(_pgbouncer_config(), "db.example", 382)
+
+    assert (
+        "myapp = host=db.example port=5432 dbname=myapp "
+        "user=${PGUSER} password=${PGPASSWORD}"
+    ) in text
+
+
+def test_ini_authenticates_clients_and_the_exporter():
+    settings = _ini_settings(render_pgbouncer_ini(_pgbouncer_config(), "db", 382))
+
+    assert settings["auth_type"] == "scram-sha-256"
+    assert settings["auth_file"] == "/etc/pgbouncer/userlist.txt"
+    assert settings["stats_users"] == "${PGUSER}"
+
+
+def test_min_pool_size_is_clamped_to_the_cap():
+    settings = _ini_settings(
+        render_pgbouncer_ini(_pgbouncer_config(min_pool_size=50), "db", 20)
+    )
+    assert settings["min_pool_size"] == "20"
+
+
+# ─── OLApplicationK8s wiring ──────────────────────────────────────────────────
+
+
+@pulumi.runtime.test
+def test_webapp_connects_through_pgbouncer_and_migrations_do_not():
+    app = OLApplicationK8s(_app_config(application_name="pooled"))
+
+    def check(spec: dict[str, Any]) -> None:
+        (app_container,) = [c for c in spec["containers"] if c["name"] == "pooled-app"]
+        (migrate,) = [c for c in spec["init_containers"] if c["name"] == "migrate"]
+        env = _env(app_container)
+        assert env["DATABASE_URL"] == (
+            "postgres://$(OL_PGBOUNCER_USER):$(OL_PGBOUNCER_PASSWORD)"
+            "@pooled-pgbouncer.myapp-ns.svc.cluster.local:5432/myapp"
+        )
+        # Declared before the URL, or Kubernetes leaves $(VAR) unexpanded.
+        names = list(env)
+        assert names.index("OL_PGBOUNCER_PASSWORD") < names.index("DATABASE_URL")
+        assert "DATABASE_URL" not in _env(migrate)
+
+    return app.application_deployment.spec.template.spec.apply(check)
+
+
+@pulumi.runtime.test
+def test_celery_workers_connect_through_pgbouncer():
+    app = OLApplicationK8s(
+        _app_config(
+            application_name="pooled-celery",
+            celery_worker_configs=[
+                OLApplicationK8sCeleryWorkerConfig(
+                    queue_name="default",
+                    redis_host=pulumi.Output.from_input("redis.example"),
+                    redis_password="not-a-secret",  # pragma: allowlist secret
+                )
+            ],
+            pgbouncer_config=_pgbouncer_config(database_url_env_var="APP_DB_URL"),
+        )
+    )
+    (worker,) = app.celery_deployments
+
+    def check(containers: list[dict[str, Any]]) -> None:
+        database_url = _env(containers[0])["APP_DB_URL"]
+        assert database_url is not None
+        assert "pooled-celery-pgbouncer" in database_url
+
+    return worker.spec.template.spec.containers.apply(check)
+
+
+@pulumi.runtime.test
+def test_pgbouncer_deployment_never_surges_and_shares_the_app_security_group():
+    app = OLApplicationK8s(_app_config(application_name="surge"))
+    assert app.pgbouncer is not None
+    assert app.pgbouncer.max_db_connections == 382
+
+    def check(spec: dict[str, Any]) -> None:
+        assert spec["replicas"] == 2
+        assert spec["strategy"]["rolling_update"]["max_surge"] == 0
+        assert spec["selector"]["match_labels"] == {
+            "ol.mit.edu/application": "surge",
+            "ol.mit.edu/component": "pgbouncer",
+        }
+        labels = spec["template"]["metadata"]["labels"]
+        assert labels["ol.mit.edu/pod-security-group"] == "myapp-sg"
+        assert (
+            "checksum/ol-pgbouncer-config"
+            in (spec["template"]["metadata"]["annotations"])
+        )
+
+    return app.pgbouncer.deployment.spec.apply(check)
+
+
+def test_pgbouncer_needs_to_know_where_it_runs():
+    with pytest.raises(ValueError, match="application_name and namespace"):
+        OLPgBouncer("unplaced", _pgbouncer_config())
+
+
+def test_no_pgbouncer_unless_configured():
+    app = OLApplicationK8s(
+        _app_config(application_name="direct", pgbouncer_config=None)
+    )
+    assert app.pgbouncer is None
+    assert app.all_deployment_names == ["direct-app"]
+
+
+def test_deployment_names_include_pgbouncer_for_restart_targets():
+    app = OLApplicationK8s(_app_config(application_name="rotating"))
+
+    assert app.all_deployment_names == ["rotating-app", "rotating-pgbouncer"]
+    assert (
+        application_deployment_names("rotating", with_pgbouncer=True)
+        == app.all_deployment_names
+    )
@@ -0,0 +1,45 @@
+"""Run every Grafana alert rule through the offline rule harness."""
+
+from pathlib import Path
+
+import pytest
+
+from ol_infrastructure.lib.rule_harness.evaluator import Evaluator
+from ol_infrastructure.lib.rule_harness.rules import (
+    collect_alert_rules,
+    load_cases,
+    rule_cost,
+    run_case,
+)
+
+CASES_FILE = Path(__file__).parent / "alert_rule_cases.yaml"
+RULES = collect_alert_rules()
+RULES_BY_NAME = {rule.name: rule for rule in RULES}
+
+
+def test_rule_names_are_unique():
+    assert len(RULES_BY_NAME) == len(RULES)
+
+
+@pytest.mark.parametrize("rule", RULES, ids=lambda rule: rule.name)
+def test_rule_evaluates(rule):
+    # Parses, and evaluates without error against no data at all -- which is
+    # what every rule sees on a stack its environment filter excludes.
+    Evaluator().evaluate(rule.node, 3600, logql=rule.logql)
+
+
+@pytest.mark.parametrize("rule", RULES, ids=lambda rule: rule.name)
+def test_rule_query_cost_is_within_budget(rule):
+    assert rule_cost(rule).problems() == []
+
+
+@pytest.mark.parametrize(
+    "case", load_cases(CASES_FILE), ids=lambda case: f"{case.rule}: {case.name}"
+)
+def test_rule_case(case):
+    failures = [
+        result.describe()
+        for result in run_case(case, RULES_BY_NAME, CASES_FILE.parent)
+        if not result.passed
+    ]
+    assert failures == []
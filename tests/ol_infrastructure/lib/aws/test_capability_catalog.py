@@ -0,0 +1,146 @@
+"""Config validation reads the checked-in AWS capability catalog, not the AWS APIs.
+
+A preview with no AWS credentials must still validate engines, versions and
+instance types, so by default none of these helpers may reach a boto3 client --
+given a generated catalog. A hand-seeded one only answers what it lists.
+"""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from ol_infrastructure.lib.aws import (
+    capability_catalog,
+    ec2_helper,
+    elasticache_helper,
+    rds_helper,
+)
+from ol_infrastructure.lib.aws.capability_catalog import (
+    CATALOG_FILE,
+    LIVE_LOOKUPS_ENV_VAR,
+    AWSCapabilityCatalog,
+    load_catalog,
+)
+
+CACHED_HELPERS = (
+    rds_helper.db_engines,
+    rds_helper.max_minor_version,
+    rds_helper.parameter_group_family,
+    elasticache_helper.cache_engines,
+    elasticache_helper.parameter_group_family,
+    ec2_helper._describe_instance_type,
+)
+
+
+def _no_aws(*_, **__):
+    msg = "validation called AWS"
+    raise AssertionError(msg)
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.delenv(LIVE_LOOKUPS_ENV_VAR, raising=False)
+    for client in (rds_helper.rds_client, elasticache_helper.cache_client):
+        monkeypatch.setattr(client, "get_paginator", _no_aws)
+    monkeypatch.setattr(rds_helper.rds_client, "describe_db_engine_versions", _no_aws)
+    monkeypatch.setattr(
+        elasticache_helper.cache_client, "describe_cache_engine_versions", _no_aws
+    )
+    monkeypatch.setattr(ec2_helper.ec2_client, "describe_instance_types", _no_aws)
+    for helper in CACHED_HELPERS:
+        helper.cache_clear()
+    yield
+    for helper in CACHED_HELPERS:
+        helper.cache_clear()
+
+
+def _use_catalog(monkeypatch, catalog: AWSCapabilityCatalog) -> None:
+    for module in (capability_catalog, rds_helper, elasticache_helper, ec2_helper):
+        monkeypatch.setattr(module, "load_catalog", lambda: catalog)
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Use the checked-in catalog as if the refresh script had written it."""
+    _use_catalog(
+        monkeypatch,
+        load_catalog().model_copy(
+            update={"generated_at": datetime(2026, 1, 1, tzinfo=UTC)}
+        ),
+    )
+
+
+def test_checked_in_catalog_is_rendered_canonically():
+    """A refresh rewrites the file with render(); hand edits must match it."""
+    assert CATALOG_FILE.read_text() == load_catalog().render()
+
+
+def test_checked_in_catalog_does_not_claim_to_be_generated():
+    """It was seeded by hand; only the refresh script may stamp generated_at."""
+    assert not load_catalog().complete
+
+
+@pytest.mark.usefixtures("generated")
+def test_rds_lookups_read_the_catalog():
+    assert "postgres" in rds_helper.db_engines()
+    assert rds_helper.max_minor_version("postgres", 18).startswith("18.")
+    assert rds_helper.parameter_group_family("postgres", "18.1") == "postgres18"
+
+
+@pytest.mark.usefixtures("generated")
+def test_cache_lookups_read_the_catalog():
+    assert "7.2" in elasticache_helper.cache_engines()["valkey"]
+    assert elasticache_helper.parameter_group_family("valkey", "7.2") == "valkey7"
+
+
+@pytest.mark.usefixtures("generated")
+def test_instance_types_read_the_catalog():
+    assert ec2_helper.is_valid_instance_type("m7a.large")
+    assert not ec2_helper.is_valid_instance_type("m7a.enormous")
+    assert ec2_helper.InstanceTypes.dereference("general_purpose_large") == "m7a.large"
+
+
+def test_every_instance_types_member_is_catalogued():
+    catalog = load_catalog()
+    missing = [
+        t.value for t in ec2_helper.InstanceTypes if t not in catalog.instance_types
+    ]
+    assert missing == []
+
+
+@pytest.mark.parametrize(
+    ("engine", "version", "family"),
+    [
+        # A live instance a minor version ahead of the catalog.
+        ("postgres", "18.9", "postgres18"),
+        ("mariadb", "11.8.99", "mariadb11.8"),
+    ],
+)
+def test_uncatalogued_minor_version_uses_its_release_family(engine, version, family):
+    assert rds_helper.parameter_group_family(engine, version) == family
+
+
+def test_unknown_release_names_the_remedy():
+    with pytest.raises(ValueError, match="refresh-aws-capability-catalog"):
+        rds_helper.parameter_group_family("postgres", "99.1")
+
+
+def test_seeded_catalog_leaves_version_listings_to_aws():
+    """A partial version list would make max_minor_version pick a stale minor."""
+    with pytest.raises(AssertionError, match="called AWS"):
+        rds_helper.max_minor_version("postgres", 18)
+    with pytest.raises(AssertionError, match="called AWS"):
+        elasticache_helper.cache_engines()
+
+
+def test_seeded_catalog_answers_what_it_lists_and_asks_about_the_rest():
+    assert ec2_helper.instance_type_spec("m7g.large").memory_mib == 8192
+    with pytest.raises(AssertionError, match="called AWS"):
+        ec2_helper.is_valid_instance_type("m7a.enormous")
+
+
+def test_live_lookups_are_opt_in(monkeypatch):
+    monkeypatch.setenv(LIVE_LOOKUPS_ENV_VAR, "1")
+    assert capability_catalog.live_lookups_enabled()
+    with pytest.raises(AssertionError, match="called AWS"):
+        ec2_helper.is_valid_instance_type("m7a.large")
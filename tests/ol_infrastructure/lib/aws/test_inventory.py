@@ -0,0 +1,203 @@
+"""The inventory engine must see every page, every region, and admit what it missed.
+
+The reports it replaced each read one page from one region and called that the
+estate. The cases here pin the three ways that went wrong: truncation, region
+coverage, and a failed call that looked like an empty collection.
+"""
+
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from botocore.exceptions import ClientError
+
+from ol_infrastructure.lib.aws import inventory
+
+
+class FakePaginator:
+    def __init__(self, pages: list[dict[str, Any]], calls: list[Any], op: str):
+        self.pages = pages
+        self.calls = calls
+        self.op = op
+
+    def paginate(self, **params: Any):
+        self.calls.append((self.op, params))
+        yield from self.pages
+
+
+class FakeClient:
+    """Serve canned pages per operation; a callable response is invoked per call."""
+
+    def __init__(self, responses: dict[str, Any]):
+        self.responses = responses
+        self.calls: list[Any] = []
+
+    def can_paginate(self, operation: str) -> bool:
+        return isinstance(self.responses.get(operation), list)
+
+    def get_paginator(self, operation: str) -> FakePaginator:
+        return FakePaginator(self.responses[operation], self.calls, operation)
+
+    def __getattr__(self, operation: str):
+        def call(**params: Any) -> Any:
+            self.calls.append((operation, params))
+            response = self.responses[operation]
+            if isinstance(response, Exception):
+                raise response
+            return response(**params) if callable(response) else response
+
+        return call
+
+
+class FakeSession(inventory.BotoSession):
+    def __init__(self, clients: dict[tuple[str, str], FakeClient]):
+        self.clients = clients
+
+    def client(
+        self, service_name: str, region_name: str | None = None, **_: Any
+    ) -> FakeClient:
+        if service_name == "sts":
+            return FakeClient({"get_caller_identity": {"Account": "123456789012"}})
+        assert region_name is not None, f"{service_name} client built without a region"
+        return self.clients[region_name, service_name]
+
+
+def _sg(group_id: str) -> dict[str, Any]:
+    return {"GroupId": group_id, "GroupName": group_id, "VpcId": "vpc-1"}
+
+
+def test_every_page_of_every_region_is_collected():
+    session = FakeSession(
+        {
+            ("us-east-1", "ec2"): FakeClient(
+                {
+                    "describe_security_groups": [
+                        {"SecurityGroups": [_sg("sg-1"), _sg("sg-2")]},
+                        {"SecurityGroups": [_sg("sg-3")]},
+                    ]
+                }
+            ),
+            ("us-west-2", "ec2"): FakeClient(
+                {"describe_security_groups": [{"SecurityGroups": [_sg("sg-4")]}]}
+            ),
+        }
+    )
+
+    snapshot = inventory.collect(
+        ["us-east-1", "us-west-2"], ["security_groups"], session=session
+    )
+
+    assert [sg["GroupId"] for sg in snapshot.items("security_groups")] == [
+        "sg-1",
+        "sg-2",
+        "sg-3",
+        "sg-4",
+    ]
+    assert {sg["_region"] for sg in snapshot.items("security_groups")} == {
+        "us-east-1",
+        "us-west-2",
+    }
+    assert [
+        sg["GroupId"] for sg in snapshot.items("security_groups", region="us-west-2")
+    ] == ["sg-4"]
+    assert snapshot.account_id == "123456789012"
+    assert snapshot.errors == []
+
+
+def test_nested_and_detail_collections_are_expanded():
+    ec2 = FakeClient(
+        {
+            "describe_instances": [
+                {"Reservations": [{"Instances": [{"InstanceId": "i-1"}]}]},
+                {"Reservations": [{"Instances": [{"InstanceId": "i-2"}]}]},
+            ],
+            "describe_launch_templates": [
+                {"LaunchTemplates": [{"LaunchTemplateId": "lt-1"}]}
+            ],
+            "describe_launch_template_versions": [
+                {"LaunchTemplateVersions": [{"VersionNumber": 1}, {"VersionNumber": 2}]}
+            ],
+        }
+    )
+    eks = FakeClient(
+        {
+            "list_clusters": [{"clusters": ["operations"]}],
+            "describe_cluster": lambda name: {"cluster": {"name": name}},
+        }
+    )
+    session = FakeSession({("us-east-1", "ec2"): ec2, ("us-east-1", "eks"): eks})
+
+    snapshot = inventory.collect(
+        ["us-east-1"],
+        ["instances", "launch_template_versions", "eks_clusters"],
+        session=session,
+    )
+
+    assert [i["InstanceId"] for i in snapshot.items("instances")] == ["i-1", "i-2"]
+    assert len(list(snapshot.items("launch_template_versions"))) == 2
+    assert (
+        "describe_launch_template_versions",
+        {"LaunchTemplateId": "lt-1"},
+    ) in ec2.calls
+    assert [c["name"] for c in snapshot.items("eks_clusters")] == ["operations"]
+
+
+def test_unpaginated_operations_fall_back_to_one_call():
+    ec2 = FakeClient({"describe_addresses": {"Addresses": [{"PublicIp": "1.2.3.4"}]}})
+    session = FakeSession({("us-east-1", "ec2"): ec2})
+
+    snapshot = inventory.collect(["us-east-1"], ["addresses"], session=session)
+
+    assert [a["PublicIp"] for a in snapshot.items("addresses")] == ["1.2.3.4"]
+
+
+def test_failed_collection_is_an_error_not_an_empty_list():
+    denied = ClientError(
+        {"Error": {"Code": "AccessDenied", "Message": "no"}}, "DescribeDBInstances"
+    )
+    session = FakeSession(
+        {("us-east-1", "rds"): FakeClient({"describe_db_instances": denied})}
+    )
+
+    snapshot = inventory.collect(["us-east-1"], ["db_instances"], session=session)
+
+    assert "db_instances" not in snapshot.resources["us-east-1"]
+    assert not snapshot.is_complete("db_instances")
+    assert snapshot.is_complete("security_groups")
+    assert snapshot.errors[0]["collection"] == "db_instances"
+
+
+def test_unknown_collection_is_rejected():
+    with pytest.raises(ValueError, match="unknown collections"):
+        inventory.collect(["us-east-1"], ["nope"], session=FakeSession({}))
+
+
+@pytest.mark.parametrize("suffix", [".json", ".json.gz"])
+def test_snapshot_round_trips_and_live_values_match_loaded(tmp_path, suffix):
+    created = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+    ec2 = FakeClient(
+        {
+            "describe_volumes": [
+                {"Volumes": [{"VolumeId": "vol-1", "CreateTime": created}]}
+            ]
+        }
+    )
+    live = inventory.collect(
+        ["us-east-1"], ["volumes"], session=FakeSession({("us-east-1", "ec2"): ec2})
+    )
+    path = tmp_path / f"inventory{suffix}"
+
+    live.save(path)
+    loaded = inventory.Snapshot.load(path)
+
+    assert loaded == live
+    assert next(loaded.items("volumes"))["CreateTime"] == created.isoformat()
+    assert inventory.parse_timestamp(created.isoformat()) == created
+
+
+def test_snapshot_from_another_version_is_rejected(tmp_path):
+    path = tmp_path / "inventory.json"
+    path.write_text('{"version": 0}')
+
+    with pytest.raises(ValueError, match="Re-collect"):
+        inventory.Snapshot.load(path)
@@ -11,7 +11,8 @@ import re
 import pytest
 from botocore.exceptions import ClientError
 
-from ol_infrastructure.lib.aws import rds_helper
+from ol_infrastructure.lib.aws import ec2_helper, rds_helper
+from ol_infrastructure.lib.aws.capability_catalog import LIVE_LOOKUPS_ENV_VAR
 
 
 @pytest.fixture
@@ -60,28 +61,32 @@ class TestPostgresMaxConnections:
 
     Overstating it silently overcommits the pool against the database -- the failure
     mode that took Dagster down on 2026-08-10 -- so the arithmetic is worth pinning.
+    Instance memory comes from the capability catalog, so none of this calls EC2
+    unless the class is missing from it.
     """
 
-    @staticmethod
-    def _stub_ec2(monkeypatch, size_mib: int):
-        """Stand in for a successful EC2 ``describe_instance_types``."""
+    @pytest.fixture(autouse=True)
+    def _offline(self, monkeypatch):
+        monkeypatch.delenv(LIVE_LOOKUPS_ENV_VAR, raising=False)
         monkeypatch.setattr(
-            rds_helper.ec2_client,
-            "describe_instance_types",
-            lambda **_: {"InstanceTypes": [{"MemoryInfo": {"SizeInMiB": size_mib}}]},
+            ec2_helper.ec2_client, "describe_instance_types", self._no_ec2
         )
-        # The function is lru_cached, so each case needs a clean slate.
+        # Both lookups are lru_cached, so each case needs a clean slate.
         rds_helper.postgres_max_connections.cache_clear()
+        ec2_helper._describe_instance_type.cache_clear()
+
+    @staticmethod
+    def _no_ec2(**_):
+        msg = "postgres_max_connections called EC2"
+        raise AssertionError(msg)
 
-    def test_below_the_cap_divides_instance_memory(self, monkeypatch):
+    def test_below_the_cap_divides_instance_memory(self):
         # db.m7g.large, 8 GiB: 8589934592 / 9531392 = 901
-        self._stub_ec2(monkeypatch, 8192)
         assert rds_helper.postgres_max_connections("db.m7g.large") == 901
 
-    def test_large_classes_are_held_at_the_cap(self, monkeypatch):
+    def test_large_classes_are_held_at_the_cap(self):
         # db.r7g.2xlarge, 64 GiB, computes 7210 before the LEAST(). Verified against
         # ol-etl-db-production, where SHOW max_connections returns 5000.
-        self._stub_ec2(monkeypatch, 65536)
         assert rds_helper.postgres_max_connections("db.r7g.2xlarge") == 5000
 
     def test_the_db_prefix_is_stripped_for_ec2(self, monkeypatch):
@@ -89,11 +94,15 @@ class TestPostgresMaxConnections:
 
         def _record(**kwargs):
             queried.update(kwargs)
-            return {"InstanceTypes": [{"MemoryInfo": {"SizeInMiB": 4096}}]}
-
-        monkeypatch.setattr(rds_helper.ec2_client, "describe_instance_types", _record)
-        rds_helper.postgres_max_connections.cache_clear()
-        rds_helper.postgres_max_connections("db.t4g.medium")
+            return {
+                "InstanceTypes": [
+                    {"VCpuInfo": {"DefaultVCpus": 2}, "MemoryInfo": {"SizeInMiB": 4096}}
+                ]
+            }
+
+        monkeypatch.setenv(LIVE_LOOKUPS_ENV_VAR, "1")
+        monkeypatch.setattr(ec2_helper.ec2_client, "describe_instance_types", _record)
+        assert rds_helper.postgres_max_connections("db.t4g.medium") == 450
         assert queried["InstanceTypes"] == ["t4g.medium"]
 
     def test_unknown_instance_class_names_the_bad_value(self, monkeypatch):
@@ -114,7 +123,6 @@ class TestPostgresMaxConnections:
                 "DescribeInstanceTypes",
             )
 
-        monkeypatch.setattr(rds_helper.ec2_client, "describe_instance_types", _raise)
-        rds_helper.postgres_max_connections.cache_clear()
+        monkeypatch.setattr(ec2_helper.ec2_client, "describe_instance_types", _raise)
         with pytest.raises(ValueError, match=re.escape("db.nonexistent.xlarge")):
             rds_helper.postgres_max_connections("db.nonexistent.xlarge")
@@ -0,0 +1,172 @@
+"""Every way a security group can be held must count as holding it.
+
+The index feeds reports of groups to delete, so the costly mistake is a MISSED
+reference: a group reported unused while a load balancer or another group's rule
+still depends on it. Each case below is one reference path the old hand-built
+`active_groups` set did not follow.
+"""
+
+from typing import Any
+
+import pytest
+
+from ol_infrastructure.lib.aws.inventory import Snapshot
+from ol_infrastructure.lib.aws.security_group_index import (
+    REFERENCE_COLLECTIONS,
+    SecurityGroupIndex,
+)
+
+REGION = "us-east-1"
+
+
+def _sg(
+    group_id: str, *, ingress_from: tuple[str, ...] = (), **extra: Any
+) -> dict[str, Any]:
+    return {
+        "GroupId": group_id,
+        "GroupName": extra.pop("GroupName", group_id),
+        "VpcId": extra.pop("VpcId", "vpc-1"),
+        "IpPermissions": [
+            {"UserIdGroupPairs": [{"GroupId": source} for source in ingress_from]}
+        ],
+        "IpPermissionsEgress": [],
+        **extra,
+    }
+
+
+def _snapshot(**collections: list[dict[str, Any]]) -> Snapshot:
+    resources: dict[str, list[dict[str, Any]]] = {
+        name: [] for name in REFERENCE_COLLECTIONS
+    }
+    for name, items in collections.items():
+        resources[name] = [{**item, "_region": REGION} for item in items]
+    return Snapshot(
+        taken_at="2026-10-01T00:00:00+00:00",
+        account_id="123456789012",
+        regions=[REGION],
+        resources={REGION: resources},
+    )
+
+
+@pytest.mark.parametrize(
+    ("collection", "item", "kind"),
+    [
+        (
+            "instances",
+            {"InstanceId": "i-1", "SecurityGroups": [{"GroupId": "sg-a"}]},
+            "instance",
+        ),
+        (
+            "load_balancers",
+            {"LoadBalancerName": "lb", "SecurityGroups": ["sg-a"]},
+            "load-balancer",
+        ),
+        (
+            "launch_template_versions",
+            {
+                "LaunchTemplateId": "lt-1",
+                "LaunchTemplateData": {"NetworkInterfaces": [{"Groups": ["sg-a"]}]},
+            },
+            "launch-template",
+        ),
+        (
+            "eks_clusters",
+            {
+                "name": "operations",
+                "resourcesVpcConfig": {"clusterSecurityGroupId": "sg-a"},
+            },
+            "eks",
+        ),
+        (
+            "lambda_functions",
+            {"FunctionName": "fn", "VpcConfig": {"SecurityGroupIds": ["sg-a"]}},
+            "lambda",
+        ),
+        (
+            "vpc_endpoints",
+            {"VpcEndpointId": "vpce-1", "Groups": [{"GroupId": "sg-a"}]},
+            "vpc-endpoint",
+        ),
+        (
+            "db_instances",
+            {
+                "DBInstanceIdentifier": "db",
+                "VpcSecurityGroups": [{"VpcSecurityGroupId": "sg-a"}],
+            },
+            "rds",
+        ),
+    ],
+)
+def test_each_resource_type_counts_as_a_reference(collection, item, kind):
+    index = SecurityGroupIndex.from_snapshot(
+        _snapshot(security_groups=[_sg("sg-a")], **{collection: [item]})
+    )
+
+    assert {ref.kind for ref in index.references("sg-a")} == {kind}
+    assert index.unused() == set()
+
+
+def test_rule_reference_from_an_in_use_group_keeps_the_target():
+    index = SecurityGroupIndex.from_snapshot(
+        _snapshot(
+            security_groups=[_sg("sg-web", ingress_from=("sg-lb",)), _sg("sg-lb")],
+            instances=[
+                {"InstanceId": "i-1", "SecurityGroups": [{"GroupId": "sg-web"}]}
+            ],
+        )
+    )
+
+    (reference,) = index.references("sg-lb")
+    assert (reference.kind, reference.resource_id, reference.detail) == (
+        "sg-rule",
+        "sg-web",
+        "ingress",
+    )
+    assert index.unused() == set()
+
+
+def test_groups_referencing_only_each_other_are_both_unused():
+    index = SecurityGroupIndex.from_snapshot(
+        _snapshot(
+            security_groups=[
+                _sg("sg-a", ingress_from=("sg-b",)),
+                _sg("sg-b", ingress_from=("sg-a",)),
+            ]
+        )
+    )
+
+    assert index.unused() == {"sg-a", "sg-b"}
+
+
+def test_default_groups_are_never_reported():
+    index = SecurityGroupIndex.from_snapshot(
+        _snapshot(security_groups=[_sg("sg-d", GroupName="default")])
+    )
+
+    assert index.unused() == set()
+
+
+def test_lookup_by_vpc_and_tag():
+    index = SecurityGroupIndex.from_snapshot(
+        _snapshot(
+            security_groups=[
+                _sg("sg-a", Tags=[{"Key": "Name", "Value": "web"}]),
+                _sg("sg-b", VpcId="vpc-2", Tags=[{"Key": "Name", "Value": "db"}]),
+            ]
+        )
+    )
+
+    assert index.groups_in_vpc("vpc-2") == {"sg-b"}
+    assert index.groups_with_tag("Name", "web") == {"sg-a"}
+    assert index.groups_with_tag("Name") == {"sg-a", "sg-b"}
+
+
+def test_incomplete_snapshot_is_refused():
+    snapshot = _snapshot(security_groups=[_sg("sg-a")])
+    del snapshot.resources[REGION]["load_balancers"]
+    snapshot.errors.append(
+        {"region": REGION, "collection": "load_balancers", "error": "denied"}
+    )
+
+    with pytest.raises(ValueError, match="load_balancers"):
+        SecurityGroupIndex.from_snapshot(snapshot)
@@ -0,0 +1,228 @@
+"""Tests for the per-database connection budget and its derivation from app configs.
+
+Budgets here pin ``max_connections`` unless the instance class itself is under
+test, which resolves from the capability catalog and never calls EC2.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pulumi
+
+try:
+    asyncio.get_event_loop()
+except RuntimeError:
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+class K8sMocks(pulumi.runtime.Mocks):
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        return [args.name + "_id", args.inputs]
+
+    def call(self, args: pulumi.runtime.MockCallArgs):  # noqa: ARG002
+        return {}
+
+
+pulumi.runtime.set_mocks(K8sMocks())
+
+import pytest  # noqa: E402
+
+from ol_infrastructure.components.services.k8s import (  # noqa: E402
+    CELERY_WORKER_CONCURRENCY,
+    GranianConfig,
+    OLApplicationK8sCeleryBeatConfig,
+    OLApplicationK8sCeleryWorkerConfig,
+    OLApplicationK8sConfig,
+    OLApplicationK8sScheduledJobConfig,
+)
+from ol_infrastructure.components.services.pgbouncer import (  # noqa: E402
+    OLPgBouncerConfig,
+)
+from ol_infrastructure.lib.aws import ec2_helper  # noqa: E402
+from ol_infrastructure.lib.connection_budget import (  # noqa: E402
+    DEFAULT_HEADROOM_FACTOR,
+    ConnectionBudgetExceededError,
+    ConnectionConsumer,
+    DatabaseBudget,
+    budgets_from_outputs,
+    consumers_from_application,
+    merge_budgets,
+    uwsgi_connections_per_pod,
+)
+
+
+def _app_config(tmp_path, **overrides) -> OLApplicationK8sConfig:
+    defaults = {
+        "application_name": "myapp",
+        "application_namespace": "myapp-ns",
+        "application_image_repository": "registry.example.com/myapp",
+        "application_docker_tag": "latest",
+        "application_security_group_id": pulumi.Output.from_input("sg-test"),
+        "application_security_group_name": pulumi.Output.from_input("myapp-sg"),
+        "application_lb_service_name": "myapp-service",
+        "application_lb_service_port_name": "http",
+        "application_config": {},
+        "env_from_secret_names": ["myapp-secret"],
+        "vault_k8s_resource_auth_name": "myapp-vault-auth",
+        "project_root": tmp_path,
+        "import_nginx_config": False,
+        "k8s_global_labels": {"ol.mit.edu/environment": "qa"},
+        "application_max_replicas": 10,
+        "granian_config": GranianConfig(workers=2, blocking_threads=32),
+    }
+    defaults.update(overrides)
+    return OLApplicationK8sConfig(**defaults)
+
+
+def _worker(queue_name: str, max_replicas: int = 10):
+    return OLApplicationK8sCeleryWorkerConfig(
+        queue_name=queue_name,
+        max_replicas=max_replicas,
+        redis_host=pulumi.Output.from_input("redis.example"),
+        redis_password="not-a-secret",  # pragma: allowlist secret
+    )
+
+
+def _budget(
+    *consumers: ConnectionConsumer,
+    database: str = "myapp-db",
+    headroom_factor: float = DEFAULT_HEADROOM_FACTOR,
+) -> DatabaseBudget:
+    return DatabaseBudget(
+        database=database,
+        instance_class="db.m7g.large",
+        consumers=list(consumers),
+        max_connections=900,
+        headroom_factor=headroom_factor,
+    )
+
+
+# ─── Budget arithmetic ────────────────────────────────────────────────────────
+
+
+def test_demand_is_every_consumer_at_max_replicas():
+    budget = _budget(
+        ConnectionConsumer("web", 10, 64), ConnectionConsumer("worker", 10, 2)
+    )
+    assert budget.demand == 660
+    assert budget.budget == 810
+    assert budget.overcommit == -150
+
+
+def test_check_raises_when_overcommitted():
+    budget = _budget(ConnectionConsumer("web", 10, 100, "uwsgi processes x threads"))
+    with pytest.raises(ConnectionBudgetExceededError, match="OVERCOMMITTED by 190"):
+        budget.check()
+
+
+def test_check_only_warns_when_not_enforced():
+    budget = _budget(ConnectionConsumer("web", 10, 100))
+    assert budget.check(enforce=False) is budget
+
+
+def test_max_connections_comes_from_the_catalog(monkeypatch):
+    def no_ec2(**_):
+        msg = "DatabaseBudget called EC2"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(ec2_helper.ec2_client, "describe_instance_types", no_ec2)
+    # db.t4g.small, 2 GiB: 2147483648 / 9531392 = 225
+    budget = DatabaseBudget(database="ci-db", instance_class="db.t4g.small")
+    assert budget.max_connections == 225
+
+
+def test_round_trips_through_a_stack_output():
+    budget = _budget(ConnectionConsumer("web", 10, 64, "granian 2x32"))
+    assert DatabaseBudget.from_dict(budget.to_dict()) == budget
+
+
+def test_each_database_keeps_its_own_stack_output(monkeypatch):
+    exported: dict[str, object] = {}
+    monkeypatch.setattr(pulumi, "export", exported.__setitem__)
+    first = _budget(ConnectionConsumer("web", 10, 64)).check()
+    second = _budget(ConnectionConsumer("etl", 2, 10), database="etl-db").check()
+
+    assert set(exported) == {
+        "database_connection_budgets.myapp-db",
+        "database_connection_budgets.etl-db",
+    }
+    outputs = {**exported, "unrelated_output": "x"}
+    assert budgets_from_outputs(outputs) == [first, second]
+
+
+def test_merge_sums_stacks_sharing_a_database():
+    merged = merge_budgets(
+        [
+            _budget(ConnectionConsumer("web", 10, 50)),
+            _budget(ConnectionConsumer("etl", 4, 100), headroom_factor=0.8),
+            _budget(ConnectionConsumer("web", 10, 50)),  # the same stack read twice
+            _budget(database="other-db"),
+        ]
+    )
+    assert [budget.database for budget in merged] == ["myapp-db", "other-db"]
+    assert merged[0].demand == 900
+    assert merged[0].budget == 720
+
+
+# ─── Consumers from an OLApplicationK8sConfig ─────────────────────────────────
+
+
+def test_granian_webapp_workers_and_beat(tmp_path):
+    config = _app_config(
+        tmp_path,
+        celery_worker_configs=[_worker("celery"), _worker("hubspot_sync", 4)],
+        celery_beat_config=OLApplicationK8sCeleryBeatConfig(),
+        scheduled_jobs=[
+            OLApplicationK8sScheduledJobConfig(
+                name="cleanup", schedule="0 * * * *", command=["cleanup"]
+            )
+        ],
+    )
+    consumers = {c.name: c.worst_case for c in consumers_from_application(config)}
+    assert consumers == {
+        "myapp-app": 640,
+        "myapp-celery-celery-worker": 10 * CELERY_WORKER_CONCURRENCY,
+        "myapp-hubspot-sync-celery-worker": 4 * CELERY_WORKER_CONCURRENCY,
+        "myapp-celery-beat": 1,
+        "myapp-cleanup": 1,
+    }
+
+
+def test_uwsgi_webapp_reads_processes_and_threads(tmp_path):
+    tmp_path.joinpath("files").mkdir()
+    tmp_path.joinpath("files/uwsgi.ini").write_text(
+        "[uwsgi]\nprocesses = 2\nsocket = :$(PORT)\nthreads = 50\nthunder-lock =\n"
+    )
+    config = _app_config(tmp_path, granian_config=None, import_uwsgi_config=True)
+    (webapp,) = consumers_from_application(config)
+    assert webapp.connections_per_replica == 100
+
+
+def test_uwsgi_defaults_to_one_process_and_thread():
+    assert uwsgi_connections_per_pod("[uwsgi]\nmaster = true\n") == 1
+
+
+def test_asgi_webapp_needs_an_explicit_figure(tmp_path):
+    config = _app_config(tmp_path, granian_config=GranianConfig(interface="asgi"))
+    with pytest.raises(ValueError, match="connections_per_pod"):
+        consumers_from_application(config)
+    (webapp,) = consumers_from_application(config, connections_per_pod=20)
+    assert webapp.worst_case == 200
+
+
+def test_pgbouncer_replaces_the_processes_it_pools(tmp_path):
+    config = _app_config(
+        tmp_path,
+        celery_worker_configs=[_worker("celery")],
+        pgbouncer_config=OLPgBouncerConfig(
+            db_host="myapp-db.example",
+            db_name="myapp",
+            db_instance_class="db.m7g.large",
+            db_max_connections=900,
+            credentials_secret_name="myapp-db-creds",  # pragma: allowlist secret
+        ),
+    )
+    (pool,) = consumers_from_application(config)
+    assert pool.name == "myapp-pgbouncer"
+    assert pool.worst_case == 2 * 382
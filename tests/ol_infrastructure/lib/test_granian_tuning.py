@@ -0,0 +1,93 @@
+"""Tests for deriving Granian concurrency from a measured request profile."""
+
+import pytest
+from pydantic import ValidationError
+
+from ol_infrastructure.lib.granian_tuning import (
+    MAX_TUNED_BLOCKING_THREADS,
+    GranianRequestProfile,
+    tune_granian,
+)
+
+
+def _profile(**overrides) -> GranianRequestProfile:
+    defaults = {"service_seconds": 0.1, "io_wait_fraction": 0.7}
+    defaults.update(overrides)
+    return GranianRequestProfile(**defaults)
+
+
+def test_threads_cover_io_wait_at_cpu_saturation():
+    # 30ms of CPU per 100ms request: 3.3 in flight keep one core busy
+    tuning = tune_granian(_profile(), interface="wsgi", cpu_request_cores=0.25)
+    assert (tuning.workers, tuning.blocking_threads, tuning.backpressure) == (1, 4, 8)
+
+
+def test_tail_latency_sizes_threads_for_the_slow_requests():
+    tuning = tune_granian(
+        _profile(p95_service_seconds=0.3), interface="wsgi", cpu_request_cores=0.25
+    )
+    assert tuning.blocking_threads == 10
+
+
+def test_cpu_limit_shrinks_each_workers_core():
+    tuning = tune_granian(
+        _profile(), interface="wsgi", cpu_request_cores=0.25, cpu_limit_cores=0.5
+    )
+    assert tuning.blocking_threads == 2
+
+
+def test_workers_follow_whole_cores_but_fit_in_memory():
+    tuning = tune_granian(
+        _profile(worker_rss_mib=1024),
+        interface="wsgi",
+        cpu_request_cores=4,
+        memory_limit_bytes=2 * 2**30,
+    )
+    assert tuning.workers == 1
+    assert "capped at 1" in tuning.explain()
+
+
+def test_measured_demand_raises_threads_above_the_model():
+    tuning = tune_granian(
+        _profile(peak_busy_threads=17.7), interface="wsgi", cpu_request_cores=1
+    )
+    assert tuning.blocking_threads == 18
+    assert "CPU-bound at peak" in tuning.explain()
+
+
+def test_threads_are_capped():
+    tuning = tune_granian(
+        _profile(io_wait_fraction=0.999), interface="wsgi", cpu_request_cores=1
+    )
+    assert tuning.blocking_threads == MAX_TUNED_BLOCKING_THREADS
+
+
+def test_queue_depth_follows_the_wait_budget():
+    tuning = tune_granian(
+        _profile(), interface="wsgi", cpu_request_cores=1, max_queue_wait_seconds=0.05
+    )
+    assert tuning.backpressure == 4 + 2
+
+
+def test_pins_are_kept_and_derived_from():
+    tuning = tune_granian(
+        _profile(), interface="wsgi", cpu_request_cores=1, workers=2, blocking_threads=6
+    )
+    assert (tuning.workers, tuning.blocking_threads, tuning.backpressure) == (2, 6, 12)
+    assert "(pinned)" in tuning.explain()
+
+
+def test_async_interfaces_size_backpressure_only():
+    tuning = tune_granian(_profile(), interface="asgi", cpu_request_cores=1)
+    assert tuning.blocking_threads is None
+    assert tuning.backpressure == 8
+
+
+def test_requires_a_cpu_request():
+    with pytest.raises(ValueError, match="CPU request"):
+        tune_granian(_profile(), interface="wsgi", cpu_request_cores=0)
+
+
+def test_rejects_a_tail_shorter_than_the_mean():
+    with pytest.raises(ValidationError, match="different windows"):
+        _profile(p95_service_seconds=0.05)
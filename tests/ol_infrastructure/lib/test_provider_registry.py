@@ -0,0 +1,105 @@
+"""Tests for the shared provider registry in ol_infrastructure.lib.provider_registry."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pulumi
+import pytest
+
+# Python 3.14+ compatibility
+try:
+    asyncio.get_event_loop()
+except RuntimeError:
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+class ProviderMocks(pulumi.runtime.Mocks):
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        return [args.name + "_id", args.inputs]
+
+    def call(self, args: pulumi.runtime.MockCallArgs):  # noqa: ARG002
+        return {}
+
+
+pulumi.runtime.set_mocks(ProviderMocks())
+
+from ol_infrastructure.lib import provider_registry  # noqa: E402
+from ol_infrastructure.lib.consul import get_consul_provider  # noqa: E402
+from ol_infrastructure.lib.pulumi_helper import StackInfo  # noqa: E402
+from ol_infrastructure.lib.vault import (  # noqa: E402
+    get_vault_provider,
+    setup_vault_provider,
+)
+
+VAULT_ADDRESS = "https://vault-qa.odl.mit.edu"
+STACK_INFO = StackInfo(
+    name="QA",
+    namespace="",
+    env_suffix="qa",
+    env_prefix="",
+    full_name="mitol/ol-infrastructure-ocw/QA",
+    k8s_name="qa",
+)
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    """Count sops decryptions instead of running sops."""
+    provider_registry.clear()
+    reads: list[str] = []
+
+    def fake_read_yaml_secrets(path):
+        reads.append(str(path))
+        return {
+            "auth_username": "pulumi",
+            "auth_password": "secret",  # pragma: allowlist secret
+            "basic_auth_password": "secret",  # pragma: allowlist secret
+        }
+
+    monkeypatch.setattr(provider_registry, "read_yaml_secrets", fake_read_yaml_secrets)
+    yield reads
+    provider_registry.clear()
+
+
+def test_vault_provider_shared_across_call_forms(credentials):
+    """Spelling the same configuration differently returns one provider."""
+    first = get_vault_provider(VAULT_ADDRESS, "operations-qa")
+    second = get_vault_provider(
+        VAULT_ADDRESS, "operations-qa", provider_name=None, skip_child_token=False
+    )
+    assert first is second
+    assert credentials == ["pulumi/vault.operations-qa.yaml"]
+
+
+def test_vault_provider_distinct_per_configuration(credentials):
+    """Different options are different providers; credentials still decrypt once."""
+    child = get_vault_provider(VAULT_ADDRESS, "operations-qa", "vault-a")
+    no_child = get_vault_provider(
+        VAULT_ADDRESS, "operations-qa", "vault-b", skip_child_token=True
+    )
+    assert child is not no_child
+    assert credentials == ["pulumi/vault.operations-qa.yaml"]
+
+
+def test_register_provider_transformation_is_idempotent(monkeypatch):
+    registered: list[pulumi.ResourceTransformation] = []
+    monkeypatch.setattr(
+        pulumi.runtime, "register_stack_transformation", registered.append
+    )
+    for _ in range(3):
+        setup_vault_provider(STACK_INFO)
+    assert len(registered) == 1
+    assert not provider_registry.register_provider_transformation(
+        ("vault", VAULT_ADDRESS, "operations.qa", False), registered[0]
+    )
+
+
+def test_consul_provider_shared(credentials):
+    first = get_consul_provider(STACK_INFO, consul_address="https://consul-qa")
+    second = get_consul_provider(
+        STACK_INFO, wrap_in_pulumi_options=False, consul_address="https://consul-qa"
+    )
+    assert isinstance(first, pulumi.ResourceOptions)
+    assert first.provider is second
+    assert credentials == ["pulumi/consul.qa.yaml"]
@@ -0,0 +1,308 @@
+"""The profiler must attribute time and resources to what actually caused them."""
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from ol_infrastructure.lib import pulumi_profiler
+from ol_infrastructure.lib.pulumi_profiler import ProgramProfile
+
+PROGRAM = """
+import time
+
+import pulumi
+from bridge.secrets.sops import read_yaml_secrets
+
+
+class Inner(pulumi.ComponentResource):
+    def __init__(self, name, opts=None):
+        super().__init__("test:index:Inner", name, None, opts)
+        time.sleep(0.05)
+        pulumi.CustomResource(
+            "test:index:Thing", f"{name}-thing", {"vpc": vpc_id},
+            opts=pulumi.ResourceOptions(parent=self),
+        )
+
+
+class Outer(pulumi.ComponentResource):
+    def __init__(self, name):
+        super().__init__("test:index:Outer", name)
+        time.sleep(0.05)
+        Inner(f"{name}-a", pulumi.ResourceOptions(parent=self))
+        Inner(f"{name}-b", pulumi.ResourceOptions(parent=self))
+
+
+secrets = read_yaml_secrets("secrets.yaml")
+assert secrets["db"]["password"] == "profiler-stub:secrets.yaml.db.password"
+network = pulumi.StackReference("organization/network/QA")
+vpc_id = network.require_output("vpc")["id"]
+assert pulumi.Config().require("greeting") == "hello"
+Outer("outer")
+"""
+
+
+@pytest.fixture
+def program(tmp_path: Path) -> Path:
+    (tmp_path / "__main__.py").write_text(textwrap.dedent(PROGRAM))
+    (tmp_path / "Pulumi.yaml").write_text("name: profiled\nruntime: python\n")
+    (tmp_path / "Pulumi.tenant.QA.yaml").write_text(
+        "config:\n  profiled:greeting: hello\n  profiled:token:\n    secure: abc\n"
+    )
+    return tmp_path
+
+
+def test_profile_attributes_time_and_resources(program):
+    profile = pulumi_profiler.profile_program(program, stack="QA", timeout=120)
+
+    assert profile.ok, profile.error
+    assert profile.stack == "tenant.QA"
+    assert profile.resources == {
+        "pulumi:pulumi:StackReference": 1,
+        "test:index:Outer": 1,
+        "test:index:Inner": 2,
+        "test:index:Thing": 2,
+    }
+    outer = profile.components["__main__.Outer"]
+    inner = profile.components["__main__.Inner"]
+    assert inner.count == 2
+    assert inner.total_seconds >= 0.1
+    # Outer's self time excludes the two nested Inner constructions.
+    assert 0.05 <= outer.self_seconds < outer.total_seconds - 0.09
+    assert profile.peak_rss_bytes > 0
+    assert any(entry.module == "pulumi" for entry in profile.imports)
+
+
+def test_supplied_stack_outputs_replace_stubs(program, tmp_path):
+    (program / "__main__.py").write_text(
+        textwrap.dedent(
+            """
+            import pulumi
+
+            network = pulumi.StackReference("organization/network/QA")
+            vpc = network.require_output("vpc")
+            vpc.apply(lambda v: v["id"] == "vpc-123" or pulumi.CustomResource(
+                "test:index:Wrong", "wrong", {}
+            ))
+            network.require_output("subnets").apply(
+                lambda v: v.startswith("profiler-stub:organization/network/QA.subnets")
+                or pulumi.CustomResource("test:index:Wrong", "unstubbed", {})
+            )
+            """
+        )
+    )
+    outputs = tmp_path / "outputs.json"
+    outputs.write_text('{"organization/network/QA": {"vpc": {"id": "vpc-123"}}}')
+
+    profile = pulumi_profiler.profile_program(
+        program, stack="QA", stack_outputs=outputs, timeout=120
+    )
+
+    assert profile.ok, profile.error
+    assert "test:index:Wrong" not in profile.resources
+
+
+def test_aws_lookups_fail_cleanly_and_stubs_behave_like_values(program):
+    (program / "__main__.py").write_text(
+        textwrap.dedent(
+            """
+            import boto3
+            import pulumi
+            import yaml
+            from botocore.exceptions import ClientError
+
+            try:
+                boto3.client("ec2").describe_vpcs()
+            except ClientError as error:
+                assert "profiled without AWS" in str(error)
+            else:
+                raise AssertionError("boto3 reached AWS")
+
+            network = pulumi.StackReference("organization/network/QA")
+
+            def check(subnets):
+                assert subnets[0].endswith("QA.subnets[0]")
+                assert yaml.safe_dump({"subnet": subnets[0]}).startswith("subnet: ")
+
+            network.require_output("subnets").apply(check)
+            """
+        )
+    )
+
+    profile = pulumi_profiler.profile_program(program, stack="QA", timeout=120)
+
+    assert profile.ok, profile.error
+
+
+def test_config_and_preview_reach_the_program_and_urns_match_the_engines(program):
+    (program / "__main__.py").write_text(
+        textwrap.dedent(
+            """
+            import pulumi
+
+            assert pulumi.runtime.is_dry_run()
+            assert pulumi.Config().require_object("groups") == ["workloads"]
+            outer = pulumi.ComponentResource("test:index:Outer", "outer")
+            inner = pulumi.ComponentResource(
+                "test:index:Inner", "inner", opts=pulumi.ResourceOptions(parent=outer)
+            )
+            thing = pulumi.CustomResource(
+                "test:index:Thing", "thing", {}, pulumi.ResourceOptions(parent=inner)
+            )
+            # Outputs stay known, as in a preview of a stack that already exists.
+            thing.id.apply(
+                lambda _: pulumi.CustomResource("test:index:Late", "late", {})
+            )
+            """
+        )
+    )
+
+    profile = pulumi_profiler.profile_program(
+        program,
+        stack="QA",
+        config={"profiled:groups": ["workloads"]},
+        preview=True,
+        timeout=120,
+    )
+
+    assert profile.ok, profile.error
+    assert [urn.split("::", 2)[2] for urn in profile.urns] == [
+        "test:index:Late::late",
+        "test:index:Outer$test:index:Inner$test:index:Thing::thing",
+        "test:index:Outer$test:index:Inner::inner",
+        "test:index:Outer::outer",
+    ]
+
+
+def test_failing_program_still_reports(program):
+    (program / "__main__.py").write_text("raise RuntimeError('boom')\n")
+
+    profile = pulumi_profiler.profile_program(program, stack="QA", timeout=120)
+
+    assert not profile.ok
+    assert profile.error == "RuntimeError: boom"
+
+
+def test_unknown_stack_lists_the_known_ones(program):
+    with pytest.raises(ValueError, match=r"tenant\.QA"):
+        pulumi_profiler.resolve_stack(program, "Production")
+
+
+def test_import_times_are_parsed_with_depth():
+    stderr = textwrap.dedent(
+        """\
+        import time: self [us] | cumulative | imported package
+        import time:       120 |        120 |   yaml.error
+        import time:      1000 |       1120 | yaml
+        something the program printed
+        """
+    )
+
+    timings = pulumi_profiler.parse_import_times(stderr)
+
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ("yaml.error", 120, 120, 1),
+        ("yaml", 1000, 1120, 0),
+    ]
+
+
+def test_profile_round_trips_through_json():
+    profile = ProgramProfile(
+        program="applications/x",
+        stack="QA",
+        ok=True,
+        resources={"a": 2},
+        components={"C": pulumi_profiler.ComponentTiming(1, 0.5, 0.25)},
+        imports=[pulumi_profiler.ImportTiming("m", 10, 20, 0)],
+    )
+
+    assert ProgramProfile.from_dict(profile.to_dict()) == profile
+    assert profile.to_dict()["resource_count"] == 2
+
+
+def _baseline(**overrides):
+    fields = {
+        "program": "applications/x",
+        "stack": "QA",
+        "ok": True,
+        "wall_seconds": 10.0,
+        "peak_rss_bytes": 100 * 2**20,
+        "resources": {"aws:s3/bucket:Bucket": 20, "vault:index/policy:Policy": 5},
+    }
+    return ProgramProfile(**{**fields, **overrides})
+
+
+def test_within_tolerance_is_not_a_regression():
+    current = _baseline(
+        wall_seconds=15.0, resources={"aws:s3/bucket:Bucket": 30, "x": 0}
+    )
+
+    assert (
+        pulumi_profiler.compare_to_baseline(
+            current, _baseline(), pulumi_profiler.Tolerances()
+        )
+        == []
+    )
+
+
+def test_doubled_wall_time_and_added_resources_are_regressions():
+    current = _baseline(
+        wall_seconds=20.0,
+        resources={"aws:s3/bucket:Bucket": 220, "vault:index/policy:Policy": 5},
+    )
+
+    regressions = pulumi_profiler.compare_to_baseline(
+        current, _baseline(), pulumi_profiler.Tolerances()
+    )
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("wall time 20.00s")
+    assert "aws:s3/bucket:Bucket +200" in regressions[1]
+
+
+def test_dropped_resources_are_a_regression():
+    current = _baseline(resources={"vault:index/policy:Policy": 5})
+
+    (regression,) = pulumi_profiler.compare_to_baseline(
+        current, _baseline(), pulumi_profiler.Tolerances()
+    )
+
+    assert "aws:s3/bucket:Bucket -20" in regression
+
+
+def test_short_programs_get_an_absolute_wall_time_floor():
+    baseline = _baseline(wall_seconds=0.5)
+
+    assert not pulumi_profiler.compare_to_baseline(
+        _baseline(wall_seconds=2.4), baseline, pulumi_profiler.Tolerances()
+    )
+
+
+def test_wall_time_is_scaled_by_this_machines_speed():
+    slower = pulumi_profiler.machine_speed(
+        _baseline(wall_seconds=3.0), _baseline(wall_seconds=1.5)
+    )
+
+    assert slower == 2.0
+    assert not pulumi_profiler.compare_to_baseline(
+        _baseline(wall_seconds=30.0),
+        _baseline(),
+        pulumi_profiler.Tolerances(),
+        speed=slower,
+    )
+    (regression,) = pulumi_profiler.compare_to_baseline(
+        _baseline(wall_seconds=40.0),
+        _baseline(),
+        pulumi_profiler.Tolerances(),
+        speed=slower,
+    )
+    assert regression.endswith("(baseline 10.00s, x2.00 for this machine)")
+
+
+def test_a_failed_reference_leaves_wall_time_unscaled():
+    assert (
+        pulumi_profiler.machine_speed(
+            _baseline(ok=False, wall_seconds=9.0), _baseline(wall_seconds=1.0)
+        )
+        == 1.0
+    )
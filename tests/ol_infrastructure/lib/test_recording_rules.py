@@ -0,0 +1,98 @@
+"""Tests for the recording rules shared by KEDA triggers and alert rules."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pulumi
+
+try:
+    asyncio.get_event_loop()
+except RuntimeError:
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+class KedaMocks(pulumi.runtime.Mocks):
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        return [args.name + "_id", args.inputs]
+
+    def call(self, args: pulumi.runtime.MockCallArgs):  # noqa: ARG002
+        return {}
+
+
+pulumi.runtime.set_mocks(KedaMocks())
+
+from ol_infrastructure.lib.k8s_keda import build_webapp_keda_config  # noqa: E402
+from ol_infrastructure.lib.recording_rules import (  # noqa: E402
+    APISIX_HOST_5XX_RATE,
+    APISIX_HOST_REQUEST_RATE,
+    APISIX_ROUTE_LATENCY_BUCKET_RATE,
+    APISIX_ROUTE_REQUEST_RATE,
+    RECORDING_RULES,
+    over_window,
+    route_p95_latency_query,
+    route_request_rate_query,
+)
+
+ROUTES = "mitxonline_.*"
+
+
+def test_raw_queries_are_unchanged():
+    assert route_request_rate_query(ROUTES, recorded=False) == (
+        'sum(rate(apisix_http_status{route=~"mitxonline_.*"}[5m]))'
+    )
+    assert route_p95_latency_query(ROUTES, recorded=False) == (
+        "histogram_quantile(0.95,sum(rate("
+        'apisix_http_latency_bucket{route=~"mitxonline_.*"}[5m])) by (le))'
+    )
+
+
+def test_recorded_queries_read_the_recorded_series():
+    assert route_request_rate_query(ROUTES, recorded=True) == (
+        f'sum({APISIX_ROUTE_REQUEST_RATE.record}{{route=~"mitxonline_.*"}})'
+    )
+    latency = route_p95_latency_query(ROUTES, recorded=True)
+    assert APISIX_ROUTE_LATENCY_BUCKET_RATE.record in latency
+    assert "by (le)" in latency
+
+
+def test_short_windows_average_the_recorded_rate():
+    rule = APISIX_HOST_REQUEST_RATE
+    assert over_window(rule, "5m", recorded=True) == rule.record
+    assert over_window(rule, "10m", recorded=True) == (
+        f"avg_over_time({rule.record}[10m])"
+    )
+
+
+def test_long_windows_and_unrecorded_queries_rate_the_raw_counters():
+    expected = 'sum by (matched_host) (rate(apisix_http_status{code=~"5.."}[6h]))'
+    assert over_window(APISIX_HOST_5XX_RATE, "6h", recorded=True) == expected
+    assert over_window(APISIX_HOST_5XX_RATE, "6h", recorded=False) == expected
+    assert over_window(APISIX_HOST_REQUEST_RATE, "10m", recorded=False) == (
+        "sum by (matched_host) (rate(apisix_http_status[10m]))"
+    )
+
+
+def test_record_names_are_unique_and_aggregated():
+    records = [rule.record for rule in RECORDING_RULES]
+    assert len(records) == len(set(records))
+    assert all(rule.expr.startswith("sum by (") for rule in RECORDING_RULES)
+
+
+def test_keda_config_opts_in_to_recorded_series():
+    def queries(config):
+        return [
+            trigger["metadata"]["query"]
+            for trigger in config.triggers
+            if trigger["type"] == "prometheus"
+        ]
+
+    raw = queries(build_webapp_keda_config("auth", ROUTES, "webapp"))
+    recorded = queries(
+        build_webapp_keda_config("auth", ROUTES, "webapp", use_recording_rules=True)
+    )
+    assert all("apisix_http_" in q and ":" not in q for q in raw)
+    assert recorded == [
+        route_request_rate_query(ROUTES, recorded=True),
+        route_p95_latency_query(ROUTES, recorded=True),
+    ]
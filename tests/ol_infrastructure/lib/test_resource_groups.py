@@ -0,0 +1,239 @@
+"""Tests for restricted previews with ResourceGroups in lib.pulumi_helper.
+
+Building only part of a program is only safe in a preview, and only useful if
+a selected group still gets everything it takes as inputs, and if its
+``--target`` flags match everything it builds and nothing it leaves out.
+"""
+
+import json
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import pulumi
+import pytest
+
+from ol_infrastructure.applications.edxapp.resource_groups import (
+    EDXAPP_RESOURCE_GROUPS,
+)
+from ol_infrastructure.applications.mit_learn.resource_groups import (
+    MIT_LEARN_RESOURCE_GROUPS,
+)
+from ol_infrastructure.lib import pulumi_helper, pulumi_profiler
+from ol_infrastructure.lib.pulumi_helper import ResourceGroup, ResourceGroups
+
+GROUPS = [
+    ResourceGroup("secrets", targets=("**ol:services:Vault:K8S:**",)),
+    ResourceGroup("configmaps", targets=("**kubernetes:core/v1:ConfigMap::*",)),
+    ResourceGroup("ingress"),
+    ResourceGroup("workloads", requires=("secrets", "configmaps")),
+    ResourceGroup("autoscaling", requires=("workloads",)),
+]
+
+
+@pytest.fixture
+def select(monkeypatch):
+    """Set ``app:resource_groups`` for the test, as pulumi config would."""
+    monkeypatch.setattr(pulumi.runtime, "is_dry_run", lambda: True)
+    monkeypatch.setattr(pulumi_helper, "get_stack", lambda: "QA")
+    monkeypatch.setattr(pulumi, "get_project", lambda: "ol-infrastructure-edxapp")
+
+    def _select(*names: str) -> None:
+        pulumi.runtime.set_config("app:resource_groups", json.dumps(list(names)))
+
+    yield _select
+    _select()
+
+
+@pytest.mark.usefixtures("select")
+def test_every_group_is_built_by_default():
+    groups = ResourceGroups("app", GROUPS)
+    assert all(groups.selected(group.name) for group in GROUPS)
+
+
+def test_selection_pulls_in_required_groups_transitively(select):
+    select("autoscaling")
+    groups = ResourceGroups("app", GROUPS)
+    built = {group.name for group in GROUPS if groups.selected(group.name)}
+    assert built == {"autoscaling", "workloads", "secrets", "configmaps"}
+
+
+def test_targets_cover_only_the_selected_groups(select):
+    select("configmaps")
+    groups = ResourceGroups("app", GROUPS)
+    assert not groups.selected("secrets")
+    assert groups.target_urns(["configmaps"]) == [
+        "urn:pulumi:QA::ol-infrastructure-edxapp::**kubernetes:core/v1:ConfigMap::*"
+    ]
+
+
+def test_a_restricted_update_is_refused(select, monkeypatch):
+    select("configmaps")
+    monkeypatch.setattr(pulumi.runtime, "is_dry_run", lambda: False)
+    with pytest.raises(ValueError, match="Unset it before running an update"):
+        ResourceGroups("app", GROUPS)
+
+
+def test_unknown_selection_is_rejected(select):
+    select("configmap")
+    with pytest.raises(ValueError, match=r"unknown resource groups \['configmap'\]"):
+        ResourceGroups("app", GROUPS)
+
+
+def test_unknown_requirement_is_rejected():
+    with pytest.raises(ValueError, match="workloads requires"):
+        ResourceGroups("app", [ResourceGroup("workloads", requires=("secrets",))])
+
+
+@pytest.mark.usefixtures("select")
+def test_guarding_an_undeclared_group_is_an_error():
+    groups = ResourceGroups("app", GROUPS)
+    with pytest.raises(ValueError, match="selected"):
+        groups.selected("celery")
+
+
+def test_targets_match_as_pulumi_globs_do():
+    group = ResourceGroup(
+        "secrets",
+        targets=("**ol:services:Vault:K8S:VaultStaticSecret::ol-*-edxapp-*-secret-*",),
+    )
+    prefix = "urn:pulumi:QA::ol-infrastructure-edxapp::"
+    assert group.covers(
+        prefix
+        + "ol:services:Vault:K8S:VaultStaticSecret::ol-mitx-edxapp-forum-secret-qa"
+    )
+    # `**` crosses parent types; `*` stays within the name.
+    assert group.covers(
+        prefix + "ol:infrastructure:services:k8s:OLApisixOIDCResources$"
+        "ol:services:Vault:K8S:VaultStaticSecret::ol-mitx-edxapp-oidc-secret-qa"
+    )
+    assert not group.covers(
+        prefix + "ol:services:Vault:K8S:VaultStaticSecret::ol-mitx-edxapp-forum-qa"
+    )
+    assert not group.covers(
+        prefix + "ol:services:Vault:K8S:VaultStaticSecret$kubernetes:yaml/v2:"
+        "ConfigGroup::ol-mitx-edxapp-forum-secret-qa"
+    )
+
+
+class GroupedProgram(NamedTuple):
+    """A program with resource groups, and how the benchmark suite evaluates it."""
+
+    program: str
+    stack: str
+    env: dict[str, str]
+    config_namespace: str
+    groups: list[ResourceGroup]
+
+
+GROUPED_PROGRAMS = [
+    GroupedProgram(
+        "applications/edxapp",
+        "mitx.QA",
+        {"EDXAPP_DOCKER_IMAGE_DIGEST": "sha256:profiler-stub"},
+        "edxapp",
+        EDXAPP_RESOURCE_GROUPS,
+    ),
+    GroupedProgram(
+        "applications/mit_learn",
+        "QA",
+        {"MIT_LEARN_DOCKER_TAG": "profiler-stub"},
+        "mitlearn",
+        MIT_LEARN_RESOURCE_GROUPS,
+    ),
+]
+
+
+def _with_requirements(groups: list[ResourceGroup], names: Iterable[str]) -> set[str]:
+    requires = {group.name: group.requires for group in groups}
+    closure: set[str] = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in closure:
+            closure.add(name)
+            pending.extend(requires[name])
+    return closure
+
+
+def _left_out(groups: list[ResourceGroup], name: str) -> frozenset[str]:
+    """Return the groups a preview of everything not needing ``name`` selects."""
+    return frozenset(
+        group.name
+        for group in groups
+        if name not in _with_requirements(groups, [group.name])
+    )
+
+
+@pytest.fixture(scope="module")
+def built_by_group() -> dict[str, dict[str, set[str]]]:
+    """Per program, the URNs each group builds.
+
+    A group builds what a preview selecting it adds to one that selects every
+    group not needing it. Each selection is evaluated once, in its own
+    interpreter, under the profiler's mocks.
+    """
+    programs = {entry.program: entry for entry in GROUPED_PROGRAMS}
+    selections = {
+        (entry.program, selection)
+        for entry in GROUPED_PROGRAMS
+        for group in entry.groups
+        for selection in (
+            _left_out(entry.groups, group.name),
+            _left_out(entry.groups, group.name) | {group.name},
+        )
+    }
+
+    def evaluate(key: tuple[str, frozenset[str]]) -> set[str]:
+        program, selection = key
+        entry = programs[program]
+        profile = pulumi_profiler.profile_program(
+            pulumi_profiler.resolve_program(program),
+            stack=entry.stack,
+            env=entry.env,
+            config={f"{entry.config_namespace}:resource_groups": sorted(selection)},
+            preview=True,
+        )
+        assert profile.ok, f"{program} {sorted(selection)}: {profile.error}"
+        return set(profile.urns)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        urns = dict(zip(selections, pool.map(evaluate, selections), strict=True))
+    return {
+        entry.program: {
+            group.name: urns[
+                entry.program, _left_out(entry.groups, group.name) | {group.name}
+            ]
+            - urns[entry.program, _left_out(entry.groups, group.name)]
+            for group in entry.groups
+        }
+        for entry in GROUPED_PROGRAMS
+    }
+
+
+@pytest.mark.parametrize(
+    "entry", GROUPED_PROGRAMS, ids=[entry.program for entry in GROUPED_PROGRAMS]
+)
+def test_targets_cover_everything_a_group_builds(entry, built_by_group):
+    for group in entry.groups:
+        built = built_by_group[entry.program][group.name]
+        assert built, f"{group.name} builds nothing"
+        assert sorted(urn for urn in built if not group.covers(urn)) == [], group.name
+
+
+@pytest.mark.parametrize(
+    "entry", GROUPED_PROGRAMS, ids=[entry.program for entry in GROUPED_PROGRAMS]
+)
+def test_targets_match_nothing_a_group_leaves_out(entry, built_by_group):
+    """A target matching an unbuilt resource would preview it as a delete."""
+    for group in entry.groups:
+        built_with = _with_requirements(entry.groups, [group.name])
+        for other in entry.groups:
+            if other.name not in built_with:
+                reached = sorted(
+                    urn
+                    for urn in built_by_group[entry.program][other.name]
+                    if group.covers(urn)
+                )
+                assert reached == [], f"{group.name} targets {other.name}'s"
@@ -0,0 +1,178 @@
+"""Tests for the PromQL/LogQL evaluator behind the offline rule harness."""
+
+import pytest
+
+from ol_infrastructure.lib.rule_harness.evaluator import (
+    Evaluator,
+    QueryEvaluationError,
+    Vector,
+)
+from ol_infrastructure.lib.rule_harness.fixtures import (
+    LogStore,
+    SeriesStore,
+    expand_values,
+)
+from ol_infrastructure.lib.rule_harness.query import QuerySyntaxError, parse_query
+from ol_infrastructure.lib.rule_harness.rules import AlertRule, evaluate_rule
+
+
+def _series(*fixtures: tuple[str, str]) -> Evaluator:
+    store = SeriesStore()
+    for selector, values in fixtures:
+        store.add_notation(selector, values)
+    return Evaluator(series=store)
+
+
+def _values(result: Vector) -> dict[tuple[tuple[str, str], ...], float]:
+    return {tuple(sorted(s.labels.items())): s.value for s in result}
+
+
+def test_expanding_notation():
+    assert expand_values("1+2x2 5") == [1, 3, 5, 5]
+    values = expand_values("1 _x2 stale")
+    assert values[0] == 1
+    assert len(values) == 4
+    assert values[-1] is None
+
+
+def test_instant_selector_looks_back_five_minutes_and_honours_staleness():
+    evaluator = _series(("up{job='a'}", "1 _x8"), ("up{job='b'}", "1 stale"))
+    assert _values(evaluator.evaluate("up", 240)) == {
+        (("__name__", "up"), ("job", "a")): 1
+    }
+    assert evaluator.evaluate("up", 360) == []
+
+
+def test_rate_extrapolates_like_prometheus():
+    evaluator = _series(
+        ("steady_total", "0+60x10"),
+        # The reset hides the 300 -> 360 step: 180 counted over the 240s the
+        # window's samples span, extrapolated to 225 over 5m.
+        ("reset_total", "0+60x5 0+60x4"),
+    )
+    (steady,) = evaluator.evaluate("rate(steady_total[5m])", 540)
+    (reset,) = evaluator.evaluate("rate(reset_total[5m])", 540)
+    assert steady.value == pytest.approx(1.0)
+    assert reset.value == pytest.approx(0.75)
+    assert "__name__" not in steady.labels
+
+
+def test_one_to_one_matching_refuses_duplicates():
+    evaluator = _series(
+        ('a{pod="p1", x="1"}', "1"),
+        ('b{pod="p1", y="1"}', "1"),
+        ('b{pod="p1", y="2"}', "1"),
+    )
+    with pytest.raises(QueryEvaluationError, match="many-to-many"):
+        evaluator.evaluate("a / on (pod) b", 0)
+
+
+def test_group_left_copies_labels_from_the_one_side():
+    evaluator = _series(
+        ('used{pod="p1", volume="data"}', "5"), ('info{pod="p1", node="n1"}', "1")
+    )
+    assert _values(evaluator.evaluate("used * on (pod) group_left (node) info", 0)) == {
+        (("node", "n1"), ("pod", "p1"), ("volume", "data")): 5
+    }
+
+
+def test_comparisons_filter_unless_bool():
+    evaluator = _series(('up{pod="p1"}', "0"), ('up{pod="p2"}', "1"))
+    assert len(evaluator.evaluate("up == 0", 0)) == 1
+    assert sorted(s.value for s in evaluator.evaluate("up == bool 0", 0)) == [0, 1]
+
+
+def test_histogram_quantile_interpolates_within_the_bucket():
+    evaluator = _series(
+        ('latency_bucket{le="100"}', "50"),
+        ('latency_bucket{le="200"}', "100"),
+        ('latency_bucket{le="+Inf"}', "100"),
+    )
+    (sample,) = evaluator.evaluate("histogram_quantile(0.75, latency_bucket)", 0)
+    assert sample.value == pytest.approx(150)
+
+
+def test_logql_pipeline_parses_formats_and_filters():
+    logs = LogStore()
+    for status in ("200", "502", "503"):
+        logs.add_lines(
+            '{app="caddy"}', f'{{"message": "{{\\"status\\": {status}}}"}}', count=2
+        )
+    result = Evaluator(logs=logs).evaluate(
+        'sum(count_over_time({app="caddy"} | json | line_format "{{.message}}"'
+        " | json | status >= 500 [5m]))",
+        60,
+        logql=True,
+    )
+    assert [s.value for s in result] == [4]
+
+
+def test_pattern_parser_and_label_format_rename():
+    logs = LogStore()
+    logs.add_lines('{app="nginx"}', '1.2.3.4 - - [x] "GET /a HTTP/1.1" 502 10 "-"')
+    (sample,) = Evaluator(logs=logs).evaluate(
+        'count_over_time({app="nginx"} | pattern `<ip> - - [<_>] "<method> <uri> <_>"'
+        " <status> <_>` | label_format code=status [5m])",
+        0,
+        logql=True,
+    )
+    assert sample.labels["code"] == "502"
+    assert "status" not in sample.labels
+
+
+def test_unfiltered_parser_errors_fail_the_query_like_loki():
+    logs = LogStore()
+    logs.add_lines('{app="edxapp"}', "not json")
+    query = 'sum(count_over_time({app="edxapp"} | json %s [5m]))'
+    with pytest.raises(QueryEvaluationError, match="JSONParserErr"):
+        Evaluator(logs=logs).evaluate(query % "", 0, logql=True)
+    assert Evaluator(logs=logs).evaluate(query % '| __error__=""', 0, logql=True) == []
+
+
+def test_unsupported_syntax_fails_loudly():
+    with pytest.raises(QuerySyntaxError, match="position 25"):
+        parse_query("max_over_time(rate(x[5m])[1h:])")
+    with pytest.raises(QuerySyntaxError, match="not supported"):
+        Evaluator().evaluate("predict_linear(x[1h], 60)", 0)
+
+
+def test_stage_c_drops_zero_values():
+    # sum() over a comparison that filters to zeros is always 0, so Grafana's
+    # `> 0` threshold stage never fires on it.
+    evaluator = _series(('ready{node="n1"}', "0x10"))
+    summed = AlertRule(
+        "g",
+        "summed",
+        "sum by (node) (ready == 0)",
+        logql=False,
+        for_seconds=0,
+        interval_seconds=60,
+    )
+    counted = AlertRule(
+        "g",
+        "counted",
+        "count by (node) (ready == 0)",
+        logql=False,
+        for_seconds=0,
+        interval_seconds=60,
+    )
+    assert evaluate_rule(summed, evaluator, 300).firing == []
+    assert evaluate_rule(counted, evaluator, 300).firing == [{"node": "n1"}]
+
+
+def test_for_requires_every_evaluation_to_pass():
+    evaluator = _series(('up{pod="p1"}', "0x4 1 0x10"))
+    rule = AlertRule(
+        "g",
+        "down",
+        "count by (pod) (up == 0)",
+        logql=False,
+        for_seconds=300,
+        interval_seconds=60,
+    )
+    # Evaluations at 300..600 still include the 1 at 300; 360..660 are all 0.
+    assert evaluate_rule(rule, evaluator, 600).firing == []
+    evaluation = evaluate_rule(rule, evaluator, 660)
+    assert evaluation.firing == [{"pod": "p1"}]
+    # Cost is that of the one evaluation at 660, not of the whole `for` window.
+    assert evaluation.cost.series_touched == 1
@@ -0,0 +1,130 @@
+"""Tests for the fleet loader's parse cache and single-pass validation.
+
+The cache is only safe if it is invisible: a warm load must return exactly what a
+cold one would, any edit to an input must miss, and validation must still run on a
+hit. Each test here pins one of those, against a copy of the real data directory.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from ol_infrastructure.saas.github.repositories import archetypes
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the loader at a scratch copy of the fleet data and a scratch cache."""
+    data = tmp_path / "data"
+    shutil.copytree(archetypes.DATA_DIR, data)
+    monkeypatch.setattr(archetypes, "DATA_DIR", data)
+    monkeypatch.setattr(archetypes, "REPOS_DIR", data / "repos")
+    monkeypatch.setattr(archetypes, "CACHE_FILE", tmp_path / "cache" / "fleet.json")
+    return data
+
+
+def _forbid_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(path: Path) -> Any:
+        pytest.fail(f"cache hit expected, but {path.name} was parsed")
+
+    monkeypatch.setattr(archetypes, "_load_yaml", fail)
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_warm_load_matches_cold_load_without_parsing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cold = archetypes.load_fleet(use_cache=False)
+    assert archetypes.load_fleet() == cold
+    assert archetypes.CACHE_FILE.exists()
+
+    _forbid_parsing(monkeypatch)
+    assert archetypes.load_fleet() == cold
+
+
+def test_touched_but_unchanged_inputs_still_hit(
+    data_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A checkout rewrites mtimes but not bytes; that must not force a parse."""
+    archetypes.load_fleet()
+    for path in (data_dir / "repos").glob("*.yaml"):
+        os.utime(path, ns=(0, 0))
+
+    _forbid_parsing(monkeypatch)
+    assert len(archetypes.load_fleet()) == len(list((data_dir / "repos").iterdir()))
+
+
+def test_edited_repo_file_misses(data_dir: Path) -> None:
+    archetypes.load_fleet()
+    path = data_dir / "repos" / ".github.yaml"
+    path.write_text(path.read_text() + "description: edited after caching\n")
+
+    fleet = {repo["name"]: repo for repo in archetypes.load_fleet()}
+    assert fleet[".github"]["description"] == "edited after caching"
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_validation_runs_on_a_cache_hit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """teams.yaml is not a cache input, so a hit must still be checked against it."""
+    archetypes.load_fleet()
+    monkeypatch.setattr(archetypes, "TEAM_IDS", {})
+
+    with pytest.raises(ValueError, match=r"not in teams\.yaml"):
+        archetypes.load_fleet()
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_unreadable_cache_falls_back_to_parsing() -> None:
+    archetypes.CACHE_FILE.parent.mkdir(parents=True)
+    archetypes.CACHE_FILE.write_text("{not json")
+
+    assert archetypes.load_fleet() == archetypes.load_fleet(use_cache=False)
+
+
+def _repo(**overrides: Any) -> dict[str, Any]:
+    base: dict[str, Any] = {
+        "name": "example",
+        "archived": False,
+        "_visibility": "public",
+        "teams": {"odl-engineering-owners": "admin", "odl-engineering": "push"},
+        "vulnerability_alerts": True,
+    }
+    return {**base, **overrides}
+
+
+def test_clean_fleet_validates() -> None:
+    archetypes.validate_fleet([_repo()])
+
+
+@pytest.mark.parametrize(
+    ("overrides", "match"),
+    [
+        ({"teams": {"no-such-team": "push"}}, r"not in teams\.yaml"),
+        (
+            {"_direct_collaborators": {"someone": "push"}},
+            "outside the allowed vocabulary",
+        ),
+        ({"_visibility": None}, "no visibility recorded"),
+        ({"teams": {"odl-engineering": "push"}}, "public repos must grant"),
+        (
+            {"dependabot_security_updates": True, "vulnerability_alerts": False},
+            "rejects \\(422\\)",
+        ),
+    ],
+)
+def test_each_check_reports(overrides: dict[str, Any], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        archetypes.validate_fleet([_repo(**overrides)])
+
+
+def test_every_offender_is_named_not_just_the_first() -> None:
+    fleet = [
+        _repo(name="alpha", teams={"ghost": "push"}),
+        _repo(name="bravo", teams={"phantom": "push"}),
+    ]
+    with pytest.raises(ValueError, match="alpha") as excinfo:
+        archetypes.validate_fleet(fleet)
+    assert "bravo" in str(excinfo.value)
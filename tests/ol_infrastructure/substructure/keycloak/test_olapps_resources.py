@@ -0,0 +1,116 @@
+"""The olapps realm must register the same resources before and after a refactor.
+
+Moving hand-written clients onto `OIDCClient` specs is meant to preview as a
+no-op. That is checked here by building the realm against mocks with the QA
+stack's config and comparing every registered resource's type, logical name
+and inputs with ``olapps_resources.json``, which was recorded from the
+hand-written module. Regenerate it only for an intended change:
+
+    PYTHONPATH=src python tests/ol_infrastructure/substructure/keycloak/\
+test_olapps_resources.py
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pulumi
+import pytest
+import yaml
+
+from ol_infrastructure.lib.pulumi_helper import StackInfo
+from ol_infrastructure.substructure.keycloak.olapps import create_olapps_realm
+
+HERE = Path(__file__).parent
+SNAPSHOT = HERE / "olapps_resources.json"
+STACK_CONFIG = (
+    HERE.parents[3]
+    / "src"
+    / "ol_infrastructure"
+    / "substructure"
+    / "keycloak"
+    / "Pulumi.QA.yaml"
+)
+
+
+class RecordingMocks(pulumi.runtime.Mocks):
+    """Record each resource's inputs; a resource's id is its logical name."""
+
+    def __init__(self) -> None:
+        self.resources: dict[str, dict[str, Any]] = {}
+
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        self.resources[f"{args.typ}::{args.name}"] = args.inputs
+        return [args.inputs.get("realm", args.name), args.inputs]
+
+    def call(self, args: pulumi.runtime.MockCallArgs):
+        return {"id": f"{args.args.get('clientId')}-id"}
+
+
+def _load_stack_config() -> None:
+    """Set the QA stack's config, with a placeholder for each encrypted value."""
+    values = yaml.safe_load(STACK_CONFIG.read_text())["config"]
+    for key, value in values.items():
+        if isinstance(value, dict) and "secure" in value:
+            value = f"{key}-value"  # noqa: PLW2901
+        elif not isinstance(value, str):
+            value = json.dumps(value)  # noqa: PLW2901
+        pulumi.runtime.set_config(key, value)
+
+
+def registered_resources() -> dict[str, dict[str, Any]]:
+    """Build the olapps realm against mocks and return what it registered."""
+    mocks = RecordingMocks()
+    pulumi.runtime.set_mocks(mocks, preview=True)
+    _load_stack_config()
+
+    @pulumi.runtime.test
+    def build():
+        provider = pulumi.ProviderResource("keycloak", "keycloak_provider")
+        create_olapps_realm(
+            provider,
+            "https://sso-qa.ol.mit.edu",
+            "keycloak-qa",
+            StackInfo(
+                name="QA",
+                namespace="",
+                env_suffix="qa",
+                env_prefix="",
+                full_name="mitodl/ol-infrastructure-keycloak/QA",
+                k8s_name="qa",
+            ),
+            "mailgun-password",
+            "mailgun-username",
+            "smtp.mailgun.org",
+            "touchstone-cert",
+            "session-secret",
+            lambda realm_id: f"{realm_id}-public-key",
+        )
+
+    build()
+    # Outputs a mock leaves unset (service account user ids) are unknown in a
+    # preview; record them as such rather than by object identity.
+    return json.loads(
+        json.dumps(mocks.resources, sort_keys=True, default=lambda _: "<unknown>")
+    )
+
+
+@pytest.fixture
+def resources():
+    previous = pulumi.runtime.settings.SETTINGS.monitor
+    yield registered_resources()
+    if isinstance(previous, pulumi.runtime.mocks.MockMonitor):
+        pulumi.runtime.set_mocks(previous.mocks)
+
+
+def test_olapps_registers_the_recorded_resources(resources):
+    recorded = json.loads(SNAPSHOT.read_text())
+    assert sorted(resources) == sorted(recorded)
+    for name, inputs in recorded.items():
+        assert resources[name] == inputs, name
+
+
+if __name__ == "__main__":
+    SNAPSHOT.write_text(
+        json.dumps(registered_resources(), indent=1, sort_keys=True) + "\n"
+    )
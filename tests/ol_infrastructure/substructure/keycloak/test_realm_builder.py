@@ -0,0 +1,99 @@
+"""Tests for the declarative OIDC client specs in the Keycloak realm modules.
+
+Adopting a spec is only safe if it derives exactly the names the hand-written
+blocks used, and a restricted program is only safe if it never reaches an
+update.
+"""
+
+import pulumi
+import pytest
+
+from ol_infrastructure.substructure.keycloak import realm_builder
+from ol_infrastructure.substructure.keycloak.realm_builder import (
+    BuiltClient,
+    CompositeRole,
+    OIDCClient,
+    RealmBuilder,
+    realm_selected,
+)
+
+
+class FakeConfig:
+    values: dict[str, object] = {}  # noqa: RUF012
+
+    def __init__(self, namespace: str):
+        self.name = self.namespace = namespace
+
+    def get_object(self, key: str):
+        return self.values.get(f"{self.namespace}:{key}")
+
+
+@pytest.fixture
+def config(monkeypatch):
+    values: dict[str, object] = {}
+    monkeypatch.setattr(FakeConfig, "values", values)
+    monkeypatch.setattr(realm_builder, "Config", FakeConfig)
+    return values
+
+
+@pytest.fixture
+def preview(monkeypatch):
+    monkeypatch.setattr(pulumi.runtime, "is_dry_run", lambda: True)
+
+
+@pytest.fixture
+def update(monkeypatch):
+    monkeypatch.setattr(pulumi.runtime, "is_dry_run", lambda: False)
+
+
+def test_service_account_roles_keep_their_existing_names():
+    spec = OIDCClient(app="starrocks", client_id="ol-starrocks-client")
+    assert spec.service_account_role_prefix == "ol-starrocks-service-account"
+
+
+def test_specs_are_immutable():
+    spec = OIDCClient(app="leek", client_id="ol-leek-client")
+    with pytest.raises(ValueError, match="frozen"):
+        spec.app = "other"
+
+
+@pytest.mark.usefixtures("config", "update")
+def test_every_realm_is_built_by_default():
+    assert realm_selected("olapps")
+
+
+@pytest.mark.usefixtures("preview")
+def test_realm_selection_restricts_a_preview(config):
+    config["keycloak:realms"] = ["ol-data-platform"]
+    assert realm_selected("ol-data-platform")
+    assert not realm_selected("olapps")
+
+
+@pytest.mark.usefixtures("update")
+def test_a_restricted_update_is_refused(config):
+    config["keycloak:realms"] = ["ol-data-platform"]
+    with pytest.raises(ValueError, match="Unset it before running an update"):
+        realm_selected("ol-data-platform")
+
+
+def test_composite_roles_skip_client_roles_config_omits(monkeypatch):
+    created: list[tuple[str, list[str]]] = []
+    monkeypatch.setattr(
+        realm_builder.keycloak,
+        "Role",
+        lambda resource_name, **kwargs: created.append(
+            (resource_name, kwargs["composite_roles"])
+        ),
+    )
+    builder = RealmBuilder.__new__(RealmBuilder)
+    builder.realm = type("Realm", (), {"id": "realm-id"})()
+    builder.resource_options = pulumi.ResourceOptions()
+    role = type("Role", (), {"id": "admin-role-id"})()
+    builder.composite_roles(
+        BuiltClient(client=None, roles={"admin": role}),
+        [
+            CompositeRole("superset-admin", "superset_admin", "", "admin"),
+            CompositeRole("superset-alpha", "superset_alpha", "", "alpha"),
+        ],
+    )
+    assert created == [("superset-admin", ["admin-role-id"])]
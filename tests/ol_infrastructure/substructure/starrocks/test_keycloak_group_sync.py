@@ -0,0 +1,132 @@
+"""Tests for the Keycloak -> StarRocks group file sync.
+
+Every ConfigMap write makes StarRocks reload its group file, so the sync must
+leave an unchanged ConfigMap alone; and a role with more than one page of
+members must not be truncated by the concurrent fetch.
+"""
+
+from typing import Any
+
+import httpx
+import pytest
+from kubernetes import client
+
+from ol_infrastructure.substructure.starrocks.keycloak_group_sync import (
+    _GOVERNANCE_ROLES,
+    _PAGE_SIZE,
+    ConfigMapApi,
+    apply_groups,
+    fetch_role_members,
+    render_groups,
+)
+
+CLIENT_UUID = "8c1f"
+
+
+class FakeCoreV1(ConfigMapApi):
+    """Records ConfigMap calls against an in-memory ConfigMap.
+
+    A ``read_status`` fails every read with that API status instead.
+    """
+
+    def __init__(self, data: dict[str, str] | None, read_status: int | None = None):
+        self.data = data
+        self.read_status = read_status
+        self.writes: list[str] = []
+
+    def read_namespaced_config_map(
+        self,
+        name: str,  # noqa: ARG002
+        namespace: str,  # noqa: ARG002
+    ) -> client.V1ConfigMap:
+        if self.read_status is not None:
+            raise client.exceptions.ApiException(status=self.read_status)
+        if self.data is None:
+            raise client.exceptions.ApiException(status=404)
+        return client.V1ConfigMap(data=self.data)
+
+    def patch_namespaced_config_map(
+        self,
+        name: str,  # noqa: ARG002
+        namespace: str,  # noqa: ARG002
+        body: dict[str, Any],
+    ) -> None:
+        self.writes.append("patch")
+        self.data = body["data"]
+
+    def create_namespaced_config_map(
+        self,
+        namespace: str,  # noqa: ARG002
+        body: client.V1ConfigMap,
+    ) -> None:
+        self.writes.append("create")
+        self.data = body.data
+
+
+def keycloak(members: dict[str, list[str]]) -> httpx.Client:
+    """Build an admin API client that answers role-membership pages from members."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        role = request.url.path.split("/")[-2]
+        first = int(request.url.params["first"])
+        size = int(request.url.params["max"])
+        page = members.get(role, [])[first : first + size]
+        return httpx.Response(200, json=[{"username": u} for u in page])
+
+    return httpx.Client(
+        base_url="https://sso.example/admin/realms/ol-data-platform",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_every_role_is_fetched_in_full():
+    big_role = [f"user{i:04d}" for i in range(_PAGE_SIZE * 2 + 5)]
+    http = keycloak(
+        {"ol_researcher": list(reversed(big_role)), "ol_data_engineer": ["bob"]}
+    )
+    members = fetch_role_members(http, CLIENT_UUID)
+    assert list(members) == list(_GOVERNANCE_ROLES)
+    assert members["ol_researcher"] == big_role
+    assert members["ol_data_engineer"] == ["bob"]
+
+
+def test_render_skips_empty_roles():
+    assert (
+        render_groups(
+            {"ol_data_analyst": ["a", "b"], "ol_instructor": [], "ol_researcher": ["c"]}
+        )
+        == "ol_data_analyst:a,b\nol_researcher:c"
+    )
+
+
+def test_unchanged_groups_are_not_written():
+    core_v1 = FakeCoreV1({"groups.txt": "ol_researcher:c"})
+    assert not apply_groups(core_v1, "starrocks", "groups", "ol_researcher:c")
+    assert core_v1.writes == []
+
+
+def test_reordered_groups_are_not_written():
+    core_v1 = FakeCoreV1({"groups.txt": "ol_researcher:d,c\nol_data_analyst:a"})
+    assert not apply_groups(
+        core_v1, "starrocks", "groups", "ol_data_analyst:a\nol_researcher:c,d"
+    )
+    assert core_v1.writes == []
+
+
+def test_changed_groups_are_patched():
+    core_v1 = FakeCoreV1({"groups.txt": "ol_researcher:c"})
+    assert apply_groups(core_v1, "starrocks", "groups", "ol_researcher:c,d")
+    assert core_v1.writes == ["patch"]
+    assert core_v1.data == {"groups.txt": "ol_researcher:c,d"}
+
+
+def test_missing_configmap_is_created():
+    core_v1 = FakeCoreV1(None)
+    assert apply_groups(core_v1, "starrocks", "groups", "")
+    assert core_v1.writes == ["create"]
+
+
+def test_other_api_errors_propagate():
+    core_v1 = FakeCoreV1({}, read_status=403)
+    with pytest.raises(client.exceptions.ApiException):
+        apply_groups(core_v1, "starrocks", "groups", "")
@@ -0,0 +1,133 @@
+"""Tests for the structural JSON deep diff."""
+
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+SCRIPT_PATH = (
+    Path(__file__).resolve().parents[3] / "scripts" / "helpers" / "json_deep_diff.py"
+)
+
+
+def load_diff_module():
+    """Load the diff helper directly from scripts/helpers/json_deep_diff.py."""
+    spec = importlib.util.spec_from_file_location(
+        "test_scripts_json_deep_diff", SCRIPT_PATH
+    )
+    if spec is None or spec.loader is None:
+        msg = f"Unable to load module from {SCRIPT_PATH}"
+        raise RuntimeError(msg)
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def diff_module():
+    """Return the loaded diff module."""
+    return load_diff_module()
+
+
+def _resources(*names):
+    return [{"urn": f"urn:{name}", "outputs": {"name": name}} for name in names]
+
+
+@pytest.mark.unit
+def test_insertion_in_keyed_list_reports_only_the_new_entry(diff_module):
+    """One inserted resource must not shift every later one into 'changed'."""
+    left = {"resources": _resources("a", "b", "c")}
+    right = {"resources": _resources("new", "a", "b", "c")}
+
+    diffs = list(diff_module.structural_diff(left, right))
+
+    assert [(kind, path) for kind, path, _, _ in diffs] == [
+        ("added", "resources[urn=urn:new]")
+    ]
+
+
+@pytest.mark.unit
+def test_changed_leaf_in_keyed_list_is_reported_by_key(diff_module):
+    """A change inside a keyed element is addressed by its key, not its index."""
+    left = {"resources": _resources("a", "b")}
+    right = {"resources": _resources("b", "a")}
+    right["resources"][0]["outputs"]["name"] = "renamed"
+
+    diffs = list(diff_module.structural_diff(left, right))
+
+    assert diffs == [("changed", "resources[urn=urn:b].outputs.name", "b", "renamed")]
+
+
+@pytest.mark.unit
+def test_scalar_lists_are_aligned_by_content(diff_module):
+    """Unkeyed lists pair up by content, so a removal is one removal."""
+    diffs = list(diff_module.structural_diff({"x": [1, 2, 3]}, {"x": [1, 3]}))
+
+    assert diffs == [("removed", "x[1]", 2, None)]
+
+
+@pytest.mark.unit
+def test_numbers_compare_as_equal_values(diff_module):
+    """`1`, `1.0` and `True` are equal, as they were for the flattening diff."""
+    left = {"a": 1, "b": 1, "c": [0, 2.5]}
+    right = {"a": 1.0, "b": True, "c": [False, 2.5]}
+
+    assert list(diff_module.structural_diff(left, right)) == []
+
+
+@pytest.mark.unit
+def test_numbers_and_strings_still_differ(diff_module):
+    """Normalising numbers must not make `1` equal to `"1"` or `1.5` to `1`."""
+    diffs = list(diff_module.structural_diff({"a": 1, "b": 1.5}, {"a": "1", "b": 1}))
+
+    assert [path for _, path, _, _ in diffs] == ["a", "b"]
+
+
+@pytest.mark.unit
+def test_identical_documents_have_no_differences(diff_module):
+    """Key order does not matter for objects."""
+    left = {"a": {"x": 1, "y": [1, {"z": None}]}, "b": "s"}
+    right = {"b": "s", "a": {"y": [1, {"z": None}], "x": 1}}
+
+    assert list(diff_module.structural_diff(left, right)) == []
+
+
+@pytest.mark.unit
+def test_iter_paths_matches_the_flattened_form(diff_module):
+    """The generator yields what the old recursive flattener returned."""
+    nested = {"a": {"b": [1, {"c": 2}], "d": {}}, "e": []}
+
+    assert diff_module.get_all_paths(nested) == {"a.b[0]": 1, "a.b[1].c": 2}
+
+
+@pytest.mark.unit
+def test_empty_containers_are_not_reported(diff_module, tmp_path, capsys):
+    """An added or removed empty container has no leaves to report."""
+    left = tmp_path / "left.json"
+    right = tmp_path / "right.json"
+    left.write_text('{"a": {}, "b": [], "c": {"d": 1}}')
+    right.write_text('{"b": {}, "c": {"d": 1, "e": []}}')
+
+    diff_module.deep_diff(str(left), str(right))
+
+    assert capsys.readouterr().out.count("(none)") == 3
+
+
+@pytest.mark.unit
+def test_iter_paths_handles_depth_beyond_the_recursion_limit(diff_module):
+    """Deeply nested documents must not raise RecursionError."""
+    deep: dict[str, Any] = {}
+    node = deep
+    for _ in range(sys.getrecursionlimit() + 100):
+        node["n"] = {}
+        node = node["n"]
+    node["leaf"] = 1
+
+    (path, value) = list(diff_module.iter_paths(deep))[-1]
+
+    assert path.endswith(".leaf")
+    assert value == 1
@@ -0,0 +1,214 @@
+"""Tests for the observation cache and batch mode of analyze-pulumi-iam-usage.
+
+Access Analyzer is replaced by an in-memory fake, so these cover what the
+script does with its answers: which roles it asks about, what it caches, and
+what survives when one role in a batch fails.
+"""
+
+import importlib.util
+import json
+import sys
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from importlib.machinery import SourceFileLoader
+from pathlib import Path
+from typing import Any
+
+import pytest
+from botocore.exceptions import ClientError
+
+SCRIPT_PATH = Path(__file__).resolve().parents[2] / "bin" / "analyze-pulumi-iam-usage"
+
+ROLES = [
+    "arn:aws:iam::123456789012:role/worker-infra",
+    "arn:aws:iam::123456789012:role/worker-ocw",
+]
+
+
+def load_script_module():
+    """Load bin/analyze-pulumi-iam-usage, which has no .py suffix."""
+    name = "test_scripts_analyze_pulumi_iam_usage"
+    loader = SourceFileLoader(name, str(SCRIPT_PATH))
+    spec = importlib.util.spec_from_loader(name, loader)
+    if spec is None:
+        msg = f"Unable to load module from {SCRIPT_PATH}"
+        raise RuntimeError(msg)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+class QuotaExceededError(Exception):
+    pass
+
+
+class ConflictError(Exception):
+    pass
+
+
+class FakeAccessAnalyzer:
+    """Answers for one batch: each role's generated policy and finding history.
+
+    Roles in ``failed_roles`` fail policy generation; roles in
+    ``throttled_finding_roles`` have their finding lookup throttled.
+    """
+
+    class exceptions:  # noqa: N801 - mirrors the boto3 client attribute
+        ServiceQuotaExceededException = QuotaExceededError
+        ConflictException = ConflictError
+
+    def __init__(
+        self,
+        *,
+        failed_roles: Iterable[str] = (),
+        throttled_finding_roles: Iterable[str] = (),
+        max_jobs: int | None = None,
+    ) -> None:
+        self.failed_roles = set(failed_roles)
+        self.throttled_finding_roles = set(throttled_finding_roles)
+        self.max_jobs = max_jobs
+        self.started: list[str] = []
+        self.running: set[str] = set()
+        self.finding_requests: list[str] = []
+
+    def start_policy_generation(self, **kwargs: Any) -> dict[str, Any]:
+        role_arn = kwargs["policyGenerationDetails"]["principalArn"]
+        if self.max_jobs is not None and len(self.running) >= self.max_jobs:
+            raise QuotaExceededError
+        self.started.append(role_arn)
+        self.running.add(role_arn)
+        return {"jobId": role_arn}
+
+    def get_generated_policy(self, **kwargs: Any) -> dict[str, Any]:
+        job_id = kwargs["jobId"]
+        self.running.discard(job_id)
+        if job_id in self.failed_roles:
+            return {
+                "jobDetails": {
+                    "status": "FAILED",
+                    "jobError": {"code": "SERVICE_ERROR", "message": "boom"},
+                }
+            }
+        policy = {"Statement": [{"Action": f"s3:Get{job_id.rsplit('/', 1)[-1]}"}]}
+        return {
+            "jobDetails": {"status": "SUCCEEDED"},
+            "generatedPolicyResult": {
+                "generatedPolicies": [{"policy": json.dumps(policy)}]
+            },
+        }
+
+    def list_findings_v2(self, **kwargs: Any) -> dict[str, Any]:
+        role_arn = kwargs["filter"]["resource"]["eq"][0]
+        if role_arn in self.throttled_finding_roles:
+            raise ClientError({"Error": {"Code": "Throttling"}}, "ListFindingsV2")
+        self.finding_requests.append(role_arn)
+        return {"findings": [{"id": role_arn}]}
+
+    def get_finding_v2(self, **_: Any) -> dict[str, Any]:
+        return {
+            "findingDetails": [
+                {
+                    "unusedPermissionDetails": {
+                        "serviceNamespace": "ec2",
+                        "actions": [
+                            {"action": "DescribeVpcs", "lastAccessed": "2026-01-01"},
+                            {"action": "RunInstances"},
+                        ],
+                    }
+                }
+            ]
+        }
+
+
+@pytest.fixture
+def script():
+    return load_script_module()
+
+
+@pytest.fixture
+def observe(script, monkeypatch, tmp_path):
+    """Run one batch against a given fake, caching under tmp_path."""
+
+    def run(client, roles=ROLES, **overrides):
+        monkeypatch.setattr(script.boto3, "client", lambda *_, **__: client)
+        kwargs = {
+            "analyzer_arn": "analyzer",
+            "access_role_arn": "access-role",
+            "trail_arn": "trail",
+            "lookback_days": 14,
+            "region": "us-east-1",
+            "poll_interval_seconds": 0,
+            "timeout_seconds": 60,
+            "skip_cloudtrail": False,
+            "cache_dir": tmp_path,
+        } | overrides
+        return script._observed_actions_by_role(list(roles), **kwargs)
+
+    return run
+
+
+def test_batch_merges_cloudtrail_and_finding_history(observe):
+    observed = observe(FakeAccessAnalyzer())
+    assert observed[ROLES[0]] == {"s3:Getworker-infra", "ec2:DescribeVpcs"}
+    assert observed[ROLES[1]] == {"s3:Getworker-ocw", "ec2:DescribeVpcs"}
+
+
+def test_second_run_reads_the_cache(observe):
+    observe(FakeAccessAnalyzer())
+    client = FakeAccessAnalyzer()
+    first = observe(FakeAccessAnalyzer(), cache_dir=None)
+    assert observe(client) == first
+    assert client.started == []
+    assert client.finding_requests == []
+
+
+def test_refresh_ignores_the_cache(observe):
+    observe(FakeAccessAnalyzer())
+    client = FakeAccessAnalyzer()
+    observe(client, refresh=True)
+    assert client.started == ROLES
+
+
+def test_quota_rejections_are_retried_not_fatal(observe):
+    client = FakeAccessAnalyzer(max_jobs=1)
+    observed = observe(client)
+    assert set(observed) == set(ROLES)
+    assert client.started == ROLES
+
+
+def test_a_failed_role_keeps_the_rest_of_the_batch(observe):
+    with pytest.raises(RuntimeError, match=r"incomplete for 1 role.*SERVICE_ERROR"):
+        observe(FakeAccessAnalyzer(failed_roles={ROLES[1]}))
+
+    client = FakeAccessAnalyzer()
+    observed = observe(client)
+    assert client.started == [ROLES[1]]
+    assert client.finding_requests == []
+    assert observed[ROLES[0]] == {"s3:Getworker-infra", "ec2:DescribeVpcs"}
+
+
+def test_a_failed_finding_walk_keeps_the_rest_of_the_batch(observe):
+    with pytest.raises(RuntimeError, match="unused-access findings"):
+        observe(FakeAccessAnalyzer(throttled_finding_roles={ROLES[0]}))
+
+    retry = FakeAccessAnalyzer()
+    observe(retry)
+    assert retry.started == []
+    assert retry.finding_requests == [ROLES[0]]
+
+
+def test_skip_cloudtrail_ignores_cached_cloudtrail_actions(observe):
+    observe(FakeAccessAnalyzer())
+    client = FakeAccessAnalyzer()
+    observed = observe(client, skip_cloudtrail=True)
+    assert observed[ROLES[0]] == {"ec2:DescribeVpcs"}
+    assert client.started == []
+
+
+def test_window_ends_at_the_last_utc_midnight(script):
+    start, end = script._policy_generation_window(
+        14, now=datetime(2026, 3, 10, 17, 45, tzinfo=UTC)
+    )
+    assert end == datetime(2026, 3, 10, tzinfo=UTC)
+    assert start == datetime(2026, 2, 24, tzinfo=UTC)